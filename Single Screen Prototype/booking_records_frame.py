@@ -3,19 +3,26 @@ from tkinter import ttk, messagebox
 import calendar
 from datetime import date
 
-from database_manager import DatabaseManager
 from edit_reservation_dialog import EditReservationDialog
-
-db = DatabaseManager()
+from ui_task_runner import LoadingIndicator, get_runner
+from virtual_table import VirtualTable
 
 
 class BookingRecordsFrame(tk.Frame):
-    """Displays booking records with filtering, pagination, and edit dialog access."""
+    """Displays booking records with filtering, sorting, and edit dialog access."""
+
+    # get_filtered_reservations' ORDER BY, used to place rows merged from a delta
+    STATUS_PRIORITY = {"Late Check-out": 1, "Late": 2, "Checked-in": 3}
 
     def __init__(self, parent, controller: "HotelApp"):
         super().__init__(parent, bg="#2C3E50")
         self.controller = controller
+        self.db = controller.db
         self.sort_column = None
+        self._sort_index = None
+        self._filters = {}
+        self._watermark = None
+        self._stale = False
         self.sort_reverse = False
 
         self.hotel = getattr(controller, "hotel", None)
@@ -178,8 +185,14 @@ class BookingRecordsFrame(tk.Frame):
             "status",
         )
 
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=15)
-        self.tree.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        table_frame = tk.Frame(self, bg="#2C3E50")
+        table_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        vsb = ttk.Scrollbar(table_frame, orient="vertical")
+        vsb.pack(side="right", fill="y")
+
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=15)
+        self.tree.pack(fill="both", expand=True)
 
         headings = [
             "Res ID", "Guest ID", "Guest", "Room ID", "Room #",
@@ -192,30 +205,20 @@ class BookingRecordsFrame(tk.Frame):
 
         # Open Edit Dialog on double-click
         self.tree.bind("<Double-1>", self.open_edit_dialog)
+        self.loading = LoadingIndicator(self.tree)
+
+        # Only the visible rows exist as Treeview items; the scrollbar drives the table, not the tree
+        self.table = VirtualTable(self.tree, key=lambda row: row[0], scrollbar=vsb)  # reservation_id
 
         # ---------------------------------------------------------
-        # PAGINATION
+        # RESULT COUNT
         # ---------------------------------------------------------
-        page_frame = tk.Frame(self, bg="#2C3E50")
-        page_frame.pack(fill="x", pady=6)
+        count_frame = tk.Frame(self, bg="#2C3E50")
+        count_frame.pack(fill="x", pady=6)
 
-        self.current_page = tk.IntVar(value=1)
-        self.rows_per_page = 29
         self.result_rows = []
-
-        # Prev / Next Buttons
-        tk.Button(page_frame, text="<", command=lambda: self._change_page(-1)).pack(side="left", padx=6)
-        tk.Label(page_frame, text="Page", bg="#2C3E50", fg="white").pack(side="left")
-
-        self.page_entry = tk.Entry(page_frame, width=4, justify="center")
-        self.page_entry.insert(0, "1")
-        self.page_entry.pack(side="left", padx=6)
-        self.page_entry.bind("<Return>", lambda e: self._go_to_page())
-
-        self.max_page_label = tk.Label(page_frame, text="of 1", bg="#2C3E50", fg="white")
-        self.max_page_label.pack(side="left", padx=(6, 20))
-
-        tk.Button(page_frame, text=">", command=lambda: self._change_page(1)).pack(side="left")
+        self.count_label = tk.Label(count_frame, text="0 reservations", bg="#2C3E50", fg="white")
+        self.count_label.pack(side="left", padx=6)
 
         # ---------------------------------------------------------
         # DAY DROP-DOWN UPDATERS
@@ -229,6 +232,8 @@ class BookingRecordsFrame(tk.Frame):
         # ---------------------------------------------------------
         # INITIAL DATA LOAD
         # ---------------------------------------------------------
+        # Reload when a booking, guest or room changes (here or at another desk)
+        controller.notifier.subscribe(("reservations", "guests", "rooms"), self._on_tables_changed)
         self._load_data()
 
         # Enter triggers filtering
@@ -240,6 +245,8 @@ class BookingRecordsFrame(tk.Frame):
     # ---------------------------------------------------------------------
     def _load_data(self):
         """Pulls filters, requests data from DB, and updates table."""
+        self._stale = False
+        self._loaded_on = date.today()
 
         def build_date(y, m, d):
             if y and m and d:
@@ -249,7 +256,8 @@ class BookingRecordsFrame(tk.Frame):
         ci_date = build_date(self.ci_year_var.get(), self.ci_month_var.get(), self.ci_day_var.get())
         co_date = build_date(self.co_year_var.get(), self.co_month_var.get(), self.co_day_var.get())
 
-        self.result_rows = db.get_filtered_reservations(
+        # Filters of the rows on screen; later deltas are fetched with the same filters
+        self._filters = dict(
             guest_name=self.guest_var.get().strip() or None,
             room_number=self.room_var.get().strip() or None,
             status=self.status_var.get() or None,
@@ -257,9 +265,63 @@ class BookingRecordsFrame(tk.Frame):
             checkout_before=co_date,
             show_active=self.show_active_var.get(),
         )
+        self._watermark = None
+
+        # Query runs off the Tk thread; a newer filter supersedes a load still in flight
+        get_runner().submit(
+            self, self._fetch_all, self._filters,
+            key="reservations",
+            indicator=self.loading,
+            on_success=self._show_rows,
+            on_error=self._show_load_error,
+        )
+
+    def _fetch_all(self, filters):
+        # Watermark first: anything written while the query runs is delivered again by the next delta
+        return self.db.current_change_seq(), self.db.get_filtered_reservations(**filters)
+
+    def _show_rows(self, loaded):
+        self._watermark, self.result_rows = loaded
+        self._sort_index = None
+        self._update_table()
+        if self._stale and self.controller.visible_frame is self:
+            self._sync_changes()
+
+    def _sync_changes(self):
+        """Merge the reservations changed since the last load instead of reloading the whole result."""
+        if self._watermark is None:
+            self._load_data()
+            return
+        self._stale = False
+        get_runner().submit(
+            self, self.db.get_filtered_reservation_changes, self._watermark,
+            key="reservations",
+            on_success=self._merge_changes,
+            on_error=self._show_load_error,
+            **self._filters,
+        )
 
-        self.current_page.set(1)
-        self._update_page()
+    def _merge_changes(self, delta):
+        self._watermark, rows, removed = delta
+        if not rows and not removed:
+            return
+        gone = set(removed)
+        changed = {row[0]: row for row in rows}
+        merged = [changed.pop(row[0], row) for row in self.result_rows if row[0] not in gone]
+        merged.extend(changed.values())
+        self.result_rows = merged
+        self._apply_order()
+        self._update_table()
+
+    def _show_load_error(self, e):
+        self._stale = True
+        messagebox.showerror("Database Error", f"Could not load reservations:\n{e}")
+
+    def _on_tables_changed(self, tables):
+        self._stale = True
+        # While a full load is in flight (no watermark yet) _show_rows picks the change up
+        if self.controller.visible_frame is self and self._watermark is not None:
+            self._sync_changes()
 
     def _sort_by_column(self, col_name):
         """Sorts visible reservation records by column header click."""
@@ -275,6 +337,23 @@ class BookingRecordsFrame(tk.Frame):
             self.sort_column = col_name
             self.sort_reverse = False
 
+        # Sort internal rows
+        self._sort_index = col_index
+        self._apply_order()
+
+        # Show the top of the sorted rows
+        self._update_table(keep_position=False)
+
+    def _apply_order(self):
+        """Re-sort result_rows by the clicked column, or in the database's order if none was clicked."""
+        if self._sort_index is None:
+            # Same order as get_filtered_reservations: late check-outs, late, checked-in, then newest check-in
+            self.result_rows.sort(key=lambda row: row[5], reverse=True)
+            self.result_rows.sort(key=lambda row: self.STATUS_PRIORITY.get(row[9], 99))
+            return
+
+        col_index = self._sort_index
+
         # Attempt numeric sort when appropriate
         def sort_key(row):
             value = row[col_index]
@@ -284,49 +363,12 @@ class BookingRecordsFrame(tk.Frame):
             except (TypeError, ValueError):
                 return value
 
-        # Sort internal rows
         self.result_rows.sort(key=sort_key, reverse=self.sort_reverse)
 
-        # Restart pagination on page 1
-        self.current_page.set(1)
-        self._update_page()
-
-    def _update_page(self):
-        self.tree.delete(*self.tree.get_children())
-
-        page = self.current_page.get()
-        start = (page - 1) * self.rows_per_page
-        end = start + self.rows_per_page
-
-        for row in self.result_rows[start:end]:
-            self.tree.insert("", tk.END, values=row)
-
-        max_page = max(1, (len(self.result_rows) - 1) // self.rows_per_page + 1)
-        self.page_entry.delete(0, tk.END)
-        self.page_entry.insert(0, str(page))
-        self.max_page_label.config(text=f"of {max_page}")
-
-    def _change_page(self, amount):
-        new_page = self.current_page.get() + amount
-        max_page = max(1, (len(self.result_rows) - 1) // self.rows_per_page + 1)
-
-        if 1 <= new_page <= max_page:
-            self.current_page.set(new_page)
-            self._update_page()
-
-    def _go_to_page(self):
-        try:
-            new_page = int(self.page_entry.get())
-        except ValueError:
-            self.page_entry.delete(0, tk.END)
-            self.page_entry.insert(0, "1")
-            return
-
-        max_page = max(1, (len(self.result_rows) - 1) // self.rows_per_page + 1)
-        new_page = max(1, min(new_page, max_page))
-
-        self.current_page.set(new_page)
-        self._update_page()
+    def _update_table(self, keep_position=True):
+        # Keyed diff: only rows that changed inside the visible window touch the Treeview
+        self.table.set_rows(self.result_rows, keep_position=keep_position)
+        self.count_label.config(text=f"{len(self.result_rows)} reservations")
 
     # ---------------------------------------------------------------------
     # EDIT DIALOG OPEN
@@ -346,7 +388,7 @@ class BookingRecordsFrame(tk.Frame):
             parent_frame=self,
             controller=self.controller,
             reservation_values=values,
-            refresh_callback=self._load_data
+            refresh_callback=self._sync_changes
         )
 
     # ---------------------------------------------------------------------
@@ -423,4 +465,8 @@ class BookingRecordsFrame(tk.Frame):
     # REFRESH (Called by parent controller)
     # ---------------------------------------------------------------------
     def refresh(self):
-        self._load_data()
+        # Full reload when the day rolled over (show_active uses today); otherwise merge only what changed
+        if self._loaded_on != date.today():
+            self._load_data()
+        elif self._stale:
+            self._sync_changes()
@@ -20,11 +20,10 @@ from metrics_frame import MetricsFrame
 from employee_frame import EmployeeProfileFrame
 from reservation_form_frame import ReservationFormFrame
 from hotel_manager import HotelManager
+from job_scheduler import JobScheduler
 
 print("[Debug GUI] Using database at:", DB_PATH)
 
-db = DatabaseManager("hotel.db")
-
 BG_COLOR = "#2C3E50"
 FG_COLOR = "#ECF0F1"
 
@@ -44,11 +43,20 @@ class CustomerMenuFrame(tk.Frame):
         # (self doesn't have show_splash, show_frame, etc.)
         self.controller = controller
 
-        # Use the global db instance
-        self.db = db
-        self.hotel = HotelManager(self.db)
-        # Allow DatabaseManager to reference HotelManager if needed
-        self.db.hotel_manager = self.hotel
+        # Share the app's database; a standalone preview opens its own
+        self.scheduler = None
+        if self.controller is not None:
+            self.db = self.controller.db
+            self.hotel = self.controller.hotel
+        else:
+            self.db = DatabaseManager()
+            self.hotel = HotelManager(self.db)
+            # Allow DatabaseManager to reference HotelManager if needed
+            self.db.hotel_manager = self.hotel
+
+            # Standalone preview has no HotelApp scheduler, so run the daily jobs here
+            self.scheduler = JobScheduler(self.db)
+            self.scheduler.start()
 
         # Current User logged in info
         self.current_user_id = None
@@ -93,7 +101,7 @@ class MainMenuFrame(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg=BG_COLOR)
         self.controller = controller
-        self.db = db
+        self.db = controller.db
 
         # Frame fills the container
         self.grid_rowconfigure(0, weight=1)
@@ -219,12 +227,7 @@ class MainMenuFrame(tk.Frame):
             pass
 
     def refresh(self):
-        #updates room availability based on reservation date
-        self.db.update_room_availability_today()
-
-        #Updates reservations based on date and times
-        self.db.run_daily_reservation_updates()
-        self.db.run_daily_reservation_updates()
+        #Room availability and daily reservation updates run from the JobScheduler
 
         #Called when this menu is shown; hide buttons based on role.
         name = self.controller.current_user_name or "Guest"
@@ -257,8 +260,8 @@ class ReservationLookupFrame(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg=BG_COLOR)
         self.controller = controller
-        self.db = db
-        self.hotel = HotelManager(self.db)
+        self.db = controller.db
+        self.hotel = controller.hotel
 
         # Title
         title = tk.Label(
@@ -6,6 +6,7 @@ import sys
 from pathlib import Path
 from customer_menu_frame import CustomerMenuFrame
 from login_frame import LoginFrame
+from database_manager import DatabaseManager
 
 BG = "#2C3E50"
 FG = "#ECF0F1"
@@ -77,7 +78,8 @@ def launch_staff_app(root):
         class EmployeeLoginController:
             def __init__(self, root_widget):
                 self.root_widget = root_widget
-                self.db = None
+                # LoginFrame checks credentials through controller.db
+                self.db = getattr(root_widget, "db", None) or DatabaseManager()
                 self.hotel = None
                 self.current_user_id = None
                 self.current_user_name = None
@@ -2,9 +2,8 @@
 
 import smtplib
 import base64
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
-from email.mime.multipart import MIMEMultipart
+
+from receipt_renderer import RECEIPT_SUBJECT, ReceiptRenderer
 
 
 class EmailReceiptSender:
@@ -13,181 +12,57 @@ class EmailReceiptSender:
     with optional inline CID-embedded logo support.
     """
 
-    def __init__(self, smtp_server, smtp_port, username, password, sender_name="Hotel Reservations"):
+    def __init__(self, smtp_server, smtp_port, username, password, sender_name="Hotel Reservations",
+                 outbox=None):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
         self.sender_name = sender_name
 
-        # Store Base64
-        self.logo_base64 = HOTEL_LOGO_BASE64
+        # When set (an email_outbox.EmailOutbox), receipts are queued and sent by its worker thread
+        self.outbox = outbox
+
+        # Template compiled and logo part encoded once, not per email
+        self.renderer = ReceiptRenderer(sender_name, username, base64.b64decode(HOTEL_LOGO_BASE64))
 
     # ----------------------------------------------------------
-    # HTML receipt template
+    # HTML receipt template (see receipt_renderer.RECEIPT_HTML)
     # ----------------------------------------------------------
     def build_reservation_receipt_html(
             self, guest_name, reservation_id, room_number,
             check_in, check_out, nights, amount, is_paid):
 
-        TAX_RATE = 0.145
-
-        # Reverse-calc subtotal and tax using the total
-        subtotal = amount / (1 + TAX_RATE)
-        tax_amount = subtotal * TAX_RATE
-        room_price = subtotal / nights if nights else subtotal
-
-        status_label = "Total Paid" if is_paid else "Total Due At Check-In"
-
-        return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-    <meta charset="UTF-8" />
-    <title>Your Reservation Receipt</title>
-
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            background-color: #f4f4f4;
-            margin: 0;
-            padding: 0;
-        }}
-
-        .container {{
-            width: 100%;
-            max-width: 600px;
-            margin: 20px auto;
-            background: white;
-            padding: 20px;
-            border-radius: 8px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }}
-
-        h2 {{
-            text-align: center;
-            color: #2C3E50;
-        }}
-
-        .receipt-box {{
-            border: 1px solid #ccc;
-            padding: 20px;
-            border-radius: 6px;
-            background-color: #fafafa;
-            margin-top: 20px;
-        }}
-
-        .row {{
-            margin-bottom: 10px;
-        }}
-
-        .label {{
-            font-weight: bold;
-            color: #34495E;
-            margin-right: 5px;
-        }}
-
-        .footer {{
-            margin-top: 25px;
-            text-align: center;
-            font-size: 13px;
-            color: #666;
-        }}
-
-        .logo {{
-            text-align: center;
-            margin-bottom: 20px;
-        }}
-    </style>
-
-    </head>
-    <body>
-
-    <div class="container">
-
-        <div class="logo">
-            <img src="cid:hotel_logo" alt="Hotel Logo" style="width:160px;">
-        </div>
-
-        <h2>Reservation Confirmation</h2>
-
-        <p>Hello {guest_name},</p>
-        <p>Thank you for choosing our hotel! Below is your reservation receipt:</p>
-
-        <div class="receipt-box">
-
-            <div class="row"><span class="label">Reservation ID:</span> {reservation_id}</div>
-            <div class="row"><span class="label">Room Number:</span> {room_number}</div>
-            <div class="row"><span class="label">Check-In:</span> {check_in}</div>
-            <div class="row"><span class="label">Check-Out:</span> {check_out}</div>
-
-            <hr>
-
-            <div class="row"><span class="label">Room Price:</span> ${room_price:.2f}</div>
-            <div class="row"><span class="label">{nights} Nights:</span> X{nights}</div>
-            <div class="row"><span class="label">Subtotal:</span> ${subtotal:.2f}</div>
-            <div class="row"><span class="label">Tax (14.5%):</span> ${tax_amount:.2f}</div>
-
-            <div class="row" style="margin-top: 15px; font-size: 16px;">
-                <span class="label">{status_label}:</span> ${amount:.2f}
-            </div>
-
-        </div>
-
-        <p class="footer">
-            We look forward to your stay!<br>
-            — {self.sender_name}
-        </p>
-
-    </div>
-
-    </body>
-    </html>
-    """
+        return self.renderer.render_html(
+            guest_name, reservation_id, room_number,
+            check_in, check_out, nights, amount, is_paid
+        )
 
     # ----------------------------------------------------------
-    # Low-level email sender
+    # Message builder: complete message text with the inline logo
     # ----------------------------------------------------------
-    def send_email(self, to_email, subject, body_html):
-
-        msg = MIMEMultipart("related")  # allows HTML + inline images
-        msg["From"] = f"{self.sender_name} <{self.username}>"
-        msg["To"] = to_email
-        msg["Subject"] = subject
+    def build_message(self, to_email, subject, body_html):
+        return self.renderer.render_message(to_email, subject, body_html)
 
-        # Alternative part for HTML + plain fallback
-        alt = MIMEMultipart("alternative")
-        alt.attach(MIMEText(body_html, "html"))
-        msg.attach(alt)
+    # ----------------------------------------------------------
+    # Low-level email sender (sends right away, one connection per message)
+    # ----------------------------------------------------------
+    def send_email(self, to_email, subject, body_html):
 
-        # ---------------------------------------------------
-        # Embed CID inline image (hotel logo)
-        # ---------------------------------------------------
-        try:
-            logo_bytes = base64.b64decode(self.logo_base64)
-            img = MIMEImage(logo_bytes, name="hotel_logo.png")
-            img.add_header("Content-ID", "<hotel_logo>")
-            img.add_header("Content-Disposition", "inline", filename="hotel_logo.png")
-            msg.attach(img)
-        except Exception as e:
-            print("LOGO EMBED ERROR:", e)
+        msg = self.build_message(to_email, subject, body_html)
 
-        # ---------------------------------------------------
-        # Send through SMTP
-        # ---------------------------------------------------
         try:
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 server.starttls()
                 server.login(self.username, self.password)
-                server.sendmail(self.username, to_email, msg.as_string())
+                server.sendmail(self.username, to_email, msg)
             return True
-
         except Exception as e:
             print("EMAIL SEND ERROR:", e)
             return False
 
     # ----------------------------------------------------------
-    # High-level helper: builds + sends receipt email
+    # High-level helper: builds + sends (or queues) receipt email
     # ----------------------------------------------------------
     def send_reservation_receipt(self, guest_email, guest_name, reservation_id,
                                  room_number, check_in, check_out, nights, amount, is_paid):
@@ -196,12 +71,22 @@ class EmailReceiptSender:
             guest_name, reservation_id, room_number,
             check_in, check_out, nights, amount, is_paid
         )
+        subject = RECEIPT_SUBJECT.format(reservation_id=reservation_id)
 
-        return self.send_email(
-            to_email=guest_email,
-            subject=f"Your Reservation Confirmation #{reservation_id}",
-            body_html=html_body,
-        )
+        if self.outbox is None:
+            return self.send_email(to_email=guest_email, subject=subject, body_html=html_body)
+
+        # Queued: True means the receipt is stored; the outbox worker delivers (and retries) it
+        try:
+            self.outbox.enqueue(
+                guest_email, subject,
+                self.build_message(guest_email, subject, html_body),
+                reservation_id=reservation_id,
+            )
+            return True
+        except Exception as e:
+            print("EMAIL QUEUE ERROR:", e)
+            return False
 
     # ==============================================================
     # Storing the MASSIVE Base64 logo down here for readability sake
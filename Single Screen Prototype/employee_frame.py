@@ -1,19 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
-from database_manager import DatabaseManager
-import random
 
 BG_APP = "#2C3E50"
 PANEL_BG = "#34495E"
 
-db = DatabaseManager()
-
 
 class EmployeeProfileFrame(tk.Frame):
     def __init__(self, parent, controller: "HotelApp"):
         super().__init__(parent, bg=BG_APP)
         self.controller = controller
+        self.db = controller.db
 
         # Search field variables
         self.search_id_var = tk.StringVar()
@@ -127,7 +124,7 @@ class EmployeeProfileFrame(tk.Frame):
         name = self.search_name_var.get().strip()
         role = self.search_role_var.get().strip()
 
-        rows = db.search_employees(
+        rows = self.db.search_employees(
             emp_id=emp_id if emp_id else None,
             name=name if name else None,
             role=role if role else None
@@ -144,7 +141,7 @@ class EmployeeProfileFrame(tk.Frame):
         self.results_listbox.delete(0, tk.END)
         role = self.search_role_var.get().strip()
 
-        rows = db.load_all_employees(role if role else None)
+        rows = self.db.load_all_employees(role if role else None)
 
         if not rows:
             self.results_listbox.insert(tk.END, "No employees found.")
@@ -214,7 +211,7 @@ class EmployeeProfileFrame(tk.Frame):
         self.open_employee_profile_popup(eid)
 
     def open_employee_profile_popup(self, employee_id):
-        data = db.get_employee_details(employee_id)
+        data = self.db.get_employee_details(employee_id)
         if not data:
             return
 
@@ -337,7 +334,7 @@ class EmployeeProfileFrame(tk.Frame):
 
         if not create_mode:
             # Editing existing employee
-            data = db.get_employee_details(employee_id)
+            data = self.db.get_employee_details(employee_id)
             if not data:
                 return
 
@@ -455,9 +452,9 @@ class EmployeeProfileFrame(tk.Frame):
         if create_mode:
             def create_employee():
                 try:
-                    unique_id = db.generate_unique_employee_id()
+                    unique_id = self.db.generate_unique_employee_id()
 
-                    success = db.create_employee(
+                    success = self.db.create_employee(
                         unique_id,
                         self.edit_vars["password"].get(),
                         self.edit_vars["first"].get(),
@@ -492,7 +489,7 @@ class EmployeeProfileFrame(tk.Frame):
             # EDIT MODE BUTTONS ----------------------------------------
             def save_changes():
                 try:
-                    success = db.update_employee(
+                    success = self.db.update_employee(
                         employee_id,
                         self.edit_vars["password"].get(),
                         self.edit_vars["first"].get(),
@@ -556,7 +553,7 @@ class EmployeeProfileFrame(tk.Frame):
             return
 
         try:
-            success = db.delete_employee(employee_id)
+            success = self.db.delete_employee(employee_id)
 
             if success:
                 messagebox.showinfo("Deleted", "Employee removed.")
@@ -577,19 +574,5 @@ class EmployeeProfileFrame(tk.Frame):
 
 
     def generate_unique_employee_id(self):
-        """Generate a unique 5-digit employee ID (10000–99999)."""
-        try:
-            conn = db.connect()
-            cur = conn.cursor()
-
-            while True:
-                new_id = random.randint(10000, 99999)
-
-                cur.execute("SELECT 1 FROM employees WHERE employee_id = ?", (new_id,))
-                exists = cur.fetchone()
-
-                if not exists:
-                    return new_id
-
-        finally:
-            conn.close()
+        """Generate a unique employee ID (see DatabaseManager.generate_unique_employee_id)."""
+        return self.db.generate_unique_employee_id()
@@ -9,19 +9,16 @@ repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if repo_root not in sys.path:
     sys.path.insert(0, repo_root)
 
-from database_manager import DatabaseManager
-
 BG_APP = "#2C3E50"
 PANEL_BG = "#34495E"
 ACCENT = "#1ABC9C"
 
-db = DatabaseManager()
-
 
 class LoginFrame(tk.Frame):
     def __init__(self, parent, controller: "HotelApp"):
         super().__init__(parent, bg=BG_APP)
         self.controller = controller
+        self.db = controller.db
 
         # Variables
         self.username_var = tk.StringVar()
@@ -120,7 +117,7 @@ class LoginFrame(tk.Frame):
 
         conn = None
         try:
-            conn = db.connect()
+            conn = self.db.connect()
             cur = conn.cursor()
 
             cur.execute("""
@@ -8,28 +8,39 @@ if repo_root not in sys.path:
     sys.path.insert(0, repo_root)
 
 from reservation_lookup_window import open_reservation_lookup_window
+import importlib
 from database_manager import DatabaseManager
 from config import DB_PATH
 import tkinter as tk
-from rooms_status_frame import RoomStatusFrame
-from login_frame import LoginFrame
-from booking_records_frame import BookingRecordsFrame
-from metrics_frame import MetricsFrame
-from employee_frame import EmployeeProfileFrame
-from reservation_form_frame import ReservationFormFrame
 from hotel_manager import HotelManager
+from job_scheduler import JobScheduler
+from change_notifier import ChangeNotifier
+import metrics_exporter
 from email_receipt_sender import EmailReceiptSender
-from customer_menu_frame import CustomerMenuFrame
-from customer_window import SplashScreen
+from email_outbox import EmailOutbox
+from room_search_popup import RoomSearchPopup
+from asset_manager import get_assets
 
 
 print("[Debug GUI] Using database at:", DB_PATH)
 
-db = DatabaseManager("hotel.db")
-
 BG_COLOR = "#2C3E50"
 FG_COLOR = "#ECF0F1"
 
+#Screen name -> "module:FrameClass". A screen's module is imported and its frame built the first time it is
+#shown, so startup only pays for the login screen.
+SCREENS = {
+    "login_screen": "login_frame:LoginFrame",
+    "main_menu": f"{__name__}:MainMenuFrame",
+    "new_reservation": "reservation_form_frame:ReservationFormFrame",
+    "rooms_status": "rooms_status_frame:RoomStatusFrame",
+    "booking_records": "booking_records_frame:BookingRecordsFrame",
+    "metrics": "metrics_frame:MetricsFrame",
+    "employees": "employee_frame:EmployeeProfileFrame",
+    "customer_menu": "customer_menu_frame:CustomerMenuFrame",
+    "splash_screen": "customer_window:SplashScreen",
+}
+
 #---------------------------------------
 # APP INITIALIZATION / PROGRAM START
 #---------------------------------------
@@ -41,14 +52,40 @@ class HotelApp(tk.Tk):
         #Allows DatabaseManager to call HotelManager methods
         self.db.hotel_manager = self.hotel
 
+        #Daily maintenance jobs (availability, late reservations) run once per business day
+        self.scheduler = JobScheduler(self.db)
+        self.scheduler.start()
+
+        #Screens subscribe to table changes (from this app or other desks) and reload only when their data changed
+        self.notifier = ChangeNotifier(self.db)
+        self.notifier.start(self)
+
+        #Prometheus metrics for ops (optional): HOTEL_METRICS_PORT serves /metrics, HOTEL_METRICS_FILE writes a file
+        metrics_exporter.register_database(self.db)
+        if os.environ.get("HOTEL_METRICS_PORT"):
+            metrics_exporter.serve(int(os.environ["HOTEL_METRICS_PORT"]))
+        if os.environ.get("HOTEL_METRICS_FILE"):
+            metrics_exporter.start_textfile_writer(os.environ["HOTEL_METRICS_FILE"])
+
         #Email receipt system
-        self.email_sender = EmailReceiptSender(
+        smtp_settings = dict(
             smtp_server="smtp.gmail.com",
             smtp_port=587,
             username="roomservicecoders@gmail.com",
             password="xmtz bioj edqp prnp",
-            sender_name="RSC Hotels"
         )
+        #Receipts are queued in email_outbox and sent in batches by a worker thread, so booking never waits on SMTP
+        self.email_outbox = EmailOutbox(self.db, **smtp_settings)
+        self.email_outbox.start()
+        self.email_sender = EmailReceiptSender(
+            **smtp_settings,
+            sender_name="RSC Hotels",
+            outbox=self.email_outbox,
+        )
+
+        #Decode and scale the room search map in the background so the first popup opens instantly.
+        #Started once the login screen is up so it does not compete with startup.
+        self.after_idle(get_assets().preload, [("Hotel_Map.png", RoomSearchPopup.MAP_SIZE)])
 
         # Window properties
         self.title("Hotel Management")
@@ -87,30 +124,29 @@ class HotelApp(tk.Tk):
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
 
-        self.frames = {}  # name -> frame instance
-
-        #Screens made here:
-        self.frames["login_screen"] = LoginFrame(self.container, self)
-        self.frames["main_menu"] = MainMenuFrame(self.container, self)
-        self.frames["new_reservation"] = ReservationFormFrame(self.container, self)
-        self.frames["rooms_status"] = RoomStatusFrame(self.container, self)
-        self.frames["booking_records"] = BookingRecordsFrame(self.container,self)
-        self.frames["metrics"] = MetricsFrame(self.container, self)
-        self.frames["employees"] = EmployeeProfileFrame(self.container, self)
-        self.frames["customer_menu"] = CustomerMenuFrame(self.container, self)
-        self.frames["splash_screen"] = SplashScreen(self.container, self)
-
-        # Layout screens (stacked, we raise the one we want)
-        for frame in self.frames.values():
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.frames = {}  # name -> frame instance, filled in by get_frame as screens are first shown
+        self.visible_frame = None
 
-        #First Frame shown on program start
+        #First Frame shown on program start (the only one built now)
         self.show_frame("login_screen")
 
+    #def to get a screen, building it on first use
+    def get_frame(self, name):
+        frame = self.frames.get(name)
+        if frame is None:
+            module_name, class_name = SCREENS[name].split(":")
+            frame_class = getattr(importlib.import_module(module_name), class_name)
+            frame = frame_class(self.container, self)
+            # Layout screens (stacked, we raise the one we want)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[name] = frame
+        return frame
+
     #def to show new screen
     def show_frame(self, name):
-        frame = self.frames[name]
+        frame = self.get_frame(name)
         frame.tkraise()
+        self.visible_frame = frame
         if hasattr(frame, "refresh"):
             frame.refresh()
 
@@ -121,7 +157,7 @@ class MainMenuFrame(tk.Frame):
     def __init__(self, parent, controller: "HotelApp"):
         super().__init__(parent, bg=BG_COLOR)
         self.controller = controller
-        self.db = db
+        self.db = controller.db
 
         # Frame fills the container
         self.grid_rowconfigure(0, weight=1)
@@ -254,12 +290,7 @@ class MainMenuFrame(tk.Frame):
         self.controller.show_frame("login_screen")
 
     def refresh(self):
-        #updates room availability based on reservation date
-        self.db.update_room_availability_today()
-
-        #Updates reservations based on date and times
-        self.db.run_daily_reservation_updates()
-        self.db.run_daily_reservation_updates()
+        #Room availability and daily reservation updates run from the JobScheduler
 
         #Called when this menu is shown; hide buttons based on role.
         name = self.controller.current_user_name or "Guest"
@@ -1,14 +1,14 @@
 import tkinter as tk
+from datetime import date
 from tkinter import messagebox
-from database_manager import DatabaseManager
-
-db = DatabaseManager()
+from ui_task_runner import LoadingIndicator, get_runner
 
 
 class MetricsFrame(tk.Frame):
     def __init__(self, parent, controller: "HotelApp"):
         super().__init__(parent, bg="#2C3E50")
         self.controller = controller
+        self.db = controller.db
 
         # ---------------- TITLE ----------------
         tk.Label(
@@ -22,6 +22,7 @@ class MetricsFrame(tk.Frame):
         # Main wrapper
         self.wrapper = tk.Frame(self, bg="#2C3E50")
         self.wrapper.pack(fill="both", expand=True)
+        self.loading = LoadingIndicator(self.wrapper)
 
         # Data variables
         self.vars = {
@@ -97,7 +98,8 @@ class MetricsFrame(tk.Frame):
             width=12
         ).pack(pady=(0, 10))
 
-        # Load initial data
+        # Load initial data; any table change makes the dashboard stale
+        controller.notifier.subscribe(None, self._on_tables_changed)
         self._load_from_db()
 
 
@@ -147,14 +149,27 @@ class MetricsFrame(tk.Frame):
     # --------- DB LOAD ----------
     def _load_from_db(self):
         """
-        Reads DB metrics and assigns values to all dashboard cards.
+        Reads DB metrics off the Tk thread; _show_metrics fills in the cards when they arrive.
+        """
+        self._stale = False
+        self._loaded_on = date.today()
+        get_runner().submit(self, self.db.get_manager_metrics, key="metrics", indicator=self.loading,
+                            on_success=self._show_metrics,
+                            on_error=self._show_load_error)
+
+    def _show_load_error(self, e):
+        self._stale = True
+        messagebox.showerror("DB Error", str(e))
+
+    def _on_tables_changed(self, tables):
+        self._stale = True
+        if self.controller.visible_frame is self:
+            self._load_from_db()
+
+    def _show_metrics(self, metrics):
+        """
+        Assigns values to all dashboard cards.
         """
-        try:
-            metrics = db.get_manager_metrics()
-        except Exception as e:
-            messagebox.showerror("DB Error", str(e))
-            return
-
         # ----- Occupancy Metrics -----
         total_rooms = metrics.get("total_rooms", 0)
         available = metrics.get("available_rooms_today", 0)
@@ -203,4 +218,6 @@ class MetricsFrame(tk.Frame):
         self.vars["smoking_ratio"].set(f"{smoking_ratio:.1f}%")
 
     def refresh(self):
-        self._load_from_db()
+        # Today's check-ins/outs change with the date even when no table did
+        if self._stale or self._loaded_on != date.today():
+            self._load_from_db()
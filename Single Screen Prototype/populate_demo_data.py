@@ -1,8 +1,17 @@
+import os
+import sys
 import sqlite3
 import random
 from datetime import date, timedelta, datetime
 import string
 
+# Ensure repository root is on sys.path so imports from repo root work
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from database_manager import DatabaseManager
+
 DB_PATH = "hotel.db"
 # -------------------------------------
 # Helper functions
@@ -68,7 +77,9 @@ def random_payment_status(status):
 # -------------------------------------------------
 def populate_database():
 
-    conn = sqlite3.connect(DB_PATH)
+    # DatabaseManager applies schema upgrades (id_sequences) and owns the ID allocator
+    db = DatabaseManager(DB_PATH)
+    conn = db.connect()
     cur = conn.cursor()
 
     # Fetch room_ids to assign reservations to
@@ -101,6 +112,9 @@ def populate_database():
     required_statuses += [random.choice(other_status_pool) for _ in range(remaining_count)]
     random.shuffle(required_statuses)
 
+    # Reserve all reservation IDs up front in one block
+    reservation_ids = iter(db.id_allocator.allocate_many("reservations", len(required_statuses), conn=conn))
+
     # ---------------------------------------------------
     # Create 50 Guests + Reservations
     # ---------------------------------------------------
@@ -161,7 +175,7 @@ def populate_database():
         else:
             is_paid = random.choice([0, 1])
 
-        reservation_id = random.randint(100000, 999999)
+        reservation_id = next(reservation_ids)
 
         cur.execute("""
             INSERT INTO reservations (
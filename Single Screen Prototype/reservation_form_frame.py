@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 from room_search_popup import RoomSearchPopup
 import calendar
 from datetime import date, datetime, timedelta
+from hotel_models import TAX_RATE
 
 BG_COLOR = "#2C3E50"
 PANEL_BG = "#34495E"
@@ -434,7 +435,7 @@ class ReservationFormFrame(tk.Frame):
         tk.Label(reserve_frame, textvariable=self.price_subtotal_var, bg=PANEL_BG, fg=FG_COLOR) \
             .grid(row=8, column=1, sticky="w")
 
-        tk.Label(reserve_frame, text="Tax (14.5%):", bg=PANEL_BG, fg=FG_COLOR) \
+        tk.Label(reserve_frame, text=f"Tax ({TAX_RATE:.1%}):", bg=PANEL_BG, fg=FG_COLOR) \
             .grid(row=9, column=0, sticky="e")
         tk.Label(reserve_frame, textvariable=self.price_tax_var, bg=PANEL_BG, fg=FG_COLOR) \
             .grid(row=9, column=1, sticky="w")
@@ -633,18 +634,17 @@ class ReservationFormFrame(tk.Frame):
                 self.price_total_var.set("")
                 return
 
-            nightly_price = self.controller.db.get_room_price(self.selected_room_id)
-
             d1 = date(self.ci_year.get(), self.ci_month.get(), self.ci_day.get())
             d2 = date(self.co_year.get(), self.co_month.get(), self.co_day.get())
-            nights = (d2 - d1).days
-
-            if nights <= 0:
+            if (d2 - d1).days <= 0:
                 return
 
-            subtotal = nightly_price * nights
-            tax = subtotal * 0.145
-            total = subtotal + tax
+            quote = self.controller.hotel.quote_many([self.selected_room_id], d1, d2)[self.selected_room_id]
+            nights = quote.nights
+            nightly_price = quote.subtotal / nights  # average over the stay; rates can differ night to night
+            subtotal = quote.subtotal
+            tax = quote.tax
+            total = quote.total
 
             self.price_per_night_var.set(f"${nightly_price:,.2f}")
             self.price_nights_var.set(f"{nights}")
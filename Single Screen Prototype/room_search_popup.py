@@ -1,8 +1,12 @@
-from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from asset_manager import get_assets
+from ui_task_runner import LoadingIndicator, get_runner
+
 class RoomSearchPopup(tk.Toplevel):
+    MAP_SIZE = (550, 800)
+
     def __init__(self, parent, controller, check_in, check_out, num_guests, include_smoking):
         super().__init__(parent)
         self.parent_frame = parent
@@ -39,7 +43,7 @@ class RoomSearchPopup(tk.Toplevel):
         content_frame.pack(padx=20, pady=10, fill="both", expand=True)
 
         # LEFT SIDE → Treeview
-        columns = ("room_number", "capacity", "price", "smoking")
+        columns = ("room_number", "capacity", "price", "total", "smoking")
         self.tree = ttk.Treeview(content_frame, columns=columns, show="headings", height=12)
         self.tree.pack(side="left", fill="both", expand=True, padx=(0, 10))
 
@@ -50,6 +54,8 @@ class RoomSearchPopup(tk.Toplevel):
                           command=lambda: self.sort_column("capacity", False))
         self.tree.heading("price", text="Price",
                           command=lambda: self.sort_column("price", False))
+        self.tree.heading("total", text="Stay Total",
+                          command=lambda: self.sort_column("total", False))
         self.tree.heading("smoking", text="Smoking",
                           command=lambda: self.sort_column("smoking", False))
 
@@ -57,12 +63,38 @@ class RoomSearchPopup(tk.Toplevel):
         for col in columns:
             self.tree.column(col, anchor="center")
 
-        # Query available rooms
-        # MUST RETURN smoking field now
-        results = controller.db.get_available_rooms(
-            check_in, check_out, num_guests, include_smoking
-        )
+        # Query available rooms and price them off the Tk thread; rows are filled in by _show_results
+        self._totals = {}   # iid -> stay total as a number (None when a room has no quote), used for sorting
+        self.loading = LoadingIndicator(self.tree, text="Searching rooms...")
+
+        def fetch():
+            # MUST RETURN smoking field now
+            results = controller.db.get_available_rooms(
+                check_in, check_out, num_guests, include_smoking
+            )
+            if not results:
+                return results, {}
+            # Price the whole stay for every result in one pass (tax included)
+            return results, controller.hotel.quote_many([row[0] for row in results], check_in, check_out)
+
+        get_runner().submit(self, fetch, key="search", indicator=self.loading,
+                            on_success=self._show_results, on_error=self._show_search_error)
+
+        ttk.Button(self, text="Select Room", command=self.select_room)\
+            .pack(pady=10)
+
+        # RIGHT SIDE → Hotel Map Visual (loaded and scaled once, shared by every popup)
+        try:
+            self.map_image = get_assets().photo("Hotel_Map.png", self.MAP_SIZE, master=self)
+
+            img_label = tk.Label(content_frame, image=self.map_image, bg="#2C3E50")
+            img_label.pack(side="right", fill="y")
 
+        except Exception as e:
+            print("Error loading map image:", e)
+
+    def _show_results(self, found):
+        results, quotes = found
         if not results:
             messagebox.showinfo("No Rooms", "No rooms meet the criteria.")
             self.destroy()
@@ -71,30 +103,19 @@ class RoomSearchPopup(tk.Toplevel):
         # Insert results
         for room_id, room_number, capacity, price, smoking in results:
             smoking_text = "Yes" if smoking == 1 else "No"
+            quote = quotes.get(room_id)
+            total_text = f"${quote.total:,.2f}" if quote else ""
+            self._totals[str(room_id)] = quote.total if quote else None
             self.tree.insert(
                 "",
                 "end",
                 iid=str(room_id),
-                values=(room_number, capacity, f"${price:,.2f}", smoking_text)
+                values=(room_number, capacity, f"${price:,.2f}", total_text, smoking_text)
             )
 
-        ttk.Button(self, text="Select Room", command=self.select_room)\
-            .pack(pady=10)
-
-        # RIGHT SIDE → Hotel Map Visual
-        try:
-            img = Image.open("Images/Hotel_Map.png")
-
-            # Resize if needed (optional)
-            img = img.resize((550, 800), Image.LANCZOS)
-
-            self.map_image = ImageTk.PhotoImage(img)
-
-            img_label = tk.Label(content_frame, image=self.map_image, bg="#2C3E50")
-            img_label.pack(side="right", fill="y")
-
-        except Exception as e:
-            print("Error loading map image:", e)
+    def _show_search_error(self, e):
+        messagebox.showerror("Database Error", f"Room search failed: {e}")
+        self.destroy()
 
     def select_room(self):
         selected = self.tree.focus()
@@ -114,8 +135,14 @@ class RoomSearchPopup(tk.Toplevel):
         # Get all rows as (value, id)
         data = [(self.tree.set(k, col), k) for k in self.tree.get_children("")]
 
+        # Stay totals sort on the stored amount; rooms without a quote go last
+        if col == "total":
+            priced = sorted((t for t in data if self._totals.get(t[1]) is not None),
+                            key=lambda t: self._totals[t[1]], reverse=reverse)
+            data = priced + [t for t in data if self._totals.get(t[1]) is None]
+
         # Numeric sort columns
-        if col in ("capacity", "price"):
+        elif col in ("capacity", "price"):
             data.sort(key=lambda t: float(t[0].replace("$", "").replace(",", "")), reverse=reverse)
 
         # Sort Yes/No logically instead of alphabetically
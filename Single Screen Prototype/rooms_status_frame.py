@@ -3,6 +3,9 @@ from tkinter import ttk, messagebox
 import sqlite3
 from typing import List, Tuple
 
+from ui_task_runner import LoadingIndicator, get_runner
+from virtual_table import VirtualTable
+
 BG_COLOR = "#395A7F"
 DB_PATH = "hotel.db"
 
@@ -14,8 +17,6 @@ class RoomStatusFrame(tk.Frame):
         self.sort_reverse = False
 
         # State
-        self.current_page = 1
-        self.rows_per_page = 27
         self.result_rows: List[Tuple] = []
         self.columns = (
             "edit",
@@ -39,10 +40,10 @@ class RoomStatusFrame(tk.Frame):
         self._create_styles()
         self._create_filter_bar()
         self._create_table()
-        self._create_page_bar()
-        self._bind_shortcuts()
+        self._create_count_bar()
 
-        # initial load
+        # initial load; reload when rooms or reservations change (here or at another desk)
+        controller.notifier.subscribe(("rooms", "reservations"), self._on_tables_changed)
         self.load_data()
 
     # -------------------------
@@ -126,7 +127,7 @@ class RoomStatusFrame(tk.Frame):
         clear_btn = tk.Button(
             filter_frame,
             text="Clear Filters",
-            command=lambda: (self.reset_filters(), self.refresh()),
+            command=lambda: (self.reset_filters(), self.load_data()),
         )
         clear_btn.pack(side="left", padx=8)
 
@@ -146,9 +147,7 @@ class RoomStatusFrame(tk.Frame):
             table_frame,
             columns=self.columns,
             show="headings",
-            yscrollcommand=vsb.set,
         )
-        vsb.config(command=self.tree.yview)
         self.tree.pack(fill="both", expand=True)
 
         # headings & column widths
@@ -168,80 +167,33 @@ class RoomStatusFrame(tk.Frame):
 
         # double-click binding
         self.tree.bind("<Double-1>", self._on_tree_double_click)
+        self.loading = LoadingIndicator(self.tree)
+
+        # Only the visible rows exist as Treeview items; the scrollbar drives the table, not the tree
+        self.table = VirtualTable(
+            self.tree,
+            key=lambda row: row[1],  # room_id
+            tags=lambda row: ("avail_yes" if row[-1] == "Yes" else "avail_no",),
+            scrollbar=vsb,
+        )
 
-    def _create_page_bar(self):
-        page_frame = tk.Frame(self, bg=BG_COLOR)
-        page_frame.pack(fill="x", pady=10)
-
-        prev_btn = tk.Button(page_frame, text="<", command=lambda: self.change_page(-1))
-        prev_btn.pack(side="left", padx=5)
-
-        tk.Label(page_frame, text="Page", bg=BG_COLOR, fg="white").pack(side="left", padx=(10, 5))
-
-        self.page_entry = tk.Entry(page_frame, width=4, justify="center")
-        self.page_entry.insert(0, "1")
-        self.page_entry.pack(side="left")
-        self.page_entry.bind("<Return>", lambda e: self.go_to_page())
-
-        self.max_page_label = tk.Label(page_frame, text="of 1", bg=BG_COLOR, fg="white")
-        self.max_page_label.pack(side="left", padx=(5, 20))
-
-        next_btn = tk.Button(page_frame, text=">", command=lambda: self.change_page(1))
-        next_btn.pack(side="left", padx=5)
+    def _create_count_bar(self):
+        count_frame = tk.Frame(self, bg=BG_COLOR)
+        count_frame.pack(fill="x", pady=10)
 
-    def _bind_shortcuts(self):
-        # binds on controller so arrow keys work across the app
-        try:
-            self.controller.bind_all("<Left>", lambda e: self.change_page(-1))
-            self.controller.bind_all("<Right>", lambda e: self.change_page(1))
-        except Exception:
-            # controller may not support bind_all during testing; ignore safely
-            pass
-
-    # -------------------------
-    # Pagination helpers
-    # -------------------------
-    def go_to_page(self):
-        try:
-            new_page = int(self.page_entry.get())
-        except ValueError:
-            self.page_entry.delete(0, tk.END)
-            self.page_entry.insert(0, "1")
-            return
+        self.count_label = tk.Label(count_frame, text="0 rooms", bg=BG_COLOR, fg="white")
+        self.count_label.pack(side="left", padx=10)
 
-        max_page = max(1, (len(self.result_rows) - 1) // self.rows_per_page + 1)
-        new_page = max(1, min(new_page, max_page))
-        self.current_page = new_page
-        self.update_page()
-
-    def change_page(self, amount: int):
-        new_page = self.current_page + amount
-        max_page = max(1, (len(self.result_rows) - 1) // self.rows_per_page + 1)
-        if 1 <= new_page <= max_page:
-            self.current_page = new_page
-            self.update_page()
-
-    def update_page(self):
-        # clears and inserts current page rows
-        self.tree.delete(*self.tree.get_children())
-
-        page = self.current_page
-        start = (page - 1) * self.rows_per_page
-        end = start + self.rows_per_page
-        for row in self.result_rows[start:end]:
-            availability_str = row[-1]
-            tag = "avail_yes" if availability_str == "Yes" else "avail_no"
-            self.tree.insert("", tk.END, values=row, tags=(tag,))
-
-        max_page = max(1, (len(self.result_rows) - 1) // self.rows_per_page + 1)
-        self.page_entry.delete(0, tk.END)
-        self.page_entry.insert(0, str(page))
-        self.max_page_label.config(text=f"of {max_page}")
+    def update_table(self, keep_position=True):
+        # Keyed diff: only rows that changed inside the visible window touch the Treeview
+        self.table.set_rows(self.result_rows, keep_position=keep_position)
+        self.count_label.config(text=f"{len(self.result_rows)} rooms")
 
     # -------------------------
     # Data loading
     # -------------------------
     def load_data(self):
+        self._stale = False
         # Convert GUI filter state → query params
         room_number = self.room_number_var.get().strip() or ""
 
@@ -256,8 +208,10 @@ class RoomStatusFrame(tk.Frame):
 
         capacity_val = self.capacity_var.get() or None
 
-        try:
-            rows = self.controller.db.get_rooms_filtered(
+        db = self.controller.db
+
+        def fetch():
+            rows = db.get_rooms_filtered(
                 room_number=room_number,
                 available=available_val,
                 smoking=smoking_val,
@@ -265,7 +219,7 @@ class RoomStatusFrame(tk.Frame):
             )
 
             # Convert DB rows to display rows
-            self.result_rows = [
+            return [
                 (
                     "Edit",
                     r[0],  # room_id
@@ -279,15 +233,26 @@ class RoomStatusFrame(tk.Frame):
                 for r in rows
             ]
 
-        except Exception as e:
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
-            self.result_rows = []
+        # Query runs off the Tk thread; a newer filter supersedes a load still in flight
+        get_runner().submit(self, fetch, key="rooms", indicator=self.loading,
+                            on_success=self._show_rows, on_error=self._show_load_error)
 
-        self.current_page = 1
-        self.update_page()
+    def _show_rows(self, rows):
+        self.result_rows = rows
+        self.update_table()
+
+    def _on_tables_changed(self, tables):
+        self._stale = True
+        if self.controller.visible_frame is self:
+            self.load_data()
+
+    def _show_load_error(self, e):
+        self._stale = True
+        messagebox.showerror("Database Error", f"An error occurred: {e}")
+        self._show_rows([])
 
     def sort_by_column(self, col_name):
-        """Sorts the result_rows list by the selected column and refreshes the page."""
+        """Sorts the result_rows list by the selected column and refreshes the table."""
 
         # Determine index in result_rows tuples
         try:
@@ -319,9 +284,8 @@ class RoomStatusFrame(tk.Frame):
                 reverse=self.sort_reverse
             )
 
-        # Refresh page 1 after sorting
-        self.current_page = 1
-        self.update_page()
+        # Show the top of the sorted rows
+        self.update_table(keep_position=False)
 
     # -------------------------
     # Edit popup + handlers
@@ -408,14 +372,16 @@ class RoomStatusFrame(tk.Frame):
         price_entry = tk.Entry(popup, textvariable=price_var, width=12)
         price_entry.grid(row=1, column=1, sticky="w", padx=5, pady=5)
 
-        tk.Label(popup, text="Availability:", bg="#2C3E50", fg="white").grid(row=2, column=0, sticky="e", padx=5, pady=5)
+        # Edits the manual out-of-service flag; "Available" is derived from it plus today's reservations
+        tk.Label(popup, text="Service:", bg="#2C3E50", fg="white").grid(row=2, column=0, sticky="e", padx=5, pady=5)
         avail_var = tk.StringVar()
         avail_dropdown = ttk.Combobox(
-            popup, textvariable=avail_var, values=["Available", "Unavailable"], state="readonly", width=12
+            popup, textvariable=avail_var, values=["In Service", "Out of Service"], state="readonly", width=12
         )
         avail_dropdown.grid(row=2, column=1, sticky="w", padx=5, pady=5)
-        initial_avail = "Available" if current_avail_str == "Yes" else "Unavailable"
-        avail_var.set(initial_avail)
+        room = self.controller.db.get_room(room_id=room_id)
+        out_of_service = room is not None and room["out_of_service"]
+        avail_var.set("Out of Service" if out_of_service else "In Service")
 
         # Button frame
         button_frame = tk.Frame(popup, bg="#2C3E50")
@@ -431,7 +397,7 @@ class RoomStatusFrame(tk.Frame):
                 messagebox.showwarning("Invalid Price", "Price must be a positive number.")
                 return
 
-            new_avail_val = 1 if avail_var.get() == "Available" else 0
+            new_avail_val = 1 if avail_var.get() == "In Service" else 0
 
             try:
                 self.controller.db.update_room(room_id, new_price, new_avail_val)
@@ -454,10 +420,9 @@ class RoomStatusFrame(tk.Frame):
     # Public functions
     # -------------------------
     def refresh(self):
-        """Called whenever this screen is shown"""
-        self.load_data()
-        #Update room availability every refresh as well
-        self.controller.db.update_room_availability_today()
+        """Called whenever this screen is shown; reloads only if rooms or reservations changed"""
+        if self._stale:
+            self.load_data()
 
     def reset_filters(self):
         """"Resets filters to blank/empty"""
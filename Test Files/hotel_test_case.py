@@ -0,0 +1,79 @@
+"""
+Module: hotel_test_case.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+Test helper with the temporary-database setup shared by the database feature tests. HotelTestCase gives every test
+a fresh database file created through DatabaseManager (schema, upgrades and triggers applied), emptied of the seed
+data, with the rooms in ROOMS and the guest in GUEST. Test modules subclass it, override ROOMS or GUEST when they need
+a different hotel, and add only their own seeding in setUp after calling super().setUp(). Modules that build their
+own database files (the dataset generator) set DATABASE = False and use temp_db_path().
+
+Important Functions:
+- HotelTestCase.setUp(): Creates self.db_path and self.db, clears reservations, rooms and guests, adds ROOMS
+  (self.room_ids by room number, self.room_id for the first one) and GUEST (self.guest_id).
+- HotelTestCase.temp_db_path(): Return an unused database file path that is deleted when the test finishes.
+- HotelTestCase.tearDown(): Closes the QueryCache connection; the database files are deleted by test cleanups.
+- HotelTestCase.insert_reservation(reservation_id, check_in, check_out, status="Confirmed", total_price=200.0,
+  is_paid=0): Insert a reservation for the test guest and room directly, bypassing HotelManager's booking rules.
+  check_in/check_out may be dates or 'YYYY-MM-DD' strings.
+
+Important Data Structures:
+- ROOMS: (room_number, room_type, capacity, price, smoking) tuples passed to DatabaseManager.add_room.
+- GUEST: Arguments for DatabaseManager.add_guest, or None for no guest.
+"""
+import os
+import tempfile
+import unittest
+
+from database_manager import DatabaseManager
+
+
+class HotelTestCase(unittest.TestCase):
+    ROOMS = ((101, "Single", 1, 100.0, 1),)
+    GUEST = ("Ada", "Lovelace", "ada@example.com", "1 Main St", "Springfield", "CA", "90001")
+    DATABASE = True
+
+    def setUp(self):
+        self.db = None
+        if not self.DATABASE:
+            return
+        self.db_path = self.temp_db_path()
+        self.db = DatabaseManager(self.db_path)
+        self.db.execute_query("DELETE FROM reservations")
+        self.db.execute_query("DELETE FROM rooms")
+        self.db.execute_query("DELETE FROM guests")
+        for room in self.ROOMS:
+            self.db.add_room(*room)
+        self.room_ids = {int(r["room_number"]): r["room_id"]
+                         for r in self.db.execute_query("SELECT room_id, room_number FROM rooms")}
+        self.room_id = self.room_ids[self.ROOMS[0][0]] if self.ROOMS else None
+        self.guest_id = self.db.add_guest(*self.GUEST) if self.GUEST else None
+
+    def tearDown(self):
+        if self.db is not None:
+            self.db.cache.close()
+
+    def temp_db_path(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.remove(path)
+        self.addCleanup(self._remove_file, path)
+        return path
+
+    @staticmethod
+    def _remove_file(path):
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def insert_reservation(self, reservation_id, check_in, check_out, status="Confirmed", total_price=200.0, is_paid=0):
+        self.db.execute_query(
+            "INSERT INTO reservations (reservation_id, guest_id, room_id, check_in_date, check_out_date, "
+            "num_guests, total_price, status, is_paid) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)",
+            (reservation_id, self.guest_id, self.room_id, str(check_in), str(check_out), total_price, status,
+             is_paid),
+        )
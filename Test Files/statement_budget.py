@@ -0,0 +1,69 @@
+"""
+Module: statement_budget.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+Test helper that counts the SQL statements a block of code runs through DatabaseManager.connect(). It is used by
+test_statement_budgets.py to hold every DatabaseManager and HotelManager method to a fixed statement budget, so a
+query added inside a loop (an N+1 pattern) fails the suite instead of slowing the app down as the tables grow.
+
+Important Functions:
+- count_statements(db): Context manager; yields a list that collects each statement's SQL text.
+- assert_statement_budget(test, db, budget, func, *args, **kwargs): Run func and fail if it ran more statements.
+  Output: func's return value.
+
+Algorithms:
+- While the block runs, db.connect is wrapped so every new connection gets a trace callback
+  (sqlite3.Connection.set_trace_callback) that records the statement and then forwards it to the QueryCache, the
+  connection's usual trace callback. Implicit BEGIN/COMMIT statements issued by the sqlite3 module are counted
+  like any other statement; EXPLAIN QUERY PLAN from the slow-query log is not.
+- Triggers: the sqlite3 module reports each trigger step (e.g. the table_versions triggers, once per written row)
+  with the text of the statement that fired it. A statement whose text repeats the previous one on the same
+  connection is therefore not counted, so an identical statement run twice back to back counts once.
+"""
+import weakref
+from contextlib import contextmanager
+
+
+def _counted(sql):
+    text = sql.lstrip()
+    return not text.startswith("--") and not text[:7].upper() == "EXPLAIN"
+
+
+@contextmanager
+def count_statements(db):
+    statements = []
+    original_connect = db.connect
+
+    def connect(*args, **kwargs):
+        conn = original_connect(*args, **kwargs)
+        conn_ref = weakref.ref(conn)
+        last = [None]
+
+        def trace(sql):
+            if sql == last[0]:
+                return
+            last[0] = sql
+            if _counted(sql):
+                statements.append(sql)
+            db.cache.note_statement(conn_ref(), sql)
+
+        conn.set_trace_callback(trace)
+        return conn
+
+    db.connect = connect
+    try:
+        yield statements
+    finally:
+        del db.connect
+
+
+def assert_statement_budget(test, db, budget, func, *args, **kwargs):
+    with count_statements(db) as statements:
+        result = func(*args, **kwargs)
+    if len(statements) > budget:
+        listing = "\n".join(f"  {i + 1}. {' '.join(sql.split())[:120]}" for i, sql in enumerate(statements))
+        test.fail(f"{getattr(func, '__qualname__', func)} ran {len(statements)} statements "
+                  f"(budget {budget}):\n{listing}")
+    return result
@@ -0,0 +1,122 @@
+"""
+Module: test_asset_manager.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `asset_manager.py`. It verifies that asset paths do not depend on the working
+directory, that each image is decoded and scaled once per size, that pre-scaled files are reused by the next
+manager until the source image changes, that an unwritable cache folder only disables the disk cache, and that
+photo() hands out one shared PhotoImage per image and size. The Pillow tests are skipped when Pillow is missing.
+
+Important Data Structures:
+- Temporary asset folder: One RGB JPEG-encoded "map" (saved as .png, like Hotel_Map.png) and one palette PNG.
+- FakePhotoImage: Stands in for ImageTk.PhotoImage (no display is needed) and counts how many were created.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import asset_manager
+from asset_manager import AssetManager
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class FakePhotoImage:
+    created = 0
+
+    def __init__(self, image, master=None):
+        FakePhotoImage.created += 1
+        self.size = image.size
+
+
+class TestAssetPaths(unittest.TestCase):
+
+    def test_paths_do_not_depend_on_working_directory(self):
+        cwd = os.getcwd()
+        os.chdir(tempfile.gettempdir())
+        try:
+            path = asset_manager.get_assets().path("Hotel_Map.png")
+        finally:
+            os.chdir(cwd)
+        self.assertTrue(os.path.isabs(path) and os.path.isfile(path))
+        with self.assertRaises(FileNotFoundError):
+            asset_manager.get_assets().path("missing.png")
+        self.assertIs(asset_manager.get_assets(), asset_manager.get_assets())
+
+
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class TestAssetManager(unittest.TestCase):
+
+    def setUp(self):
+        self.asset_dir = tempfile.mkdtemp()
+        Image.new("RGB", (400, 300), (200, 30, 30)).save(os.path.join(self.asset_dir, "map.png"), format="JPEG")
+        Image.new("P", (64, 64)).save(os.path.join(self.asset_dir, "icon.png"))
+        self.assets = AssetManager(self.asset_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.asset_dir)
+
+    def test_scaled_once_per_size(self):
+        first = self.assets.image("map.png", (100, 80))
+        self.assertIs(self.assets.image("map.png", [100, 80]), first)
+        self.assertEqual(first.size, (100, 80))
+        self.assertEqual(self.assets.stats, {"decoded": 1, "scaled": 1, "prescaled_reused": 0})
+        self.assertNotIn(("map.png", None), self.assets._images)
+
+        self.assets.image("map.png", (50, 40))
+        self.assertEqual(self.assets.stats["scaled"], 2)
+
+    def test_prescaled_files_are_reused_until_source_changes(self):
+        self.assets.image("map.png", (100, 80))
+        scaled_file = self.assets.scaled_path("map.png", (100, 80))
+        self.assertTrue(os.path.isfile(scaled_file))
+        with Image.open(scaled_file) as saved:
+            self.assertEqual((saved.format, saved.size), ("JPEG", (100, 80)))
+
+        again = AssetManager(self.asset_dir)
+        self.assertEqual(again.image("map.png", (100, 80)).size, (100, 80))
+        self.assertEqual(again.stats, {"decoded": 1, "scaled": 0, "prescaled_reused": 1})
+
+        later = time.time() + 5
+        os.utime(os.path.join(self.asset_dir, "map.png"), (later, later))
+        third = AssetManager(self.asset_dir)
+        third.image("map.png", (100, 80))
+        self.assertEqual(third.stats["scaled"], 1)
+
+    def test_palette_images_scale_in_rgba(self):
+        self.assertEqual(self.assets.image("icon.png", (32, 32)).mode, "RGBA")
+
+    def test_unwritable_cache_keeps_memory_cache(self):
+        blocker = os.path.join(self.asset_dir, "not_a_dir")
+        open(blocker, "w").close()
+        assets = AssetManager(self.asset_dir, cache_dir=blocker)
+        self.assertEqual(assets.image("map.png", (100, 80)).size, (100, 80))
+        self.assertIs(assets.image("map.png", (100, 80)), assets.image("map.png", (100, 80)))
+
+    def test_photos_are_shared(self):
+        FakePhotoImage.created = 0
+        asset_manager._load_pil()  # Pillow is imported on first use; import it before patching ImageTk
+        with mock.patch.object(asset_manager, "ImageTk", mock.Mock(PhotoImage=FakePhotoImage)):
+            photo = self.assets.photo("map.png", (100, 80))
+            self.assertIs(self.assets.photo("map.png", (100, 80)), photo)
+            self.assertEqual((photo.size, FakePhotoImage.created), ((100, 80), 1))
+            self.assets.clear()
+            self.assertIsNot(self.assets.photo("map.png", (100, 80)), photo)
+
+    def test_preload_warms_cache(self):
+        self.assets.preload([("map.png", (120, 90)), ("missing.png", (1, 1))]).join(5)
+        self.assertIn(("map.png", (120, 90)), self.assets._images)
+        self.assets.image("map.png", (120, 90))
+        self.assertEqual(self.assets.stats["scaled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
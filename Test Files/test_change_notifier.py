@@ -0,0 +1,106 @@
+"""
+Module: test_change_notifier.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `change_notifier.py` and the table_versions triggers behind it. It verifies that
+writes from this process and from another connection (standing in for another front-desk terminal) are reported
+with the tables they touched, that subscribers only hear about their own tables, that an idle database reports
+nothing, and that the QueryCache now drops only the entries whose tables another process wrote.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py): one room and one guest.
+- FakeWidget: Records after() calls so start() can be tested without a display.
+"""
+import sqlite3
+import unittest
+
+from change_notifier import ChangeNotifier
+from hotel_test_case import HotelTestCase
+
+
+class FakeWidget:
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class TestChangeNotifier(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.notifier = ChangeNotifier(self.db)
+        self.events = {"rooms": [], "guests": [], "all": []}
+        self.notifier.subscribe(("rooms",), self.events["rooms"].append)
+        self.notifier.subscribe(("guests", "reservations"), self.events["guests"].append)
+        self.notifier.subscribe(None, self.events["all"].append)
+        self.notifier.poll()  # baseline
+
+    def tearDown(self):
+        self.notifier.close()
+        super().tearDown()
+
+    def external_write(self, sql, params=()):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_idle_database_reports_nothing(self):
+        self.assertEqual(self.notifier.poll(), frozenset())
+        self.assertEqual(self.events, {"rooms": [], "guests": [], "all": []})
+
+    def test_local_write_reaches_matching_subscribers(self):
+        self.db.add_guest("Ada", "Lovelace", "ada@example.com", "1 Main St", "Springfield", "CA", "90001")
+        changed = self.notifier.poll()
+        self.assertIn("guests", changed)
+        self.assertNotIn("rooms", changed)
+        self.assertEqual(self.events["guests"], [frozenset({"guests"})])
+        self.assertEqual(self.events["rooms"], [])
+        self.assertEqual(self.events["all"], [changed])
+        self.assertEqual(self.notifier.poll(), frozenset())
+
+    def test_other_connection_write_is_detected_by_table(self):
+        self.external_write("UPDATE rooms SET price = 120.0 WHERE room_number = 101")
+        self.assertEqual(self.notifier.poll(), frozenset({"rooms"}))
+        self.assertEqual(self.events["rooms"], [frozenset({"rooms"})])
+        self.assertEqual(self.events["guests"], [])
+
+    def test_unsubscribe_and_start(self):
+        token = self.notifier.subscribe(("rooms",), lambda tables: self.fail("unsubscribed"))
+        self.notifier.unsubscribe(token)
+        widget = FakeWidget()
+        self.notifier.start(widget)
+        self.external_write("DELETE FROM rooms")
+        ms, tick = widget.scheduled[-1]
+        self.assertEqual(ms, self.notifier.interval_ms)
+        tick()
+        self.assertEqual(self.events["rooms"], [frozenset({"rooms"})])
+        self.assertEqual(len(widget.scheduled), 2)
+        self.notifier.stop()
+
+    def test_cache_drops_only_tables_written_elsewhere(self):
+        self.db.get_rooms_filtered()
+        self.external_write("INSERT INTO guests (first_name, last_name, email, address_line1, city, state, "
+                            "postal_code) VALUES ('Bo', 'Li', 'bo@example.com', '2 Side St', 'Springfield', "
+                            "'CA', '90001')")
+        self.db.get_rooms_filtered()
+        self.assertEqual(self.db.cache.stats()["methods"]["DatabaseManager.get_rooms_filtered"],
+                         {"hits": 1, "misses": 1})
+
+        self.external_write("UPDATE rooms SET price = 130.0 WHERE room_number = 101")
+        self.assertEqual(self.db.get_rooms_filtered()[0][5], 130.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
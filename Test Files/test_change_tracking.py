@@ -0,0 +1,88 @@
+"""
+Module: test_change_tracking.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for the change_seq/updated_at triggers and the delta API on DatabaseManager
+(current_change_seq, changes_since, get_filtered_reservation_changes). It verifies that every insert and update
+of a room, guest or reservation gets a new sequence number, that deletes leave tombstones, that writes from other
+connections are tracked too, and that the booking-screen delta includes reservations touched through their guest
+or room and reports the rows that no longer match the filters.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with one reservation, 500.
+"""
+import sqlite3
+import unittest
+from datetime import date, timedelta
+
+from hotel_test_case import HotelTestCase
+
+
+class TestChangeTracking(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        check_in = date.today() + timedelta(days=5)
+        self.insert_reservation(500, check_in, check_in + timedelta(days=2))
+
+    def test_writes_are_stamped_in_order(self):
+        room = self.db.execute_query("SELECT change_seq, updated_at FROM rooms")[0]
+        guest = self.db.execute_query("SELECT change_seq, updated_at FROM guests")[0]
+        reservation = self.db.execute_query("SELECT change_seq FROM reservations")[0]
+        self.assertTrue(0 < room["change_seq"] < guest["change_seq"] < reservation["change_seq"])
+        self.assertEqual(self.db.current_change_seq(), reservation["change_seq"])
+        self.assertRegex(guest["updated_at"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d$")
+
+        seq = self.db.current_change_seq()
+        self.db.execute_query("UPDATE guests SET city = 'Shelbyville' WHERE guest_id = ?", (self.guest_id,))
+        changes = self.db.changes_since(seq)
+        self.assertEqual(changes["seq"], seq + 1)
+        self.assertEqual([g["city"] for g in changes["changed"]["guests"]], ["Shelbyville"])
+        self.assertEqual(changes["changed"]["rooms"], [])
+        self.assertEqual(self.db.changes_since(changes["seq"])["changed"]["guests"], [])
+
+    def test_deletes_leave_tombstones(self):
+        seq = self.db.current_change_seq()
+        self.db.execute_query("DELETE FROM reservations WHERE reservation_id = 500")
+        changes = self.db.changes_since(seq, tables=("reservations",))
+        self.assertEqual(changes["deleted"], {"reservations": [500]})
+
+        # Re-inserting the id clears its tombstone
+        self.insert_reservation(500, "2030-01-01", "2030-01-02", total_price=100.0)
+        changes = self.db.changes_since(seq, tables=("reservations",))
+        self.assertEqual(changes["deleted"], {"reservations": []})
+        self.assertEqual([r["reservation_id"] for r in changes["changed"]["reservations"]], [500])
+
+        with self.assertRaises(ValueError):
+            self.db.changes_since(seq, tables=("employees",))
+
+    def test_other_connections_are_tracked(self):
+        seq = self.db.current_change_seq()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE rooms SET price = 90.0")
+        conn.commit()
+        conn.close()
+        self.assertEqual([r["price"] for r in self.db.changes_since(seq)["changed"]["rooms"]], [90.0])
+
+    def test_filtered_delta_follows_guest_and_room_changes(self):
+        seq = self.db.current_change_seq()
+        self.assertEqual(self.db.get_filtered_reservation_changes(seq), (seq, [], []))
+
+        self.db.execute_query("UPDATE guests SET first_name = 'Augusta' WHERE guest_id = ?", (self.guest_id,))
+        watermark, rows, removed = self.db.get_filtered_reservation_changes(seq, guest_name="Augusta")
+        self.assertEqual(watermark, seq + 1)
+        self.assertEqual([(row[0], row[2]) for row in rows], [(500, "Augusta Lovelace")])
+        self.assertEqual(rows, self.db.get_filtered_reservations(guest_name="Augusta"))
+        self.assertEqual(removed, [])
+
+        # The old name no longer matches, so a screen filtered on it drops the row
+        self.assertEqual(self.db.get_filtered_reservation_changes(seq, guest_name="Ada"), (seq + 1, [], [500]))
+
+        self.db.execute_query("UPDATE reservations SET status = 'Cancelled' WHERE reservation_id = 500")
+        self.assertEqual(self.db.get_filtered_reservation_changes(watermark)[1:], ([], [500]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -265,3 +265,72 @@ def test_get_available_rooms(db):
     rooms = db.get_available_rooms(check_in, check_out, num_guests=2, include_smoking=1)
     assert len(rooms) == 2
 
+
+
+# ---------------------------------------------------------
+# ROOM AVAILABILITY FLAG TESTS
+# ---------------------------------------------------------
+def _add_stay(db, room_id, check_in, check_out, status="Confirmed"):
+    gid = db.add_guest(
+        "Ann", "Stay", "ann@example.com",
+        address_line1="Addr1", address_line2="Addr2", city="City", state="ST", postal_code="00000",
+        phone_number="555-0000",
+    )
+    conn = db.connect()
+    conn.execute(
+        "INSERT INTO reservations (guest_id, room_id, check_in_date, check_out_date, num_guests, total_price, status, is_paid) "
+        "VALUES (?, ?, ?, ?, 1, 100.0, ?, 0)",
+        (gid, room_id, check_in, check_out, status),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_update_room_availability_only_touches_changed_rows(db):
+    db.add_room(1100, "Queen", 2, 100.0, 1)
+    db.add_room(1101, "Queen", 2, 100.0, 1)
+    room = db.get_room(room_number=1100)
+    today = date(2025, 7, 1)
+    _add_stay(db, room["room_id"], "2025-06-30", "2025-07-03")
+
+    assert db.update_room_availability_today(today) == 1
+    assert db.get_room(room_number=1100)["is_available"] == 0
+    assert db.get_room(room_number=1101)["is_available"] == 1
+
+    # Nothing changed since the last run -> no writes
+    assert db.update_room_availability_today(today) == 0
+
+    # Guest departs on the 3rd: room frees up that day
+    assert db.update_room_availability_today(date(2025, 7, 3)) == 1
+    assert db.get_room(room_number=1100)["is_available"] == 1
+
+
+def test_out_of_service_survives_recompute(db):
+    db.add_room(1200, "Queen", 2, 100.0, 1)
+    room = db.get_room(room_number=1200)
+
+    db.update_room(room["room_id"], 110.0, 0)
+    room = db.get_room(room_number=1200)
+    assert room["out_of_service"] == 1
+    assert room["is_available"] == 0
+
+    db.update_room_availability_today(date(2025, 7, 1))
+    assert db.get_room(room_number=1200)["is_available"] == 0
+
+    db.update_room(room["room_id"], 110.0, 1)
+    room = db.get_room(room_number=1200)
+    assert room["out_of_service"] == 0
+    assert room["is_available"] == 1
+
+
+def test_cancelled_reservation_releases_room(db, hotel):
+    db.add_room(1300, "Queen", 2, 100.0, 1)
+    room = db.get_room(room_number=1300)
+    today = date.today()
+    _add_stay(db, room["room_id"], today.isoformat(), date.fromordinal(today.toordinal() + 2).isoformat())
+    db.update_room_availability_today()
+    assert db.get_room(room_number=1300)["is_available"] == 0
+
+    res_id = db.execute_query("SELECT reservation_id FROM reservations")[0]["reservation_id"]
+    hotel.cancel_reservation(res_id)
+    assert db.get_room(room_number=1300)["is_available"] == 1
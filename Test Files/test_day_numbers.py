@@ -0,0 +1,160 @@
+"""
+Module: test_day_numbers.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `day_numbers.py` and the check_in_day/check_out_day columns. It verifies that the
+helpers agree with SQLite's julianday and with the strptime parsing they replace, that the stamping triggers fill
+the day numbers on insert and on every date change (bumping change_seq once, as before), that a database from
+before the columns existed is backfilled without touching change_seq, and that overlap checks, stay-range searches
+and the metrics give the same answers as the text dates did.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with reservation 700 (three nights, starting
+  ten days from today).
+"""
+import sqlite3
+import unittest
+from datetime import date, datetime, timedelta
+
+from database_manager import DatabaseManager
+from day_numbers import from_day, parse_date, to_day, to_iso
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+
+TODAY = date.today()
+
+
+class TestDayNumberHelpers(unittest.TestCase):
+
+    def test_round_trip_and_sqlite_agree(self):
+        conn = sqlite3.connect(":memory:")
+        try:
+            for text in ("1970-01-01", "1969-12-31", "2000-02-29", "2026-10-19", "2099-12-31"):
+                day = to_day(text)
+                sql_day = conn.execute("SELECT CAST(julianday(?) - 2440587.5 AS INTEGER)", (text,)).fetchone()[0]
+                self.assertEqual(day, sql_day)
+                self.assertEqual(to_iso(day), text)
+                self.assertEqual(from_day(day), date.fromisoformat(text))
+        finally:
+            conn.close()
+        self.assertEqual(to_day("1970-01-01"), 0)
+        self.assertEqual(to_day(date(2026, 10, 19)), to_day(datetime(2026, 10, 19, 23, 59)))
+
+    def test_parse_date_matches_strptime(self):
+        for text in ("2026-10-19", "2026-1-5", "2024-02-29"):
+            self.assertEqual(parse_date(text), datetime.strptime(text, "%Y-%m-%d").date())
+        for text in ("2026-02-30", "2026/10/19", "20261019", "2026-10-19T10:00", ""):
+            with self.assertRaises(ValueError):
+                parse_date(text)
+
+
+class TestDayNumberColumns(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.hotel = HotelManager(self.db)
+        self.check_in = TODAY + timedelta(days=10)
+        self.check_out = self.check_in + timedelta(days=3)
+        self.insert_reservation(700, self.check_in, self.check_out, total_price=300.0)
+
+    def _row(self):
+        return self.db.execute_query(
+            "SELECT change_seq, check_in_day, check_out_day FROM reservations WHERE reservation_id = 700")[0]
+
+    def test_triggers_stamp_days_on_insert_and_date_change(self):
+        row = self._row()
+        self.assertEqual((row["check_in_day"], row["check_out_day"]), (to_day(self.check_in), to_day(self.check_out)))
+
+        seq = self.db.current_change_seq()
+        new_out = self.check_out + timedelta(days=2)
+        self.db.execute_query("UPDATE reservations SET check_out_date = ? WHERE reservation_id = 700",
+                              (new_out.isoformat(),))
+        row = self._row()
+        self.assertEqual(row["check_out_day"], to_day(new_out))
+        self.assertEqual(row["change_seq"], seq + 1)
+        self.assertEqual(self.db.current_change_seq(), seq + 1)
+
+    def test_old_database_is_backfilled(self):
+        # Recreate the pre-migration state: old triggers and view, no day numbers on existing rows
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP TRIGGER trg_reservations_stamp_update;
+            UPDATE reservations SET check_in_day = NULL, check_out_day = NULL;
+            CREATE TRIGGER trg_reservations_change_update AFTER UPDATE ON reservations
+            WHEN NEW.change_seq = OLD.change_seq BEGIN UPDATE change_sequence SET value = value + 1; END;
+            DROP VIEW reservations_all;
+            CREATE VIEW reservations_all AS SELECT reservation_id, guest_id, room_id, check_in_date,
+                check_out_date, num_guests, total_price, status, is_paid, change_seq, updated_at FROM reservations;
+        """)
+        conn.close()
+        seq = self._row()["change_seq"]
+
+        upgraded = DatabaseManager(self.db_path)
+        row = upgraded.execute_query(
+            "SELECT change_seq, check_in_day, check_out_day FROM reservations_all WHERE reservation_id = 700")[0]
+        self.assertEqual((row["check_in_day"], row["check_out_day"]), (to_day(self.check_in), to_day(self.check_out)))
+        self.assertEqual(row["change_seq"], seq)
+        triggers = {r[0] for r in upgraded.execute_query("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        self.assertTrue({"trg_reservations_stamp_insert", "trg_reservations_stamp_update"} <= triggers)
+        self.assertNotIn("trg_reservations_change_update", triggers)
+        upgraded.cache.close()
+
+    def test_insert_keeps_supplied_day_numbers(self):
+        # A writer that passes the day numbers keeps them; the trigger still does the change tracking
+        seq = self.db.current_change_seq()
+        self.db.execute_query(
+            "INSERT INTO reservations (reservation_id, guest_id, room_id, check_in_date, check_out_date, num_guests, "
+            "total_price, status, check_in_day, check_out_day) VALUES (701, ?, ?, '2030-01-01', '2030-01-03', 1, "
+            "200.0, 'Confirmed', ?, ?)", (self.guest_id, self.room_id, to_day("2030-01-01"), to_day("2030-01-03")))
+        row = self.db.execute_query(
+            "SELECT change_seq, check_in_day, check_out_day FROM reservations WHERE reservation_id = 701")[0]
+        self.assertEqual((row["check_in_day"], row["check_out_day"]), (to_day("2030-01-01"), to_day("2030-01-03")))
+        self.assertEqual(row["change_seq"], seq + 1)
+
+        # An insert trigger from before the NULL check is replaced on upgrade
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP TRIGGER trg_reservations_stamp_insert;
+            CREATE TRIGGER trg_reservations_stamp_insert AFTER INSERT ON reservations
+            BEGIN UPDATE change_sequence SET value = value + 1 WHERE id = 1; END;
+        """)
+        conn.close()
+        upgraded = DatabaseManager(self.db_path)
+        sql = upgraded.execute_query(
+            "SELECT sql FROM sqlite_master WHERE name = 'trg_reservations_stamp_insert'")[0][0]
+        self.assertIn("COALESCE(NEW.check_in_day", sql)
+        upgraded.cache.close()
+
+    def test_overlap_checks_use_day_numbers(self):
+        ci, co = self.check_in.isoformat(), self.check_out.isoformat()
+        before = (self.check_in - timedelta(days=2)).isoformat()
+        after = (self.check_out + timedelta(days=2)).isoformat()
+
+        self.assertFalse(self.db.is_room_available(101, ci, co))
+        self.assertTrue(self.db.is_room_available(101, co, after))       # back-to-back stays are allowed
+        self.assertTrue(self.db.is_room_available(101, before, ci))
+        self.assertEqual(self.db.get_available_rooms(self.check_in, self.check_out, 1, 1), [])
+        self.assertEqual(len(self.hotel.search_rooms(check_in=co, check_out=after)), 1)
+        self.assertEqual(self.hotel.search_rooms(check_in=before, check_out=after), [])
+
+        with self.assertRaises(ValueError):
+            self.hotel.reserve_room(self.guest_id, self.room_id, before, after, 1)
+        self.assertEqual(len(self.hotel.search_reservation(stay_start=before, stay_end=after)), 1)
+        self.assertEqual(self.hotel.search_reservation(stay_start=co), [])
+        self.assertEqual(len(self.hotel.search_reservation(stay_end=co)), 1)
+
+    def test_metrics_count_nights_from_day_numbers(self):
+        self.db.execute_query("UPDATE reservations SET check_in_date = ? WHERE reservation_id = 700",
+                              (TODAY.isoformat(),))
+        metrics = self.db.get_manager_metrics()
+        nights = (self.check_out - TODAY).days
+        self.assertEqual(metrics["avg_stay"], nights)
+        self.assertAlmostEqual(metrics["adr"], 300.0 / nights)
+        self.assertEqual(metrics["available_rooms_today"], 0)
+        self.assertEqual(metrics["upcoming_res"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
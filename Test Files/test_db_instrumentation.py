@@ -0,0 +1,107 @@
+"""
+Module: test_db_instrumentation.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `db_instrumentation.py`. It verifies that statements run through
+DatabaseManager.connect() (cursor, Connection.execute shortcuts, execute_query and HotelManager transactions) are
+grouped by fingerprint with call, row and error counts, that statements over the threshold are logged with their
+EXPLAIN QUERY PLAN, and that the snapshot API returns plain values.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with a second room, 102.
+"""
+import unittest
+from datetime import date, timedelta
+
+from db_instrumentation import fingerprint
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_literals_and_in_lists_are_collapsed(self):
+        self.assertEqual(fingerprint("SELECT *  FROM rooms\n WHERE room_id IN (?, ?, ?) AND price > 10.5"),
+                         "SELECT * FROM rooms WHERE room_id IN (...) AND price > ?")
+        self.assertEqual(fingerprint("SELECT * FROM guests WHERE email = 'a''b@x.com'"),
+                         "SELECT * FROM guests WHERE email = ?")
+        self.assertEqual(fingerprint("SELECT room2 FROM t1"), "SELECT room2 FROM t1")
+
+
+class TestQueryStats(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db.add_room(102, "Double", 2, 150.0, 1)
+        self.db.query_stats.reset()
+
+    def _stats(self, prefix):
+        return [s for s in self.db.query_stats.snapshot()["statements"] if s["fingerprint"].startswith(prefix)]
+
+    def test_groups_calls_and_counts_rows(self):
+        for price in (50, 120):
+            self.db.execute_query("SELECT room_id FROM rooms WHERE price > ?", (price,))
+        conn = self.db.connect()
+        rows = list(conn.execute("SELECT room_id FROM rooms WHERE price > 10"))
+        conn.close()
+        self.assertEqual(len(rows), 2)
+
+        [stats] = self._stats("SELECT room_id FROM rooms WHERE price > ?")
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["rows"], 2 + 1 + 2)
+        self.assertGreater(stats["total_ms"], 0)
+        self.assertGreaterEqual(stats["max_ms"], stats["mean_ms"])
+
+    def test_unfinished_fetch_is_recorded_on_close(self):
+        conn = self.db.connect()
+        conn.execute("SELECT room_id FROM rooms").fetchone()
+        conn.close()
+        [stats] = self._stats("SELECT room_id FROM rooms")
+        self.assertEqual((stats["calls"], stats["rows"]), (1, 1))
+
+    def test_errors_are_counted(self):
+        with self.assertRaises(Exception):
+            self.db.execute_query("SELECT no_such_column FROM rooms")
+        [stats] = self._stats("SELECT no_such_column")
+        self.assertEqual(stats["errors"], 1)
+
+    def test_hotel_manager_transaction_is_covered(self):
+        mgr = HotelManager(self.db)
+        room_id = self.db.get_room(room_number=101).room_id
+        check_in = date.today() + timedelta(days=3)
+        mgr.reserve_room(self.guest_id, room_id, check_in.isoformat(), (check_in + timedelta(days=2)).isoformat(), 1)
+        fingerprints = [s["fingerprint"] for s in self.db.query_stats.snapshot()["statements"]]
+        self.assertIn("BEGIN IMMEDIATE", fingerprints)
+        self.assertTrue(any(fp.startswith("INSERT INTO reservations") for fp in fingerprints))
+
+    def test_slow_queries_are_logged_with_plan(self):
+        self.db.query_stats.threshold_ms = 0
+        self.db.execute_query("SELECT * FROM rooms WHERE room_id = ?", (1,))
+        slow = [q for q in self.db.query_stats.slow_queries() if q.sql.startswith("SELECT * FROM rooms")]
+        self.assertEqual(len(slow), 1)
+        self.assertEqual(slow[0].params, (1,))
+        self.assertTrue(any("rooms" in line for line in slow[0].plan))
+        # EXPLAIN runs on a plain cursor and is not recorded itself
+        self.assertEqual(self._stats("EXPLAIN"), [])
+
+    def test_threshold_filters_slow_log(self):
+        self.db.query_stats.threshold_ms = 10_000
+        self.db.execute_query("SELECT * FROM rooms")
+        self.assertEqual(self.db.query_stats.slow_queries(), [])
+
+    def test_snapshot_top_and_reset(self):
+        for _ in range(3):
+            self.db.execute_query("SELECT * FROM rooms")
+        self.db.execute_query("SELECT * FROM guests")
+        snapshot = self.db.query_stats.snapshot(top=1, sort_by="calls")
+        self.assertEqual(len(snapshot["statements"]), 1)
+        self.assertGreaterEqual(snapshot["statements_run"], 4)
+        self.assertGreaterEqual(snapshot["distinct_statements"], 2)
+        self.db.query_stats.reset()
+        self.assertEqual(self.db.query_stats.snapshot()["statements"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
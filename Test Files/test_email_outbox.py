@@ -0,0 +1,239 @@
+"""
+Module: test_email_outbox.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `email_outbox.py` against a local SMTP stand-in. It verifies that due messages are
+sent in batches over one SMTP session that is reused for the next batch, that a session dropped by the server is
+reopened, that temporary failures back off exponentially while permanent ones fail right away, that an unreachable
+server leaves every message queued, that a crashed sender's lease expires, and that EmailReceiptSender queues
+receipts through the outbox.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py): one room and one guest.
+- FakeSMTPServer: A threaded socketserver speaking just enough SMTP (EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT)
+  for smtplib. It records connections and delivered messages; rcpt_replies forces a reply per recipient and
+  drop_after closes each connection after that many messages.
+"""
+import os
+import socketserver
+import sqlite3
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from unittest import mock
+
+from email_outbox import EmailOutbox
+from hotel_test_case import HotelTestCase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Single Screen Prototype"))
+from email_receipt_sender import EmailReceiptSender  # noqa: E402
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 localhost test SMTP")
+        recipients, delivered = [], 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-localhost\r\n250 8BITMIME\r\n")
+            elif verb in ("HELO", "MAIL", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "RSET":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip().strip("<>")
+                reply = server.rcpt_replies.get(address, "250 OK")
+                if reply.startswith("250"):
+                    recipients.append(address)
+                self.reply(reply)
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in self.rfile:
+                    if data_line == b".\r\n":
+                        break
+                    data.append(data_line)
+                with server.lock:
+                    server.messages.append((tuple(recipients), b"".join(data).decode()))
+                recipients = []
+                delivered += 1
+                self.reply("250 Queued")
+                if server.drop_after and delivered >= server.drop_after:
+                    return
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        self.rcpt_replies = {}
+        self.drop_after = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+def make_message(to_address, subject="Receipt"):
+    message = EmailMessage()
+    message["From"] = "desk@hotel.test"
+    message["To"] = to_address
+    message["Subject"] = subject
+    message.set_content(f"Hello {to_address}")
+    return message
+
+
+class TestEmailOutbox(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.smtp = FakeSMTPServer()
+        self.outbox = self.make_outbox(self.smtp.port)
+        self.now = datetime.now() + timedelta(seconds=1)
+
+    def tearDown(self):
+        self.outbox.stop()
+        self.smtp.shutdown()
+        self.smtp.server_close()
+        super().tearDown()
+
+    def make_outbox(self, port, **options):
+        return EmailOutbox(self.db, "127.0.0.1", port, from_address="desk@hotel.test", use_tls=False,
+                           timeout=5, **options)
+
+    def enqueue(self, to_address):
+        return self.outbox.enqueue(to_address, "Receipt", make_message(to_address))
+
+    def test_batches_share_one_session(self):
+        self.outbox.batch_size = 2
+        ids = [self.enqueue(f"guest{i}@example.com") for i in range(5)]
+        self.assertEqual(self.outbox.process_due(self.now), {"sent": 5, "retry": 0, "failed": 0})
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual([m[0] for m in self.smtp.messages], [(f"guest{i}@example.com",) for i in range(5)])
+        self.assertIn("Hello guest0@example.com", self.smtp.messages[0][1])
+
+        email = self.outbox.get_email(ids[0])
+        self.assertEqual((email["status"], email["attempts"], email["last_error"]), ("sent", 1, None))
+        self.assertIsNotNone(email["sent_at"])
+
+        # The next batch reuses the open session
+        self.enqueue("late@example.com")
+        self.assertEqual(self.outbox.process_due(self.now)["sent"], 1)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(self.outbox.status_counts(), {"pending": 0, "sending": 0, "sent": 6, "failed": 0})
+
+    def test_dropped_session_is_reopened(self):
+        self.smtp.drop_after = 2
+        for i in range(3):
+            self.enqueue(f"guest{i}@example.com")
+        self.assertEqual(self.outbox.process_due(self.now)["sent"], 3)
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.connections, 2)
+
+    def test_temporary_failures_back_off_and_permanent_fail(self):
+        self.smtp.rcpt_replies = {"busy@example.com": "451 Try again later",
+                                  "nobody@example.com": "550 No such user"}
+        busy = self.enqueue("busy@example.com")
+        nobody = self.enqueue("nobody@example.com")
+        self.enqueue("ok@example.com")
+
+        self.assertEqual(self.outbox.process_due(self.now), {"sent": 1, "retry": 1, "failed": 1})
+        self.assertEqual(self.outbox.get_email(nobody)["status"], "failed")
+        self.assertIn("550", self.outbox.get_email(nobody)["last_error"])
+        email = self.outbox.get_email(busy)
+        self.assertEqual((email["status"], email["attempts"]), ("pending", 1))
+        first_retry = datetime.fromisoformat(email["next_attempt_at"])
+        self.assertEqual(first_retry, (self.now + EmailOutbox.BASE_DELAY).replace(microsecond=0))
+
+        # Not due yet; then due and refused again, so the delay doubles
+        self.assertEqual(self.outbox.process_due(self.now)["retry"], 0)
+        self.assertEqual(self.outbox.process_due(first_retry)["retry"], 1)
+        second_retry = datetime.fromisoformat(self.outbox.get_email(busy)["next_attempt_at"])
+        self.assertEqual(second_retry - first_retry, 2 * EmailOutbox.BASE_DELAY)
+
+        self.smtp.rcpt_replies = {}
+        self.assertEqual(self.outbox.process_due(second_retry)["sent"], 1)
+        self.assertEqual(self.outbox.get_email(busy)["attempts"], 3)
+        self.assertEqual(self.outbox.backoff(20), EmailOutbox.MAX_DELAY)
+
+    def test_unreachable_server_keeps_messages_queued(self):
+        self.outbox = self.make_outbox(self.smtp.port, batch_size=1)
+        self.smtp.shutdown()
+        self.smtp.server_close()
+        ids = [self.enqueue(f"guest{i}@example.com") for i in range(3)]
+        self.assertEqual(self.outbox.process_due(self.now), {"sent": 0, "retry": 1, "failed": 0})
+        # Only one connection attempt per pass; the other batches were left for the retry
+        self.assertEqual(self.outbox.status_counts()["pending"], 3)
+        self.assertEqual([self.outbox.get_email(i)["attempts"] for i in ids], [1, 0, 0])
+
+        self.smtp = FakeSMTPServer()
+        self.outbox = self.make_outbox(self.smtp.port)
+        self.assertEqual(self.outbox.process_due(self.now + EmailOutbox.BASE_DELAY)["sent"], 3)
+
+    def test_expired_lease_is_reclaimed(self):
+        email_id = self.enqueue("guest@example.com")
+        self.db.execute_query("UPDATE email_outbox SET status = 'sending', next_attempt_at = ? WHERE email_id = ?",
+                              ((self.now + EmailOutbox.LEASE).isoformat(timespec="seconds"), email_id))
+        self.assertEqual(self.outbox.process_due(self.now)["sent"], 0)
+        self.assertEqual(self.outbox.process_due(self.now + EmailOutbox.LEASE)["sent"], 1)
+
+    def test_locked_database_error_is_not_masked(self):
+        self.enqueue("guest@example.com")
+        holder = sqlite3.connect(self.db_path)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            with mock.patch.object(self.db, "connect", lambda raw=False: sqlite3.connect(self.db_path, timeout=0)):
+                with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                    self.outbox.process_due(self.now)
+        finally:
+            holder.rollback()
+            holder.close()
+        self.assertEqual(self.outbox.process_due(self.now)["sent"], 1)
+
+    def test_worker_thread_and_receipt_sender(self):
+        self.outbox.start()
+        sender = EmailReceiptSender("127.0.0.1", self.smtp.port, "desk@hotel.test", "", sender_name="RSC Hotels",
+                                    outbox=self.outbox)
+        self.assertTrue(sender.send_reservation_receipt("ada@example.com", "Ada Lovelace", 1042, 101,
+                                                        "2026-11-01", "2026-11-03", 2, 216.0, True))
+
+        deadline = time.time() + 10
+        while not self.smtp.messages and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(len(self.smtp.messages), 1)
+        self.assertIn("Your Reservation Confirmation #1042", self.smtp.messages[0][1])
+        row = self.db.execute_query("SELECT reservation_id, to_address FROM email_outbox")[0]
+        self.assertEqual(tuple(row), (1042, "ada@example.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Module: test_generate_dataset.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `generate_dataset.py`. It verifies that the same seed produces the same database,
+that occupied stays never overlap within a room, that statuses agree with the dates, that occupancy is close to
+the target, that every row is a change-tracking baseline (change_seq 0, no tombstones) while ordinary inserts are
+still stamped, and that the CLI refuses to replace an existing file without --overwrite.
+
+Important Data Structures:
+- Temporary Databases: Small generated hotels (30 rooms, a few months of history) with a fixed "today", built at
+  HotelTestCase.temp_db_path() paths (hotel_test_case.py).
+"""
+import sqlite3
+import unittest
+from datetime import date
+
+from database_manager import DatabaseManager
+from generate_dataset import FUTURE_DAYS, DatasetConfig, generate, main
+from hotel_test_case import HotelTestCase
+
+TODAY = date(2026, 3, 10)
+
+
+class TestGenerateDataset(HotelTestCase):
+    DATABASE = False
+
+    def setUp(self):
+        super().setUp()
+        self.config = DatasetConfig(rooms=30, years=0.5, occupancy=0.6, seed=7, today=TODAY)
+
+    def build(self, config=None):
+        path = self.temp_db_path()
+        counts = generate(path, config or self.config)
+        return path, counts
+
+    @staticmethod
+    def dump(path):
+        conn = sqlite3.connect(path)
+        try:
+            return [conn.execute(f"SELECT * FROM {t} ORDER BY 1").fetchall() for t in ("rooms", "guests", "reservations")]
+        finally:
+            conn.close()
+
+    def test_same_seed_same_database(self):
+        first, counts = self.build()
+        second, _ = self.build()
+        self.assertEqual(self.dump(first), self.dump(second))
+        self.assertEqual(counts["rooms"], 30)
+        self.assertGreater(counts["reservations"], 0)
+
+        other, _ = self.build(DatasetConfig(rooms=30, years=0.5, occupancy=0.6, seed=8, today=TODAY))
+        self.assertNotEqual(self.dump(first)[2], self.dump(other)[2])
+
+    def test_occupied_stays_do_not_overlap_and_statuses_follow_dates(self):
+        path, _ = self.build()
+        conn = sqlite3.connect(path)
+        try:
+            overlaps = conn.execute("""
+                SELECT COUNT(*) FROM reservations a JOIN reservations b
+                  ON a.room_id = b.room_id AND a.reservation_id < b.reservation_id
+                 AND a.check_in_date < b.check_out_date AND b.check_in_date < a.check_out_date
+                WHERE a.status != 'Cancelled' AND b.status != 'Cancelled'
+            """).fetchone()[0]
+            self.assertEqual(overlaps, 0)
+
+            today = TODAY.isoformat()
+            for status, check_in, check_out in conn.execute(
+                    "SELECT status, check_in_date, check_out_date FROM reservations WHERE status != 'Cancelled'"):
+                if check_out <= today:
+                    self.assertIn(status, ("Complete", "No-show"))
+                elif check_in < today:
+                    self.assertEqual(status, "Checked-in")
+                else:
+                    self.assertEqual(status, "Confirmed")
+
+            booked = conn.execute("""
+                SELECT SUM(julianday(check_out_date) - julianday(check_in_date)) FROM reservations
+                WHERE status != 'Cancelled'
+            """).fetchone()[0]
+        finally:
+            conn.close()
+        nights = 30 * (int(0.5 * 365) + FUTURE_DAYS)
+        self.assertAlmostEqual(booked / nights, 0.6, delta=0.08)
+
+    def test_rows_are_a_change_tracking_baseline(self):
+        path, _ = self.build()
+        conn = sqlite3.connect(path)
+        try:
+            for table in ("rooms", "guests", "reservations"):
+                stamps = conn.execute(f"SELECT DISTINCT change_seq, updated_at FROM {table}").fetchall()
+                self.assertEqual(stamps, [(0, f"{TODAY.isoformat()}T00:00:00")], table)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM change_tombstones").fetchone()[0], 0)
+            # Day numbers were inserted with the rows and agree with SQLite's own conversion
+            mismatched = conn.execute("""
+                SELECT COUNT(*) FROM reservations
+                WHERE check_in_day IS NOT CAST(julianday(check_in_date) - 2440587.5 AS INTEGER)
+                   OR check_out_day IS NOT CAST(julianday(check_out_date) - 2440587.5 AS INTEGER)
+            """).fetchone()[0]
+            self.assertEqual(mismatched, 0)
+            # Rows in progress today were flagged by the availability refresh and still carry the baseline
+            self.assertGreater(conn.execute("SELECT COUNT(*) FROM rooms WHERE is_available = 0").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+        # Ordinary inserts are still stamped by the triggers
+        db = DatabaseManager(path)
+        db.add_room(9999, "Single", 1, 90.0, 0)
+        room = db.execute_query("SELECT change_seq, updated_at FROM rooms WHERE room_number = '9999'")[0]
+        self.assertGreater(room["change_seq"], 0)
+        self.assertNotEqual(room["updated_at"], f"{TODAY.isoformat()}T00:00:00")
+        db.cache.close()
+
+    def test_old_insert_triggers_are_replaced(self):
+        path, _ = self.build()
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            DROP TRIGGER trg_guests_change_insert;
+            CREATE TRIGGER trg_guests_change_insert AFTER INSERT ON guests
+            BEGIN UPDATE change_sequence SET value = value + 1 WHERE id = 1; END;
+        """)
+        conn.close()
+        db = DatabaseManager(path)
+        sql = db.execute_query("SELECT sql FROM sqlite_master WHERE name = 'trg_guests_change_insert'")[0][0]
+        self.assertIn("WHEN NEW.updated_at IS NULL", sql)
+        db.cache.close()
+
+    def test_invalid_config_raises(self):
+        with self.assertRaises(ValueError):
+            generate(self.temp_db_path(), DatasetConfig(occupancy=1.5))
+        with self.assertRaises(ValueError):
+            generate(self.temp_db_path(), DatasetConfig(mix={"Penthouse": 1}))
+
+    def test_cli_requires_overwrite(self):
+        path = self.temp_db_path()
+        self.assertEqual(main(["--db", path, "--rooms", "5", "--years", "0.1"]), 0)
+        with self.assertRaises(SystemExit):
+            main(["--db", path, "--rooms", "5", "--years", "0.1"])
+        self.assertEqual(main(["--db", path, "--rooms", "5", "--years", "0.1", "--overwrite"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Module: test_id_allocator.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `id_allocator.py`. It verifies that the keyed permutation is one-to-one, that
+allocated IDs are unique and move to a wider ID space once the current width is used up, that IDs already present
+in the table are skipped, and that `HotelManager.reserve_room` and `generate_unique_employee_id` use the allocator.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py): one room and one guest.
+- Small test sequence: A 1-digit sequence so the width rollover (9 IDs) can be exercised quickly.
+
+Algorithms:
+- Exhaustive checks over small domains; data-driven checks against the temporary database.
+"""
+import sqlite3
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from database_manager import DatabaseManager
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+from id_allocator import IdAllocator, IdSequence, permute, position_to_id
+
+
+class TestPermutation(unittest.TestCase):
+
+    def test_permute_is_bijection(self):
+        secret = b"k" * 16
+        for domain in (1, 2, 7, 90, 900, 1001):
+            values = [permute(v, domain, secret) for v in range(domain)]
+            self.assertEqual(sorted(values), list(range(domain)))
+
+    def test_permute_depends_on_key(self):
+        a = [permute(v, 900, b"a" * 16) for v in range(50)]
+        b = [permute(v, 900, b"b" * 16) for v in range(50)]
+        self.assertNotEqual(a, b)
+        self.assertNotEqual(a, sorted(a))
+
+    def test_position_to_id_widens(self):
+        secret = b"k" * 16
+        first_block = {position_to_id(p, 1, secret) for p in range(9)}
+        self.assertEqual(first_block, set(range(1, 10)))
+        second_block = {position_to_id(p, 1, secret) for p in range(9, 99)}
+        self.assertEqual(second_block, set(range(10, 100)))
+        self.assertEqual(len(str(position_to_id(900000, 6, secret))), 7)
+
+
+class TestIdAllocator(HotelTestCase):
+
+    def test_allocate_many_unique_and_six_digits(self):
+        ids = self.db.id_allocator.allocate_many("reservations", 2000)
+        self.assertEqual(len(set(ids)), 2000)
+        self.assertTrue(all(100000 <= i <= 999999 for i in ids))
+        # A second allocator on the same database continues the same sequence
+        more = DatabaseManager(self.db_path).id_allocator.allocate_many("reservations", 100)
+        self.assertFalse(set(ids) & set(more))
+
+    def test_small_sequence_rolls_over_to_wider_ids(self):
+        allocator = IdAllocator(self.db, {"tiny": IdSequence("tiny", "employees", "employee_id", 1)})
+        ids = [allocator.allocate("tiny") for _ in range(20)]
+        self.assertEqual(len(set(ids)), 20)
+        self.assertEqual(sorted(ids[:9]), list(range(1, 10)))
+        self.assertTrue(all(10 <= i <= 99 for i in ids[9:]))
+
+    def test_existing_ids_are_skipped(self):
+        allocator = IdAllocator(self.db, {"tiny": IdSequence("tiny", "employees", "employee_id", 1)})
+        for emp_id in (3, 5, 7):
+            self.db.create_employee(emp_id, "pw", "A", "B", "Employee", "555", "a1", "", "c", "ST", "00000")
+        ids = allocator.allocate_many("tiny", 6)
+        self.assertEqual(sorted(ids), [1, 2, 4, 6, 8, 9])
+
+    def test_reserve_room_and_employee_ids_use_allocator(self):
+        self.db.add_room(5000, "Queen", 2, 100.0, 1)
+        room_id = self.db.get_room(room_number=5000)["room_id"]
+        gid = self.db.add_guest("Tim", "Booker", "tim@example.com", "555-7777",
+                                "Addr1", "Addr2", "City", "ST", "00000")
+        hotel = HotelManager(self.db)
+        check_in = date.today() + timedelta(days=1)
+        res_id = hotel.reserve_room(gid, room_id, check_in.isoformat(), (check_in + timedelta(days=2)).isoformat())
+        self.assertTrue(100000 <= res_id <= 999999)
+        next_value = self.db.execute_query("SELECT next_value FROM id_sequences WHERE name = 'reservations'")[0][0]
+        self.assertEqual(next_value, 1)
+
+        emp_id = self.db.generate_unique_employee_id()
+        self.assertTrue(10000 <= emp_id <= 99999)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.db.id_allocator.allocate("unknown")
+        with self.assertRaises(ValueError):
+            self.db.id_allocator.allocate_many("reservations", 0)
+
+    def test_locked_database_error_is_not_masked(self):
+        self.db.id_allocator.allocate("reservations")  # create the sequence row first
+        holder = sqlite3.connect(self.db_path)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            with mock.patch.object(self.db, "connect", lambda raw=False: sqlite3.connect(self.db_path, timeout=0)):
+                with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                    self.db.id_allocator.allocate("reservations")
+        finally:
+            holder.rollback()
+            holder.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
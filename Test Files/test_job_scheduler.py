@@ -0,0 +1,158 @@
+"""
+Module: test_job_scheduler.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for the `JobScheduler` class. It uses the `unittest` framework with a temporary
+database to verify that daily maintenance jobs are recorded in `job_runs`, run at most once per business date,
+respect their time-of-day gates, retry after failures, and can be backfilled for a date range.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py), with one room, one guest and one
+  reservation checking in on BUSINESS_DATE - 1 that never checked in.
+
+Algorithms:
+- Data-Driven Testing: Jobs are run against known data and the resulting rows in `reservations` and `job_runs`
+  are asserted directly.
+"""
+import sqlite3
+import unittest
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+
+from hotel_test_case import HotelTestCase
+from job_scheduler import Job, JobScheduler
+
+BUSINESS_DATE = date(2026, 3, 10)
+
+
+class TestJobScheduler(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.insert_reservation(100001, BUSINESS_DATE - timedelta(days=1), BUSINESS_DATE + timedelta(days=2),
+                                total_price=240.0)
+        self.scheduler = JobScheduler(self.db)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        super().tearDown()
+
+    def _run_row(self, name, business_date=BUSINESS_DATE):
+        rows = self.db.execute_query(
+            "SELECT * FROM job_runs WHERE job_name = ? AND business_date = ?",
+            (name, business_date.isoformat()),
+        )
+        return rows[0] if rows else None
+
+    def test_run_due_records_success_and_applies_job(self):
+        results = self.scheduler.run_due(datetime.combine(BUSINESS_DATE, time(9, 0)))
+        self.assertEqual(results["room_availability"], "success")
+        self.assertEqual(results["mark_late_reservations"], "success")
+        # Noon and 2 PM jobs are not due yet at 9 AM
+        self.assertEqual(results["mark_late_checkouts"], "skipped")
+        self.assertEqual(results["cancel_expired_late_reservations"], "skipped")
+        self.assertIsNone(self._run_row("mark_late_checkouts"))
+
+        row = self._run_row("mark_late_reservations")
+        self.assertEqual(row["status"], "success")
+        self.assertEqual(row["attempts"], 1)
+        self.assertIsNotNone(row["duration_ms"])
+        status = self.db.execute_query("SELECT status FROM reservations")[0]["status"]
+        self.assertEqual(status, "Late")
+
+    def test_job_runs_once_per_business_date(self):
+        now = datetime.combine(BUSINESS_DATE, time(9, 0))
+        self.scheduler.run_due(now)
+        # A second scheduler (another window/process) sees the recorded success
+        other = JobScheduler(self.db)
+        self.assertEqual(other.run_job("room_availability", BUSINESS_DATE, now), "skipped")
+        self.assertEqual(self.scheduler.run_due(now)["room_availability"], "skipped")
+        self.assertEqual(self._run_row("room_availability")["attempts"], 1)
+        # The next business date runs again
+        next_day = datetime.combine(BUSINESS_DATE + timedelta(days=1), time(9, 0))
+        self.assertEqual(other.run_due(next_day)["room_availability"], "success")
+
+    def test_force_reruns_successful_job(self):
+        now = datetime.combine(BUSINESS_DATE, time(9, 0))
+        self.scheduler.run_job("room_availability", BUSINESS_DATE, now)
+        self.assertEqual(self.scheduler.run_job("room_availability", BUSINESS_DATE, now, force=True), "success")
+        self.assertEqual(self._run_row("room_availability")["attempts"], 2)
+
+    def test_failed_job_is_recorded_and_retried(self):
+        calls = []
+
+        def flaky(db, business_date, now):
+            calls.append(business_date)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+        scheduler = JobScheduler(self.db, jobs=[Job("flaky", flaky)])
+        now = datetime.combine(BUSINESS_DATE, time(9, 0))
+        self.assertEqual(scheduler.run_due(now)["flaky"], "failed")
+        row = self._run_row("flaky")
+        self.assertEqual(row["status"], "failed")
+        self.assertIn("boom", row["error"])
+
+        self.assertEqual(scheduler.run_due(now)["flaky"], "success")
+        row = self._run_row("flaky")
+        self.assertEqual(row["status"], "success")
+        self.assertEqual(row["attempts"], 2)
+        self.assertIsNone(row["error"])
+
+    def test_failed_job_stops_after_max_attempts(self):
+        def broken(db, business_date, now):
+            raise RuntimeError("still broken")
+
+        scheduler = JobScheduler(self.db, jobs=[Job("broken", broken)])
+        now = datetime.combine(BUSINESS_DATE, time(9, 0))
+        for _ in range(JobScheduler.MAX_ATTEMPTS):
+            self.assertEqual(scheduler.run_due(now)["broken"], "failed")
+        self.assertEqual(scheduler.run_due(now)["broken"], "skipped")
+
+    def test_fresh_running_row_is_not_run_twice(self):
+        self.db.execute_query(
+            "INSERT INTO job_runs (job_name, business_date, status, started_at) VALUES (?, ?, 'running', ?)",
+            ("room_availability", BUSINESS_DATE.isoformat(), datetime.now().isoformat(timespec="seconds")),
+        )
+        self.assertEqual(self.scheduler.run_job("room_availability", BUSINESS_DATE), "skipped")
+
+        stale = datetime.now() - JobScheduler.STALE_RUNNING_AFTER - timedelta(minutes=1)
+        self.db.execute_query(
+            "UPDATE job_runs SET started_at = ? WHERE job_name = ?",
+            (stale.isoformat(timespec="seconds"), "room_availability"),
+        )
+        self.assertEqual(self.scheduler.run_job("room_availability", BUSINESS_DATE), "success")
+
+    def test_backfill_runs_each_date(self):
+        start = BUSINESS_DATE - timedelta(days=2)
+        results = self.scheduler.backfill(start, BUSINESS_DATE, names=["mark_late_reservations"])
+        self.assertEqual(list(results), [(start + timedelta(days=i)).isoformat() for i in range(3)])
+        self.assertTrue(all(r["mark_late_reservations"] == "success" for r in results.values()))
+        count = self.db.execute_query("SELECT COUNT(*) AS n FROM job_runs")[0]["n"]
+        self.assertEqual(count, 3)
+
+        with self.assertRaises(ValueError):
+            self.scheduler.backfill(BUSINESS_DATE, start)
+
+    def test_unknown_job_raises(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.run_job("does_not_exist", BUSINESS_DATE)
+
+    def test_locked_database_error_is_not_masked(self):
+        holder = sqlite3.connect(self.db_path)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            # No busy timeout, so BEGIN IMMEDIATE fails at once; the caller must see that error, not the rollback's
+            with mock.patch.object(self.db, "connect", lambda raw=False: sqlite3.connect(self.db_path, timeout=0)):
+                with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                    self.scheduler.run_job("room_availability", BUSINESS_DATE)
+        finally:
+            holder.rollback()
+            holder.close()
+        self.assertEqual(self.scheduler.run_job("room_availability", BUSINESS_DATE), "success")
+
+
+if __name__ == "__main__":
+    unittest.main()
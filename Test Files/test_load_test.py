@@ -0,0 +1,88 @@
+"""
+Module: test_load_test.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `benchmarks/load_test.py`. It runs a short threaded load against a temporary hotel
+and checks that the outcome counters agree with the reservations left in the database, and that a busy retry
+works on the same reservation (or puts it back when every attempt fails) instead of taking another one.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with four rooms and one guest, and no
+  reservations.
+"""
+import os
+import sqlite3
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from hotel_test_case import HotelTestCase
+from load_test import Client, LoadConfig, run_load
+
+
+class TestLoadTest(HotelTestCase):
+    ROOMS = tuple((301 + n, "Double", 2, 120.0, 1) for n in range(4))
+    GUEST = ("Load", "Client", "load@example.com", "1 Main St", "Springfield", "CA", "90001")
+
+    def _statuses(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM reservations GROUP BY status").fetchall())
+        finally:
+            conn.close()
+
+    def test_outcome_counters_match_database(self):
+        mix = {"reserve": 40, "cancel": 20, "check_in": 20, "check_out": 20}
+        report = run_load(LoadConfig(db_path=self.db_path, clients=2, mix=mix, duration=30, max_operations=40,
+                                     seed=3))
+        ops = report["operations"]
+        for stats in ops.values():
+            self.assertEqual(stats["count"], stats["ok"] + stats["rejected"] + stats["errors"])
+            self.assertEqual(stats["errors"], 0)
+        self.assertEqual(sum(s["count"] for s in ops.values()), 80)
+        self.assertEqual(report["overlaps"], [])
+
+        ok = {op: ops.get(op, {}).get("ok", 0) for op in ("reserve", "cancel", "check_in", "check_out")}
+        statuses = self._statuses()
+        self.assertGreater(ok["reserve"], 0)
+        self.assertEqual(sum(statuses.values()), ok["reserve"])
+        self.assertEqual(statuses.get("Cancelled", 0), ok["cancel"])
+        self.assertEqual(statuses.get("Complete", 0), ok["check_out"])
+        self.assertEqual(statuses.get("Checked-in", 0) + statuses.get("Complete", 0), ok["check_in"])
+
+    def test_busy_retry_keeps_the_same_reservation(self):
+        client = Client(LoadConfig(db_path=self.db_path, backoff=0, max_retries=2), 0)
+        client.call("reserve")
+        client.call("reserve")
+        booked = client.confirmed + client.arrivals
+        client.confirmed, client.arrivals = list(booked), []
+        seen = []
+
+        def busy_once(reservation_id):
+            seen.append(reservation_id)
+            if len(seen) == 1:
+                raise sqlite3.OperationalError("database is locked")
+
+        client.mgr.cancel_reservation = busy_once
+        client.call("cancel")
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(seen[0], seen[1])
+        self.assertNotIn(seen[0], client.confirmed)
+        self.assertEqual((client.outcomes["cancel"]["ok"], client.busy_errors, client.retries), (1, 1, 1))
+
+        def always_busy(reservation_id):
+            raise sqlite3.OperationalError("database is locked")
+
+        client.mgr.cancel_reservation = always_busy
+        client.call("cancel")
+        self.assertEqual(sorted(client.confirmed), sorted(set(booked) - {seen[0]}))
+        self.assertEqual(client.outcomes["cancel"]["errors"], 1)
+        self.assertEqual(client.busy_errors, 4)
+        client.db.cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Module: test_metrics_exporter.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `metrics_exporter.py`. It verifies the Prometheus text format (HELP/TYPE lines,
+label escaping, cumulative histogram buckets), that HotelManager operations and scheduler jobs are counted by
+outcome, that the database collector exports lock waits, cache ratios and job runs, that the text can be
+written to a file or served over HTTP on localhost, and that the command line exporter leaves out the per-process
+figures it cannot see.
+
+Important Data Structures:
+- Private MetricsRegistry instances for format tests, and the process-wide REGISTRY (read as before/after deltas)
+  for the HotelManager and JobScheduler hooks.
+- Temporary Database: HotelTestCase's database (hotel_test_case.py): one room and one guest.
+"""
+import os
+import tempfile
+import unittest
+import urllib.request
+from datetime import date, timedelta
+
+import metrics_exporter
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+from job_scheduler import JobScheduler
+from metrics_exporter import JOB_RUNS, OPERATION_SECONDS, OPERATIONS, MetricsRegistry, render
+
+
+def _value(counter, *labels):
+    return counter.labels(*labels).value
+
+
+class TestFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self):
+        requests = self.registry.counter("app_requests_total", "Requests.", ("path",))
+        requests.labels('/a"b').inc()
+        requests.labels('/a"b').inc(2)
+        self.registry.gauge("app_temperature", "Temperature.").set(21.5)
+        text = render(self.registry)
+        self.assertIn("# HELP app_requests_total Requests.\n# TYPE app_requests_total counter\n", text)
+        self.assertIn('app_requests_total{path="/a\\"b"} 3\n', text)
+        self.assertIn("# TYPE app_temperature gauge\napp_temperature 21.5\n", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        latency = self.registry.histogram("app_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            latency.observe(value)
+        text = render(self.registry)
+        self.assertIn('app_seconds_bucket{le="0.1"} 1\n', text)
+        self.assertIn('app_seconds_bucket{le="1"} 3\n', text)
+        self.assertIn('app_seconds_bucket{le="+Inf"} 4\n', text)
+        self.assertIn("app_seconds_count 4\n", text)
+        self.assertIn("app_seconds_sum 4.25\n", text)
+
+    def test_reregistering_returns_same_metric(self):
+        first = self.registry.counter("app_total", "Total.", ("a",))
+        self.assertIs(self.registry.counter("app_total", "Total.", ("a",)), first)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("app_total", "Total.")
+        with self.assertRaises(ValueError):
+            first.labels("x", "y")
+
+    def test_metric_subclass_must_define_children(self):
+        class Incomplete(metrics_exporter._Metric):
+            kind = "gauge"
+
+        with self.assertRaises(TypeError):
+            Incomplete("app_incomplete", "Incomplete.")
+
+    def test_failing_collector_is_skipped(self):
+        def broken():
+            raise RuntimeError("boom")
+            yield
+
+        self.registry.register_collector(broken)
+        self.registry.register_collector(lambda: [("app_up", "gauge", "Up.", [({}, 1)])])
+        self.assertIn("app_up 1\n", render(self.registry))
+
+
+class TestHooks(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.mgr = HotelManager(self.db)
+        self.db.hotel_manager = self.mgr
+        self.registry = MetricsRegistry()
+        metrics_exporter.register_database(self.db, self.registry)
+
+    def test_operations_counted_by_outcome(self):
+        before = (_value(OPERATIONS, "reserve", "success"), _value(OPERATIONS, "reserve", "rejected"),
+                  OPERATION_SECONDS.labels("reserve").counts[:])
+        check_in = date.today() + timedelta(days=5)
+        stay = (check_in.isoformat(), (check_in + timedelta(days=2)).isoformat())
+        self.mgr.reserve_room(self.guest_id, self.room_id, *stay, 1)
+        with self.assertRaises(ValueError):
+            self.mgr.reserve_room(self.guest_id, self.room_id, *stay, 1)
+
+        self.assertEqual(_value(OPERATIONS, "reserve", "success") - before[0], 1)
+        self.assertEqual(_value(OPERATIONS, "reserve", "rejected") - before[1], 1)
+        self.assertEqual(sum(OPERATION_SECONDS.labels("reserve").counts) - sum(before[2]), 2)
+
+    def test_job_runs_and_database_collector(self):
+        before = _value(JOB_RUNS, "room_availability", "success")
+        JobScheduler(self.db).run_job("room_availability", date.today())
+        self.assertEqual(_value(JOB_RUNS, "room_availability", "success") - before, 1)
+
+        check_in = date.today() + timedelta(days=5)
+        self.mgr.reserve_room(self.guest_id, self.room_id, check_in.isoformat(),
+                              (check_in + timedelta(days=1)).isoformat(), 1)
+        self.mgr.search_rooms()
+        self.mgr.search_rooms()
+
+        text = render(self.registry)
+        self.assertIn('hotel_job_last_success{job="room_availability"} 1\n', text)
+        self.assertIn("# TYPE hotel_db_lock_wait_seconds summary\n", text)
+        self.assertRegex(text, r"hotel_db_lock_wait_seconds_count [1-9]")
+        self.assertIn('hotel_cache_hits_total{method="HotelManager.search_rooms"} 1\n', text)
+        self.assertIn("hotel_cache_hit_ratio 0.5\n", text)
+
+    def test_textfile_and_http(self):
+        path = os.path.join(tempfile.mkdtemp(), "hotel.prom")
+        metrics_exporter.write_textfile(path, self.registry)
+        with open(path, encoding="utf-8") as f:
+            self.assertIn("hotel_db_statements_total", f.read())
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["hotel.prom"])
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+        server = metrics_exporter.serve(0, "127.0.0.1", self.registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertEqual(response.headers["Content-Type"], metrics_exporter.CONTENT_TYPE)
+                self.assertIn(b"hotel_cache_hit_ratio", response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_command_line_exports_database_figures_only(self):
+        JobScheduler(self.db).run_job("room_availability", date.today())
+        path = os.path.join(tempfile.mkdtemp(), "cli.prom")
+        try:
+            self.assertEqual(metrics_exporter.main(["--db", self.db_path, "--textfile", path]), 0)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rmdir(os.path.dirname(path))
+        self.assertIn('hotel_job_last_success{job="room_availability"} 1\n', text)
+        for per_process in ("hotel_operations_total", "hotel_db_lock_wait_seconds", "hotel_cache_hit_ratio"):
+            self.assertNotIn(per_process, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Module: test_price_quotes.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `HotelManager.quote_many`. It verifies the per-night breakdown, tax and total for
+several rooms at once, that unknown rooms are left out, that no database queries are issued once the room inventory
+and rate rules are loaded, and that calculate_total_price agrees with the bulk quotes.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with three rooms and one guest.
+"""
+import unittest
+from datetime import date, datetime
+
+from database_manager import DatabaseManager
+from hotel_manager import HotelManager
+from hotel_models import TAX_RATE, PriceQuote
+from hotel_test_case import HotelTestCase
+
+
+class TestQuoteMany(HotelTestCase):
+    ROOMS = ((101, "Single", 1, 80.0, 1), (102, "Double", 2, 120.0, 1), (103, "Suite", 4, 300.0, 1))
+
+    def setUp(self):
+        super().setUp()
+        self.mgr = HotelManager(self.db)
+
+    def test_breakdown_tax_and_total(self):
+        ids = [self.room_ids[101], self.room_ids[103]]
+        quotes = self.mgr.quote_many(ids, "2026-03-10", "2026-03-13")
+        self.assertEqual(list(quotes), ids)
+
+        suite = quotes[self.room_ids[103]]
+        self.assertIsInstance(suite, PriceQuote)
+        self.assertEqual(str(suite.room_number), "103")
+        self.assertEqual(suite.nights, 3)
+        self.assertEqual(suite.nightly, (("2026-03-10", 300.0), ("2026-03-11", 300.0), ("2026-03-12", 300.0)))
+        self.assertAlmostEqual(suite.subtotal, 900.0)
+        self.assertAlmostEqual(suite.tax, 900.0 * TAX_RATE)
+        self.assertAlmostEqual(suite.total, 900.0 * (1 + TAX_RATE))
+
+    def test_accepts_dates_and_skips_unknown_rooms(self):
+        quotes = self.mgr.quote_many([self.room_ids[102], 99999, self.room_ids[102]],
+                                     date(2026, 3, 10), date(2026, 3, 11))
+        self.assertEqual(list(quotes), [self.room_ids[102]])
+        self.assertAlmostEqual(quotes[self.room_ids[102]].subtotal, 120.0)
+        at_noon = self.mgr.quote_many([self.room_ids[102]], datetime(2026, 3, 10, 12, 30), datetime(2026, 3, 11, 9))
+        self.assertEqual(at_noon, quotes)
+
+    def test_invalid_dates_raise(self):
+        with self.assertRaises(ValueError):
+            self.mgr.quote_many([self.room_ids[101]], "2026-03-10", "2026-03-10")
+
+    def test_no_queries_after_inventory_loaded(self):
+        self.mgr.quote_many([self.room_ids[101]], "2026-03-10", "2026-03-12")   # loads rooms and rate rules
+        calls = []
+        self.db.connect = lambda *a, **k: calls.append(a) or DatabaseManager.connect(self.db, *a, **k)
+        self.mgr.quote_many(list(self.room_ids.values()), "2026-03-10", "2026-03-12")
+        self.assertEqual(calls, [])
+
+    def test_calculate_total_price_matches_quote(self):
+        room_id = self.room_ids[101]
+        quote = self.mgr.quote_many([room_id], "2026-03-10", "2026-03-12")[room_id]
+        self.assertEqual(self.mgr.calculate_total_price(room_id, "2026-03-10", "2026-03-12"), quote.total)
+        with self.assertRaises(ValueError):
+            self.mgr.calculate_total_price(99999, "2026-03-10", "2026-03-12")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Module: test_query_cache.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `query_cache.py`. It verifies that cached DatabaseManager/HotelManager read methods
+return cached results for repeated calls, are invalidated by writes made through DatabaseManager (including
+HotelManager transactions and `with conn:` commits), notice writes made by other connections/processes, evict
+least-recently-used entries, and are bypassed for a mocked DatabaseManager.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with one Single room at 80.0 and one guest.
+
+Algorithms:
+- Behavior checks through `QueryCache.stats()` hit/miss counters.
+"""
+import sqlite3
+import unittest
+from unittest.mock import MagicMock
+
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+
+
+class TestQueryCache(HotelTestCase):
+    ROOMS = ((101, "Single", 1, 80.0, 1),)
+
+    def _method_stats(self, name):
+        return self.db.cache.stats()["methods"][name]
+
+    def test_repeated_reads_hit_cache(self):
+        for _ in range(5):
+            self.assertEqual(self.db.get_rooms_filtered(room_number="101")[0][5], 80.0)
+        self.assertEqual(self._method_stats("DatabaseManager.get_rooms_filtered"), {"hits": 4, "misses": 1})
+
+    def test_write_invalidates_dependent_entries(self):
+        self.db.get_rooms_filtered()
+        self.db.update_room(self.room_id, 95.0, 1)
+        self.assertEqual(self.db.get_rooms_filtered()[0][5], 95.0)
+
+    def test_with_block_commit_invalidates(self):
+        self.db.get_rooms_filtered()
+        with self.db.connect() as conn:
+            conn.execute("UPDATE rooms SET price = 70.0 WHERE room_id = ?", (self.room_id,))
+        rows = self.db.get_rooms_filtered()
+        self.assertEqual(rows[0][5], 70.0)
+
+    def test_unrelated_table_write_keeps_entry(self):
+        self.db.get_rooms_filtered()
+        self.db.add_guest("Alice", "Smith", "alice@example.com", "1 Main St", "LA", "CA", "90001")
+        self.db.get_rooms_filtered()
+        self.assertEqual(self._method_stats("DatabaseManager.get_rooms_filtered")["hits"], 1)
+
+    def test_hotel_manager_search_invalidated_by_reservation(self):
+        hotel = HotelManager(self.db)
+        gid = self.db.add_guest("Alice", "Smith", "alice@example.com", "1 Main St", "LA", "CA", "90001")
+        from datetime import date, timedelta
+        ci = date.today() + timedelta(days=3)
+        co = ci + timedelta(days=2)
+        self.assertEqual(len(hotel.search_rooms(check_in=ci.isoformat(), check_out=co.isoformat())), 1)
+        hotel.reserve_room(gid, self.room_id, ci.isoformat(), co.isoformat())
+        self.assertEqual(len(hotel.search_rooms(check_in=ci.isoformat(), check_out=co.isoformat())), 0)
+
+    def test_external_write_detected(self):
+        self.assertEqual(self.db.get_rooms_filtered()[0][5], 80.0)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE rooms SET price = 60.0 WHERE room_id = ?", (self.room_id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.get_rooms_filtered()[0][5], 60.0)
+
+    def test_lru_eviction(self):
+        self.db.cache.maxsize = 2
+        self.db.add_room(102, "Single", 1, 81.0, 1)
+        self.db.add_room(103, "Single", 1, 82.0, 1)
+        for number in ("101", "102", "103"):
+            self.db.get_rooms_filtered(room_number=number)
+        stats = self.db.cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertGreaterEqual(stats["evictions"], 1)
+
+    def test_results_are_copies(self):
+        rows = self.db.get_rooms_filtered()
+        rows.clear()
+        self.assertEqual(len(self.db.get_rooms_filtered()), 1)
+
+    def test_mock_database_bypasses_cache(self):
+        mock_db = MagicMock()
+        mock_db.execute_query.return_value = []
+        hotel = HotelManager(mock_db)
+        hotel.search_rooms()
+        hotel.search_rooms()
+        self.assertEqual(mock_db.execute_query.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
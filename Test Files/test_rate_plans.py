@@ -0,0 +1,115 @@
+"""
+Module: test_rate_plans.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `rate_plans.py`. It verifies seasonal, day-of-week, fixed and length-of-stay rules,
+that the precomputed calendar agrees with evaluating the rules directly, that adding/updating/deleting a rule only
+changes the nights it covers, that changes from another DatabaseManager are picked up, and that quote_many and
+calculate_total_price use the rates.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with a Single room (base 100.0) and a Suite room
+  (base 300.0).
+- NIGHT: A Monday inside the calendar horizon, so weekday rules can be placed on known dates.
+"""
+import unittest
+from datetime import date, timedelta
+
+from database_manager import DatabaseManager
+from hotel_manager import HotelManager
+from hotel_models import TAX_RATE
+from hotel_test_case import HotelTestCase
+
+_today = date.today()
+NIGHT = _today + timedelta(days=7 - _today.weekday() + 7)   # Monday in one to two weeks
+
+
+def _iso(days):
+    return (NIGHT + timedelta(days=days)).isoformat()
+
+
+class TestRatePlans(HotelTestCase):
+    ROOMS = ((101, "Single", 1, 100.0, 1), (301, "Suite", 4, 300.0, 1))
+
+    def setUp(self):
+        super().setUp()
+        self.single = self.room_ids[101]
+        self.suite = self.room_ids[301]
+        self.plans = self.db.rate_plans
+        self.mgr = HotelManager(self.db)
+
+    def nightly(self, room_type, nights=7, base=100.0, first=NIGHT):
+        return list(self.plans.stay_rates(room_type, first, nights).nightly(base))
+
+    def test_no_rules_uses_base_price(self):
+        self.assertEqual(self.nightly("Single", 3), [100.0, 100.0, 100.0])
+
+    def test_weekend_and_season_rules_compose_in_priority_order(self):
+        self.plans.add_rule("Weekend", "percent", 20, days_of_week=[4, 5])
+        self.plans.add_rule("Festival", "amount", 15, start_date=_iso(5), end_date=_iso(6), priority=1)
+        # Mon..Sun: Fri and Sat +20%, then Sat and Sun +15
+        self.assertEqual(self.nightly("Single"), [100.0, 100.0, 100.0, 100.0, 120.0, 135.0, 115.0])
+
+    def test_room_type_and_fixed_rules(self):
+        self.plans.add_rule("Suite promo", "fixed", 250, room_type="Suite", start_date=_iso(0), end_date=_iso(0))
+        self.assertEqual(self.nightly("Suite", 2, base=300.0), [250.0, 300.0])
+        self.assertEqual(self.nightly("Single", 2), [100.0, 100.0])
+
+    def test_length_of_stay_rule(self):
+        self.plans.add_rule("Week stay", "percent", -10, min_nights=7)
+        self.assertEqual(self.nightly("Single", 6), [100.0] * 6)
+        self.assertEqual([round(r, 6) for r in self.nightly("Single", 7)], [90.0] * 7)
+
+    def test_update_and_delete_recompute_covered_nights(self):
+        rule_id = self.plans.add_rule("Season", "percent", 50, start_date=_iso(1), end_date=_iso(2))
+        self.assertEqual(self.nightly("Single", 4), [100.0, 150.0, 150.0, 100.0])
+        self.plans.update_rule(rule_id, start_date=_iso(2), end_date=_iso(3))
+        self.assertEqual(self.nightly("Single", 4), [100.0, 100.0, 150.0, 150.0])
+        self.plans.delete_rule(rule_id)
+        self.assertEqual(self.nightly("Single", 4), [100.0] * 4)
+        self.assertEqual(self.plans.list_rules(), [])
+        with self.assertRaises(ValueError):
+            self.plans.delete_rule(rule_id)
+
+    def test_calendar_matches_direct_evaluation(self):
+        self.plans.add_rule("Weekend", "percent", 25, days_of_week="4,5")
+        self.plans.add_rule("Season", "amount", -10, room_type="Single", start_date=_iso(3), end_date=_iso(40))
+        calendar = self.nightly("Single", 60)
+        # Stays starting in the past are evaluated from the rules, not the calendar
+        past_first = NIGHT - timedelta(days=7 * 100)
+        direct = [self.plans._evaluate("Single", NIGHT + timedelta(days=i)) for i in range(60)]
+        self.assertEqual(calendar, [a * 100.0 + b for a, b in direct])
+        self.assertEqual(len(self.nightly("Single", 3, first=past_first)), 3)
+
+    def test_rules_added_by_other_process_are_seen(self):
+        self.assertEqual(self.nightly("Single", 1), [100.0])
+        other = DatabaseManager(self.db_path)
+        other.rate_plans.add_rule("Surge", "amount", 5)
+        other.cache.close()
+        self.assertEqual(self.nightly("Single", 1), [105.0])
+
+    def test_invalid_rules_raise(self):
+        with self.assertRaises(ValueError):
+            self.plans.add_rule("Bad", "discount", 10)
+        with self.assertRaises(ValueError):
+            self.plans.add_rule("Bad", "percent", 10, start_date=_iso(5), end_date=_iso(1))
+        with self.assertRaises(ValueError):
+            self.plans.add_rule("Bad", "percent", 10, days_of_week=[7])
+        with self.assertRaises(ValueError):
+            self.plans.update_rule(999, adjustment=1)
+
+    def test_quotes_use_rates(self):
+        self.plans.add_rule("Weekend", "percent", 20, days_of_week=[4, 5])
+        quotes = self.mgr.quote_many([self.single, self.suite], _iso(3), _iso(6))   # Thu, Fri, Sat nights
+        single = quotes[self.single]
+        self.assertEqual([rate for _, rate in single.nightly], [100.0, 120.0, 120.0])
+        self.assertAlmostEqual(single.subtotal, 340.0)
+        self.assertAlmostEqual(quotes[self.suite].subtotal, 1020.0)
+        self.assertAlmostEqual(self.mgr.calculate_total_price(self.single, _iso(3), _iso(6)),
+                               340.0 * (1 + TAX_RATE))
+
+
+if __name__ == "__main__":
+    unittest.main()
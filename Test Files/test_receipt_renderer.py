@@ -0,0 +1,96 @@
+"""
+Module: test_receipt_renderer.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `receipt_renderer.py`. It verifies that compiled templates fill constants once and
+escape string values, that a rendered receipt parses back into the same multipart/related message the sender used
+to build (HTML part plus the inline logo), that every message gets its own boundary, and that render_many returns
+the same messages in order whether it renders in-process or over a process pool.
+
+Important Data Structures:
+- RECEIPT: One sample Receipt shared by the tests.
+"""
+import email
+import email.header
+import unittest
+
+import receipt_renderer
+from receipt_renderer import CompiledTemplate, Receipt, ReceiptRenderer, render_many
+
+RECEIPT = Receipt("ada@example.com", "Ada <Lovelace>", 1042, 101, "2026-11-01", "2026-11-03", 2, 216.0, True)
+
+
+class TestCompiledTemplate(unittest.TestCase):
+
+    def test_constants_and_escaping(self):
+        template = CompiledTemplate("{{x}} {greeting}, {name}! Total {total:.2f} ({rate:.0%})",
+                                    greeting="Hello", rate=0.08)
+        self.assertEqual(template.fields, {"name", "total"})
+        self.assertEqual(template.render({"name": "A & B", "total": 3}), "{x} Hello, A &amp; B! Total 3.00 (8%)")
+        with self.assertRaises(ValueError):
+            CompiledTemplate("{name!r}")
+
+
+class TestReceiptRenderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(receipt_renderer.LOGO_PATH, "rb") as f:
+            cls.logo = f.read()
+        cls.renderer = ReceiptRenderer("RSC Hotels", "desk@hotel.example", cls.logo)
+
+    def test_message_structure(self):
+        subject, text = self.renderer.render_receipt(RECEIPT)
+        self.assertEqual(subject, "Your Reservation Confirmation #1042")
+        message = email.message_from_string(text)
+        self.assertEqual(message["From"], "RSC Hotels <desk@hotel.example>")
+        self.assertEqual((message["To"], message["Subject"]), ("ada@example.com", subject))
+        self.assertTrue(message["Message-ID"].endswith("@hotel.example>"))
+        self.assertEqual([part.get_content_type() for part in message.walk()],
+                         ["multipart/related", "multipart/alternative", "text/html", "image/png"])
+        self.assertTrue(all(not part.defects for part in message.walk()))
+
+        html_part, logo_part = list(message.walk())[2:]
+        html = html_part.get_payload(decode=True).decode("utf-8")
+        self.assertIn("Hello Ada &lt;Lovelace&gt;,", html)
+        self.assertIn("— RSC Hotels", html)
+        self.assertIn("Total Paid:</span> $216.00", html)
+        self.assertEqual(logo_part.get_payload(decode=True), self.logo)
+        self.assertEqual(logo_part["Content-ID"], "<hotel_logo>")
+
+    def test_boundaries_and_headers_per_message(self):
+        first = email.message_from_string(self.renderer.render_message("a@example.com", "Reçu", "<p>x</p>"))
+        second = email.message_from_string(self.renderer.render_message("b@example.com", "Hi", "<p>y</p>"))
+        self.assertNotEqual(first.get_boundary(), second.get_boundary())
+        outer, inner = first.get_boundary(), first.get_payload(0).get_boundary()
+        self.assertFalse(inner.startswith(outer) or outer.startswith(inner))
+        self.assertEqual(str(email.header.make_header(email.header.decode_header(first["Subject"]))), "Reçu")
+
+        injected = self.renderer.render_message("a@example.com\nBcc: evil@example.com", "x", "")
+        self.assertIsNone(email.message_from_string(injected)["Bcc"])
+
+    def test_render_many_serial_and_pool(self):
+        receipts = [Receipt(f"g{i}@example.com", f"Guest {i}", i, 100 + i, "2026-11-01", "2026-11-02", 1,
+                            108.0, False) for i in range(12)]
+        serial = list(render_many(receipts, "RSC Hotels", "desk@hotel.example", self.logo, workers=1))
+
+        original = receipt_renderer.PARALLEL_MIN
+        receipt_renderer.PARALLEL_MIN = 1
+        try:
+            pooled = list(render_many(receipts, "RSC Hotels", "desk@hotel.example", self.logo, workers=2,
+                                      chunk_size=5))
+        finally:
+            receipt_renderer.PARALLEL_MIN = original
+
+        self.assertEqual([r for r, _, _ in pooled], receipts)
+        for (_, subject, text), (_, pooled_subject, pooled_text) in zip(serial, pooled):
+            self.assertEqual(subject, pooled_subject)
+            a, b = email.message_from_string(text), email.message_from_string(pooled_text)
+            self.assertEqual([p.get_payload(decode=True) for p in a.walk() if not p.is_multipart()],
+                             [p.get_payload(decode=True) for p in b.walk() if not p.is_multipart()])
+
+
+if __name__ == "__main__":
+    unittest.main()
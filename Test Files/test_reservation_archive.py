@@ -0,0 +1,131 @@
+"""
+Module: test_reservation_archive.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `reservation_archive.py` and the reads that go through the reservations_all view.
+It verifies that only Cancelled/Complete stays older than the cutoff are moved (in chunks, keeping their ids and
+change_seq), that inactive booking records, reservation search, guest history and the manager metrics return the
+same results before and after archiving, that the booking-screen delta keeps archived rows in an inactive list,
+and that the scheduler's archive job and the ID allocator know about the archive.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with reservations 600-607 (old and recent
+  closed stays, an old stay that is still open, and an upcoming booking).
+"""
+import sqlite3
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+from id_allocator import SEQUENCES
+from job_scheduler import JobScheduler
+from reservation_archive import ReservationArchive
+
+TODAY = date.today()
+OLD_CLOSED = {600: "Complete", 601: "Cancelled", 602: "Complete", 603: "Cancelled", 604: "Complete"}
+
+
+class TestReservationArchive(HotelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.hotel = HotelManager(self.db)
+
+        stays = [(rid, status, 200 + i * 3) for i, (rid, status) in enumerate(OLD_CLOSED.items())]
+        stays += [(605, "Complete", 10), (606, "Late", 200), (607, "Confirmed", -10)]
+        for rid, status, days_ago in stays:
+            check_out = TODAY - timedelta(days=days_ago)
+            self.insert_reservation(rid, check_out - timedelta(days=2), check_out, status, total_price=216.0)
+
+    def _ids(self, table):
+        return {row[0] for row in self.db.execute_query(f"SELECT reservation_id FROM {table}")}
+
+    def test_moves_only_old_closed_stays_in_chunks(self):
+        seqs = dict(self.db.execute_query("SELECT reservation_id, change_seq FROM reservations"))
+        archive = ReservationArchive(self.db, min_age_days=90, chunk_size=2)
+
+        self.assertEqual(archive.archive_closed(TODAY), len(OLD_CLOSED))
+        self.assertEqual(self._ids("reservations_archive"), set(OLD_CLOSED))
+        self.assertEqual(self._ids("reservations"), {605, 606, 607})
+        self.assertEqual(archive.counts(), {"hot": 3, "archived": 5})
+        for row in self.db.execute_query("SELECT reservation_id, change_seq, archived_at FROM reservations_archive"):
+            self.assertEqual(row["change_seq"], seqs[row["reservation_id"]])
+            self.assertTrue(row["archived_at"])
+
+        self.assertEqual(archive.archive_closed(TODAY), 0)
+        with self.assertRaises(ValueError):
+            ReservationArchive(self.db, chunk_size=0)
+
+    def test_reads_are_unchanged_by_archiving(self):
+        def snapshot():
+            return (
+                sorted(self.db.get_filtered_reservations(show_active=False)),
+                sorted(self.db.get_filtered_reservations(show_active=True)),
+                self.db.get_manager_metrics(),
+                sorted(r["reservation_id"] for r in self.hotel.search_reservation(email="ada@example.com")),
+                sorted(r["reservation_id"] for r in self.db.get_guest_reservations("ADA@example.com")),
+            )
+
+        before = snapshot()
+        self.assertEqual(self.db.archive.archive_closed(TODAY), len(OLD_CLOSED))
+        self.assertEqual(snapshot(), before)
+        self.assertEqual(len(before[3]), 8)
+
+        active = self.hotel.search_reservation(status=["Confirmed", "Late"])
+        self.assertEqual({r["reservation_id"] for r in active}, {606, 607})
+        self.assertEqual([r["reservation_id"] for r in self.hotel.search_reservation(reservation_id=600)], [600])
+
+    def test_search_rows_have_one_shape_for_both_sources(self):
+        # A column only the hot table has (as a later upgrade might add) must not leak into status-filtered rows
+        self.db.execute_query("ALTER TABLE reservations ADD COLUMN notes TEXT")
+        active = self.hotel.search_reservation(status="Confirmed")     # reads reservations
+        everything = self.hotel.search_reservation()                    # reads reservations_all
+        self.assertEqual(active[0].keys(), everything[0].keys())
+        self.assertNotIn("notes", active[0].keys())
+
+    def test_locked_database_error_is_not_masked(self):
+        holder = sqlite3.connect(self.db_path)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            with mock.patch.object(self.db, "connect", lambda raw=False: sqlite3.connect(self.db_path, timeout=0)):
+                with self.assertRaisesRegex(sqlite3.OperationalError, "locked"):
+                    self.db.archive.archive_closed(TODAY)
+        finally:
+            holder.rollback()
+            holder.close()
+        self.assertEqual(self.db.archive.archive_closed(TODAY), len(OLD_CLOSED))
+
+    def test_inactive_delta_keeps_archived_rows(self):
+        seq = self.db.current_change_seq()
+        self.db.archive.archive_closed(TODAY)
+
+        _, rows, removed = self.db.get_filtered_reservation_changes(seq, show_active=False)
+        self.assertEqual({row[0] for row in rows}, set(OLD_CLOSED))
+        self.assertEqual(removed, [])
+        self.assertEqual(set(self.db.changes_since(seq)["deleted"]["reservations"]), set(OLD_CLOSED))
+
+        # A guest rename still reaches archived rows in the inactive list
+        seq = self.db.current_change_seq()
+        self.db.execute_query("UPDATE guests SET last_name = 'Byron' WHERE guest_id = ?", (self.guest_id,))
+        _, rows, _ = self.db.get_filtered_reservation_changes(seq, show_active=False)
+        self.assertEqual({row[0] for row in rows}, set(OLD_CLOSED) | {605})
+        self.assertTrue(all(row[2] == "Ada Byron" for row in rows))
+
+    def test_scheduler_job_and_id_allocator(self):
+        self.assertEqual(JobScheduler(self.db).run_job("archive_closed_reservations", TODAY), "success")
+        self.assertEqual(self._ids("reservations_archive"), set(OLD_CLOSED))
+
+        conn = self.db.connect()
+        try:
+            taken = self.db.id_allocator._existing(conn.cursor(), SEQUENCES["reservations"], [600, 605, 999999])
+        finally:
+            conn.close()
+        self.assertEqual(taken, {600, 605})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Module: test_reserve_room_fast_path.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains integration tests for the single-connection `HotelManager.reserve_room` path. It verifies that
+a booking opens exactly one connection, records a timing for every stage, stores the quoted price, and still
+rejects unknown guests and overlapping stays.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with one Double room and one guest.
+"""
+import unittest
+from datetime import date, timedelta
+
+from hotel_manager import HotelManager
+from hotel_test_case import HotelTestCase
+
+CHECK_IN = (date.today() + timedelta(days=10)).isoformat()
+CHECK_OUT = (date.today() + timedelta(days=12)).isoformat()
+
+
+class TestReserveRoomFastPath(HotelTestCase):
+    ROOMS = ((101, "Double", 2, 100.0, 1),)
+
+    def setUp(self):
+        super().setUp()
+        self.mgr = HotelManager(self.db)
+        # Warm the room inventory and rate calendar so only the booking itself is measured
+        self.mgr.quote_many([self.room_id], CHECK_IN, CHECK_OUT)
+        self.connects = []
+        original = self.db.connect
+        self.db.connect = lambda *a, **k: self.connects.append(a) or original(*a, **k)
+
+    def test_booking_uses_one_connection_and_records_stages(self):
+        reservation_id = self.mgr.reserve_room(self.guest_id, self.room_id, CHECK_IN, CHECK_OUT, num_guests=2)
+        self.assertEqual(len(self.connects), 1)
+        self.assertEqual(
+            list(self.mgr.last_reserve_timings),
+            ["validate", "price", "lock", "overlap", "allocate", "insert", "availability", "commit", "total"],
+        )
+        row = self.db.execute_query("SELECT total_price FROM reservations WHERE reservation_id = ?",
+                                    (reservation_id,))[0]
+        self.assertAlmostEqual(row["total_price"], self.mgr.calculate_total_price(self.room_id, CHECK_IN, CHECK_OUT))
+
+    def test_rejections_release_the_connection(self):
+        with self.assertRaises(ValueError):
+            self.mgr.reserve_room(99999, self.room_id, CHECK_IN, CHECK_OUT)
+        self.assertIn("total", self.mgr.last_reserve_timings)
+        self.assertNotIn("lock", self.mgr.last_reserve_timings)
+
+        self.mgr.reserve_room(self.guest_id, self.room_id, CHECK_IN, CHECK_OUT)
+        with self.assertRaises(ValueError):
+            self.mgr.reserve_room(self.guest_id, self.room_id, CHECK_IN, CHECK_OUT)
+        # The failed attempt rolled back, so the database is not left locked
+        self.db.execute_query("UPDATE guests SET city = 'SF' WHERE guest_id = ?", (self.guest_id,))
+        self.assertEqual(self.db.get_guest(guest_id=self.guest_id)["city"], "SF")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Module: test_room_inventory.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `RoomInventory` (room_inventory.py) and the slotted `Room` model. It verifies the
+snapshot's indexes, that repeated lookups reuse the same snapshot, and that add_room, update_room, HotelManager
+writes and writes from other connections all publish a new snapshot.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with three known rooms and one guest.
+"""
+import sqlite3
+import unittest
+from datetime import date, timedelta
+
+from hotel_manager import HotelManager
+from hotel_models import Room
+from hotel_test_case import HotelTestCase
+
+
+class TestRoomInventory(HotelTestCase):
+    ROOMS = ((101, "Single", 1, 80.0, 1), (102, "Double", 2, 120.0, 1), (201, "Double", 2, 110.0, 0))
+
+    def test_indexes(self):
+        snap = self.db.inventory.snapshot()
+        self.assertEqual(len(snap.rooms), 3)
+        room = snap.get(room_number=102)
+        self.assertIs(snap.get(room_number="102"), room)
+        self.assertIs(snap.get(room_id=room.room_id), room)
+        self.assertEqual([r.room_number for r in snap.of_type("Double")], ["102", "201"])
+        self.assertEqual(snap.of_type("Suite"), ())
+        self.assertEqual(snap.get(room_number=201).out_of_service, 1)
+        with self.assertRaises(TypeError):
+            snap.by_id[999] = room
+
+    def test_lookups_reuse_snapshot(self):
+        first = self.db.inventory.snapshot()
+        room_id = self.db.get_room(room_number=101)["room_id"]
+        self.assertEqual(self.db.get_room_price(room_id), 80.0)
+        self.assertEqual(self.db.get_room_number(room_id), "101")
+        self.assertTrue(self.db.room_exists(room_number=101))
+        self.assertFalse(self.db.room_exists(room_number=999))
+        self.assertIs(self.db.inventory.snapshot(), first)
+
+    def test_add_and_update_room_reload(self):
+        first = self.db.inventory.snapshot()
+        self.db.add_room(301, "Suite", 4, 300.0, 1)
+        self.assertIsNot(self.db.inventory.snapshot(), first)
+        room = self.db.get_room(room_number=301)
+        self.db.update_room(room.room_id, 280.0, 1)
+        self.assertEqual(self.db.get_room_price(room.room_id), 280.0)
+        # The old snapshot object is untouched
+        self.assertIsNone(first.get(room_number=301))
+
+    def test_external_write_reloads(self):
+        room_id = self.db.get_room(room_number=101).room_id
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("UPDATE rooms SET price = 90.0 WHERE room_id = ?", (room_id,))
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.db.get_room_price(room_id), 90.0)
+
+    def test_booking_that_leaves_flags_alone_keeps_snapshot(self):
+        first = self.db.inventory.snapshot()
+        check_in = date.today() + timedelta(days=10)
+        HotelManager(self.db).reserve_room(self.guest_id, self.room_id, check_in.isoformat(),
+                                           (check_in + timedelta(days=2)).isoformat(), 1)
+        self.assertEqual(self.db.refresh_room_availability(), 0)
+        self.assertIs(self.db.inventory.snapshot(), first)
+
+    def test_missing_room_price_raises(self):
+        with self.assertRaises(ValueError):
+            self.db.get_room_price(99999)
+        with self.assertRaises(ValueError):
+            self.db.get_room()
+
+
+class TestRoomModel(unittest.TestCase):
+
+    def test_room_is_slotted_and_row_compatible(self):
+        room = Room(1, 101, "Single", 1, 80.0, 1, smoking=1)
+        self.assertFalse(hasattr(room, "__dict__"))
+        self.assertEqual(room["capacity"], 1)
+        self.assertEqual(room["smoking"], 1)
+        self.assertIn("out_of_service", room.keys())
+        with self.assertRaises(KeyError):
+            room["missing"]
+
+
+if __name__ == "__main__":
+    unittest.main()
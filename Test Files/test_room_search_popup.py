@@ -0,0 +1,77 @@
+"""
+Module: test_room_search_popup.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for the sortable columns of `room_search_popup.py`. It verifies that the stay total
+column sorts on the quoted amount rather than its "$1,234.50" text, and that a room without a quote (an empty
+cell) sorts after every priced room in both directions instead of raising inside the Tk callback.
+
+Important Data Structures:
+- FakeTree: Holds the rows and order the popup gives its Treeview, so the tests run without a display.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Single Screen Prototype"))
+from hotel_models import PriceQuote  # noqa: E402
+from room_search_popup import RoomSearchPopup  # noqa: E402
+
+COLUMNS = ("room_number", "capacity", "price", "total", "smoking")
+
+
+class FakeTree:
+
+    def __init__(self):
+        self.children = []
+        self.values = {}
+        self.headings = {}
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.children.append(iid)
+        self.values[iid] = dict(zip(COLUMNS, values))
+
+    def set(self, iid, col):
+        return self.values[iid][col]
+
+    def get_children(self, item=""):
+        return tuple(self.children)
+
+    def move(self, iid, parent, index):
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def heading(self, col, command=None):
+        self.headings[col] = command
+
+
+def quote(room_id, total):
+    return PriceQuote(room_id, str(room_id), "2026-11-01", "2026-11-03", (), total, 0.0, total)
+
+
+class TestRoomSearchPopupSort(unittest.TestCase):
+
+    def setUp(self):
+        self.popup = RoomSearchPopup.__new__(RoomSearchPopup)
+        self.popup.tree = FakeTree()
+        self.popup._totals = {}
+        results = [(1, 101, 2, 120.0, 0), (2, 102, 2, 95.0, 0), (3, 103, 4, 300.0, 1), (4, 104, 2, 80.0, 0)]
+        # Room 3 has no quote, so its total cell is empty; 1,150.00 sorts after 950.00 only as a number
+        self.popup._show_results((results, {1: quote(1, 1150.0), 2: quote(2, 950.0), 4: quote(4, 205.5)}))
+
+    def test_total_sorts_numerically_with_unpriced_rooms_last(self):
+        self.popup.sort_column("total", False)
+        self.assertEqual(self.popup.tree.children, ["4", "2", "1", "3"])
+        self.popup.tree.headings["total"]()  # second click sorts descending
+        self.assertEqual(self.popup.tree.children, ["1", "2", "4", "3"])
+        self.assertEqual(self.popup.tree.set("3", "total"), "")
+
+    def test_price_column_still_sorts_on_text_value(self):
+        self.popup.sort_column("price", True)
+        self.assertEqual(self.popup.tree.children, ["3", "1", "2", "4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
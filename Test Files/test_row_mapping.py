@@ -0,0 +1,107 @@
+"""
+Module: test_row_mapping.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `row_mapping.py`. It verifies that records returned by DatabaseManager support the
+access styles the old sqlite3.Row/tuple/dict results supported, that the typed record classes are picked from the
+column names, that records cost no more memory than tuples, and that raw mode and the SQL-formatted
+get_filtered_reservations rows are plain tuples.
+
+Important Data Structures:
+- Temporary Database: HotelTestCase's database (hotel_test_case.py) with two rooms, a guest and a reservation.
+"""
+import sqlite3
+import sys
+import unittest
+from datetime import date, timedelta
+
+from hotel_test_case import HotelTestCase
+from row_mapping import (GuestRecord, Record, ReservationRecord, ReservationViewRecord, RoomRecord,
+                         record_class, record_factory)
+
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = record_factory
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_access_styles(self):
+        row = self.conn.execute("SELECT 1 AS room_id, '101' AS room_number, 'Single' AS room_type").fetchone()
+        self.assertIsInstance(row, RoomRecord)
+        self.assertEqual(row[0], 1)
+        self.assertEqual(row["room_number"], "101")
+        self.assertEqual(row["ROOM_TYPE"], "Single")
+        self.assertEqual(row.room_type, "Single")
+        self.assertEqual(row, (1, "101", "Single"))
+        room_id, number, room_type = row
+        self.assertEqual(dict(row), {"room_id": 1, "room_number": "101", "room_type": "Single"})
+        self.assertEqual(row.keys(), ["room_id", "room_number", "room_type"])
+        self.assertIsNone(row.get("missing"))
+        with self.assertRaises(IndexError):
+            row["missing"]
+
+    def test_record_memory_matches_tuple(self):
+        row = self.conn.execute("SELECT 1 AS a, 2 AS b, 3 AS c").fetchone()
+        self.assertFalse(hasattr(row, "__dict__"))
+        self.assertEqual(sys.getsizeof(row), sys.getsizeof((1, 2, 3)))
+
+    def test_typed_classes(self):
+        self.assertTrue(issubclass(record_class(("guest_id", "first_name", "last_name", "email")), GuestRecord))
+        self.assertTrue(issubclass(record_class(("reservation_id", "guest_id", "room_id",
+                                                 "check_in_date", "check_out_date")), ReservationRecord))
+        self.assertTrue(issubclass(record_class(("reservation_id", "check_in_date", "check_out_date",
+                                                 "first_name", "room_number")), ReservationViewRecord))
+        self.assertIs(record_class(("count",)).__mro__[1], Record)
+        # Columns that clash with tuple methods stay reachable by key
+        row = self.conn.execute("SELECT 5 AS count").fetchone()
+        self.assertEqual(row["count"], 5)
+        self.assertEqual(row.count(5), 1)
+
+    def test_duplicate_columns_resolve_to_first(self):
+        row = self.conn.execute("SELECT 1 AS id, 2 AS id").fetchone()
+        self.assertEqual(row["id"], 1)
+
+
+class TestDatabaseManagerRows(HotelTestCase):
+    ROOMS = ((101, "Single", 1, 80.0, 1), (102, "Double", 2, 120.0, 1))
+    GUEST = ("Alice", "Smith", "alice@example.com", "1 Main St", "LA", "CA", "90001")
+
+    def setUp(self):
+        super().setUp()
+        today = date.today()
+        self.insert_reservation(123456, today, today + timedelta(days=2), total_price=160.5, is_paid=1)
+
+    def test_guest_record(self):
+        guest = self.db.get_guest(email="alice@example.com")
+        self.assertIsInstance(guest, GuestRecord)
+        self.assertEqual(guest["first_name"], "Alice")
+
+    def test_raw_mode_returns_tuples(self):
+        conn = self.db.connect(raw=True)
+        try:
+            row = conn.execute("SELECT room_id FROM rooms").fetchone()
+        finally:
+            conn.close()
+        self.assertIs(type(row), tuple)
+
+    def test_filtered_reservations_formatted_in_sql(self):
+        rows = self.db.get_filtered_reservations()
+        self.assertEqual(rows, [(123456, self.guest_id, "Alice Smith", self.room_id, "101",
+                                 rows[0][5], rows[0][6], "160.50", "Yes", "Confirmed")])
+        self.assertIs(type(rows[0]), tuple)
+
+    def test_all_rooms_status(self):
+        statuses = {str(r["room_number"]): r for r in self.db.get_all_rooms_status(date.today().isoformat())}
+        self.assertFalse(statuses["101"]["is_available"])
+        self.assertTrue(statuses["102"]["is_available"])
+        self.assertIsInstance(statuses["102"], RoomRecord)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+"""
+Module: test_statement_budgets.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module holds every public DatabaseManager and HotelManager method to an explicit statement budget (see
+statement_budget.py). The test hotel has enough rooms, guests and reservations in every state that a query
+issued per row (an N+1 pattern such as a SELECT followed by one UPDATE per reservation) goes over budget. A new
+public method fails test_every_public_method_has_a_budget until it is given a budget here.
+
+Budgets count every statement the method runs, including the implicit BEGIN and COMMIT issued by the sqlite3
+module. The @cached read methods are measured with an empty QueryCache, and the room inventory and rate calendar
+are loaded before measuring (they are built once and reused by every later call).
+
+Important Data Structures:
+- DB_BUDGETS / MANAGER_BUDGETS: method name -> maximum statements for the call made in the matching test.
+- NOT_BUDGETED: Setup/plumbing methods that are not part of the per-request data path.
+- Temporary Database: 12 rooms, 6 guests, and reservations that are upcoming, in-house, due out today, late
+  arrivals and cancelled.
+"""
+import inspect
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+
+from database_manager import DatabaseManager
+from hotel_manager import HotelManager
+from statement_budget import assert_statement_budget, count_statements
+
+TODAY = date.today()
+
+DB_BUDGETS = {
+    "add_guest": 3,
+    "get_guest": 1,
+    "guest_exists": 1,
+    "add_room": 3,
+    "get_room": 0,
+    "room_exists": 0,
+    "get_room_price": 0,
+    "get_room_number": 0,
+    "get_rooms_filtered": 1,
+    "update_room": 5,
+    "update_room_availability_today": 4,
+    "refresh_room_availability": 4,           # stale-room SELECT, then BEGIN, UPDATE, COMMIT
+    "reservation_exists": 1,
+    "validate_reservation_exists": 1,
+    "get_guest_reservations": 1,
+    "get_all_rooms_status": 1,
+    "cancel_reservation": 4,
+    "update_reservation": 3,
+    "execute_query": 1,
+    "is_room_available": 2,
+    "get_available_rooms": 1,
+    "get_filtered_reservations": 1,
+    "current_change_seq": 1,
+    "changes_since": 7,                         # BEGIN, watermark, one per table, tombstones, COMMIT
+    "get_filtered_reservation_changes": 6,
+    "search_employees": 1,
+    "load_all_employees": 1,
+    "get_employee_details": 1,
+    "create_employee": 3,
+    "update_employee": 3,
+    "delete_employee": 3,
+    "generate_unique_employee_id": 7,
+    "run_daily_reservation_updates": 4,
+    "mark_late_reservations": 3,
+    "mark_late_checkouts": 3,
+    "cancel_expired_late_reservations": 1,      # plus one HotelManager.cancel_reservation per expired booking
+    "get_manager_metrics": 16,
+}
+
+MANAGER_BUDGETS = {
+    "search_rooms": 1,
+    "calculate_total_price": 0,
+    "quote_many": 0,
+    "reserve_room": 10,
+    "cancel_reservation": 6,
+    "update_reservation": 8,
+    "search_reservation": 1,
+    "check_in_reservation": 4,
+    "check_out_reservation": 6,
+}
+
+NOT_BUDGETED = {"connect", "create_if_missing", "apply_schema_upgrades"}
+
+
+def _iso(days):
+    return (TODAY + timedelta(days=days)).isoformat()
+
+
+def _public_methods(cls):
+    return {name for name, member in inspect.getmembers(cls, inspect.isfunction) if not name.startswith("_")}
+
+
+class TestStatementBudgets(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.remove(self.db_path)
+        self.db = DatabaseManager(self.db_path)
+        self.db.execute_query("DELETE FROM reservations")
+        self.db.execute_query("DELETE FROM rooms")
+        self.db.execute_query("DELETE FROM guests")
+        self.mgr = HotelManager(self.db)
+        self.db.hotel_manager = self.mgr
+
+        for n in range(12):
+            self.db.add_room(101 + n, "Double" if n % 2 else "Single", 2, 100.0 + n, 1)
+        self.room_ids = [r.room_id for r in self.db.inventory.snapshot().rooms]
+        self.guest_ids = [
+            self.db.add_guest(f"Guest{n}", "Budget", f"guest{n}@example.com", "1 Main St", "Springfield", "CA",
+                              "90001")
+            for n in range(6)
+        ]
+
+        # Every room gets several reservations in different states, so per-row work shows up in the counts
+        rows = []
+        for i, room_id in enumerate(self.room_ids):
+            guest_id = self.guest_ids[i % len(self.guest_ids)]
+            rows += [
+                (guest_id, room_id, _iso(-3), _iso(0), "Checked-in"),     # due out today
+                (guest_id, room_id, _iso(-1), _iso(2) if i % 2 else _iso(0), "Confirmed"),  # arrived yesterday
+                (guest_id, room_id, _iso(10), _iso(12), "Confirmed"),     # upcoming
+                (guest_id, room_id, _iso(20), _iso(22), "Cancelled"),
+                (guest_id, room_id, _iso(0), _iso(1), "Late"),           # late arrival, not yet expired
+            ]
+        conn = self.db.connect()
+        for guest_id, room_id, ci, co, status in rows:
+            reservation_id = self.db.id_allocator.allocate("reservations", conn=conn)
+            conn.execute(
+                "INSERT INTO reservations (reservation_id, guest_id, room_id, check_in_date, check_out_date, "
+                "num_guests, total_price, status) VALUES (?, ?, ?, ?, ?, 1, 200.0, ?)",
+                (reservation_id, guest_id, room_id, ci, co, status),
+            )
+        conn.commit()
+        conn.close()
+
+        self.upcoming_id = self._reservation_id(_iso(10), "Confirmed")
+        self.arrival_id = self._reservation_id(_iso(-1), "Confirmed")
+        self.in_house_id = self._reservation_id(_iso(-3), "Checked-in")
+
+        # Built once per DatabaseManager and reused afterwards; keep them out of the per-call counts
+        self.db.inventory.snapshot()
+        self.mgr.quote_many(self.room_ids, _iso(30), _iso(31))
+        self.db.cache.clear()
+
+    def tearDown(self):
+        self.db.cache.close()
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+    def _reservation_id(self, check_in, status):
+        return self.db.execute_query(
+            "SELECT MIN(reservation_id) AS r FROM reservations WHERE check_in_date = ? AND status = ?",
+            (check_in, status),
+        )[0]["r"]
+
+    def _db(self, method, *args, **kwargs):
+        return assert_statement_budget(self, self.db, DB_BUDGETS[method], getattr(self.db, method),
+                                       *args, **kwargs)
+
+    def _mgr(self, method, *args, **kwargs):
+        return assert_statement_budget(self, self.db, MANAGER_BUDGETS[method], getattr(self.mgr, method),
+                                       *args, **kwargs)
+
+    # ---------------------------------------------------
+    # Coverage of the budget tables
+    # ---------------------------------------------------
+    def test_every_public_method_has_a_budget(self):
+        self.assertEqual(_public_methods(DatabaseManager) - NOT_BUDGETED, set(DB_BUDGETS))
+        self.assertEqual(_public_methods(HotelManager), set(MANAGER_BUDGETS))
+
+    def test_counter_sees_each_statement(self):
+        with count_statements(self.db) as statements:
+            self.db.execute_query("SELECT 1")
+            self.db.execute_query("SELECT 2")
+        self.assertEqual(len(statements), 2)
+
+    # ---------------------------------------------------
+    # DatabaseManager: guests and rooms
+    # ---------------------------------------------------
+    def test_guest_methods(self):
+        self._db("add_guest", "New", "Guest", "new@example.com", "2 Main St", "Springfield", "CA", "90001")
+        self.assertIsNotNone(self._db("get_guest", guest_id=self.guest_ids[0]))
+        self.assertTrue(self._db("guest_exists", email="guest1@example.com"))
+        self._db("get_guest_reservations", "guest1@example.com")
+
+    def test_room_methods(self):
+        self._db("add_room", 999, "Suite", 4, 300.0, 1)
+        self.db.inventory.snapshot()
+        self.assertIsNotNone(self._db("get_room", room_number=101))
+        self.assertTrue(self._db("room_exists", room_id=self.room_ids[0]))
+        self._db("get_room_price", self.room_ids[0])
+        self._db("get_room_number", self.room_ids[0])
+        self.assertEqual(len(self._db("get_rooms_filtered")), 13)
+        self._db("update_room", self.room_ids[0], 120.0, True)
+        self._db("update_room_availability_today")
+        self._db("refresh_room_availability", self.room_ids)
+        self.assertEqual(len(self._db("get_all_rooms_status", TODAY.isoformat())), 13)
+        self.assertTrue(self._db("is_room_available", 999, _iso(40), _iso(42)))
+        self._db("get_available_rooms", TODAY + timedelta(days=40), TODAY + timedelta(days=42), 1, 1)
+
+    # ---------------------------------------------------
+    # DatabaseManager: reservations
+    # ---------------------------------------------------
+    def test_reservation_methods(self):
+        self.assertTrue(self._db("reservation_exists", self.upcoming_id))
+        self.assertTrue(self._db("validate_reservation_exists", self.upcoming_id))
+        self.assertTrue(self._db("get_filtered_reservations", show_active=False))
+        self._db("execute_query", "SELECT COUNT(*) FROM reservations")
+        self._db("update_reservation", self.upcoming_id, _iso(10), _iso(13), 300.0, "Confirmed")
+        guest_id = self.db.execute_query("SELECT guest_id FROM reservations WHERE reservation_id = ?",
+                                         (self.upcoming_id,))[0][0]
+        self.assertTrue(self._db("cancel_reservation", self.upcoming_id, guest_id))
+
+    def test_change_tracking_methods(self):
+        seq = self._db("current_change_seq")
+        self.db.execute_query("UPDATE rooms SET price = 150.0 WHERE room_id = ?", (self.room_ids[0],))
+        changes = self._db("changes_since", seq)
+        self.assertEqual(len(changes["changed"]["rooms"]), 1)
+        # Every reservation in the changed room comes back in one query, not one per row
+        watermark, rows, removed = self._db("get_filtered_reservation_changes", seq)
+        self.assertEqual(len(rows), 4)       # Checked-in, Confirmed x2, Late
+        self.assertEqual(len(removed), 1)    # Cancelled does not match show_active
+
+    def test_daily_updates_do_not_scale_with_rows(self):
+        now = datetime.combine(TODAY, datetime.min.time()).replace(hour=15)
+        # Only the not-yet-expired 'Late' arrivals exist at this point
+        self._db("cancel_expired_late_reservations", now)
+        self._db("mark_late_reservations", TODAY)
+        self._db("mark_late_checkouts", now)
+        late_checkouts = self.db.execute_query(
+            "SELECT COUNT(*) FROM reservations WHERE status = 'Late Check-out'")[0][0]
+        self.assertEqual(late_checkouts, 12)
+
+    def test_expired_cancellations_cost_one_cancel_each(self):
+        now = datetime.combine(TODAY, datetime.min.time()).replace(hour=15)
+        self.db.mark_late_reservations(TODAY)
+        expired = self.db.execute_query("SELECT COUNT(*) FROM reservations WHERE status = 'Late' "
+                                        "AND check_in_date = ?", (_iso(-1),))[0][0]
+        budget = DB_BUDGETS["cancel_expired_late_reservations"] + expired * MANAGER_BUDGETS["cancel_reservation"]
+        assert_statement_budget(self, self.db, budget, self.db.cancel_expired_late_reservations, now)
+        still_late = self.db.execute_query("SELECT COUNT(*) FROM reservations WHERE status = 'Late' "
+                                           "AND check_in_date = ?", (_iso(-1),))[0][0]
+        self.assertEqual(still_late, 0)
+
+    def test_daily_run_before_noon(self):
+        self._db("run_daily_reservation_updates", datetime.combine(TODAY, datetime.min.time()).replace(hour=11))
+
+    def test_manager_metrics(self):
+        self._db("get_manager_metrics")
+
+    # ---------------------------------------------------
+    # DatabaseManager: employees
+    # ---------------------------------------------------
+    def test_employee_methods(self):
+        employee_id = self._db("generate_unique_employee_id")
+        self.assertTrue(self._db("create_employee", employee_id, "pw", "Ann", "Lee", "Employee",
+                                 "555-0100", "1 Main St", None, "Springfield", "CA", "90001"))
+        self.assertTrue(self._db("update_employee", employee_id, "pw2", "Ann", "Lee", "Manager",
+                                 "555-0100", "1 Main St", None, "Springfield", "CA", "90001"))
+        self._db("search_employees", name="Ann")
+        self._db("load_all_employees")
+        self.assertIsNotNone(self._db("get_employee_details", employee_id))
+        self.assertTrue(self._db("delete_employee", employee_id))
+
+    # ---------------------------------------------------
+    # HotelManager
+    # ---------------------------------------------------
+    def test_manager_reads(self):
+        self.assertEqual(len(self._mgr("search_rooms", check_in=_iso(40), check_out=_iso(42))), 12)
+        self._mgr("search_reservation", last_name="Budget")
+        self.assertEqual(len(self._mgr("quote_many", self.room_ids, _iso(30), _iso(31))), 12)
+        self._mgr("calculate_total_price", self.room_ids[0], _iso(30), _iso(31))
+
+    def test_manager_writes(self):
+        reservation_id = self._mgr("reserve_room", self.guest_ids[0], self.room_ids[0], _iso(40), _iso(42), 1)
+        self._mgr("update_reservation", reservation_id, new_check_in=_iso(41), new_check_out=_iso(44))
+        self._mgr("cancel_reservation", reservation_id)
+        self._mgr("check_in_reservation", self.arrival_id, confirm_payment=True)
+        self._mgr("check_out_reservation", self.in_house_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
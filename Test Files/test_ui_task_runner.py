@@ -0,0 +1,155 @@
+"""
+Module: test_ui_task_runner.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `ui_task_runner.py`. It verifies that background work runs off the calling thread
+and that its result is delivered through after() on the calling thread, that a newer load under the same key
+supersedes an older one, that errors reach on_error, that results for destroyed widgets are dropped, and that the
+loading indicator is shown and hidden around each task.
+
+Important Data Structures:
+- FakeWidget: Stands in for a Tk widget (no display is needed). after() queues callbacks, which the test runs with
+  pump(), the same way Tk's event loop would run them on the main thread.
+- FakeIndicator: Counts show()/hide() calls in place of LoadingIndicator.
+"""
+import threading
+import time
+import unittest
+
+from ui_task_runner import UITaskRunner
+
+
+class FakeWidget:
+
+    def __init__(self):
+        self.scheduled = []
+        self.alive = True
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def winfo_exists(self):
+        return self.alive
+
+
+class FakeIndicator:
+
+    def __init__(self):
+        self.shown = 0
+        self.hidden = 0
+
+    def show(self):
+        self.shown += 1
+
+    def hide(self):
+        self.hidden += 1
+
+
+class TestUITaskRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = UITaskRunner(max_workers=2)
+        self.widget = FakeWidget()
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+
+    def pump(self, timeout=5.0):
+        """Run scheduled after() callbacks until the poll loop stops."""
+        deadline = time.monotonic() + timeout
+        while self.widget.scheduled:
+            self.assertLess(time.monotonic(), deadline, "poll loop did not finish")
+            callback = self.widget.scheduled.pop(0)
+            callback()
+            time.sleep(0.005)
+
+    def test_result_delivered_on_calling_thread(self):
+        seen = {}
+
+        def work(a, b=0):
+            seen["worker"] = threading.get_ident()
+            return a + b
+
+        def done(result):
+            seen["result"] = result
+            seen["callback"] = threading.get_ident()
+
+        self.runner.submit(self.widget, work, 2, b=3, on_success=done)
+        self.assertNotIn("result", seen)
+        self.pump()
+        self.assertEqual(seen["result"], 5)
+        self.assertEqual(seen["callback"], threading.get_ident())
+        self.assertNotEqual(seen["worker"], threading.get_ident())
+
+    def test_newer_load_supersedes_older(self):
+        release = threading.Event()
+        results = []
+
+        def slow():
+            release.wait(5)
+            return "old"
+
+        first = self.runner.submit(self.widget, slow, key="load", on_success=results.append)
+        self.runner.submit(self.widget, lambda: "new", key="load", on_success=results.append)
+        # A different key is independent
+        self.runner.submit(self.widget, lambda: "other", key="other", on_success=results.append)
+        release.set()
+        self.pump()
+        self.assertTrue(first.cancelled)
+        self.assertEqual(sorted(results), ["new", "other"])
+
+    def test_queued_task_is_not_run_once_superseded(self):
+        release = threading.Event()
+        ran = []
+        # Occupy both workers so the next task waits in the queue
+        for _ in range(2):
+            self.runner.submit(self.widget, release.wait, 5)
+        self.runner.submit(self.widget, lambda: ran.append("stale"), key="load")
+        self.runner.submit(self.widget, lambda: ran.append("fresh"), key="load")
+        release.set()
+        self.pump()
+        self.assertEqual(ran, ["fresh"])
+
+    def test_error_goes_to_on_error(self):
+        errors, results = [], []
+
+        def broken():
+            raise ValueError("no such room")
+
+        self.runner.submit(self.widget, broken, on_success=results.append, on_error=errors.append)
+        self.pump()
+        self.assertEqual(results, [])
+        self.assertIsInstance(errors[0], ValueError)
+
+    def test_destroyed_owner_gets_no_callback(self):
+        indicator = FakeIndicator()
+        results = []
+        owner = FakeWidget()
+        release = threading.Event()
+
+        def work():
+            release.wait(5)
+            return 1
+
+        # Poll on self.widget (the "root") while the owner, like a popup, is closed mid-load
+        owner._root = lambda: self.widget
+        self.runner.submit(owner, work, on_success=results.append, indicator=indicator)
+        owner.alive = False
+        release.set()
+        self.pump()
+        self.assertEqual(results, [])
+        self.assertEqual((indicator.shown, indicator.hidden), (1, 1))
+
+    def test_indicator_wraps_each_task(self):
+        indicator = FakeIndicator()
+        self.runner.submit(self.widget, lambda: 1, key="a", indicator=indicator)
+        self.runner.submit(self.widget, lambda: 2, key="a", indicator=indicator)
+        self.assertEqual(indicator.shown, 2)
+        self.pump()
+        self.assertEqual(indicator.hidden, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+Module: test_virtual_table.py
+Date: 10/19/2026
+Programmer(s): Keano
+
+Brief Description:
+This module contains tests for `virtual_table.py`. It verifies that only the visible window of a large row set
+becomes Treeview items, that scrolling recycles items instead of inserting new ones, that set_rows() reports a
+keyed diff and touches only the visible items whose rows changed, that the selection follows its row while
+items are recycled, and that Up/Down at the edge of the window scroll by one row and move the cursor with it.
+
+Important Data Structures:
+- FakeTree: Records the Treeview calls VirtualTable makes (insert, item, move, detach, delete, selection) so the
+  tests run without a display, and counts inserts and value updates.
+- FakeScrollbar: Records the (first, last) fractions the table reports.
+"""
+import unittest
+
+from virtual_table import VirtualTable
+
+
+class FakeTree:
+
+    def __init__(self, height=10):
+        self.height = height
+        self.children = []
+        self.values = {}
+        self.tags = {}
+        self.selected = []
+        self.focused = ""
+        self.bindings = {}
+        self.inserts = 0
+        self.updates = 0
+        self._next = 0
+
+    def cget(self, option):
+        return {"height": self.height}[option]
+
+    def configure(self, **options):
+        pass
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def insert(self, parent, index, **options):
+        self._next += 1
+        self.inserts += 1
+        iid = f"I{self._next:03d}"
+        self.children.append(iid)
+        self.values[iid] = ()
+        return iid
+
+    def item(self, iid, values=None, tags=None):
+        self.updates += 1
+        self.values[iid] = tuple(values)
+        self.tags[iid] = tuple(tags)
+
+    def move(self, iid, parent, index):
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def detach(self, iid):
+        self.children.remove(iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            if iid in self.children:
+                self.children.remove(iid)
+            del self.values[iid]
+
+    def get_children(self, item=""):
+        return tuple(self.children)
+
+    def selection(self):
+        return tuple(self.selected)
+
+    def selection_set(self, items):
+        self.selected = list(items)
+
+    def focus(self, item=None):
+        if item is None:
+            return self.focused
+        self.focused = item
+
+    def shown(self):
+        return [self.values[iid] for iid in self.children]
+
+
+class FakeScrollbar:
+
+    def __init__(self):
+        self.command = None
+        self.fraction = None
+
+    def configure(self, command=None):
+        self.command = command
+
+    def set(self, first, last):
+        self.fraction = (first, last)
+
+
+def make_rows(count, status="Booked"):
+    return [(i, f"Guest {i}", status) for i in range(1, count + 1)]
+
+
+class TestVirtualTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = FakeTree(height=10)
+        self.scrollbar = FakeScrollbar()
+        self.table = VirtualTable(self.tree, key=lambda row: row[0], scrollbar=self.scrollbar)
+
+    def test_only_visible_rows_are_materialized(self):
+        self.table.set_rows(make_rows(50_000))
+        self.assertEqual(self.tree.inserts, 10)
+        self.assertEqual(self.tree.shown(), make_rows(10))
+        self.assertEqual(self.scrollbar.fraction, (0.0, 10 / 50_000))
+
+    def test_scrolling_recycles_items(self):
+        rows = make_rows(1000)
+        self.table.set_rows(rows)
+        self.tree.updates = 0
+
+        self.scrollbar.command("scroll", 3, "units")
+        self.assertEqual(self.tree.shown(), rows[3:13])
+        self.assertEqual(self.tree.updates, 3)  # seven items kept their rows
+
+        self.scrollbar.command("moveto", "0.5")
+        self.assertEqual(self.tree.shown(), rows[500:510])
+        self.scrollbar.command("scroll", 1, "pages")
+        self.assertEqual(self.tree.shown(), rows[510:520])
+        self.table.scroll_to(999)
+        self.assertEqual(self.tree.shown(), rows[990:1000])
+        self.scrollbar.command("scroll", 5, "units")  # clamped at the end
+        self.assertEqual(self.tree.shown(), rows[990:1000])
+        self.assertEqual(self.tree.inserts, 10)
+
+    def test_refresh_applies_keyed_diff(self):
+        rows = make_rows(100)
+        self.table.set_rows(rows)
+        self.scrollbar.command("scroll", 20, "units")
+        self.tree.updates = 0
+
+        refreshed = [row for row in rows if row[0] != 50]
+        refreshed[21] = (22, "Guest 22", "Checked-in")
+        refreshed.append((101, "Guest 101", "Booked"))
+        diff = self.table.set_rows(refreshed)
+
+        self.assertEqual((diff.added, diff.changed, diff.removed), ((101,), (22,), (50,)))
+        # The top row stays in place; only the changed visible row is rewritten
+        self.assertEqual(self.tree.shown(), refreshed[20:30])
+        self.assertEqual(self.tree.updates, 1)
+        self.assertFalse(self.table.set_rows(refreshed))
+
+    def test_sort_moves_to_top_and_shrinking_detaches_items(self):
+        self.table.set_rows(make_rows(100))
+        self.scrollbar.command("scroll", 40, "units")
+        self.table.set_rows(list(reversed(make_rows(100))), keep_position=False)
+        self.assertEqual(self.table.offset, 0)
+        self.assertEqual(self.tree.shown()[0], (100, "Guest 100", "Booked"))
+
+        self.table.set_rows(make_rows(3))
+        self.assertEqual(self.tree.shown(), make_rows(3))
+        self.table.set_rows(make_rows(10))
+        self.assertEqual(self.tree.inserts, 10)  # detached items were reused
+
+    def test_selection_follows_row(self):
+        rows = make_rows(100)
+        self.table.set_rows(rows)
+        self.tree.selection_set([self.tree.children[2]])
+        self.tree.bindings["<<TreeviewSelect>>"]()
+        self.assertEqual(self.table.selected_rows(), [rows[2]])
+
+        self.scrollbar.command("scroll", 50, "units")
+        self.assertEqual(self.tree.selection(), ())
+        self.tree.bindings["<<TreeviewSelect>>"]()
+        self.assertEqual(self.table.selected_rows(), [rows[2]])
+
+        self.scrollbar.command("moveto", "0")
+        self.assertEqual([self.table.row_for(i) for i in self.tree.selection()], [rows[2]])
+
+    def test_arrow_keys_move_past_the_window_edge(self):
+        rows = make_rows(100)
+        self.table.set_rows(rows)
+        self.tree.focus(self.tree.children[-1])
+        for expected in (rows[10], rows[11]):
+            self.assertEqual(self.tree.bindings["<Down>"](None), "break")
+            focus = self.tree.focus()
+            self.assertEqual(self.table.row_for(focus), expected)
+            self.assertEqual(focus, self.tree.children[-1])
+            self.assertEqual([self.table.row_for(i) for i in self.tree.selection()], [expected])
+        self.assertEqual(self.table.selected_rows(), [rows[11]])
+
+        # Inside the window the Treeview moves the focus itself
+        self.tree.focus(self.tree.children[1])
+        self.assertIsNone(self.tree.bindings["<Up>"](None))
+        self.tree.focus(self.tree.children[0])
+        self.assertEqual(self.tree.bindings["<Up>"](None), "break")
+        self.assertEqual(self.table.row_for(self.tree.focus()), rows[1])
+        self.assertEqual(self.tree.focus(), self.tree.children[0])
+        self.assertEqual(self.table.selected_rows(), [rows[1]])
+
+    def test_duplicate_keys_rejected(self):
+        with self.assertRaises(ValueError):
+            self.table.set_rows([(1, "a", "Booked"), (1, "b", "Booked")])
+
+
+if __name__ == "__main__":
+    unittest.main()
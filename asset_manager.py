@@ -0,0 +1,210 @@
+"""
+Module: asset_manager.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module loads the UI's images (hotel map, logo, backgrounds) once and shares them between screens. Paths are
+resolved against the Images folder next to the GUI, not the working directory. Each scaled size is kept in memory
+after the first resize, and is also saved as a pre-scaled file under Images/.scaled. A later run then skips both
+the decode of the full-size image and the LANCZOS resize. Tk PhotoImage objects are cached too, so opening a
+popup again reuses the image it showed last time and opens immediately.
+
+Usage:
+    assets = get_assets()
+    self.map_image = assets.photo("Hotel_Map.png", (550, 800), master=self)
+    assets.preload([("Hotel_Map.png", (550, 800))])        # warm the cache off the Tk thread at startup
+
+Important Functions:
+- AssetManager.path(name): Absolute path of an asset (FileNotFoundError if missing).
+- AssetManager.image(name, size=None): The Pillow image, scaled to size (width, height) when given. Thread-safe.
+- AssetManager.photo(name, size=None, master=None): A shared PhotoImage for the image. Tk thread only.
+  Without Pillow, PNG/GIF files are still shown, shrunk by Tk's integer subsample to fit size (Tk cannot
+  read JPEG data).
+- AssetManager.preload(requests): Load and scale (name, size) pairs on a background thread.
+  Output: the started threading.Thread (None without Pillow).
+- AssetManager.clear(): Drop the in-memory caches (pre-scaled files stay on disk).
+- get_assets(): The AssetManager shared by every screen (created on first use).
+
+Important Data Structures:
+- _images (dict): (name, size or None) -> Pillow image, decoded and scaled at most once per process.
+- _photos (dict): (name, size or None) -> PhotoImage handed out to widgets. Callers must keep a reference, as
+  with any PhotoImage; the cache keeps one too, so a shared image is never garbage collected while shown.
+- stats (dict): Counts of file decodes, resizes and pre-scaled files reused, for tests and tuning.
+
+Algorithms:
+- Pre-scaled files are named <stem>_<width>x<height><ext> and are used only when they are newer than the source
+  image, so replacing an image in Images/ invalidates its scaled copies. They keep the source's format (JPEG at
+  quality 95) and are written to a temporary file and
+  renamed into place, so a reader never sees half a file. If the folder is not writable, the cache stays in
+  memory only.
+- Pillow is imported on first use (_load_pil), so importing this module costs nothing at app startup.
+"""
+import math
+import os
+import threading
+import tkinter as tk
+
+Image = ImageTk = None
+_pil_checked = False
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Single Screen Prototype", "Images")
+
+
+def _load_pil():
+    """Import Pillow on first use rather than at startup. Returns False when it is not installed."""
+    global Image, ImageTk, _pil_checked
+    if not _pil_checked:
+        try:
+            from PIL import Image, ImageTk
+        except ImportError:  # Pillow is optional; without it images are shown unscaled (or subsampled)
+            pass
+        _pil_checked = True
+    return Image is not None
+
+
+class AssetManager:
+
+    def __init__(self, asset_dir=ASSET_DIR, cache_dir=None, persist=True):
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir or os.path.join(asset_dir, ".scaled")
+        self.persist = persist
+        self.stats = {"decoded": 0, "scaled": 0, "prescaled_reused": 0}
+        self._images = {}
+        self._photos = {}
+        self._lock = threading.RLock()
+
+    # ---------------------------------------------------
+    # Paths
+    # ---------------------------------------------------
+    def path(self, name):
+        path = os.path.join(self.asset_dir, name)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Asset not found: {path}")
+        return path
+
+    def scaled_path(self, name, size):
+        stem, ext = os.path.splitext(name)
+        return os.path.join(self.cache_dir, f"{stem}_{size[0]}x{size[1]}{ext}")
+
+    # ---------------------------------------------------
+    # Pillow images
+    # ---------------------------------------------------
+    def image(self, name, size=None):
+        if not _load_pil():
+            raise RuntimeError("Pillow is required to load or scale images")
+        key = (name, tuple(size) if size else None)
+        with self._lock:
+            img = self._images.get(key)
+            if img is None:
+                img = self._load_scaled(name, key[1]) if key[1] else self._decode(self.path(name))
+                self._images[key] = img
+            return img
+
+    def _decode(self, path):
+        img = Image.open(path)
+        img.load()
+        self.stats["decoded"] += 1
+        return img
+
+    def _load_scaled(self, name, size):
+        source = self.path(name)
+        scaled_file = self.scaled_path(name, size)
+        if self.persist and self._is_fresh(scaled_file, source):
+            try:
+                img = self._decode(scaled_file)
+                self.stats["prescaled_reused"] += 1
+                return img
+            except OSError:
+                pass  # Damaged cache file; scale again and overwrite it
+
+        # Only the scaled copy is cached; the full-size image is not kept unless asked for
+        original = self._images.get((name, None)) or self._decode(source)
+        # Palette and 1-bit images would be resized with NEAREST; scale them in RGBA instead
+        source_img = original.convert("RGBA") if original.mode in ("P", "1") else original
+        img = source_img.resize(size, Image.LANCZOS)
+        self.stats["scaled"] += 1
+        if self.persist:
+            self._save(img, scaled_file, original.format)
+        return img
+
+    @staticmethod
+    def _is_fresh(scaled_file, source):
+        try:
+            return os.path.getmtime(scaled_file) >= os.path.getmtime(source)
+        except OSError:
+            return False
+
+    def _save(self, img, scaled_file, image_format):
+        tmp = f"{scaled_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image_format = image_format or "PNG"
+            img.save(tmp, format=image_format, **({"quality": 95} if image_format == "JPEG" else {}))
+            os.replace(tmp, scaled_file)
+        except (OSError, ValueError) as e:
+            print(f"[AssetManager] Could not save {scaled_file}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # ---------------------------------------------------
+    # Tk images
+    # ---------------------------------------------------
+    def photo(self, name, size=None, master=None):
+        """A shared PhotoImage for `name` (scaled to `size`). Must be called on the Tk thread."""
+        key = (name, tuple(size) if size else None)
+        photo = self._photos.get(key)
+        if photo is None:
+            if _load_pil() and ImageTk is not None:
+                photo = ImageTk.PhotoImage(self.image(name, size), master=master)
+            else:
+                photo = self._tk_photo(name, key[1], master)
+            self._photos[key] = photo
+        return photo
+
+    def _tk_photo(self, name, size, master):
+        # Tk reads PNG and GIF itself but can only shrink by whole factors
+        photo = tk.PhotoImage(file=self.path(name), master=master)
+        if size:
+            factor = max(math.ceil(photo.width() / size[0]), math.ceil(photo.height() / size[1]), 1)
+            if factor > 1:
+                photo = photo.subsample(factor)
+        return photo
+
+    # ---------------------------------------------------
+    # Cache control
+    # ---------------------------------------------------
+    def preload(self, requests):
+        """Decode and scale (name, size) pairs on a background thread so the first popup is fast too."""
+        requests = list(requests)
+
+        def work():
+            for name, size in requests:
+                try:
+                    self.image(name, size)
+                except Exception as e:
+                    print(f"[AssetManager] Preload of {name} failed: {e}")
+
+        if not _load_pil():
+            return None
+        thread = threading.Thread(target=work, name="AssetPreload", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+        self._photos.clear()
+
+
+_assets = None
+_assets_lock = threading.Lock()
+
+
+def get_assets():
+    """The asset manager shared by every screen (created on first use)."""
+    global _assets
+    with _assets_lock:
+        if _assets is None:
+            _assets = AssetManager()
+        return _assets
@@ -0,0 +1,154 @@
+"""
+Module: bench_hot_paths.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+pytest-benchmark suite for the reservation engine's hot paths: room search, reservation search, booking, the
+cancel and check-in/check-out cycles, and the dashboard/table queries. Every benchmark runs once per dataset size
+selected with --bench-sizes (see conftest.py), and results are autosaved as JSON under .benchmarks/.
+
+Usage:
+    python -m pytest benchmarks --bench-sizes small,medium
+    python -m pytest benchmarks --benchmark-compare      # compare against the previous saved run
+
+Important Functions:
+- bench_search_rooms_*: HotelManager.search_rooms with availability "free", "occupied" and "all".
+- bench_search_reservation_*: HotelManager.search_reservation with filter mixes used by the GUI.
+- bench_reserve_room, bench_cancel_cycle, bench_check_in_out_cycle: Write paths, one booking per round.
+- bench_manager_metrics, bench_filtered_reservations, bench_all_rooms_status: Dashboard and table queries.
+
+Algorithms:
+- Read benchmarks clear the QueryCache before every round (setup=...) so they measure the database work, except
+  the *_cached variants, which measure a cache hit.
+- Write benchmarks use rooms added only for benchmarking, and every round books different nights (or frees the
+  room again), so no round fails on an overlap.
+"""
+import itertools
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+TODAY = date.today()
+STAY_IN = (TODAY + timedelta(days=5)).isoformat()
+STAY_OUT = (TODAY + timedelta(days=8)).isoformat()
+WRITE_ROUNDS = 100
+
+
+def _iso(days):
+    return (TODAY + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture(scope="module")
+def db(seeded_db):
+    return seeded_db
+
+
+@pytest.fixture(scope="module")
+def mgr(db):
+    return db.hotel_manager
+
+
+@pytest.fixture(scope="module")
+def bench_rooms(db):
+    """Three rooms with no history, used by the write benchmarks."""
+    for n in (1, 2, 3):
+        db.add_room(f"B{n}", "Double", 2, 150.0, 1)
+    return [db.get_room(room_number=f"B{n}").room_id for n in (1, 2, 3)]
+
+
+@pytest.fixture(scope="module")
+def guest_id(db):
+    return db.execute_query("SELECT MIN(guest_id) AS g FROM guests")[0]["g"]
+
+
+def _cold(benchmark, db, func, **kwargs):
+    return benchmark.pedantic(func, kwargs=kwargs, setup=db.cache.clear, rounds=20, iterations=1)
+
+
+# ---------------------------------------------------
+# Room search
+# ---------------------------------------------------
+@pytest.mark.parametrize("availability", ["free", "occupied", "all"])
+def bench_search_rooms(benchmark, db, mgr, availability):
+    rows = _cold(benchmark, db, mgr.search_rooms, check_in=STAY_IN, check_out=STAY_OUT, availability=availability)
+    assert isinstance(rows, list)
+
+
+def bench_search_rooms_filtered(benchmark, db, mgr):
+    _cold(benchmark, db, mgr.search_rooms, check_in=STAY_IN, check_out=STAY_OUT, num_guests=2,
+          room_types=["Double", "Suite"], max_price=250, smoking=False, sort_by="price")
+
+
+def bench_search_rooms_cached(benchmark, mgr):
+    mgr.search_rooms(check_in=STAY_IN, check_out=STAY_OUT)
+    benchmark(mgr.search_rooms, check_in=STAY_IN, check_out=STAY_OUT)
+
+
+# ---------------------------------------------------
+# Reservation search
+# ---------------------------------------------------
+SEARCH_MIXES = {
+    "last_name": dict(last_name="Miller"),
+    "full_name": dict(first_name="Sarah", last_name="Miller", sort_by="total_price"),
+    "status_window": dict(status=["Confirmed", "Checked-in"], stay_start=_iso(0), stay_end=_iso(14)),
+    "type_unpaid": dict(room_type="Suite", is_paid=0, sort_by="total_price", sort_dir="desc"),
+    "room_history": dict(room_number="101", stay_start=_iso(-365), stay_end=_iso(0)),
+}
+
+
+@pytest.mark.parametrize("mix", list(SEARCH_MIXES))
+def bench_search_reservation(benchmark, db, mgr, mix):
+    _cold(benchmark, db, mgr.search_reservation, **SEARCH_MIXES[mix])
+
+
+# ---------------------------------------------------
+# Write paths
+# ---------------------------------------------------
+def bench_reserve_room(benchmark, mgr, bench_rooms, guest_id):
+    nights = itertools.count(1)
+
+    def book():
+        day = next(nights)
+        return mgr.reserve_room(guest_id, bench_rooms[0], _iso(day), _iso(day + 1), num_guests=1)
+
+    benchmark.pedantic(book, rounds=WRITE_ROUNDS, iterations=1)
+
+
+def bench_cancel_cycle(benchmark, mgr, bench_rooms, guest_id):
+    def reserve_then_cancel():
+        reservation_id = mgr.reserve_room(guest_id, bench_rooms[1], _iso(200), _iso(203), num_guests=1)
+        return mgr.cancel_reservation(reservation_id)
+
+    benchmark.pedantic(reserve_then_cancel, rounds=WRITE_ROUNDS, iterations=1)
+
+
+def bench_check_in_out_cycle(benchmark, mgr, bench_rooms, guest_id):
+    # A stay that started yesterday can be checked in at any time of day
+    def stay():
+        reservation_id = mgr.reserve_room(guest_id, bench_rooms[2], _iso(-1), _iso(1), num_guests=1, is_paid=1)
+        mgr.check_in_reservation(reservation_id)
+        return mgr.check_out_reservation(reservation_id)
+
+    benchmark.pedantic(stay, rounds=WRITE_ROUNDS, iterations=1)
+
+
+# ---------------------------------------------------
+# Dashboard and tables
+# ---------------------------------------------------
+def bench_manager_metrics(benchmark, db):
+    _cold(benchmark, db, db.get_manager_metrics)
+
+
+def bench_filtered_reservations(benchmark, db):
+    _cold(benchmark, db, db.get_filtered_reservations)
+
+
+def bench_filtered_reservations_by_guest(benchmark, db):
+    _cold(benchmark, db, db.get_filtered_reservations, guest_name="Sarah Miller", show_active=False)
+
+
+def bench_all_rooms_status(benchmark, db):
+    _cold(benchmark, db, db.get_all_rooms_status, target_date=TODAY.isoformat())
@@ -0,0 +1,119 @@
+"""
+Module: bench_receipts.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This script benchmarks rendering reservation receipt emails in bulk (10,000 by default, a night of folio emails for
+a large property). It compares the per-email path the receipt sender used before receipt_renderer.py with the
+compiled renderer in one process and render_many() over a process pool. The old path rebuilt the HTML with an
+f-string, decoded the base64 logo, built a MIMEMultipart/MIMEImage tree and serialized it with the email package
+for every message. It is reproduced here as legacy_render so all paths are measured on the same receipts.
+
+Usage:
+    python benchmarks/bench_receipts.py [--receipts 10000] [--legacy-receipts 1000] [--workers 4]
+
+Important Functions:
+- legacy_render(renderer, logo_base64, receipt): The pre-renderer message build (returns the message text).
+- run(path, receipts, workers): Render every receipt with one path.
+  Output: dict with seconds, receipts per second and mean KB per message.
+- main(argv): Runs every path and prints a table.
+
+Algorithms:
+- The legacy path is slow, so it renders only --legacy-receipts receipts by default; its per-second rate is
+  directly comparable with the other rows.
+- Every rendered message is consumed as soon as it is produced (its length is summed), the way a caller
+  streaming into EmailOutbox.enqueue_many would.
+"""
+import argparse
+import base64
+import os
+import sys
+from email.mime.image import MIMEImage
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from time import perf_counter
+
+# Ensure repository root is on sys.path so imports from repo root work
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from receipt_renderer import LOGO_PATH, RECEIPT_SUBJECT, Receipt, ReceiptRenderer, render_many
+
+SENDER_NAME = "RSC Hotels"
+FROM_ADDRESS = "roomservicecoders@gmail.com"
+
+
+def make_receipts(count):
+    return [
+        Receipt(f"guest{i}@example.com", f"Guest {i}", 100_000 + i, 100 + i % 400,
+                "2026-11-01", "2026-11-04", 3, 324.0 + i % 50, bool(i % 2))
+        for i in range(count)
+    ]
+
+
+def legacy_render(renderer, logo_base64, receipt):
+    """The old EmailReceiptSender.send_email message build, one full MIME tree per receipt."""
+    html = renderer.render_html(receipt.guest_name, receipt.reservation_id, receipt.room_number, receipt.check_in,
+                                receipt.check_out, receipt.nights, receipt.amount, receipt.is_paid)
+    msg = MIMEMultipart("related")
+    msg["From"] = f"{SENDER_NAME} <{FROM_ADDRESS}>"
+    msg["To"] = receipt.guest_email
+    msg["Subject"] = RECEIPT_SUBJECT.format(reservation_id=receipt.reservation_id)
+    alt = MIMEMultipart("alternative")
+    alt.attach(MIMEText(html, "html"))
+    msg.attach(alt)
+    img = MIMEImage(base64.b64decode(logo_base64), name="hotel_logo.png")
+    img.add_header("Content-ID", "<hotel_logo>")
+    img.add_header("Content-Disposition", "inline", filename="hotel_logo.png")
+    msg.attach(img)
+    return msg.as_string()
+
+
+def run(path_name, receipts, workers):
+    renderer = ReceiptRenderer(SENDER_NAME, FROM_ADDRESS)
+    total_bytes = 0
+    start = perf_counter()
+    if path_name == "legacy":
+        with open(LOGO_PATH, "rb") as f:
+            logo_base64 = base64.encodebytes(f.read()).decode("ascii")
+        for receipt in receipts:
+            total_bytes += len(legacy_render(renderer, logo_base64, receipt))
+    elif path_name == "compiled":
+        for receipt in receipts:
+            total_bytes += len(renderer.render_receipt(receipt)[1])
+    else:
+        for _, _, message in render_many(receipts, SENDER_NAME, FROM_ADDRESS, workers=workers):
+            total_bytes += len(message)
+    seconds = perf_counter() - start
+    return {
+        "path": path_name,
+        "receipts": len(receipts),
+        "seconds": seconds,
+        "per_sec": len(receipts) / seconds if seconds else 0.0,
+        "mean_kb": total_bytes / len(receipts) / 1024 if receipts else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk receipt rendering.")
+    parser.add_argument("--receipts", type=int, default=10_000)
+    parser.add_argument("--legacy-receipts", type=int, default=1_000,
+                        help="receipts for the (slow) legacy path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="process pool size")
+    args = parser.parse_args(argv)
+
+    receipts = make_receipts(args.receipts)
+    print(f"{'path':<10} {'receipts':>9} {'seconds':>9} {'per sec':>10} {'KB/msg':>8}")
+    results = []
+    for path_name, batch in (("legacy", receipts[:args.legacy_receipts]), ("compiled", receipts),
+                             ("pool", receipts)):
+        r = run(path_name, batch, args.workers)
+        results.append(r)
+        print(f"{r['path']:<10} {r['receipts']:>9} {r['seconds']:>9.2f} {r['per_sec']:>10.0f} {r['mean_kb']:>8.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
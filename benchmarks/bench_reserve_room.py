@@ -0,0 +1,350 @@
+"""
+Module: bench_reserve_room.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This script benchmarks HotelManager.reserve_room against the booking path it replaced, with 1, 8 and 32 clients
+booking at the same time. The baseline path is the reserve_room of the baseline commit (0423fab), copied verbatim
+together with the DatabaseManager lookups it called: each validation call (guest_exists, room_exists, get_room,
+calculate_total_price) opens its own plain sqlite3 connection and queries the rooms and guests tables, the dates
+are parsed twice, and the booking transaction runs on yet another connection with a random-probe reservation ID.
+
+Usage:
+    python benchmarks/bench_reserve_room.py [--clients 1 8 32] [--bookings 40] [--rooms 40]
+
+Important Functions:
+- BaselineHotelManager(db_name).reserve_room(...): The baseline booking pipeline, unchanged.
+- run(path, clients, bookings, rooms): Book `bookings` stays per client on a fresh database.
+  Output: dict with throughput, latency percentiles and, for the fast path, mean per-stage timings.
+- main(argv): Runs both paths for every client count and prints a table.
+
+Algorithms:
+- Conflict-free workload: Client c always books room c (mod rooms) and its i-th booking is the single night
+  starting i + 1 days from today, so bookings never overlap and every call does the full amount of work.
+- Clients are threads. Fast-path clients share one DatabaseManager (as the GUI windows do) and each has its own
+  HotelManager, so last_reserve_timings is per client. Baseline clients open plain connections to the same file,
+  as the baseline code did. Both paths book into the current schema, so the triggers cost the same on each side.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from time import perf_counter
+
+# Ensure repository root is on sys.path so imports from repo root work
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from database_manager import DatabaseManager
+from hotel_manager import HotelManager
+
+STAGES = ("validate", "price", "lock", "overlap", "allocate", "insert", "availability", "commit")
+
+
+class BaselineDatabase:
+    """DatabaseManager's lookups as of the baseline commit (0423fab), copied verbatim."""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+
+    def connect(self):
+        """Return a new database connection with foreign key enforcement enabled."""
+        conn = sqlite3.connect(self.db_name)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+
+    def get_guest(self, guest_id: int = None, email: str = None) -> sqlite3.Row | None:
+        """Retrieve a guest by guest_id or email. Returns None if not found."""
+        if guest_id is None and email is None:
+            raise ValueError("Provide guest_id or email to search for guest.")
+        conn = self.connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        if guest_id:
+            cur.execute("SELECT * FROM guests WHERE guest_id = ?", (guest_id,))
+        else:
+            cur.execute("SELECT * FROM guests WHERE email = ?", (email,))
+        row = cur.fetchone()
+        conn.close()
+        return row
+
+    def guest_exists(self, guest_id=None, email=None):
+        return self.get_guest(guest_id=guest_id, email=email) is not None
+
+
+    def get_room(self, room_id=None, room_number=None):
+        if room_id is None and room_number is None:
+            raise ValueError("Provide room_id or room_number.")
+        conn = self.connect()
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        if room_id:
+            cur.execute("SELECT * FROM rooms WHERE room_id = ?", (room_id,))
+        else:
+            cur.execute("SELECT * FROM rooms WHERE room_number = ?", (room_number,))
+        row = cur.fetchone()
+        conn.close()
+        return row
+
+    def room_exists(self, room_id: int = None, room_number: int = None) -> bool:
+        """Checks if a room exists using its ID or number."""
+        if room_id is None and room_number is None:
+            raise ValueError("Provide room_id or room_number.")
+        if room_id:
+            sql = "SELECT 1 FROM rooms WHERE room_id = ? LIMIT 1"
+            params = (room_id,)
+        else:
+            sql = "SELECT 1 FROM rooms WHERE room_number = ? LIMIT 1"
+            params = (room_number,)
+        conn = self.connect()
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, params)
+            return cur.fetchone() is not None
+        finally:
+            conn.close()
+
+
+class BaselineHotelManager:
+    """HotelManager.reserve_room and its helpers as of the baseline commit (0423fab), copied verbatim."""
+    MAX_ADVANCE_DAYS = 365
+    MAX_STAY_NIGHTS = 30
+
+    def __init__(self, db_name):
+        self.db = BaselineDatabase(db_name)
+
+    def _parse_dates(self, check_in: str, check_out: str) -> tuple[str, str, int]:
+        """Private helper function, validates date text and calculates number of nights."""
+        try:
+            ci = datetime.strptime(check_in, "%Y-%m-%d").date()
+            co = datetime.strptime(check_out, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+
+        if co < ci:
+            raise ValueError("check_out must be after check_in.")
+        if co == ci:
+            raise ValueError("check_out cannot be the same day as check_in.")
+
+        nights = (co - ci).days
+        return ci.isoformat(), co.isoformat(), nights
+
+    def calculate_total_price(self, room_id: int, check_in: str, check_out: str) -> float:
+        """Calculates the total price for a stay based on the room's price, nights, and tax."""
+        ci_iso, co_iso, nights = self._parse_dates(check_in, check_out)
+        room = self.db.get_room(room_id=room_id)
+        if room is None:
+            raise ValueError("Room does not exist")
+
+        base_price = float(room["price"]) * nights
+        tax_rate = 0.145
+        total_with_tax = base_price * (1 + tax_rate)
+        return total_with_tax
+
+    def reserve_room(
+            self,
+            guest_id: int,
+            room_id: int,
+            check_in: str,
+            check_out: str,
+            num_guests: int = None,
+            status: str = "Confirmed",
+            is_paid: int = None
+    ) -> int:
+
+        """Creates a new reservation in the database with transactional safety."""
+
+        # Date parsing and initial validation
+        ci_iso, co_iso, nights = self._parse_dates(check_in, check_out)
+
+        if nights > self.MAX_STAY_NIGHTS:
+            raise ValueError(
+                f"Stay duration ({nights} nights) exceeds maximum allowed ({self.MAX_STAY_NIGHTS} nights).")
+
+        today = datetime.now().date()
+        ci_date_obj = datetime.strptime(ci_iso, "%Y-%m-%d").date()
+        if (ci_date_obj - today).days > self.MAX_ADVANCE_DAYS:
+            raise ValueError(f"Check-in date cannot be more than {self.MAX_ADVANCE_DAYS} days in the future.")
+
+        if not self.db.guest_exists(guest_id=guest_id):
+            raise ValueError("Guest does not exist.")
+
+        if not self.db.room_exists(room_id=room_id):
+            raise ValueError("Room does not exist.")
+
+        if num_guests is not None and num_guests < 1:
+            raise ValueError("Number of guests must be at least 1.")
+
+        if num_guests is not None:
+            room = self.db.get_room(room_id=room_id)
+            if num_guests > room["capacity"]:
+                raise ValueError("Number of guests exceeds room capacity.")
+
+        total_price = self.calculate_total_price(room_id, check_in, check_out)
+
+        conn = self.db.connect()
+        cur = conn.cursor()
+
+        try:
+            conn.isolation_level = None
+            cur.execute("BEGIN IMMEDIATE")
+
+            # Check availability
+            occ = DatabaseManager.OCCUPIED_STATUSES
+            ph = ", ".join(["?"] * len(occ))
+            cur.execute(
+                f"""
+                    SELECT 1
+                    FROM reservations
+                    WHERE room_id = ?
+                        AND status IN ({ph})
+                        AND (check_out_date > ? AND check_in_date < ?)
+                    LIMIT 1
+                """,
+                (room_id, *occ, ci_iso, co_iso),
+            )
+
+            if cur.fetchone():
+                cur.execute("ROLLBACK")
+                raise ValueError("Room is no longer available for the selected dates.")
+
+            # -----------------------------
+            # Generate unique 6-digit ID
+            # -----------------------------
+            reservation_id = random.randint(100000, 999999)
+
+            # Ensure uniqueness (very fast, tiny table)
+            cur.execute("SELECT 1 FROM reservations WHERE reservation_id = ?", (reservation_id,))
+            while cur.fetchone():
+                reservation_id = random.randint(100000, 999999)
+
+            # Insert reservation with custom ID
+            cur.execute(
+                """
+                INSERT INTO reservations 
+                    (reservation_id, guest_id, room_id, check_in_date, check_out_date, num_guests, total_price, status, is_paid)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (reservation_id, guest_id, room_id, ci_iso, co_iso, num_guests, total_price, status, is_paid),
+            )
+
+            # OPTIONAL: mark room as unavailable
+            cur.execute("UPDATE rooms SET is_available = 0 WHERE room_id = ?", (room_id,))
+
+            cur.execute("COMMIT")
+            return reservation_id
+
+        except Exception:
+            try:
+                cur.execute("ROLLBACK")
+            except:
+                pass
+            raise
+
+        finally:
+            conn.close()
+
+
+def _setup(path, rooms):
+    db = DatabaseManager(path)
+    db.execute_query("DELETE FROM reservations")
+    db.execute_query("DELETE FROM rooms")
+    db.execute_query("DELETE FROM guests")
+    for n in range(rooms):
+        db.add_room(1000 + n, "Double", 2, 100.0 + n, 1)
+    guest_id = db.add_guest("Bench", "Client", "bench@example.com", "1 Main St", "Springfield", "CA", "90001")
+    room_ids = [r.room_id for r in db.inventory.snapshot().rooms]
+    return db, guest_id, room_ids
+
+
+def run(path_name, clients, bookings, rooms):
+    """Run one benchmark round on a fresh temporary database."""
+    fd, db_path = tempfile.mkstemp(prefix="bench_reserve_", suffix=".db")
+    os.close(fd)
+    os.remove(db_path)
+    db, guest_id, room_ids = _setup(db_path, max(rooms, clients))
+    today = date.today()
+    latencies = []
+    stage_totals = {stage: [] for stage in STAGES}
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(c):
+        mgr = BaselineHotelManager(db_path) if path_name == "baseline" else HotelManager(db)
+        room_id = room_ids[c % len(room_ids)]
+        local, local_stages = [], {stage: [] for stage in STAGES}
+        barrier.wait()
+        for i in range(bookings):
+            ci = today + timedelta(days=i + 1)
+            args = (guest_id, room_id, ci.isoformat(), (ci + timedelta(days=1)).isoformat(), 1)
+            start = perf_counter()
+            try:
+                mgr.reserve_room(*args)
+                if path_name == "fast":
+                    for stage in STAGES:
+                        local_stages[stage].append(mgr.last_reserve_timings.get(stage, 0.0))
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            local.append((perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+            for stage in STAGES:
+                stage_totals[stage].extend(local_stages[stage])
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    wall = perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = perf_counter() - wall
+
+    db.cache.close()
+    os.remove(db_path)
+
+    latencies.sort()
+    return {
+        "path": path_name,
+        "clients": clients,
+        "bookings": len(latencies),
+        "errors": len(errors),
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "stages_ms": {s: statistics.mean(v) for s, v in stage_totals.items() if v},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reserve_room against the baseline booking path.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--bookings", type=int, default=40, help="bookings per client")
+    parser.add_argument("--rooms", type=int, default=40)
+    args = parser.parse_args(argv)
+
+    print(f"{'path':<8} {'clients':>7} {'booked':>7} {'errors':>6} {'per sec':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    results = []
+    for clients in args.clients:
+        for path_name in ("baseline", "fast"):
+            r = run(path_name, clients, args.bookings, args.rooms)
+            results.append(r)
+            print(f"{r['path']:<8} {r['clients']:>7} {r['bookings']:>7} {r['errors']:>6} "
+                  f"{r['throughput']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}")
+            if r["stages_ms"]:
+                print("         stages: " + ", ".join(f"{s} {ms:.2f}" for s, ms in r["stages_ms"].items()))
+    return results
+
+
+if __name__ == "__main__":
+    main()
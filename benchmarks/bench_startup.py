@@ -0,0 +1,115 @@
+"""
+Module: bench_startup.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This script benchmarks how long the staff app takes to start: importing main.py, then building HotelApp until the
+login screen has been drawn. Each run is a fresh Python process, so module imports and database opens are measured
+cold, the way a front-desk user sees them. HotelApp builds a screen the first time it is shown; the --eager row
+also builds every screen in SCREENS before the login screen is drawn, which is what startup cost when all nine
+frames were created up front.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--eager]
+
+Important Functions:
+- measure(eager): One startup in a child process.
+  Output: dict with import_ms, login_ms (None when Tk cannot open a display), database_opens and frames_built.
+- main(argv): Runs the startups and prints a table with the median of every column.
+
+Algorithms:
+- The child counts DatabaseManager constructions by wrapping its __init__, so a module that opens its own
+  database at import time shows up in database_opens.
+- The children run in a temporary folder so the relative hotel.db HotelApp opens is a scratch database. One
+  unmeasured run creates and seeds it first, so the timed runs only check the existing schema.
+- Without a display (e.g. CI without Xvfb) only the import phase is reported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Ensure repository root is on sys.path so imports from repo root work
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+GUI_DIR = os.path.join(repo_root, "Single Screen Prototype")
+
+CHILD = r"""
+import json, os, sys
+from time import perf_counter
+sys.path[:0] = [{gui_dir!r}, {repo_root!r}]
+
+import database_manager
+opens = [0]
+_init = database_manager.DatabaseManager.__init__
+def counting_init(self, *args, **kwargs):
+    opens[0] += 1
+    _init(self, *args, **kwargs)
+database_manager.DatabaseManager.__init__ = counting_init
+
+start = perf_counter()
+import main
+result = {{"import_ms": (perf_counter() - start) * 1000, "login_ms": None}}
+try:
+    start = perf_counter()
+    app = main.HotelApp()
+    if {eager}:
+        for name in main.SCREENS:
+            app.get_frame(name)
+        app.show_frame("login_screen")
+    app.update()
+    result["login_ms"] = (perf_counter() - start) * 1000
+    result["frames_built"] = len(app.frames)
+except main.tk.TclError as e:
+    result["error"] = str(e)
+result["database_opens"] = opens[0]
+print(json.dumps(result))
+sys.stdout.flush()
+os._exit(0)  # skip joining the app's worker threads
+"""
+
+
+def measure(eager=False, cwd=None):
+    code = CHILD.format(gui_dir=GUI_DIR, repo_root=repo_root, eager=bool(eager))
+    out = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark staff app startup (time to login screen).")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true", help="also time building every screen up front")
+    args = parser.parse_args(argv)
+
+    modes = ["lazy", "eager"] if args.eager else ["lazy"]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        measure(cwd=tmp)  # creates and seeds the scratch hotel.db
+        print(f"{'mode':<6} {'import ms':>10} {'login ms':>10} {'total ms':>10} {'db opens':>9} {'frames':>7}")
+        for mode in modes:
+            runs = [measure(mode == "eager", cwd=tmp) for _ in range(args.runs)]
+            row = {"mode": mode, "import_ms": statistics.median(r["import_ms"] for r in runs),
+                   "database_opens": runs[0]["database_opens"], "frames_built": runs[0].get("frames_built"),
+                   "login_ms": None, "error": runs[0].get("error")}
+            if all(r["login_ms"] is not None for r in runs):
+                row["login_ms"] = statistics.median(r["login_ms"] for r in runs)
+            results.append(row)
+
+            login = f"{row['login_ms']:>10.1f}" if row["login_ms"] is not None else f"{'n/a':>10}"
+            total = (f"{row['import_ms'] + row['login_ms']:>10.1f}" if row["login_ms"] is not None
+                     else f"{'n/a':>10}")
+            print(f"{mode:<6} {row['import_ms']:>10.1f} {login} {total} {row['database_opens']:>9} "
+                  f"{row['frames_built'] if row['frames_built'] is not None else '-':>7}")
+        if results[0]["error"]:
+            print(f"(Tk could not start, only imports were timed: {results[0]['error']})")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Module: conftest.py (benchmarks)
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+Shared fixtures for the pytest-benchmark suite in this folder. Each benchmark runs against seeded databases of
+several sizes, built with generate_dataset.py (seed 1, so every run sees the same data). Seeding the large sizes
+takes a while, so every size is built once per session (or reused from --bench-data-dir) and copied for each
+benchmark module that writes to it.
+
+Options:
+- --bench-sizes: Which sizes to run (default: small). Sizes are defined in SIZES.
+- --bench-data-dir: Folder where seeded template databases are kept between runs.
+
+Results are saved as JSON under .benchmarks/ (pytest-benchmark autosave); compare two runs with
+`pytest-benchmark compare` or `python -m pytest benchmarks --benchmark-compare`.
+
+Important Functions:
+- seeded_db (fixture): DatabaseManager for one size, parametrized over --bench-sizes.
+
+Important Data Structures:
+- SIZES: size name -> (rooms, approximate number of reservations).
+"""
+import os
+import shutil
+import sys
+
+import pytest
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from database_manager import DatabaseManager
+from generate_dataset import DatasetConfig, generate, years_for
+from hotel_manager import HotelManager
+
+SIZES = {
+    "small": (100, 10_000),
+    "medium": (1_000, 100_000),
+    "large": (10_000, 1_000_000),
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-sizes", default="small",
+                     help=f"comma separated dataset sizes to benchmark ({', '.join(SIZES)})")
+    parser.addoption("--bench-data-dir", default=None,
+                     help="folder to keep seeded databases between runs")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Always keep a JSON record of the run so results can be compared between commits
+    if hasattr(config.option, "benchmark_autosave"):
+        config.option.benchmark_autosave = True
+
+
+def pytest_generate_tests(metafunc):
+    if "seeded_db" in metafunc.fixturenames:
+        sizes = [s.strip() for s in metafunc.config.getoption("--bench-sizes").split(",") if s.strip()]
+        unknown = [s for s in sizes if s not in SIZES]
+        if unknown:
+            raise pytest.UsageError(f"Unknown --bench-sizes: {', '.join(unknown)}")
+        metafunc.parametrize("size", sizes, scope="module")
+
+
+@pytest.fixture(scope="session")
+def template_dir(request, tmp_path_factory):
+    data_dir = request.config.getoption("--bench-data-dir")
+    if data_dir:
+        os.makedirs(data_dir, exist_ok=True)
+        return data_dir
+    return str(tmp_path_factory.mktemp("bench_templates"))
+
+
+@pytest.fixture(scope="module")
+def seeded_db(size, template_dir, tmp_path_factory):
+    """A fresh copy of the seeded database for `size`, shared by the benchmarks of one module."""
+    rooms, reservations = SIZES[size]
+    template = os.path.join(template_dir, f"hotel_{size}_{rooms}_{reservations}.db")
+    if not os.path.exists(template):
+        if os.path.exists(template + ".tmp"):
+            os.remove(template + ".tmp")
+        generate(template + ".tmp", DatasetConfig(rooms=rooms, years=years_for(rooms, reservations), seed=1))
+        os.replace(template + ".tmp", template)
+
+    path = str(tmp_path_factory.mktemp(f"bench_{size}") / "hotel.db")
+    shutil.copyfile(template, path)
+    db = DatabaseManager(path)
+    db.hotel_manager = HotelManager(db)
+    yield db
+    db.cache.close()
@@ -0,0 +1,340 @@
+"""
+Module: load_test.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This script simulates many front-desk terminals working on one database file at once. Each client (a thread or a
+process) runs a weighted mix of search, reserve, modify, cancel, check-in and check-out calls through HotelManager
+for a fixed time or number of operations. At the end it reports throughput and per-operation latency
+percentiles, counts "database is locked" errors and retries, and checks that no room ended up with overlapping
+occupied reservations.
+
+Usage:
+    python benchmarks/load_test.py --db load.db --clients 16 --mode process --duration 30 --seed-rooms 200
+    python benchmarks/load_test.py --db load.db --mix search=50,reserve=20,modify=10,cancel=10,check_in=5,check_out=5
+
+Important Functions:
+- run_load(config): Run the load and return the merged report.
+  Input: LoadConfig.
+  Output: dict (see Important Data Structures).
+- find_overlaps(db_path): Occupied reservations that share a night in the same room.
+  Output: list of (room_id, reservation_id, reservation_id).
+- main(argv): Command line entry point; exits with status 1 if overlaps were found.
+
+Important Data Structures:
+- LoadConfig: Dataclass with the database path, client count, mode ("thread"/"process"), operation mix, duration,
+  operation limit, retry policy and random seed.
+- Report: {"operations": {op: {"count", "ok", "rejected", "errors", "p50_ms", "p95_ms", "p99_ms"}},
+  "busy_errors", "retries", "throughput", "elapsed", "overlaps"}.
+
+Algorithms:
+- Each client keeps the reservations it created, so modify/cancel/check-in/check-out act on real bookings. When it
+  has none in the right state the operation falls back to a search. Stays used for check-in start yesterday so they
+  can be checked in at any time of day.
+- The reservation is picked once per call (_take), before the first attempt, so every busy retry works on the same
+  booking. If the call still fails it goes back into the pool it came from; a rejected call drops it.
+- Busy handling: sqlite3.OperationalError "locked"/"busy" is counted and retried with exponential backoff and
+  jitter up to max_retries. Business rule rejections (ValueError, e.g. the room was just taken) count as
+  "rejected", not errors.
+- Latency percentiles use the nearest-rank method over every successful or rejected call.
+- Overlap check: a self-join on reservations by room where both stays are occupied and
+  a.check_in < b.check_out AND b.check_in < a.check_out.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from time import perf_counter
+
+# Ensure repository root is on sys.path so imports from repo root work
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from database_manager import DatabaseManager
+from hotel_manager import HotelManager
+
+OPERATIONS = ("search", "reserve", "modify", "cancel", "check_in", "check_out")
+DEFAULT_MIX = {"search": 50, "reserve": 20, "modify": 10, "cancel": 8, "check_in": 6, "check_out": 6}
+FREE_STATUSES = ("Cancelled", "Complete", "No-show")
+
+
+@dataclass
+class LoadConfig:
+    db_path: str
+    clients: int = 8
+    mode: str = "thread"                 # "thread" or "process"
+    mix: dict = field(default_factory=lambda: dict(DEFAULT_MIX))
+    duration: float = 10.0               # seconds per client
+    max_operations: int = None           # per client; stops early when reached
+    max_retries: int = 5
+    backoff: float = 0.01                # first retry delay in seconds
+    seed: int = 0
+
+
+def _is_busy(error):
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class Client:
+    """One simulated terminal."""
+
+    def __init__(self, config, client_id):
+        self.config = config
+        self.rng = random.Random(config.seed * 1000 + client_id)
+        self.db = DatabaseManager(config.db_path)
+        self.mgr = HotelManager(self.db)
+        self.db.hotel_manager = self.mgr
+        self.guest_id = self.db.execute_query("SELECT MIN(guest_id) AS g FROM guests")[0]["g"]
+        self.room_ids = [r.room_id for r in self.db.inventory.snapshot().rooms]
+        self.confirmed = []     # reservation IDs booked by this client, still Confirmed
+        self.arrivals = []      # Confirmed stays starting yesterday (can be checked in now)
+        self.in_house = []      # Checked-in stays
+        self.latencies = {op: [] for op in OPERATIONS}
+        self.outcomes = {op: {"ok": 0, "rejected": 0, "errors": 0} for op in OPERATIONS}
+        self.busy_errors = 0
+        self.retries = 0
+
+    # ---------------------------------------------------
+    # Operations
+    # ---------------------------------------------------
+    def _window(self):
+        start = date.today() + timedelta(days=self.rng.randint(1, 300))
+        return start.isoformat(), (start + timedelta(days=self.rng.randint(1, 5))).isoformat()
+
+    def op_search(self):
+        check_in, check_out = self._window()
+        self.mgr.search_rooms(check_in=check_in, check_out=check_out, num_guests=self.rng.randint(1, 2))
+
+    def op_reserve(self):
+        room_id = self.rng.choice(self.room_ids)
+        if self.rng.random() < 0.3:
+            # Arrival: started yesterday so it can be checked in at any time of day
+            today = date.today()
+            check_in, check_out = (today - timedelta(days=1)).isoformat(), (today + timedelta(days=1)).isoformat()
+            reservation_id = self.mgr.reserve_room(self.guest_id, room_id, check_in, check_out, num_guests=1, is_paid=1)
+            self.arrivals.append(reservation_id)
+        else:
+            check_in, check_out = self._window()
+            reservation_id = self.mgr.reserve_room(self.guest_id, room_id, check_in, check_out, num_guests=1)
+            self.confirmed.append(reservation_id)
+
+    def op_modify(self, reservation_id):
+        check_in, check_out = self._window()
+        self.mgr.update_reservation(reservation_id, new_check_in=check_in, new_check_out=check_out)
+
+    def op_cancel(self, reservation_id):
+        self.mgr.cancel_reservation(reservation_id)
+
+    def op_check_in(self, reservation_id):
+        self.mgr.check_in_reservation(reservation_id, confirm_payment=True)
+        self.in_house.append(reservation_id)
+
+    def op_check_out(self, reservation_id):
+        self.mgr.check_out_reservation(reservation_id)
+
+    def _take(self, op):
+        """The reservation an operation acts on, chosen once per call so busy retries reuse it.
+        Returns (reservation_id, pool it was popped from or None).
+        """
+        if op == "modify":
+            return self.rng.choice(self.confirmed), None
+        if op == "cancel":
+            return self.confirmed.pop(self.rng.randrange(len(self.confirmed))), self.confirmed
+        if op == "check_in":
+            return self.arrivals.pop(), self.arrivals
+        if op == "check_out":
+            return self.in_house.pop(), self.in_house
+        return None, None
+
+    def _resolve(self, op):
+        """Fall back to a search when the client has no booking in the state an operation needs."""
+        needs = {"modify": self.confirmed, "cancel": self.confirmed, "check_in": self.arrivals,
+                 "check_out": self.in_house}
+        if op in needs and not needs[op]:
+            return "search"
+        return op
+
+    # ---------------------------------------------------
+    # Loop
+    # ---------------------------------------------------
+    def call(self, op):
+        func = getattr(self, f"op_{op}")
+        reservation_id, pool = self._take(op)
+        args = () if reservation_id is None else (reservation_id,)
+        delay = self.config.backoff
+        start = perf_counter()
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                func(*args)
+                self.outcomes[op]["ok"] += 1
+                break
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or attempt == self.config.max_retries:
+                    self._failed(op, reservation_id, pool, busy=_is_busy(e))
+                    return
+                self.busy_errors += 1
+                self.retries += 1
+                time.sleep(delay * (1 + self.rng.random()))
+                delay *= 2
+            except ValueError:
+                self.outcomes[op]["rejected"] += 1
+                break
+            except Exception:
+                self._failed(op, reservation_id, pool)
+                return
+        self.latencies[op].append((perf_counter() - start) * 1000)
+
+    def _failed(self, op, reservation_id, pool, busy=False):
+        # The write did not happen, so the reservation is still in the state it was taken from
+        self.outcomes[op]["errors"] += 1
+        if busy:
+            self.busy_errors += 1
+        if pool is not None:
+            pool.append(reservation_id)
+
+    def run(self, deadline):
+        ops = list(self.config.mix)
+        weights = [self.config.mix[op] for op in ops]
+        done = 0
+        while perf_counter() < deadline:
+            if self.config.max_operations is not None and done >= self.config.max_operations:
+                break
+            self.call(self._resolve(self.rng.choices(ops, weights)[0]))
+            done += 1
+        self.db.cache.close()
+        return {"latencies": self.latencies, "outcomes": self.outcomes,
+                "busy_errors": self.busy_errors, "retries": self.retries}
+
+
+def _client_main(config, client_id, results):
+    client = Client(config, client_id)
+    results.put(client.run(perf_counter() + config.duration))
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))    # nearest rank
+    return sorted_values[int(rank) - 1]
+
+
+def find_overlaps(db_path):
+    """Occupied reservations sharing at least one night in the same room."""
+    placeholders = ", ".join("?" * len(FREE_STATUSES))
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"""
+            SELECT a.room_id, a.reservation_id, b.reservation_id
+            FROM reservations a
+            JOIN reservations b
+              ON a.room_id = b.room_id AND a.reservation_id < b.reservation_id
+             AND a.check_in_date < b.check_out_date AND b.check_in_date < a.check_out_date
+            WHERE a.status NOT IN ({placeholders}) AND b.status NOT IN ({placeholders})
+        """, FREE_STATUSES * 2).fetchall()
+    finally:
+        conn.close()
+
+
+def run_load(config):
+    """Run every client until its deadline and merge the results."""
+    unknown = set(config.mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+    if config.mode not in ("thread", "process"):
+        raise ValueError("mode must be 'thread' or 'process'.")
+
+    if config.mode == "process":
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_client_main, args=(config, i, results))
+                   for i in range(config.clients)]
+    else:
+        import queue
+        results = queue.Queue()
+        workers = [threading.Thread(target=_client_main, args=(config, i, results))
+                   for i in range(config.clients)]
+
+    started = perf_counter()
+    for worker in workers:
+        worker.start()
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = perf_counter() - started
+
+    report = {"operations": {}, "busy_errors": 0, "retries": 0, "elapsed": elapsed}
+    total = 0
+    for op in OPERATIONS:
+        latencies = sorted(l for r in collected for l in r["latencies"][op])
+        outcomes = {k: sum(r["outcomes"][op][k] for r in collected) for k in ("ok", "rejected", "errors")}
+        count = sum(outcomes.values())
+        total += count
+        if count:
+            report["operations"][op] = {
+                "count": count, **outcomes,
+                "p50_ms": _percentile(latencies, 50),
+                "p95_ms": _percentile(latencies, 95),
+                "p99_ms": _percentile(latencies, 99),
+            }
+    report["busy_errors"] = sum(r["busy_errors"] for r in collected)
+    report["retries"] = sum(r["retries"] for r in collected)
+    report["throughput"] = total / elapsed if elapsed else 0.0
+    report["overlaps"] = find_overlaps(config.db_path)
+    return report
+
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent front-desk load test.")
+    parser.add_argument("--db", required=True, help="database file shared by all clients")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--mix", type=_parse_mix, default=dict(DEFAULT_MIX),
+                        help="operation weights, e.g. search=50,reserve=20,modify=10,cancel=8,check_in=6,check_out=6")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--operations", type=int, default=None, help="stop each client after this many operations")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seed-rooms", type=int, default=None,
+                        help="first (re)generate the database with this many rooms (generate_dataset.py)")
+    args = parser.parse_args(argv)
+
+    if args.seed_rooms:
+        from generate_dataset import DatasetConfig, generate
+        generate(args.db, DatasetConfig(rooms=args.seed_rooms, years=0.25, seed=args.seed))
+
+    config = LoadConfig(db_path=args.db, clients=args.clients, mode=args.mode, mix=args.mix,
+                        duration=args.duration, max_operations=args.operations, max_retries=args.max_retries,
+                        seed=args.seed)
+    report = run_load(config)
+
+    print(f"{'operation':<10} {'count':>7} {'ok':>7} {'rejected':>8} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for op, s in report["operations"].items():
+        print(f"{op:<10} {s['count']:>7} {s['ok']:>7} {s['rejected']:>8} {s['errors']:>6} "
+              f"{s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f}")
+    print(f"throughput: {report['throughput']:.1f} ops/s over {report['elapsed']:.1f} s, "
+          f"busy errors: {report['busy_errors']}, retries: {report['retries']}")
+    if report["overlaps"]:
+        print(f"FAILED: {len(report['overlaps'])} overlapping occupied reservation pairs, e.g. {report['overlaps'][:5]}")
+        return 1
+    print("No overlapping occupied reservations.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
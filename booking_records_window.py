@@ -140,7 +140,6 @@ def open_booking_records_window(parent=None):
         conn = None
         try:
             conn = db.connect()
-            conn.row_factory = sqlite3.Row
             cur = conn.cursor()
 
             query = ("SELECT r.reservation_id, r.guest_id, g.first_name || ' ' || g.last_name AS guest_name, "
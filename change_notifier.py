@@ -0,0 +1,164 @@
+"""
+Module: change_notifier.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module tells the UI which tables changed, so a screen reloads only when its data actually changed. This
+includes changes made by other front-desk terminals writing to the same database file. A ChangeNotifier polls
+`PRAGMA data_version` on a short timer, and also hears about this process's own commits through the QueryCache
+commit hook. When something changed, it publishes the set of changed table names to the subscribers whose tables
+are in that set.
+
+Usage:
+    app.notifier = ChangeNotifier(app.db)
+    app.notifier.start(app)                      # polls with app.after() every interval_ms
+    app.notifier.subscribe(("reservations", "guests"), frame.on_tables_changed)
+
+Important Functions:
+- ChangeNotifier.subscribe(tables, callback): callback(frozenset of changed table names) whenever one of `tables`
+  changes; tables=None subscribes to every change.
+  Output: token for unsubscribe().
+- ChangeNotifier.poll(): Check for changes now and notify subscribers.
+  Output: frozenset of changed tables (empty if nothing changed).
+- ChangeNotifier.start(widget) / stop(): Run poll() on the Tk thread every interval_ms using widget.after().
+- ChangeNotifier.close(): Stop polling, detach from the cache and close the monitor connection.
+
+Important Data Structures:
+- _subscribers (dict): token -> (frozenset of tables or None, callback).
+- _versions (dict): Last table_versions values seen (table -> version).
+- _pending (set): Tables committed by this process since the last poll (filled from any thread).
+
+Algorithms:
+- PRAGMA data_version on the notifier's own connection changes whenever any other connection commits, in this
+  process or another. Reading it costs almost nothing, so an unchanged database costs one PRAGMA per poll.
+- When it changed, the notifier reads table_versions. Those counters are bumped by triggers on every write (see
+  DatabaseManager.VERSIONED_TABLES). The tables whose counter moved are the changed tables. Tables committed
+  locally that have no trigger are still reported, through _pending. If the database has no table_versions, the
+  change is reported as "*" and every subscriber is notified for all of its tables.
+- Callbacks run on the thread that calls poll() (the Tk thread when started with start()), never on a writer's
+  thread.
+"""
+import itertools
+import sqlite3
+import threading
+
+
+class ChangeNotifier:
+    def __init__(self, db, interval_ms=500):
+        self.db = db
+        self.interval_ms = interval_ms
+        self._subscribers = {}
+        self._tokens = itertools.count(1)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._data_version = None
+        self._versions = None
+        self._widget = None
+        self._after_id = None
+        db.cache.add_commit_listener(self._note_local_commit)
+
+    # ---------------------------------------------------
+    # Subscriptions
+    # ---------------------------------------------------
+    def subscribe(self, tables, callback):
+        token = next(self._tokens)
+        self._subscribers[token] = (None if tables is None else frozenset(t.lower() for t in tables), callback)
+        return token
+
+    def unsubscribe(self, token):
+        self._subscribers.pop(token, None)
+
+    def _note_local_commit(self, tables):
+        with self._lock:
+            self._pending.update(tables)
+
+    # ---------------------------------------------------
+    # Change detection
+    # ---------------------------------------------------
+    def poll(self):
+        with self._lock:
+            changed, self._pending = set(self._pending), set()
+
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db.db_name, check_same_thread=False)
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                first = self._data_version is None
+                self._data_version = data_version
+                changed |= self._changed_tables(first)
+        except sqlite3.Error as e:
+            print(f"[ChangeNotifier] Poll failed: {e}")
+            return frozenset()
+
+        changed = frozenset(changed)
+        if changed:
+            self._publish(changed)
+        return changed
+
+    def _changed_tables(self, first):
+        try:
+            versions = dict(self._conn.execute("SELECT table_name, version FROM table_versions"))
+        except sqlite3.OperationalError:
+            # No table_versions (schema not upgraded): something changed, but not known what
+            return set() if first else {"*"}
+        previous, self._versions = self._versions, versions
+        if previous is None:
+            return set()
+        return {table for table, version in versions.items() if previous.get(table) != version}
+
+    def _publish(self, changed):
+        everything = "*" in changed
+        for tables, callback in list(self._subscribers.values()):
+            if tables is None:
+                relevant = changed
+            elif everything:
+                relevant = tables
+            else:
+                relevant = tables & changed
+            if not relevant:
+                continue
+            try:
+                callback(relevant)
+            except Exception as e:
+                # One broken subscriber must not stop the others from refreshing
+                print(f"[ChangeNotifier] Subscriber failed: {e!r}")
+
+    # ---------------------------------------------------
+    # Tk polling
+    # ---------------------------------------------------
+    def start(self, widget):
+        """Poll every interval_ms on the Tk thread; the first poll records the current state as the baseline."""
+        self.stop()
+        self._widget = widget
+        self.poll()
+        self._after_id = widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if self._widget is None:
+            return
+        self.poll()
+        try:
+            self._after_id = self._widget.after(self.interval_ms, self._tick)
+        except Exception:
+            # Tk was torn down between polls
+            self._widget = None
+
+    def stop(self):
+        if self._widget is not None and self._after_id is not None:
+            try:
+                self._widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._widget = None
+        self._after_id = None
+
+    def close(self):
+        self.stop()
+        self.db.cache.remove_commit_listener(self._note_local_commit)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -14,8 +14,9 @@ Important Functions:
   create and populate the tables. This ensures a consistent database state on first run.
   Input: None.
   Output: None.
-- connect(): Returns a new database connection object with foreign key enforcement enabled.
-  Input: None.
+- connect(raw=False): Returns a new database connection object with foreign key enforcement enabled. Rows are
+  row_mapping records unless raw=True (plain tuples). Statements run on it are timed into query_stats.
+  Input: raw (bool, optional).
   Output: sqlite3.Connection object.
 - add_guest(...): Inserts a new guest record into the database.
   Input: first_name, last_name, email, address_line1, city, state, postal_code, phone_number (optional), address_line2 (optional).
@@ -25,13 +26,28 @@ Important Functions:
   Output: None.
 - get_guest/get_room(...): Functions to retrieve a single record by its ID or another unique identifier.
   Input: ID or unique field (e.g., email, room_number).
-  Output: sqlite3.Row object representing the record, or None if not found.
+  Output: GuestRecord for guests, hotel_models.Room for rooms (both support record["column"]), or None if not found.
+- apply_schema_upgrades(): Applies SCHEMA_COLUMN_UPGRADES, SCHEMA_VIEW_UPGRADES, SCHEMA_TRIGGER_UPGRADES and
+  003_schema_upgrades.sql to an existing database, and creates the table_versions triggers for VERSIONED_TABLES.
+  Input: None.
+  Output: None.
+- refresh_room_availability(room_ids, business_date, conn): Recomputes rooms.is_available from out_of_service and
+  the business date's reservations, writing only rows that change.
+  Input: room_ids (iterable, optional), business_date (date, optional), conn (optional, caller's transaction).
+  Output: int, number of rooms changed.
 - guest_exists/room_exists(...): Functions to check if a guest or room exists.
   Input: guest_id or email for guests; room_id or room_number for rooms.
   Output: bool.
 - cancel_reservation(reservation_id, guest_id): Updates a reservation's status to 'Cancelled'.
   Input: reservation_id (int), guest_id (int).
   Output: bool indicating success.
+- current_change_seq(): Latest change sequence number (the watermark to take before a full load).
+  Output: int.
+- changes_since(seq, tables): Rooms, guests and reservations written after `seq`, plus deleted ids.
+  Input: seq (int), tables (iterable of CHANGE_TRACKED_TABLES names, optional).
+  Output: dict with "seq" (new watermark), "changed" ({table: [records]}) and "deleted" ({table: [ids]}).
+- get_filtered_reservation_changes(since_seq, **filters): Delta for a get_filtered_reservations() result.
+  Output: (new watermark, changed rows that match the filters, ids to remove).
 - is_room_available(...): Checks if a room is available for a given date range by checking for overlapping
   reservations with 'occupied' statuses.
   Input: room_number (int), check_in_date (str), check_out_date (str).
@@ -40,14 +56,32 @@ Important Functions:
 Important Data Structures:
 - OCCUPIED_STATUSES: A tuple containing reservation statuses that indicate a room is physically occupied
   ('Confirmed', 'Checked-in'). This is used to determine availability conflicts.
+- cache (QueryCache): Versioned LRU cache behind the @cached read methods (query_cache.py).
+- query_stats (QueryStats): Per-statement timing and the slow-query log for every connection from connect()
+  (db_instrumentation.py).
+- inventory (RoomInventory): In-memory snapshot of the rooms table used by get_room, room_exists,
+  get_room_price and get_room_number (room_inventory.py).
+- id_allocator (IdAllocator): Unique reservation/employee ID allocation (id_allocator.py).
+- rate_plans (RatePlans): Rate rules and the precomputed rate calendar used for pricing (rate_plans.py).
+- archive (ReservationArchive): Moves old Cancelled/Complete reservations to reservations_archive
+  (reservation_archive.py). Reads that must include them use the reservations_all view.
 
 Notes:
 - Reservation creation is handled by HotelManager.reserve_room() which provides transactional safety.
+- Stay dates are passed in and returned as 'YYYY-MM-DD' strings. Overlap checks, availability and night counts
+  use the integer check_in_day/check_out_day columns instead (day_numbers.py).
 """
 import sqlite3
 from pathlib import Path
 from datetime import date, datetime, time, timedelta
-import random
+from day_numbers import to_day
+from db_instrumentation import InstrumentedConnection, QueryStats
+from id_allocator import IdAllocator
+from query_cache import QueryCache, cached
+from rate_plans import RatePlans
+from reservation_archive import ReservationArchive
+from room_inventory import RoomInventory
+from row_mapping import GuestRecord, record_factory
 
 
 class DatabaseManager:
@@ -55,10 +89,65 @@ class DatabaseManager:
 
     OCCUPIED_STATUSES = ("Confirmed", "Checked-in")
 
+    # rooms.is_available is derived: 1 only if the room is in service and nobody holds it on the business date.
+    # Used as "WHERE is_available != (expr)" so only rows whose flag actually changes are written.
+    AVAILABILITY_EXPR = """
+        CASE WHEN rooms.out_of_service = 0 AND NOT EXISTS (
+                SELECT 1 FROM reservations res
+                WHERE res.room_id = rooms.room_id
+                  AND res.status NOT IN ('Cancelled', 'Complete')
+                  AND res.check_in_day <= :today
+                  AND res.check_out_day > :today
+            )
+            THEN 1 ELSE 0 END
+    """
+
+    # Additive schema changes for databases created before a feature existed.
+    # Columns are (table, column, declaration); tables/indexes live in the upgrade script.
+    SCHEMA_COLUMN_UPGRADES = (
+        ("rooms", "out_of_service", "INTEGER NOT NULL DEFAULT 0 CHECK (out_of_service IN (0, 1))"),
+        # Change tracking (maintained by the trg_<table>_change_* triggers in 003_schema_upgrades.sql)
+        ("rooms", "change_seq", "INTEGER NOT NULL DEFAULT 0"),
+        ("rooms", "updated_at", "TEXT"),
+        ("guests", "change_seq", "INTEGER NOT NULL DEFAULT 0"),
+        ("guests", "updated_at", "TEXT"),
+        ("reservations", "change_seq", "INTEGER NOT NULL DEFAULT 0"),
+        ("reservations", "updated_at", "TEXT"),
+        # Stay dates as days since 1970-01-01 (day_numbers.py), filled by trg_reservations_stamp_* and the backfill
+        ("reservations", "check_in_day", "INTEGER"),
+        ("reservations", "check_out_day", "INTEGER"),
+        ("reservations_archive", "check_in_day", "INTEGER"),
+        ("reservations_archive", "check_out_day", "INTEGER"),
+    )
+    # Views whose column list grew: (view, newest column). An older definition is dropped so the script recreates it.
+    SCHEMA_VIEW_UPGRADES = (
+        ("reservations_all", "check_in_day"),
+    )
+    # Triggers whose definition changed: (trigger, text of the current definition). An older definition (without
+    # that text) is dropped so the script recreates it.
+    SCHEMA_TRIGGER_UPGRADES = (
+        ("trg_rooms_change_insert", "WHEN NEW.updated_at IS NULL"),
+        ("trg_guests_change_insert", "WHEN NEW.updated_at IS NULL"),
+        ("trg_reservations_stamp_insert", "WHEN NEW.updated_at IS NULL"),
+    )
+    SCHEMA_UPGRADE_SCRIPT = "003_schema_upgrades.sql"
+    # Tables stamped with change_seq/updated_at by triggers, and their primary keys (changes_since)
+    CHANGE_TRACKED_TABLES = {"rooms": "room_id", "guests": "guest_id", "reservations": "reservation_id"}
+    # Tables whose writes bump table_versions (read by QueryCache and ChangeNotifier)
+    VERSIONED_TABLES = ("rooms", "guests", "reservations", "employees", "rate_rules")
+
     def __init__(self, db_name="hotel.db"):
         self.db_name = db_name
+        self._schema_upgraded = False
+        self.cache = QueryCache(db_name)
+        self.query_stats = QueryStats()
+        self.inventory = RoomInventory(self)
+        self.rate_plans = RatePlans(self)
+        self.archive = ReservationArchive(self)
         self.create_if_missing()
         self.hotel_manager = None
+        self.id_allocator = IdAllocator(self)
+        self.apply_schema_upgrades()
     # ---------------------------------------------------
     # Database Setup
     # ---------------------------------------------------
@@ -146,10 +235,79 @@ class DatabaseManager:
                 except Exception:
                     pass
 
-    def connect(self):
-        """Return a new database connection with foreign key enforcement enabled."""
+    def apply_schema_upgrades(self):
+        """Apply the idempotent schema additions in 003_schema_upgrades.sql.
+        Runs once per instance. If the core tables do not exist yet the upgrade is skipped and
+        retried by connect(), so databases whose schema is created by hand still get upgraded.
+        """
+        if self._schema_upgraded:
+            return
+
+        script_path = Path(__file__).resolve().parent / "database_scripts" / self.SCHEMA_UPGRADE_SCRIPT
         conn = sqlite3.connect(self.db_name)
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing = {row[0] for row in cur.fetchall()}
+            if not {"rooms", "guests", "reservations"}.issubset(existing):
+                return
+
+            for table, column, declaration in self.SCHEMA_COLUMN_UPGRADES:
+                if table not in existing:
+                    continue  # created by the upgrade script with the column already in it
+                cur.execute(f"PRAGMA table_info({table})")
+                if column in {row[1] for row in cur.fetchall()}:
+                    continue
+                try:
+                    cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+                except sqlite3.OperationalError as e:
+                    # Another process may have added it between the check and the ALTER.
+                    if "duplicate column" not in str(e):
+                        raise
+
+            for view, column in self.SCHEMA_VIEW_UPGRADES:
+                cur.execute(f"PRAGMA table_info({view})")
+                columns = {row[1] for row in cur.fetchall()}
+                if columns and column not in columns:
+                    cur.execute(f"DROP VIEW IF EXISTS {view}")
+
+            for trigger, definition in self.SCHEMA_TRIGGER_UPGRADES:
+                cur.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (trigger,))
+                row = cur.fetchone()
+                if row and definition not in row[0]:
+                    cur.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+            cur.executescript(script_path.read_text(encoding="utf-8"))
+
+            cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing = {row[0] for row in cur.fetchall()}
+            for table in self.VERSIONED_TABLES:
+                if table not in existing:
+                    continue
+                cur.execute("INSERT OR IGNORE INTO table_versions (table_name) VALUES (?)", (table,))
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    cur.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()} AFTER {event} ON {table} "
+                        f"BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}'; END"
+                    )
+            conn.commit()
+            self._schema_upgraded = True
+        finally:
+            conn.close()
+
+    def connect(self, raw: bool = False):
+        """Return a new database connection with foreign key enforcement enabled.
+        Rows come back as row_mapping records (row[0], row["col"], row.col); raw=True returns plain tuples
+        for bulk paths that only need positions.
+        """
+        if not self._schema_upgraded:
+            self.apply_schema_upgrades()
+        conn = sqlite3.connect(self.db_name, factory=InstrumentedConnection)
+        conn.query_stats = self.query_stats
         conn.execute("PRAGMA foreign_keys = ON")
+        if not raw:
+            conn.row_factory = record_factory
+        self.cache.attach(conn)
         return conn
 
     # ---------------------------------------------------
@@ -183,23 +341,25 @@ class DatabaseManager:
         finally:
             conn.close()
 
-    def get_guest(self, guest_id: int = None, email: str = None) -> sqlite3.Row | None:
-        """Retrieve a guest by guest_id or email. Returns None if not found."""
+    def get_guest(self, guest_id: int = None, email: str = None, conn=None) -> GuestRecord | None:
+        """Retrieve a guest by guest_id or email. Returns None if not found. Pass conn to reuse a connection."""
         if guest_id is None and email is None:
             raise ValueError("Provide guest_id or email to search for guest.")
-        conn = self.connect()
-        conn.row_factory = sqlite3.Row
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
         cur = conn.cursor()
         if guest_id:
             cur.execute("SELECT * FROM guests WHERE guest_id = ?", (guest_id,))
         else:
             cur.execute("SELECT * FROM guests WHERE email = ?", (email,))
         row = cur.fetchone()
-        conn.close()
+        if own_conn:
+            conn.close()
         return row
 
-    def guest_exists(self, guest_id=None, email=None):
-        return self.get_guest(guest_id=guest_id, email=email) is not None
+    def guest_exists(self, guest_id=None, email=None, conn=None):
+        return self.get_guest(guest_id=guest_id, email=email, conn=conn) is not None
 
     # ---------------------------------------------------
     # Room Methods
@@ -208,78 +368,40 @@ class DatabaseManager:
         conn = self.connect()
         cur = conn.cursor()
         # Explicitly include smoking column (default 0) to be compatible with external schema requiring NOT NULL
+        # A room added as unavailable is out of service (a new room has no reservations yet)
         cur.execute("""
-            INSERT INTO rooms (room_number, room_type, smoking, capacity, price, is_available)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (room_number, room_type, 0, capacity, price, available))
+            INSERT INTO rooms (room_number, room_type, smoking, capacity, price, is_available, out_of_service)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (room_number, room_type, 0, capacity, price, available, 0 if available else 1))
         conn.commit()
         conn.close()
+        self.inventory.invalidate()
 
     def get_room(self, room_id=None, room_number=None):
+        """Return the Room (row-style access: room["price"]) from the in-memory inventory, or None."""
         if room_id is None and room_number is None:
             raise ValueError("Provide room_id or room_number.")
-        conn = self.connect()
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        if room_id:
-            cur.execute("SELECT * FROM rooms WHERE room_id = ?", (room_id,))
-        else:
-            cur.execute("SELECT * FROM rooms WHERE room_number = ?", (room_number,))
-        row = cur.fetchone()
-        conn.close()
-        return row
+        return self.inventory.snapshot().get(room_id=room_id, room_number=room_number)
 
     def room_exists(self, room_id: int = None, room_number: int = None) -> bool:
         """Checks if a room exists using its ID or number."""
-        if room_id is None and room_number is None:
-            raise ValueError("Provide room_id or room_number.")
-        if room_id:
-            sql = "SELECT 1 FROM rooms WHERE room_id = ? LIMIT 1"
-            params = (room_id,)
-        else:
-            sql = "SELECT 1 FROM rooms WHERE room_number = ? LIMIT 1"
-            params = (room_number,)
-        conn = self.connect()
-        cur = conn.cursor()
-        try:
-            cur.execute(sql, params)
-            return cur.fetchone() is not None
-        finally:
-            conn.close()
+        return self.get_room(room_id=room_id, room_number=room_number) is not None
 
     def get_room_price(self, room_id):
         """
         Returns the nightly price for a given room.
         """
-        conn = self.connect()
-        cur = conn.cursor()
-
-        try:
-            cur.execute("SELECT price FROM rooms WHERE room_id = ?", (room_id,))
-            row = cur.fetchone()
-
-            if row is None:
-                raise ValueError(f"Room with ID {room_id} not found.")
-
-            return row[0]
-
-        finally:
-            conn.close()
+        room = self.inventory.snapshot().get(room_id=room_id)
+        if room is None:
+            raise ValueError(f"Room with ID {room_id} not found.")
+        return room.price
 
     def get_room_number(self, room_id):
         """Return the room_number for the given room_id."""
-        conn = self.connect()
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT room_number
-            FROM rooms
-            WHERE room_id = ?
-        """, (room_id,))
-
-        row = cur.fetchone()
-        return row[0] if row else None
+        room = self.inventory.snapshot().get(room_id=room_id)
+        return room.room_number if room else None
 
+    @cached("rooms")
     def get_rooms_filtered(self, room_number="", available=None,
                            smoking=None, capacity=None):
         conn = self.connect()
@@ -315,43 +437,63 @@ class DatabaseManager:
 
         return rows
 
-    def update_room(self, room_id, new_price, new_is_available):
+    def update_room(self, room_id, new_price, in_service):
+        """Update a room's price and its manual in-service flag, then recompute its availability for today."""
         conn = self.connect()
         cursor = conn.cursor()
 
         cursor.execute(
-            "UPDATE rooms SET price = ?, is_available = ? WHERE room_id = ?",
-            (new_price, new_is_available, room_id),
+            "UPDATE rooms SET price = ?, out_of_service = ? WHERE room_id = ?",
+            (new_price, 0 if in_service else 1, room_id),
         )
+        self.refresh_room_availability([room_id], conn=conn)
         conn.commit()
         conn.close()
+        self.inventory.invalidate()
 
-    def update_room_availability_today(self):
-        today = date.today().isoformat()
-
-        conn = self.connect()
-        cur = conn.cursor()
-
-        # Reset all rooms to available
-        cur.execute("UPDATE rooms SET is_available = 1")
-
-        # Find reservations active today
-        cur.execute("""
-            SELECT room_id FROM reservations
-            WHERE status != 'Cancelled'
-              AND check_in_date <= ?
-              AND check_out_date > ?
-        """, (today, today))
-
-        rooms_to_block = cur.fetchall()  # [(1,), (4,), (12,), ...]
-
-        # Mark those rooms unavailable
-        cur.executemany(
-            "UPDATE rooms SET is_available = 0 WHERE room_id = ?",
-            rooms_to_block
-        )
+    def update_room_availability_today(self, business_date: date = None):
+        """Bring every room's is_available flag in line with today's occupancy. Returns the number of rows changed."""
+        return self.refresh_room_availability(business_date=business_date)
 
-        conn.commit()
+    def refresh_room_availability(self, room_ids=None, business_date: date = None, conn=None) -> int:
+        """
+        Recompute is_available for the given rooms (all rooms when room_ids is None) and write only the rows
+        whose flag actually changes. Out-of-service rooms stay unavailable; the manual flag itself is never touched.
+        When `conn` is given the update runs inside the caller's transaction and is not committed here.
+        Returns the number of rooms whose flag changed.
+
+        A SELECT checks for a stale room first and the UPDATE runs only when there is one: an UPDATE counts as a
+        write to rooms for the QueryCache and RoomInventory even when it changes no row, and most bookings
+        (future stays) leave every flag as it was.
+        """
+        params = {"today": to_day(business_date or date.today())}
+        stale_filter = f"is_available != ({self.AVAILABILITY_EXPR})"
+        if room_ids is not None:
+            room_ids = list(room_ids)
+            if not room_ids:
+                return 0
+            placeholders = ", ".join(f":r{i}" for i in range(len(room_ids)))
+            stale_filter += f" AND room_id IN ({placeholders})"
+            params.update({f"r{i}": room_id for i, room_id in enumerate(room_ids)})
+
+        own_conn = conn is None
+        if own_conn:
+            conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(f"SELECT 1 FROM rooms WHERE {stale_filter} LIMIT 1", params)
+            if cur.fetchone() is None:
+                return 0
+            # The same filter rather than a list of the stale ids: the trace hook gets the expanded statement once
+            # per trigger step, so an UPDATE carrying thousands of ids made a whole-hotel refresh quadratic
+            cur.execute(f"UPDATE rooms SET is_available = ({self.AVAILABILITY_EXPR}) WHERE {stale_filter}", params)
+            changed = cur.rowcount
+            if own_conn:
+                conn.commit()
+            return changed
+        finally:
+            if own_conn:
+                conn.close()
 
     # ---------------------------------------------------
     # Reservation Methods
@@ -376,12 +518,11 @@ class DatabaseManager:
     
     def get_guest_reservations(self, email : str):
         """
-        Return all reservations for a guest by email (case insensitive)
+        Return all reservations for a guest by email (case insensitive), archived stays included
         Each row includes: 
         all reservation columns, guest first_name, last_name, room number
         """
         conn = self.connect()
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         try:
             cur.execute(
@@ -392,7 +533,7 @@ class DatabaseManager:
                     g.last_name,
                     g.email,
                     rm.room_number
-                FROM reservations r
+                FROM reservations_all r
                 JOIN guests g ON r.guest_id = g.guest_id
                 JOIN rooms rm ON r.room_id = rm.room_id
                 WHERE LOWER(g.email) = LOWER(?)
@@ -407,7 +548,7 @@ class DatabaseManager:
     def get_all_rooms_status(self, target_date: str):
         """
         Return status of all rooms for a given date (YYYY-MM-DD)
-        Each item is a dict: 
+        Each item is a RoomRecord (row["col"] / row.col access):
         {
             "room_id": int,
             "room_number": int,
@@ -415,51 +556,28 @@ class DatabaseManager:
             "smoking": int,
             "capacity": int,
             "price": float,
-            "is_available": bool
+            "is_available": int (1 = free on target_date)
         }
         """
         conn = self.connect()
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         try:
             cur.execute(
                 """
-                Select room_id, room_number, room_type, smoking, capacity, price
-                From rooms
-                """
+                Select rm.room_id, rm.room_number, rm.room_type, rm.smoking, rm.capacity, rm.price,
+                       Not Exists (
+                           Select 1
+                           From reservations r
+                           Where r.room_id = rm.room_id
+                             And r.status != 'Cancelled'
+                             And r.check_in_day <= :day
+                             And r.check_out_day > :day
+                       ) As is_available
+                From rooms rm
+                """,
+                {"day": to_day(target_date)},
             )
-            rooms = cur.fetchall()
-            results = []
-            
-            for room in rooms: 
-                room_id = room["room_id"]
-
-                #Check if there is any overlapping reservations
-                cur.execute(
-                    """
-                    Select 1
-                    From reservations 
-                    Where room_id = ?
-                      And status != 'Cancelled'
-                      And check_in_date <= ?
-                      And check_out_date > ?
-                    Limit 1
-                    """, 
-                    (room_id, target_date, target_date)
-                )
-                is_taken = cur.fetchone() is not None
-                results.append(
-                    {
-                        "room_id": room["room_id"],
-                        "room_number": room["room_number"],
-                        "room_type": room["room_type"],
-                        "smoking": room["smoking"],
-                        "capacity": room["capacity"],
-                        "price": room["price"],
-                        "is_available": not is_taken,
-                    }
-                )
-            return results
+            return cur.fetchall()
         finally: 
             conn.close()
 
@@ -517,7 +635,6 @@ class DatabaseManager:
     def execute_query(self, query: str, params: tuple = (), fetch_all: bool = True):
         """Execute a given SQL query and return the results. Commits modifications automatically."""
         conn = self.connect()
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         try:
             cur.execute(query, params)
@@ -530,7 +647,6 @@ class DatabaseManager:
 
     def is_room_available(self, room_number: int, check_in_date: str | None = None, check_out_date: str | None = None) -> bool:
         conn = self.connect()
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         try:
             # Basic availability flag check first
@@ -551,19 +667,20 @@ class DatabaseManager:
                 SELECT 1 FROM reservations
                 WHERE room_id = ?
                   AND status IN ({placeholders})
-                  AND NOT (check_out_date <= ? OR check_in_date >= ?)
+                  AND NOT (check_out_day <= ? OR check_in_day >= ?)
                 LIMIT 1
                 """,
-                (room[0], *occ, check_in_date, check_out_date)
+                (room[0], *occ, to_day(check_in_date), to_day(check_out_date))
             )
             return cur.fetchone() is None
         finally:
             conn.close()
 
     # Can be removed if reserve_room has same functionality
+    @cached("rooms", "reservations")
     def get_available_rooms(self, check_in_date, check_out_date, num_guests, include_smoking):
-        check_in = check_in_date.isoformat()
-        check_out = check_out_date.isoformat()
+        check_in = to_day(check_in_date)
+        check_out = to_day(check_out_date)
         occ = self.OCCUPIED_STATUSES
         occ_placeholders = ", ".join(["?"] * len(occ))
 
@@ -578,9 +695,9 @@ class DatabaseManager:
                 ON r.room_id = res.room_id
                 AND res.status IN ({occ_placeholders})
                 AND NOT (
-                    res.check_out_date <= ?
+                    res.check_out_day <= ?
                     OR
-                    res.check_in_date >= ?
+                    res.check_in_day >= ?
                 )
             WHERE r.capacity >= ?
               AND (? = 1 OR r.smoking = 0)
@@ -612,86 +729,14 @@ class DatabaseManager:
         results = []
 
         try:
-            conn = self.connect()
-            conn.row_factory = sqlite3.Row
+            # Rows are formatted for the UI table in SQL and returned as plain tuples
+            conn = self.connect(raw=True)
             cur = conn.cursor()
-
-            query = (
-                "SELECT r.reservation_id, r.guest_id, "
-                "g.first_name || ' ' || g.last_name AS guest_name, "
-                "r.room_id, rm.room_number, r.check_in_date, "
-                "r.check_out_date, r.total_price, "
-                "r.is_paid, "  # <--- NEW COLUMN
-                "r.status "
-                "FROM reservations r "
-                "LEFT JOIN guests g ON r.guest_id = g.guest_id "
-                "LEFT JOIN rooms rm ON r.room_id = rm.room_id "
-                "WHERE 1=1"
+            query, params = self._filtered_reservations_query(
+                guest_name, room_number, status, checkin_after, checkout_before, show_active
             )
-            params = []
-
-            # Guest filter
-            if guest_name:
-                query += " AND (g.first_name || ' ' || g.last_name) LIKE ?"
-                params.append(f"%{guest_name}%")
-
-            # Room filter
-            if room_number:
-                query += " AND rm.room_number LIKE ?"
-                params.append(f"%{room_number}%")
-
-            # Status filter
-            if status:
-                query += " AND r.status = ?"
-                params.append(status)
-
-            # Check-in after
-            if checkin_after:
-                query += " AND r.check_in_date >= ?"
-                params.append(checkin_after)
-
-            # Check-out before
-            if checkout_before:
-                query += " AND r.check_out_date <= ?"
-                params.append(checkout_before)
-
-            # Active/Inactive filter
-            if show_active:
-                query += " AND r.status IN ('Confirmed', 'Checked-in', 'Late', 'Late Check-out')"
-            else:
-                query += " AND r.status IN ('Cancelled', 'Complete')"
-
-            # Priority ordering
-            query += """
-                ORDER BY 
-                    CASE 
-                        WHEN r.status = 'Late Check-out' THEN 1
-                        WHEN r.status = 'Late' THEN 2
-                        WHEN r.status = 'Checked-in' THEN 3
-                        ELSE 99
-                    END,
-                    r.check_in_date DESC
-            """
-
             cur.execute(query, params)
-            rows = cur.fetchall()
-
-            # Normalize result format for UI table
-            results = [
-                (
-                    r["reservation_id"],
-                    r["guest_id"],
-                    r["guest_name"] or "",
-                    r["room_id"],
-                    r["room_number"] or "",
-                    r["check_in_date"],
-                    r["check_out_date"],
-                    f"{r['total_price']:.2f}" if isinstance(r["total_price"], (float, int)) else r["total_price"],
-                    "Yes" if r["is_paid"] == 1 else "No",  # <--- CLEAN DISPLAY
-                    r["status"],
-                )
-                for r in rows
-            ]
+            results = cur.fetchall()
 
         except sqlite3.Error as e:
             print("Database error:", e)
@@ -702,6 +747,169 @@ class DatabaseManager:
 
         return results
 
+    @staticmethod
+    def _filtered_reservations_query(guest_name, room_number, status, checkin_after, checkout_before,
+                                     show_active, changed_ids_sql=None):
+        """SQL and parameters behind get_filtered_reservations. changed_ids_sql (a SELECT of reservation ids with
+        its own placeholders at the end of params) restricts the result to those reservations."""
+        query = (
+            "SELECT r.reservation_id, r.guest_id, "
+            "COALESCE(g.first_name || ' ' || g.last_name, '') AS guest_name, "
+            "r.room_id, COALESCE(rm.room_number, '') AS room_number, r.check_in_date, "
+            "r.check_out_date, "
+            "CASE WHEN typeof(r.total_price) IN ('integer', 'real') "
+            "THEN printf('%.2f', r.total_price) ELSE r.total_price END AS total_price, "
+            "CASE WHEN r.is_paid = 1 THEN 'Yes' ELSE 'No' END AS is_paid, "
+            "r.status "
+            # Closed stays may have been archived; only the inactive list needs them
+            f"FROM {'reservations' if show_active else 'reservations_all'} r "
+            "LEFT JOIN guests g ON r.guest_id = g.guest_id "
+            "LEFT JOIN rooms rm ON r.room_id = rm.room_id "
+            "WHERE 1=1"
+        )
+        params = []
+
+        # Guest filter
+        if guest_name:
+            query += " AND (g.first_name || ' ' || g.last_name) LIKE ?"
+            params.append(f"%{guest_name}%")
+
+        # Room filter
+        if room_number:
+            query += " AND rm.room_number LIKE ?"
+            params.append(f"%{room_number}%")
+
+        # Status filter
+        if status:
+            query += " AND r.status = ?"
+            params.append(status)
+
+        # Check-in after
+        if checkin_after:
+            query += " AND r.check_in_date >= ?"
+            params.append(checkin_after)
+
+        # Check-out before
+        if checkout_before:
+            query += " AND r.check_out_date <= ?"
+            params.append(checkout_before)
+
+        # Active/Inactive filter
+        if show_active:
+            query += " AND r.status IN ('Confirmed', 'Checked-in', 'Late', 'Late Check-out')"
+        else:
+            query += " AND r.status IN ('Cancelled', 'Complete')"
+
+        # Delta: only the given reservations
+        if changed_ids_sql:
+            query += f" AND r.reservation_id IN ({changed_ids_sql})"
+
+        # Priority ordering
+        query += """
+            ORDER BY 
+                CASE 
+                    WHEN r.status = 'Late Check-out' THEN 1
+                    WHEN r.status = 'Late' THEN 2
+                    WHEN r.status = 'Checked-in' THEN 3
+                    ELSE 99
+                END,
+                r.check_in_date DESC
+        """
+        return query, params
+
+    # ---------------------------------------------------
+    # Change Tracking
+    # ---------------------------------------------------
+    def current_change_seq(self):
+        """Latest change_seq handed out. Take it BEFORE a full load and pass it to changes_since() afterwards."""
+        conn = self.connect(raw=True)
+        try:
+            return conn.execute("SELECT value FROM change_sequence WHERE id = 1").fetchone()[0]
+        finally:
+            conn.close()
+
+    def changes_since(self, seq, tables=None):
+        """
+        Rows of rooms/guests/reservations inserted or updated after change_seq `seq`, and ids deleted after it.
+        Returns {"seq": new watermark, "changed": {table: [records]}, "deleted": {table: [ids]}}.
+        """
+        tables = tuple(tables or self.CHANGE_TRACKED_TABLES)
+        for table in tables:
+            if table not in self.CHANGE_TRACKED_TABLES:
+                raise ValueError(f"{table} is not change-tracked")
+
+        conn = self.connect()
+        try:
+            # One read transaction so the watermark and the rows come from the same snapshot
+            conn.execute("BEGIN")
+            watermark = conn.execute("SELECT value FROM change_sequence WHERE id = 1").fetchone()[0]
+            changed = {
+                table: conn.execute(
+                    f"SELECT * FROM {table} WHERE change_seq > ? ORDER BY change_seq", (seq,)
+                ).fetchall()
+                for table in tables
+            }
+            deleted = {table: [] for table in tables}
+            placeholders = ", ".join("?" for _ in tables)
+            for table_name, row_id in conn.execute(
+                    f"SELECT table_name, row_id FROM change_tombstones "
+                    f"WHERE change_seq > ? AND table_name IN ({placeholders}) ORDER BY change_seq",
+                    (seq, *tables)):
+                deleted[table_name].append(row_id)
+            conn.commit()
+        finally:
+            conn.close()
+
+        return {"seq": watermark, "changed": changed, "deleted": deleted}
+
+    def get_filtered_reservation_changes(
+            self,
+            since_seq,
+            guest_name=None,
+            room_number=None,
+            status=None,
+            checkin_after=None,
+            checkout_before=None,
+            show_active=True
+    ):
+        """
+        Delta for a get_filtered_reservations() result loaded at watermark `since_seq`.
+        A reservation counts as touched when it, its guest or its room changed, or it was deleted.
+        Returns (new watermark, rows in get_filtered_reservations format for touched reservations that still match,
+        ids of touched reservations that no longer match or were deleted).
+        """
+        touched_parts = ["SELECT reservation_id FROM reservations WHERE change_seq > ?"]
+        # The inactive list also shows archived stays, whose guest or room can still change
+        for table in ("reservations",) if show_active else ("reservations", "reservations_archive"):
+            touched_parts += [
+                f"SELECT r.reservation_id FROM guests g JOIN {table} r ON r.guest_id = g.guest_id "
+                "WHERE g.change_seq > ?",
+                f"SELECT r.reservation_id FROM rooms rm JOIN {table} r ON r.room_id = rm.room_id "
+                "WHERE rm.change_seq > ?",
+            ]
+        # Deleted ids are looked up again: an archived reservation left a tombstone but still matches inactive filters
+        touched_parts.append(
+            "SELECT row_id FROM change_tombstones WHERE table_name = 'reservations' AND change_seq > ?")
+        touched_sql = " UNION ".join(touched_parts)
+        touched_params = [since_seq] * len(touched_parts)
+        query, params = self._filtered_reservations_query(
+            guest_name, room_number, status, checkin_after, checkout_before, show_active,
+            changed_ids_sql=touched_sql
+        )
+
+        conn = self.connect(raw=True)
+        try:
+            conn.execute("BEGIN")
+            watermark = conn.execute("SELECT value FROM change_sequence WHERE id = 1").fetchone()[0]
+            touched = {row[0] for row in conn.execute(touched_sql, touched_params)}
+            rows = conn.execute(query, params + touched_params).fetchall() if touched else []
+            conn.commit()
+        finally:
+            conn.close()
+
+        removed = touched - {row[0] for row in rows}
+        return watermark, rows, sorted(removed)
+
     # ---------------------------------------------------
     # Employee Methods
     # ---------------------------------------------------
@@ -898,31 +1106,21 @@ class DatabaseManager:
 
 
     def generate_unique_employee_id(self):
-        """Generate a unique 5-digit ID (10000–99999)."""
-        try:
-            conn = self.connect()
-            cur = conn.cursor()
-
-            while True:
-                new_id = random.randint(10000, 99999)
-                cur.execute("SELECT 1 FROM employees WHERE employee_id = ?", (new_id,))
-                if not cur.fetchone():
-                    return new_id
-
-        finally:
-            conn.close()
+        """Generate a unique employee ID (5 digits, widening to 6+ once the 5-digit space is used up)."""
+        return self.id_allocator.allocate("employees")
 
     #------------------------------------------
     # DAILY RESERVATION START UP METHODS BELOW
     #------------------------------------------
-    def run_daily_reservation_updates(self):
-        self.mark_late_reservations()
-        self.mark_late_checkouts()
-        self.cancel_expired_late_reservations()
+    def run_daily_reservation_updates(self, now: datetime = None):
+        now = now or datetime.now()
+        self.mark_late_reservations(now.date())
+        self.mark_late_checkouts(now)
+        self.cancel_expired_late_reservations(now)
 
-    def mark_late_reservations(self):
+    def mark_late_reservations(self, business_date: date = None):
         """Mark reservations as 'Late' if yesterday was their check-in date and they never checked in."""
-        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        yesterday = ((business_date or date.today()) - timedelta(days=1)).isoformat()
 
         conn = self.connect()
         cur = conn.cursor()
@@ -937,78 +1135,66 @@ class DatabaseManager:
         """, (yesterday,))
 
         conn.commit()
+        conn.close()
 
-    def mark_late_checkouts(self):
+    def mark_late_checkouts(self, now: datetime = None):
         """
         Marks all reservations whose checkout date is today and
         are not checked out by 12:00 PM as 'Late Check-out'.
         """
 
-        now = datetime.now()
-        today = date.today()
+        now = now or datetime.now()
+        today = now.date()
 
         # Only run the check if it's at or past noon
         if now.time() < time(12, 0):
             return  # before noon → do nothing
 
-        with self.connect() as conn:
-            cursor = conn.cursor()
-
-            # Select reservations with:
-            # - checkout today
-            # - status NOT 'Checked-out'
-            # - status NOT already 'Late Check-out'
-            cursor.execute("""
-                SELECT reservation_id
-                FROM reservations
+        conn = self.connect()
+        try:
+            # One UPDATE for every reservation that:
+            # - checks out today
+            # - is not Complete, already 'Late Check-out', or 'Late'
+            conn.execute("""
+                UPDATE reservations
+                SET status = 'Late Check-out'
                 WHERE check_out_date = ?
                   AND status NOT IN ('Complete', 'Late Check-out', 'Late')
             """, (today.isoformat(),))
-
-            late_res_list = cursor.fetchall()
-
-            for (res_id,) in late_res_list:
-                cursor.execute("""
-                    UPDATE reservations
-                    SET status = 'Late Check-out'
-                    WHERE reservation_id = ?
-                """, (res_id,))
-
             conn.commit()
+        finally:
+            conn.close()
 
     from datetime import datetime, date, time, timedelta
 
-    def cancel_expired_late_reservations(self):
+    def cancel_expired_late_reservations(self, now: datetime = None):
         """
         Cancel reservations with status 'Late' if it has been 24 hours
         past their check-in time (check-in time is 2:00 PM).
         """
-        now = datetime.now()
+        now = now or datetime.now()
 
-        conn = self.connect()
-        cur = conn.cursor()
+        # Check-in time is 2:00 PM, so a reservation has expired once now >= check_in_date + 38 hours,
+        # i.e. check_in_date <= (now - 38h).date(). Filtering in SQL avoids reading every Late row.
+        cutoff = (now - timedelta(hours=14 + 24)).date().isoformat()
 
-        # Get all reservations marked as Late
-        cur.execute("""
-            SELECT reservation_id, check_in_date
-            FROM reservations
-            WHERE status = 'Late' OR status = 'Late Check-out'
-        """)
-
-        late_reservations = cur.fetchall()
-
-        for reservation_id, check_in_str in late_reservations:
-            check_in_date = datetime.fromisoformat(check_in_str).date()
-
-            # Build the actual check-in datetime: check-in date at 2:00 PM
-            check_in_datetime = datetime.combine(check_in_date, time(14, 0))
-
-            # If more than 24 hours have passed since check-in time → cancel
-            if now >= check_in_datetime + timedelta(hours=24):
-                if self.hotel_manager:
-                    self.hotel_manager.cancel_reservation(reservation_id)
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT reservation_id
+                FROM reservations
+                WHERE status IN ('Late', 'Late Check-out')
+                  AND check_in_date <= ?
+            """, (cutoff,))
+            expired = [row[0] for row in cur.fetchall()]
+        finally:
+            conn.close()
 
-        conn.close()
+        # Each cancellation goes through HotelManager's fee logic in its own transaction
+        if self.hotel_manager:
+            for reservation_id in expired:
+                self.hotel_manager.cancel_reservation(reservation_id)
 
     def get_manager_metrics(self):
         """
@@ -1018,6 +1204,7 @@ class DatabaseManager:
         cur = conn.cursor()
 
         today = date.today().isoformat()
+        today_day = to_day(today)
 
         try:
             # --- BASIC ROOM DATA ---
@@ -1036,10 +1223,10 @@ class DatabaseManager:
                     FROM reservations r
                     WHERE r.room_id = rm.room_id
                       AND r.status != 'Cancelled'
-                      AND r.check_in_date <= ?
-                      AND r.check_out_date > ?
+                      AND r.check_in_day <= ?
+                      AND r.check_out_day > ?
                 )
-            """, (today, today))
+            """, (today_day, today_day))
             available_rooms_today = cur.fetchone()[0] or 0
 
             rooms_occupied_today = total_rooms - available_rooms_today
@@ -1055,10 +1242,12 @@ class DatabaseManager:
             """)
             active_reservations = cur.fetchone()[0] or 0
 
+            # All-time figures below include archived stays (reservations_all); the "today" ones never need them
+
             # --- CANCELLED ---
             cur.execute("""
                 SELECT COUNT(*)
-                FROM reservations
+                FROM reservations_all
                 WHERE status = 'Cancelled'
             """)
             cancelled_reservations = cur.fetchone()[0] or 0
@@ -1066,7 +1255,7 @@ class DatabaseManager:
             # --- TOTAL REVENUE ---
             cur.execute("""
                 SELECT COALESCE(SUM(total_price), 0)
-                FROM reservations
+                FROM reservations_all
                 WHERE status != 'Cancelled'
             """)
             revenue = cur.fetchone()[0] or 0.0
@@ -1075,8 +1264,8 @@ class DatabaseManager:
             cur.execute("""
                 SELECT 
                     COALESCE(SUM(total_price), 0) AS revenue,
-                    COALESCE(SUM(julianday(check_out_date) - julianday(check_in_date)), 0) AS nights
-                FROM reservations
+                    COALESCE(SUM(check_out_day - check_in_day), 0) AS nights
+                FROM reservations_all
                 WHERE status != 'Cancelled'
             """)
             rev, nights = cur.fetchone()
@@ -1108,8 +1297,8 @@ class DatabaseManager:
                 SELECT COUNT(*)
                 FROM reservations
                 WHERE status != 'Cancelled'
-                  AND check_in_date BETWEEN ? AND date(?, '+7 days')
-            """, (today, today))
+                  AND check_in_day BETWEEN ? AND ?
+            """, (today_day, today_day + 7))
             upcoming_res = cur.fetchone()[0] or 0
 
             # --- ROOMS OUT OF SERVICE ---
@@ -1118,8 +1307,8 @@ class DatabaseManager:
 
             # --- AVERAGE STAY LENGTH ---
             cur.execute("""
-                SELECT AVG(julianday(check_out_date) - julianday(check_in_date))
-                FROM reservations
+                SELECT AVG(check_out_day - check_in_day)
+                FROM reservations_all
                 WHERE status != 'Cancelled'
             """)
             avg_stay = cur.fetchone()[0] or 0
@@ -1137,7 +1326,7 @@ class DatabaseManager:
             # --- OUTSTANDING BALANCE ---
             cur.execute("""
                 SELECT COALESCE(SUM(total_price), 0)
-                FROM reservations
+                FROM reservations_all
                 WHERE is_paid = 0
                   AND status != 'Cancelled'
             """)
@@ -1146,7 +1335,7 @@ class DatabaseManager:
             # --- POPULAR ROOM TYPE ---
             cur.execute("""
                 SELECT rm.room_type, COUNT(*)
-                FROM reservations r
+                FROM reservations_all r
                 JOIN rooms rm ON rm.room_id = r.room_id
                 WHERE r.status != 'Cancelled'
                 GROUP BY rm.room_type
@@ -1159,7 +1348,7 @@ class DatabaseManager:
             # --- AVG GROUP SIZE ---
             cur.execute("""
                 SELECT AVG(num_guests)
-                FROM reservations
+                FROM reservations_all
                 WHERE status != 'Cancelled'
             """)
             avg_group = cur.fetchone()[0] or 0
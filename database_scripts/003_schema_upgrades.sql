@@ -0,0 +1,307 @@
+-- Module: 003_schema_upgrades.sql
+-- Date: 10/19/2026
+-- Programmer(s): Keano
+--
+-- Description:
+-- This script holds additive schema changes that were introduced after the original tables in
+-- `001_create_tables.sql`. Unlike the first two scripts, it is executed by DatabaseManager every time a
+-- database is opened (not only on first run), so every statement in this file MUST be idempotent
+-- (CREATE ... IF NOT EXISTS). Column additions to existing tables cannot be expressed idempotently in SQLite
+-- and are handled in Python by DatabaseManager.SCHEMA_COLUMN_UPGRADES before this script runs.
+--
+-- Important Statements:
+-- - CREATE TABLE job_runs: One row per (job, business date) recording the last run of a scheduled
+--   maintenance job. Used by job_scheduler.py so each job runs at most once per business date.
+-- - CREATE TABLE id_sequences: Counters for the public reservation/employee IDs (id_allocator.py).
+-- - CREATE TABLE rate_rules: Seasonal, day-of-week and length-of-stay price adjustments (rate_plans.py).
+-- - CREATE TABLE table_versions: Per-table write counters read by query_cache.py and change_notifier.py.
+--   The triggers that bump them are created by DatabaseManager (VERSIONED_TABLES) for the tables that exist.
+-- - CREATE TABLE change_sequence / change_tombstones and the trg_<table>_change_* triggers: Stamp every written
+--   room, guest and reservation with the next global change_seq (and updated_at), and record deleted ids, so
+--   DatabaseManager.changes_since(seq) can return only what changed after a watermark.
+-- - CREATE TABLE email_outbox: Outgoing emails (reservation receipts) waiting to be sent, with their delivery
+--   status. Rows are written by the booking screens and sent in batches by email_outbox.py.
+-- - CREATE TABLE reservations_archive / VIEW reservations_all: Closed (Cancelled/Complete) reservations moved out
+--   of the hot reservations table by reservation_archive.py, and the UNION ALL of both tables read by history
+--   queries (inactive booking records, reservation search, all-time metrics).
+-- - check_in_day / check_out_day and the trg_reservations_stamp_* triggers: Integer day numbers kept next to the
+--   text stay dates, used by overlap checks, availability and night counts.
+--
+
+
+-- 1. JOB RUNS TABLE
+CREATE TABLE IF NOT EXISTS job_runs (
+    job_name TEXT NOT NULL,
+    business_date DATE NOT NULL,  -- 'YYYY-MM-DD'
+    status TEXT NOT NULL,         -- running, success, failed
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    duration_ms REAL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    error TEXT,
+
+    PRIMARY KEY (job_name, business_date)
+);
+
+-- 2. ROOM AVAILABILITY
+-- rooms.out_of_service (manual flag) is added by DatabaseManager.SCHEMA_COLUMN_UPGRADES.
+-- The per-room "held today" probe used to recompute rooms.is_available, and every stay overlap check, use
+-- idx_reservations_room_days (section 9).
+
+-- 3. ID SEQUENCES
+-- Counters behind id_allocator.py. next_value only ever grows; secret is the per-sequence permutation key.
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name TEXT PRIMARY KEY,          -- 'reservations', 'employees'
+    next_value INTEGER NOT NULL DEFAULT 0,
+    secret TEXT NOT NULL            -- hex key, created on first use
+);
+
+-- 4. RATE RULES
+-- Adjustments applied on top of rooms.price by rate_plans.py, in (priority, rule_id) order.
+-- NULL in room_type/start_date/end_date/days_of_week/min_nights means "no restriction".
+CREATE TABLE IF NOT EXISTS rate_rules (
+    rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    adjustment_type TEXT NOT NULL CHECK (adjustment_type IN ('percent', 'amount', 'fixed')),
+    adjustment REAL NOT NULL,       -- percent: -10 = 10% off; amount: added per night; fixed: nightly rate
+    room_type TEXT,
+    start_date DATE,                -- first night covered, inclusive
+    end_date DATE,                  -- last night covered, inclusive
+    days_of_week TEXT,              -- e.g. '4,5' = Friday and Saturday nights (0 = Monday)
+    min_nights INTEGER CHECK (min_nights IS NULL OR min_nights >= 1),
+    priority INTEGER NOT NULL DEFAULT 0,
+
+    CHECK (end_date IS NULL OR start_date IS NULL OR end_date >= start_date)
+);
+
+-- 5. TABLE VERSIONS
+-- version is bumped by AFTER INSERT/UPDATE/DELETE triggers on each table in DatabaseManager.VERSIONED_TABLES,
+-- so any connection (including other processes) can tell which tables changed since it last looked.
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+-- 6. CHANGE TRACKING
+-- One global sequence for rooms, guests and reservations, so a single watermark covers all three. Every insert
+-- and update stamps the row with the next value (change_seq) and the local time (updated_at); every delete leaves a
+-- tombstone with its own sequence value. change_seq and updated_at are added by
+-- DatabaseManager.SCHEMA_COLUMN_UPGRADES; rows written before tracking existed keep change_seq = 0.
+-- The update triggers skip their own stamping UPDATE (NEW.change_seq differs), even with recursive_triggers on.
+-- The insert triggers skip rows that arrive with their own updated_at: a bulk loader (generate_dataset.py) writes
+-- change_seq/updated_at in the INSERT itself, so each row costs no stamping UPDATE, counter bump or tombstone
+-- DELETE. An older insert trigger without this WHEN is dropped by DatabaseManager (SCHEMA_TRIGGER_UPGRADES).
+CREATE TABLE IF NOT EXISTS change_sequence (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    value INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO change_sequence (id, value) VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS change_tombstones (
+    table_name TEXT NOT NULL,       -- 'rooms', 'guests', 'reservations'
+    row_id INTEGER NOT NULL,        -- primary key of the deleted row
+    change_seq INTEGER NOT NULL,
+    deleted_at TEXT NOT NULL,
+
+    PRIMARY KEY (table_name, row_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_tombstones_seq ON change_tombstones (change_seq);
+
+CREATE INDEX IF NOT EXISTS idx_rooms_change_seq ON rooms (change_seq);
+
+CREATE TRIGGER IF NOT EXISTS trg_rooms_change_insert AFTER INSERT ON rooms
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    UPDATE rooms
+    SET change_seq = (SELECT value FROM change_sequence WHERE id = 1),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    WHERE room_id = NEW.room_id;
+    DELETE FROM change_tombstones WHERE table_name = 'rooms' AND row_id = NEW.room_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rooms_change_update AFTER UPDATE ON rooms
+WHEN NEW.change_seq = OLD.change_seq
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    UPDATE rooms
+    SET change_seq = (SELECT value FROM change_sequence WHERE id = 1),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    WHERE room_id = NEW.room_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rooms_change_delete AFTER DELETE ON rooms
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    INSERT OR REPLACE INTO change_tombstones (table_name, row_id, change_seq, deleted_at)
+    VALUES ('rooms', OLD.room_id, (SELECT value FROM change_sequence WHERE id = 1),
+            strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'));
+END;
+
+CREATE INDEX IF NOT EXISTS idx_guests_change_seq ON guests (change_seq);
+
+CREATE TRIGGER IF NOT EXISTS trg_guests_change_insert AFTER INSERT ON guests
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    UPDATE guests
+    SET change_seq = (SELECT value FROM change_sequence WHERE id = 1),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    WHERE guest_id = NEW.guest_id;
+    DELETE FROM change_tombstones WHERE table_name = 'guests' AND row_id = NEW.guest_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_guests_change_update AFTER UPDATE ON guests
+WHEN NEW.change_seq = OLD.change_seq
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    UPDATE guests
+    SET change_seq = (SELECT value FROM change_sequence WHERE id = 1),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    WHERE guest_id = NEW.guest_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_guests_change_delete AFTER DELETE ON guests
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    INSERT OR REPLACE INTO change_tombstones (table_name, row_id, change_seq, deleted_at)
+    VALUES ('guests', OLD.guest_id, (SELECT value FROM change_sequence WHERE id = 1),
+            strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'));
+END;
+
+CREATE INDEX IF NOT EXISTS idx_reservations_change_seq ON reservations (change_seq);
+
+-- Reservation inserts and updates are stamped by trg_reservations_stamp_* (section 9), which also fill the day
+-- number columns.
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_change_delete AFTER DELETE ON reservations
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    INSERT OR REPLACE INTO change_tombstones (table_name, row_id, change_seq, deleted_at)
+    VALUES ('reservations', OLD.reservation_id, (SELECT value FROM change_sequence WHERE id = 1),
+            strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'));
+END;
+
+-- 7. EMAIL OUTBOX
+-- message is the complete RFC 5322 text (headers, HTML body and inline logo). status moves
+-- pending -> sending -> sent, or back to pending with a later next_attempt_at after a temporary failure, or to
+-- failed. While a row is 'sending', next_attempt_at is the end of the sender's lease, so a row left behind by a
+-- crashed sender becomes due again.
+CREATE TABLE IF NOT EXISTS email_outbox (
+    email_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    to_address TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    message TEXT NOT NULL,
+    reservation_id INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT NOT NULL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at);
+
+-- 8. RESERVATION ARCHIVE
+-- Same columns as reservations (as of change tracking) plus archived_at. Rows keep their reservation_id, change_seq
+-- and updated_at when they are moved. Only reservation_archive.py writes here; nothing updates an archived row.
+CREATE TABLE IF NOT EXISTS reservations_archive (
+    reservation_id INTEGER PRIMARY KEY,
+    guest_id INTEGER NOT NULL,
+    room_id INTEGER NOT NULL,
+    check_in_date DATE NOT NULL,   -- 'YYYY-MM-DD'
+    check_out_date DATE NOT NULL,  -- 'YYYY-MM-DD'
+    num_guests INTEGER,
+    total_price REAL NOT NULL,
+    status TEXT NOT NULL,          -- Cancelled, Complete
+    is_paid INTEGER DEFAULT 0,
+    change_seq INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    archived_at TEXT NOT NULL,
+    check_in_day INTEGER,          -- days since 1970-01-01 (section 9)
+    check_out_day INTEGER,
+
+    FOREIGN KEY (guest_id) REFERENCES guests(guest_id) ON DELETE CASCADE,
+    FOREIGN KEY (room_id) REFERENCES rooms(room_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_reservations_archive_guest_id ON reservations_archive (guest_id);
+CREATE INDEX IF NOT EXISTS idx_reservations_archive_room_id ON reservations_archive (room_id);
+
+-- Finds the closed stays due for archiving, and serves the status-filtered counts on the hot table.
+CREATE INDEX IF NOT EXISTS idx_reservations_status_checkout ON reservations (status, check_out_date);
+
+-- Columns are listed (not *) so later column additions to reservations do not change the view. A view from before
+-- a listed column existed is dropped by DatabaseManager (SCHEMA_VIEW_UPGRADES) and recreated here.
+CREATE VIEW IF NOT EXISTS reservations_all AS
+    SELECT reservation_id, guest_id, room_id, check_in_date, check_out_date, num_guests, total_price, status,
+           is_paid, change_seq, updated_at, check_in_day, check_out_day
+    FROM reservations
+    UNION ALL
+    SELECT reservation_id, guest_id, room_id, check_in_date, check_out_date, num_guests, total_price, status,
+           is_paid, change_seq, updated_at, check_in_day, check_out_day
+    FROM reservations_archive;
+
+-- 9. DAY NUMBERS
+-- check_in_day / check_out_day hold the stay dates as days since 1970-01-01 (day_numbers.py), next to the
+-- 'YYYY-MM-DD' text columns that stay the public format. Overlap checks, availability and night counts compare and
+-- subtract these integers. The columns are added by DatabaseManager.SCHEMA_COLUMN_UPGRADES and are always derived
+-- from the text dates: the stamping triggers fill them on insert when the writer leaves them NULL (the application
+-- always does) and recompute them on every update. A bulk loader (generate_dataset.py) inserts them with the row,
+-- together with change_seq/updated_at, so its inserts skip the stamping trigger entirely.
+-- julianday('1970-01-01') = 2440587.5, so CAST(julianday(d) - 2440587.5 AS INTEGER) is the day number of d.
+
+-- Replaced by the stamping triggers below (same change tracking, plus the day numbers).
+DROP TRIGGER IF EXISTS trg_reservations_change_insert;
+DROP TRIGGER IF EXISTS trg_reservations_change_update;
+
+-- Replaces idx_reservations_room_dates: the same per-room range probe on integers.
+DROP INDEX IF EXISTS idx_reservations_room_dates;
+CREATE INDEX IF NOT EXISTS idx_reservations_room_days
+    ON reservations (room_id, check_in_day, check_out_day);
+
+-- Rows written before the columns existed. The partial indexes keep this check free once they are filled;
+-- a row whose text date is not a valid date keeps NULL and is skipped.
+CREATE INDEX IF NOT EXISTS idx_reservations_day_missing
+    ON reservations (reservation_id) WHERE check_in_day IS NULL;
+CREATE INDEX IF NOT EXISTS idx_reservations_archive_day_missing
+    ON reservations_archive (reservation_id) WHERE check_in_day IS NULL;
+
+UPDATE reservations
+SET check_in_day = CAST(julianday(check_in_date) - 2440587.5 AS INTEGER),
+    check_out_day = CAST(julianday(check_out_date) - 2440587.5 AS INTEGER)
+WHERE check_in_day IS NULL AND julianday(check_in_date) IS NOT NULL;
+
+UPDATE reservations_archive
+SET check_in_day = CAST(julianday(check_in_date) - 2440587.5 AS INTEGER),
+    check_out_day = CAST(julianday(check_out_date) - 2440587.5 AS INTEGER)
+WHERE check_in_day IS NULL AND julianday(check_in_date) IS NOT NULL;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_stamp_insert AFTER INSERT ON reservations
+WHEN NEW.updated_at IS NULL
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    UPDATE reservations
+    SET change_seq = (SELECT value FROM change_sequence WHERE id = 1),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'),
+        check_in_day = COALESCE(NEW.check_in_day, CAST(julianday(NEW.check_in_date) - 2440587.5 AS INTEGER)),
+        check_out_day = COALESCE(NEW.check_out_day, CAST(julianday(NEW.check_out_date) - 2440587.5 AS INTEGER))
+    WHERE reservation_id = NEW.reservation_id;
+    DELETE FROM change_tombstones WHERE table_name = 'reservations' AND row_id = NEW.reservation_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_stamp_update AFTER UPDATE ON reservations
+WHEN NEW.change_seq = OLD.change_seq
+BEGIN
+    UPDATE change_sequence SET value = value + 1 WHERE id = 1;
+    UPDATE reservations
+    SET change_seq = (SELECT value FROM change_sequence WHERE id = 1),
+        updated_at = strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime'),
+        check_in_day = CAST(julianday(NEW.check_in_date) - 2440587.5 AS INTEGER),
+        check_out_day = CAST(julianday(NEW.check_out_date) - 2440587.5 AS INTEGER)
+    WHERE reservation_id = NEW.reservation_id;
+END;
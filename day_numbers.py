@@ -0,0 +1,63 @@
+"""
+Module: day_numbers.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module converts between the 'YYYY-MM-DD' date strings the application passes around and day numbers: the
+count of days since 1970-01-01. Reservations store both. The strings stay the public format (screens, receipts,
+search filters and every DatabaseManager/HotelManager argument still use them), while the integer check_in_day and
+check_out_day columns serve the hot queries. With them an overlap check is two integer comparisons on an index, and
+a night count is a subtraction instead of two julianday() calls per row.
+
+Usage:
+    to_day("2026-10-19")          # 20745
+    to_iso(20745)                 # '2026-10-19'
+    nights = to_day(check_out) - to_day(check_in)
+
+Important Functions:
+- to_day(value): Day number of a 'YYYY-MM-DD' string, date or datetime.
+  Output: int. Raises ValueError for a malformed string.
+- from_day(day): The date for a day number.
+- to_iso(day): The 'YYYY-MM-DD' string for a day number.
+- parse_date(text): Strict 'YYYY-MM-DD' parse. Same result and errors as datetime.strptime(text, "%Y-%m-%d").date().
+
+Important Data Structures:
+- EPOCH: date(1970, 1, 1), day number 0.
+
+Algorithms:
+- Day numbers are date.toordinal() shifted by the epoch's ordinal. In SQLite the same value is
+  CAST(julianday(d) - 2440587.5 AS INTEGER), since julianday('1970-01-01') is 2440587.5; the triggers in
+  003_schema_upgrades.sql fill the columns with it.
+- parse_date takes date.fromisoformat for the common well-formed case (about 10x faster than strptime) and falls
+  back to strptime for anything else, so inputs strptime used to accept (e.g. '2026-1-5') still parse.
+"""
+from datetime import date, datetime, timedelta
+
+EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+def parse_date(text):
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
+        try:
+            return date.fromisoformat(text)
+        except ValueError:
+            pass  # let strptime raise its usual message
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def to_day(value):
+    if isinstance(value, str):
+        value = parse_date(value)
+    elif isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def from_day(day):
+    return EPOCH + timedelta(days=day)
+
+
+def to_iso(day):
+    return from_day(day).isoformat()
@@ -0,0 +1,320 @@
+"""
+Module: db_instrumentation.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module times every SQL statement run on a connection from DatabaseManager.connect(). That covers
+execute_query, every DatabaseManager helper and the HotelManager transactions, including the time a
+"BEGIN IMMEDIATE" spends waiting for the write lock. Statements are grouped by fingerprint (the SQL with literals
+and IN lists collapsed), and each group records calls, errors, rows returned and total/max latency. A statement
+slower than the threshold also goes to a bounded slow-query log, together with its EXPLAIN QUERY PLAN.
+
+Usage:
+    db.query_stats.threshold_ms = 50            # default 100 ms
+    snapshot = db.query_stats.snapshot(top=10)  # for the metrics screen
+    for slow in db.query_stats.slow_queries(): print(slow.elapsed_ms, slow.sql, slow.plan)
+
+Important Functions:
+- QueryStats.record(fingerprint, sql, params, elapsed_ms, rows, error, conn): Add one finished statement.
+- QueryStats.snapshot(top=None, sort_by="total_ms"): Totals, per-statement stats and the slow-query log.
+  Output: dict (plain values, safe to show or serialize).
+- QueryStats.slow_queries(): The slow-query log, oldest first.
+  Output: list of SlowQuery.
+- QueryStats.reset(): Clear all counters and the slow-query log.
+- fingerprint(sql): Normalized statement text used as the grouping key.
+
+Important Data Structures:
+- StatementStats: Per-fingerprint counters (calls, errors, rows, total_ms, max_ms).
+- SlowQuery: One slow execution (fingerprint, sql, params, elapsed_ms, rows, plan, at).
+- InstrumentedConnection: TrackedConnection whose cursors are InstrumentedCursor. DatabaseManager.connect()
+  creates these.
+
+Algorithms:
+- Timing: InstrumentedCursor times execute/executemany/executescript plus every fetch on the cursor. A statement
+  is finished (and recorded) when its rows are exhausted, the cursor runs another statement, or the cursor or its
+  connection is closed. Statements with no result set are recorded right after execute.
+- InstrumentedConnection.execute/executemany/executescript go through cursor(), so shortcut calls are timed too.
+- Fingerprints: Whitespace is collapsed, string and number literals become ?, and "IN (?, ?, ...)" becomes
+  "IN (...)", so the same query with different arguments is one entry. Results are memoized per SQL string.
+- EXPLAIN QUERY PLAN runs on the same connection with the same parameters, on a plain cursor so it is not
+  timed itself. Plans are only taken for SELECT/WITH/INSERT/UPDATE/DELETE/REPLACE.
+"""
+import functools
+import re
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter
+
+from query_cache import TrackedConnection
+
+_WS_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_EXPLAINABLE_RE = re.compile(r"^\s*(?:SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """Normalize a statement so calls that differ only in literals share one entry."""
+    text = _STRING_RE.sub("?", sql)
+    text = _NUMBER_RE.sub("?", text)
+    text = _WS_RE.sub(" ", text).strip()
+    return _IN_LIST_RE.sub("IN (...)", text)
+
+
+@dataclass(slots=True)
+class StatementStats:
+    fingerprint: str
+    calls: int = 0
+    errors: int = 0
+    rows: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def as_dict(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": self.total_ms,
+            "mean_ms": self.mean_ms,
+            "max_ms": self.max_ms,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SlowQuery:
+    fingerprint: str
+    sql: str
+    params: tuple
+    elapsed_ms: float
+    rows: int
+    plan: tuple       # EXPLAIN QUERY PLAN detail lines, indented by depth
+    at: datetime
+
+    def as_dict(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "params": self.params,
+            "elapsed_ms": self.elapsed_ms,
+            "rows": self.rows,
+            "plan": list(self.plan),
+            "at": self.at.isoformat(timespec="seconds"),
+        }
+
+
+class QueryStats:
+    def __init__(self, threshold_ms=100.0, slow_log_size=200, enabled=True):
+        self.threshold_ms = threshold_ms
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._since = datetime.now()
+
+    def record(self, fp, sql, params, elapsed_ms, rows, error=False, conn=None):
+        with self._lock:
+            stats = self._statements.get(fp)
+            if stats is None:
+                stats = self._statements[fp] = StatementStats(fp)
+            stats.calls += 1
+            stats.rows += rows
+            stats.total_ms += elapsed_ms
+            if elapsed_ms > stats.max_ms:
+                stats.max_ms = elapsed_ms
+            if error:
+                stats.errors += 1
+        if elapsed_ms >= self.threshold_ms:
+            plan = self._explain(conn, sql, params) if conn is not None else ()
+            with self._lock:
+                self._slow.append(SlowQuery(fp, sql, _plain_params(params), elapsed_ms, rows, plan, datetime.now()))
+
+    @staticmethod
+    def _explain(conn, sql, params):
+        if params is None or not _EXPLAINABLE_RE.match(sql):
+            return ()
+        try:
+            # A plain cursor, so the EXPLAIN itself is not timed or recorded
+            cur = sqlite3.Connection.cursor(conn)
+            cur.row_factory = None
+            rows = cur.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        except (sqlite3.Error, ValueError):
+            return ()
+        depth = {0: -1}
+        lines = []
+        for node_id, parent_id, _unused, detail in rows:
+            depth[node_id] = depth.get(parent_id, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return tuple(lines)
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def snapshot(self, top=None, sort_by="total_ms"):
+        """Totals, the `top` statements by `sort_by` (total_ms, max_ms, mean_ms, calls, rows) and the slow log."""
+        with self._lock:
+            statements = [s.as_dict() for s in self._statements.values()]
+            slow = [q.as_dict() for q in self._slow]
+            since = self._since
+        statements.sort(key=lambda s: s[sort_by], reverse=True)
+        return {
+            "since": since.isoformat(timespec="seconds"),
+            "threshold_ms": self.threshold_ms,
+            "statements_run": sum(s["calls"] for s in statements),
+            "errors": sum(s["errors"] for s in statements),
+            "total_ms": sum(s["total_ms"] for s in statements),
+            "distinct_statements": len(statements),
+            "statements": statements[:top] if top else statements,
+            "slow_queries": slow,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+            self._since = datetime.now()
+
+
+def _plain_params(params):
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params) if params else ()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including fetching its rows."""
+
+    def __init__(self, conn):
+        super().__init__(conn)
+        self._pending = None    # [fingerprint, sql, params, elapsed seconds, rows]
+
+    def _run(self, method, sql, *args, params=()):
+        """Run method(self, sql, *args); `params` are the bindings kept for the slow log and EXPLAIN."""
+        self._finish()
+        stats = self.connection.query_stats
+        if stats is None or not stats.enabled:
+            return method(self, sql, *args)
+        start = perf_counter()
+        try:
+            method(self, sql, *args)
+        except Exception:
+            stats.record(fingerprint(sql), sql, params, (perf_counter() - start) * 1000, 0,
+                         error=True, conn=self.connection)
+            raise
+        self._pending = [fingerprint(sql), sql, params, perf_counter() - start, 0]
+        if self.description is None:
+            # No result set (writes, BEGIN/COMMIT, PRAGMA assignments); rowcount is the rows touched
+            self._pending[4] = max(self.rowcount, 0)
+            self._finish()
+        else:
+            # Keep the cursor alive until its rows are read or the connection closes, so a discarded
+            # `conn.execute(...).fetchone()` cursor is still recorded
+            self.connection._pending_cursors.add(self)
+        return self
+
+    def execute(self, sql, params=()):
+        return self._run(sqlite3.Cursor.execute, sql, params, params=params)
+
+    def executemany(self, sql, seq_of_params):
+        # No single set of bindings to explain with; the plan is skipped for these
+        return self._run(sqlite3.Cursor.executemany, sql, seq_of_params, params=None)
+
+    def executescript(self, script):
+        return self._run(sqlite3.Cursor.executescript, script, params=None)
+
+    def _timed_fetch(self, method, *args):
+        pending = self._pending
+        if pending is None:
+            return method(self, *args)
+        start = perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            pending[3] += perf_counter() - start
+
+    def fetchone(self):
+        row = self._timed_fetch(sqlite3.Cursor.fetchone)
+        if self._pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._pending[4] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(sqlite3.Cursor.fetchmany, self.arraysize if size is None else size)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(sqlite3.Cursor.fetchall)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def _finish(self):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        self.connection._pending_cursors.discard(self)
+        stats = self.connection.query_stats
+        if stats is not None:
+            fp, sql, params, elapsed, rows = pending
+            stats.record(fp, sql, params, elapsed * 1000, rows, conn=self.connection)
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class InstrumentedConnection(TrackedConnection):
+    """TrackedConnection whose cursors report to a QueryStats (set by DatabaseManager.connect())."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_stats = None
+        self._pending_cursors = set()
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # sqlite3.Connection's shortcuts build a plain Cursor internally, so route them through cursor()
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def close(self):
+        # Record statements whose rows were never fully fetched (e.g. a single fetchone())
+        for cur in list(self._pending_cursors):
+            cur._finish()
+        super().close()
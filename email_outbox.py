@@ -0,0 +1,377 @@
+"""
+Module: email_outbox.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module sends the hotel's outgoing emails (reservation receipts) from a background worker, not from the booking
+screen. A booking only inserts the finished message into the `email_outbox` table, so a slow or unreachable mail
+server never holds up the front desk, and a receipt is not lost if the app closes before it is sent. The worker
+sends due messages in batches over one SMTP session, and keeps that session open for the next batch. Temporary
+failures are retried with exponential backoff. Each row records its delivery status, attempts and last error.
+
+Usage:
+    outbox = EmailOutbox(db, smtp_server="smtp.gmail.com", smtp_port=587, username=..., password=...)
+    outbox.start()                                        # background worker thread
+    outbox.enqueue("guest@example.com", "Your Reservation Confirmation #1042", message, reservation_id=1042)
+
+Important Functions:
+- EmailOutbox.enqueue(to_address, subject, message, reservation_id=None): Store a message and wake the worker.
+  Input: message is an email.message.Message or its complete text.
+  Output: email_id (int).
+- EmailOutbox.enqueue_many(messages): enqueue() for many (to_address, subject, message, reservation_id) tuples
+  in one transaction, e.g. the output of receipt_renderer.render_many().
+  Output: number of rows stored.
+- EmailOutbox.process_due(now=None): Send every message that is due, in batches of batch_size.
+  Output: dict of counts {"sent", "retry", "failed"}.
+- EmailOutbox.start() / stop(): Start or stop the worker thread (stop also closes the SMTP session).
+- EmailOutbox.get_email(email_id) / status_counts(): Delivery status of one message / counts per status.
+
+Important Data Structures:
+- email_outbox table: One row per message with status (pending, sending, sent, failed), attempts,
+  next_attempt_at, last_error and sent_at.
+- _smtp / _last_used: The open SMTP session and when it last sent, so it is reused until idle_timeout.
+
+Algorithms:
+- Claiming: Inside a BEGIN IMMEDIATE transaction the worker selects up to batch_size rows that are due
+  (status pending or sending, next_attempt_at <= now) and marks them 'sending' with next_attempt_at = now + LEASE.
+  Two workers (two desks on the same database) never claim the same row. A row left in 'sending' by a crashed
+  worker becomes due again when its lease ends, so delivery is at least once.
+- Session reuse: One SMTP connection (EHLO, STARTTLS, login) sends the whole batch and stays open between
+  batches. Before reuse it is checked with NOOP. If the server drops it in the middle of a batch, the worker
+  reconnects once and resends the message. A second failure puts the rest of the batch back for a later retry.
+- Backoff: A temporary failure (4xx reply, connection error) reschedules the row
+  BASE_DELAY * 2 ** (attempts - 1) later, capped at MAX_DELAY. A permanent failure (5xx reply), or reaching
+  MAX_ATTEMPTS, marks it 'failed'.
+"""
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.message import Message
+
+from metrics_exporter import observe_email
+
+
+class _SessionLost(Exception):
+    """The SMTP session could not be kept or reopened; `error` is the underlying exception."""
+
+    def __init__(self, error):
+        super().__init__(str(error))
+        self.error = error
+
+
+class EmailOutbox:
+    BATCH_SIZE = 20
+    MAX_ATTEMPTS = 6
+    BASE_DELAY = timedelta(seconds=30)
+    MAX_DELAY = timedelta(hours=1)
+    LEASE = timedelta(minutes=5)
+
+    def __init__(self, db, smtp_server, smtp_port, username=None, password=None, from_address=None,
+                 use_tls=True, timeout=30, batch_size=BATCH_SIZE, poll_seconds=30, idle_timeout=60):
+        self.db = db
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self.from_address = from_address or username
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.idle_timeout = idle_timeout
+
+        self._smtp = None
+        self._last_used = None
+        self._lock = threading.Lock()   # one sender at a time per outbox (worker thread or a direct call)
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ---------------------------------------------------
+    # Queueing
+    # ---------------------------------------------------
+    def enqueue(self, to_address, subject, message, reservation_id=None):
+        """Store a message for sending and wake the worker. Returns the new email_id."""
+        if isinstance(message, Message):
+            message = message.as_string()
+        stamp = datetime.now().isoformat(timespec="seconds")
+        conn = self.db.connect()
+        try:
+            cur = conn.execute("""
+                INSERT INTO email_outbox (to_address, subject, message, reservation_id, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (to_address, subject, message, reservation_id, stamp, stamp))
+            conn.commit()
+            email_id = cur.lastrowid
+        finally:
+            conn.close()
+        self._wake.set()
+        return email_id
+
+    def enqueue_many(self, messages):
+        """Store (to_address, subject, message, reservation_id) tuples in one transaction. Returns the count."""
+        stamp = datetime.now().isoformat(timespec="seconds")
+        conn = self.db.connect()
+        try:
+            cur = conn.executemany("""
+                INSERT INTO email_outbox (to_address, subject, message, reservation_id, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, ((to_address, subject, message.as_string() if isinstance(message, Message) else message,
+                   reservation_id, stamp, stamp)
+                  for to_address, subject, message, reservation_id in messages))
+            conn.commit()
+            count = cur.rowcount
+        finally:
+            conn.close()
+        self._wake.set()
+        return count
+
+    def get_email(self, email_id):
+        rows = self.db.execute_query("""
+            SELECT email_id, to_address, subject, reservation_id, status, attempts, next_attempt_at,
+                   last_error, created_at, sent_at
+            FROM email_outbox WHERE email_id = ?
+        """, (email_id,))
+        return rows[0] if rows else None
+
+    def status_counts(self):
+        rows = self.db.execute_query("SELECT status, COUNT(*) FROM email_outbox GROUP BY status")
+        counts = {"pending": 0, "sending": 0, "sent": 0, "failed": 0}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+    # ---------------------------------------------------
+    # Sending
+    # ---------------------------------------------------
+    def process_due(self, now=None):
+        """Send every message due at `now`, batch by batch, until none are left."""
+        totals = {"sent": 0, "retry": 0, "failed": 0}
+        with self._lock:
+            while True:
+                claimed = self._claim(now or datetime.now())
+                if not claimed:
+                    break
+                for result, count in self._send_batch(claimed, now).items():
+                    totals[result] += count
+                if len(claimed) < self.batch_size or self._smtp is None:
+                    break   # done, or the server is unreachable and the rest can wait for the retry
+        return totals
+
+    def _claim(self, now):
+        """Atomically mark up to batch_size due rows as 'sending'. Returns [(email_id, to, message, attempts)]."""
+        stamp = now.isoformat(timespec="seconds")
+        conn = self.db.connect()
+        cur = conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute("""
+                SELECT email_id, to_address, message, attempts
+                FROM email_outbox
+                WHERE status IN ('pending', 'sending') AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, email_id
+                LIMIT ?
+            """, (stamp, self.batch_size))
+            claimed = [tuple(row) for row in cur.fetchall()]
+            if claimed:
+                lease_end = (now + self.LEASE).isoformat(timespec="seconds")
+                cur.executemany(
+                    "UPDATE email_outbox SET status = 'sending', next_attempt_at = ? WHERE email_id = ?",
+                    [(lease_end, row[0]) for row in claimed],
+                )
+            cur.execute("COMMIT")
+            return claimed
+        except Exception:
+            # BEGIN IMMEDIATE itself may have failed (another desk holds the write lock); nothing to roll back then
+            if conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _send_batch(self, claimed, now):
+        results = {"sent": 0, "retry": 0, "failed": 0}
+        conn = self.db.connect()
+        try:
+            try:
+                self._session()
+                lost, error = 0, None
+            except OSError as e:   # smtplib.SMTPException is an OSError too
+                lost, error = 0, e
+            else:
+                lost = None
+                for index, (email_id, to_address, message, attempts) in enumerate(claimed):
+                    try:
+                        self._deliver(to_address, message)
+                    except _SessionLost as e:
+                        lost, error = index, e.error
+                        break
+                    except smtplib.SMTPException as e:
+                        results[self._record_failure(conn, email_id, attempts, e, now,
+                                                     permanent=self._is_permanent(e))] += 1
+                        continue
+                    conn.execute("""
+                        UPDATE email_outbox
+                        SET status = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL
+                        WHERE email_id = ?
+                    """, (datetime.now().isoformat(timespec="seconds"), email_id))
+                    conn.commit()
+                    observe_email("sent")
+                    results["sent"] += 1
+
+            if lost is not None:
+                # Nothing more can be sent right now; the rest of the batch waits for its next attempt
+                for email_id, _, _, attempts in claimed[lost:]:
+                    results[self._record_failure(conn, email_id, attempts, error, now, permanent=False)] += 1
+            return results
+        finally:
+            conn.close()
+
+    def _deliver(self, to_address, message):
+        try:
+            self._smtp.sendmail(self.from_address, [to_address], message)
+            self._last_used = datetime.now()
+            return
+        except OSError as e:
+            if not self._connection_lost(e):
+                raise
+            self._close_session()
+
+        # The server closed the session under us; reconnect once and resend
+        try:
+            server = self._session()
+            server.sendmail(self.from_address, [to_address], message)
+        except OSError as e:
+            if isinstance(e, smtplib.SMTPException) and self._smtp is not None and not self._connection_lost(e):
+                raise   # the new session works; the server refused this message
+            self._close_session()
+            raise _SessionLost(e) from e
+        self._last_used = datetime.now()
+
+    def _record_failure(self, conn, email_id, attempts, error, now, permanent):
+        attempts += 1
+        if permanent or attempts >= self.MAX_ATTEMPTS:
+            status, result = "failed", "failed"
+            next_attempt = (now or datetime.now())
+        else:
+            status, result = "pending", "retry"
+            next_attempt = (now or datetime.now()) + self.backoff(attempts)
+        conn.execute("""
+            UPDATE email_outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+            WHERE email_id = ?
+        """, (status, attempts, next_attempt.isoformat(timespec="seconds"), repr(error), email_id))
+        conn.commit()
+        observe_email(result)
+        if result == "failed":
+            print(f"[EmailOutbox] Giving up on email {email_id} after {attempts} attempt(s): {error}")
+        return result
+
+    def backoff(self, attempts):
+        """Delay before the next try after `attempts` failed attempts."""
+        return min(self.BASE_DELAY * 2 ** (attempts - 1), self.MAX_DELAY)
+
+    @staticmethod
+    def _connection_lost(error):
+        """True for errors that mean the SMTP session is gone (as opposed to a refused message)."""
+        return isinstance(error, smtplib.SMTPServerDisconnected) or not isinstance(error, smtplib.SMTPException)
+
+    @staticmethod
+    def _is_permanent(error):
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            codes = [code for code, _ in error.recipients.values()]
+            return bool(codes) and all(code >= 500 for code in codes)
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code >= 500
+        return False
+
+    # ---------------------------------------------------
+    # SMTP session
+    # ---------------------------------------------------
+    def _session(self):
+        """The open SMTP session if it is still usable, otherwise a new one."""
+        if self._smtp is not None:
+            idle = (datetime.now() - self._last_used).total_seconds() if self._last_used else 0
+            if idle < self.idle_timeout:
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except OSError:
+                    pass
+            self._close_session()
+
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.use_tls:
+                server.starttls()
+                server.ehlo()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        self._last_used = datetime.now()
+        return server
+
+    def _close_session(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except OSError:
+            self._smtp.close()
+        self._smtp = None
+        self._last_used = None
+
+    # ---------------------------------------------------
+    # Background worker thread
+    # ---------------------------------------------------
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._wake.set()   # send whatever was left from the last run
+        self._thread = threading.Thread(target=self._loop, name="EmailOutbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            self._close_session()
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            self._wake.clear()
+            try:
+                self.process_due()
+            except Exception as e:
+                # Never let a database or mail hiccup kill the worker; the next wake-up retries
+                print(f"[EmailOutbox] Send pass failed: {e}")
+            self._wake.wait(self._seconds_until_next())
+            if not self._wake.is_set():
+                with self._lock:
+                    if self._smtp is not None and self._idle_seconds() >= self.idle_timeout:
+                        self._close_session()
+
+    def _seconds_until_next(self):
+        """Sleep until the next retry is due, the idle session should close, or poll_seconds at most."""
+        wait = self.poll_seconds
+        if self._smtp is not None:
+            wait = min(wait, max(0.0, self.idle_timeout - self._idle_seconds()))
+        try:
+            rows = self.db.execute_query(
+                "SELECT MIN(next_attempt_at) FROM email_outbox WHERE status IN ('pending', 'sending')")
+        except Exception:
+            return wait
+        if rows and rows[0][0]:
+            due = (datetime.fromisoformat(rows[0][0]) - datetime.now()).total_seconds()
+            wait = min(wait, max(due, 0.05))
+        return wait
+
+    def _idle_seconds(self):
+        return (datetime.now() - self._last_used).total_seconds() if self._last_used else 0.0
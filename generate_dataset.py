@@ -0,0 +1,321 @@
+"""
+Module: generate_dataset.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module generates large, deterministic synthetic hotels for scaling tests and benchmarks. Unlike
+populate_demo_data.py (50 random reservations on the existing rooms), it builds the whole rooms/guests/reservations
+data set from parameters: number of rooms, room type mix, years of history, target occupancy, cancellation and
+no-show rates, and a seed. The same parameters and seed always produce the same database.
+
+Usage:
+    python generate_dataset.py --db bench.db --rooms 10000 --years 1.2 --occupancy 0.7 --seed 1 --overwrite
+
+Important Functions:
+- generate(db_path, config): Build the data set into db_path.
+  Input: db_path (str), config (DatasetConfig).
+  Output: dict with the number of rooms, guests and reservations written per status.
+- years_for(rooms, reservations, occupancy): History length that yields about `reservations` stays.
+  Output: float (years)
+- main(argv): Command line entry point.
+
+Important Data Structures:
+- DatasetConfig: Dataclass with every generator parameter (see the CLI help for defaults).
+- ROOM_TYPES: room type -> (capacity, base nightly price).
+- STAY_WEIGHTS: Relative frequency of stays of 1, 2, 3, ... nights (most stays are short).
+
+Algorithms:
+- Per-room timeline: Each room is walked forward from the start of the history to FUTURE_DAYS ahead. Stays are
+  placed back to back with random gaps whose mean is chosen so the booked share of nights matches the target
+  occupancy (gap = stay * (1 - occupancy) / occupancy). Because each room is filled in order, occupied stays can
+  never overlap.
+- Cancellations are extra bookings on the same timeline that do not consume nights (the room is resold), so the
+  cancellation rate does not lower occupancy. No-shows consume their nights like a completed stay.
+- Statuses follow the dates: past stays are Complete or No-show, stays in progress are Checked-in, stays starting
+  today or later are Confirmed.
+- Bulk loading: Rows are inserted with executemany in batches of BATCH_SIZE inside large transactions, with
+  synchronous writes and the rollback journal kept in memory while loading. Reservation IDs come from the normal
+  IdAllocator sequence (restarted with a key derived from the seed) so later bookings do not collide with
+  generated ones.
+- Generated rows are a baseline for change tracking: change_seq 0 and updated_at at midnight of `today`, so the
+  same seed produces identical rows whenever it runs. Every row is inserted with those values (reservations also
+  with their check_in_day/check_out_day from day_numbers.to_day), which the change-tracking insert triggers leave
+  alone (WHEN NEW.updated_at IS NULL), so the load pays no per-row stamping UPDATE, counter bump or tombstone
+  DELETE. Only rows stamped afterwards (rooms flagged by the availability refresh) get the baseline written back.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from time import perf_counter
+
+from database_manager import DatabaseManager
+from day_numbers import to_day
+from hotel_models import TAX_RATE
+
+ROOM_TYPES = {
+    "Single": (1, 90.0),
+    "Double": (2, 130.0),
+    "Deluxe": (3, 200.0),
+    "Suite": (4, 280.0),
+}
+DEFAULT_MIX = {"Single": 35, "Double": 40, "Deluxe": 15, "Suite": 10}
+
+STAY_WEIGHTS = (22, 24, 18, 12, 8, 5, 5, 2, 1, 1, 0.5, 0.5, 0.5, 0.5)   # 1..14 nights
+MEAN_STAY = sum((n + 1) * w for n, w in enumerate(STAY_WEIGHTS)) / sum(STAY_WEIGHTS)
+
+FUTURE_DAYS = 120
+ROOMS_PER_FLOOR = 50
+BATCH_SIZE = 50_000
+
+FIRST_NAMES = ("Daniel", "Sarah", "Michael", "Emily", "Joshua", "Laura", "David", "Olivia", "Ethan", "Sophia",
+               "James", "Emma", "Ryan", "Grace", "Matthew", "Hannah", "Andrew", "Chloe", "Noah", "Ava")
+LAST_NAMES = ("Johnson", "Miller", "Smith", "Anderson", "Brown", "Davis", "Wilson", "Moore", "Taylor", "Clark",
+              "Martin", "Walker", "Hall", "Young", "King", "Allen", "Wright", "Scott", "Green", "Baker")
+CITIES = (("Springfield", "IL"), ("Rivertown", "CA"), ("Hillcrest", "TX"), ("Lakeside", "FL"), ("Fairview", "WA"))
+
+
+@dataclass
+class DatasetConfig:
+    rooms: int = 100
+    mix: dict = field(default_factory=lambda: dict(DEFAULT_MIX))
+    years: float = 1.0
+    occupancy: float = 0.7
+    cancellation_rate: float = 0.08
+    no_show_rate: float = 0.02
+    guests: int = None          # default: one guest per three reservations
+    seed: int = 0
+    today: date = None          # default: date.today()
+
+    def validate(self):
+        if self.rooms < 1:
+            raise ValueError("rooms must be at least 1.")
+        if self.years < 0:
+            raise ValueError("years must not be negative.")
+        if not 0 < self.occupancy < 1:
+            raise ValueError("occupancy must be between 0 and 1 (exclusive).")
+        for name in ("cancellation_rate", "no_show_rate"):
+            if not 0 <= getattr(self, name) < 1:
+                raise ValueError(f"{name} must be in [0, 1).")
+        unknown = set(self.mix) - set(ROOM_TYPES)
+        if unknown or not self.mix or sum(self.mix.values()) <= 0:
+            raise ValueError(f"mix must use room types {', '.join(ROOM_TYPES)} with positive weights.")
+
+
+def years_for(rooms, reservations, occupancy=0.7, cancellation_rate=0.08):
+    """History length (years) that gives about `reservations` stays (cancelled ones included) for this many rooms."""
+    days_per_room = reservations / rooms * MEAN_STAY / occupancy / (1 + cancellation_rate)
+    return max(0.0, (days_per_room - FUTURE_DAYS) / 365)
+
+
+def parse_mix(text):
+    """'Single=35,Double=40' -> {'Single': 35.0, 'Double': 40.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def _room_rows(config, rng):
+    types = list(config.mix)
+    weights = [config.mix[t] for t in types]
+    rows = []
+    for i in range(config.rooms):
+        room_type = rng.choices(types, weights)[0]
+        capacity, price = ROOM_TYPES[room_type]
+        floor, slot = divmod(i, ROOMS_PER_FLOOR)
+        rows.append((i + 1, str((floor + 1) * 100 + slot + 1), room_type, int(rng.random() < 0.1), capacity,
+                     round(price * rng.uniform(0.9, 1.15), 2), 1, 0))
+    return rows
+
+
+def _guest_rows(count, rng):
+    for guest_id in range(1, count + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = rng.choice(CITIES)
+        yield (guest_id, first, last, f"{first.lower()}.{last.lower()}{guest_id}@example.com",
+               f"({rng.randint(200, 999)})-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+               f"{rng.randint(100, 9999)} Main St", city, state, f"{rng.randint(10000, 99999)}")
+
+
+def _stays(config, rooms, rng):
+    """Yield (room_id, check_in ordinal, check_out ordinal, status, num_guests, price) in room order."""
+    today = (config.today or date.today()).toordinal()
+    start = today - int(config.years * 365)
+    end = today + FUTURE_DAYS
+    lengths = list(range(1, len(STAY_WEIGHTS) + 1))
+    cum_weights = list(itertools.accumulate(STAY_WEIGHTS))
+    random_ = rng.random
+    mean_gap = MEAN_STAY * (1 - config.occupancy) / config.occupancy
+
+    for room_id, _, _, _, capacity, price, _, _ in rooms:
+        cursor = start + int(rng.uniform(0, 2 * mean_gap))
+        while True:
+            nights = rng.choices(lengths, cum_weights=cum_weights)[0]
+            check_out = cursor + nights
+            if check_out > end:
+                break
+            num_guests = 1 + int(random_() * capacity)
+            if random_() < config.cancellation_rate:
+                # Cancelled booking: the nights are resold, so the timeline does not move
+                yield room_id, cursor, check_out, "Cancelled", num_guests, price * nights
+                continue
+            if check_out <= today:
+                status = "No-show" if random_() < config.no_show_rate else "Complete"
+            elif cursor < today:
+                status = "Checked-in"
+            else:
+                status = "Confirmed"
+            yield room_id, cursor, check_out, status, num_guests, price * nights
+            cursor = check_out + round(rng.expovariate(1 / mean_gap)) if mean_gap else check_out
+
+
+def _date_pair(ordinal):
+    day = date.fromordinal(ordinal)
+    return day.isoformat(), to_day(day)
+
+
+def _stamp_baseline(db, stamp):
+    """Put rows stamped by a trigger during or after the load (change_seq > 0) back to the baseline: change_seq 0
+    and updated_at `stamp`, so a seed always produces the same rows. Changing change_seq in the same UPDATE keeps
+    the change-tracking trigger from restamping the row with the wall clock."""
+    conn = db.connect(raw=True)
+    try:
+        for table in DatabaseManager.CHANGE_TRACKED_TABLES:
+            conn.execute(f"UPDATE {table} SET change_seq = 0, updated_at = ? WHERE change_seq != 0", (stamp,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def generate(db_path, config=None):
+    """Build a synthetic data set into db_path (existing rooms, guests and reservations are replaced)."""
+    config = config or DatasetConfig()
+    config.validate()
+    rng = random.Random(config.seed)
+    started = perf_counter()
+    today = config.today or date.today()
+    stamp = f"{today.isoformat()}T00:00:00"    # updated_at of every generated row
+
+    db = DatabaseManager(db_path)
+    conn = db.connect(raw=True)
+    # Skip the per-statement cache tracking for the bulk load; the whole cache is invalidated at the end
+    conn.set_trace_callback(None)
+    conn.isolation_level = None
+    cur = conn.cursor()
+    counts = {"rooms": config.rooms}
+    try:
+        cur.execute("PRAGMA synchronous = OFF")
+        cur.execute("PRAGMA journal_mode = MEMORY")
+        cur.execute("BEGIN")
+        cur.execute("DELETE FROM reservations")
+        cur.execute("DELETE FROM reservations_archive")
+        cur.execute("DELETE FROM guests")
+        cur.execute("DELETE FROM rooms")
+        # The generated rows are a new baseline; tombstones for the ids just deleted would report them as removed
+        cur.execute("DELETE FROM change_tombstones")
+        # Restart the reservation ID sequence with a seed-derived key so IDs are reproducible too
+        cur.execute("INSERT OR REPLACE INTO id_sequences (name, next_value, secret) VALUES ('reservations', 0, ?)",
+                    (rng.getrandbits(128).to_bytes(16, "big").hex(),))
+        rooms = _room_rows(config, rng)
+        cur.executemany(
+            "INSERT INTO rooms (room_id, room_number, room_type, smoking, capacity, price, is_available, "
+            "out_of_service, change_seq, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+            (room + (stamp,) for room in rooms))
+
+        # Guests are needed before reservations (foreign key); size from the expected number of stays
+        expected = config.rooms * (int(config.years * 365) + FUTURE_DAYS) * config.occupancy / MEAN_STAY
+        guests = config.guests or max(1, int(expected * (1 + config.cancellation_rate)) // 3)
+        cur.executemany(
+            "INSERT INTO guests (guest_id, first_name, last_name, email, phone_number, address_line1, city, state, "
+            "postal_code, change_seq, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+            (guest + (stamp,) for guest in _guest_rows(guests, rng)))
+        counts["guests"] = guests
+        cur.execute("COMMIT")
+
+        random_ = rng.random
+        dates = {}   # date ordinal -> ('YYYY-MM-DD', day number)
+        batch = []
+        stays = _stays(config, rooms, rng)
+        while True:
+            chunk = [s for _, s in zip(range(BATCH_SIZE), stays)]
+            if not chunk:
+                break
+            cur.execute("BEGIN")
+            ids = db.id_allocator.allocate_many("reservations", len(chunk), conn=conn)
+            batch.clear()
+            for reservation_id, (room_id, check_in, check_out, status, num_guests, price) in zip(ids, chunk):
+                ci, ci_day = dates.get(check_in) or dates.setdefault(check_in, _date_pair(check_in))
+                co, co_day = dates.get(check_out) or dates.setdefault(check_out, _date_pair(check_out))
+                if status in ("Complete", "Checked-in"):
+                    is_paid = 1
+                else:
+                    is_paid = int(status == "Confirmed" and random_() < 0.5)
+                batch.append((reservation_id, 1 + int(random_() * guests), room_id, ci, co, num_guests,
+                              round(price * (1 + TAX_RATE), 2), status, is_paid, stamp, ci_day, co_day))
+                counts[status] = counts.get(status, 0) + 1
+            cur.executemany(
+                "INSERT INTO reservations (reservation_id, guest_id, room_id, check_in_date, check_out_date, "
+                "num_guests, total_price, status, is_paid, change_seq, updated_at, check_in_day, check_out_day) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)", batch)
+            cur.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    db.cache.bump()
+    db.refresh_room_availability(business_date=config.today)
+    _stamp_baseline(db, stamp)
+    db.inventory.invalidate()
+    db.cache.close()
+    counts["reservations"] = sum(v for k, v in counts.items() if k not in ("rooms", "guests"))
+    counts["seconds"] = round(perf_counter() - started, 2)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic hotel database.")
+    parser.add_argument("--db", required=True, help="database file to create or replace")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="room type weights, e.g. Single=35,Double=40,Deluxe=15,Suite=10")
+    parser.add_argument("--years", type=float, default=1.0, help="years of history before today")
+    parser.add_argument("--reservations", type=int, default=None,
+                        help="approximate number of reservations (overrides --years)")
+    parser.add_argument("--occupancy", type=float, default=0.7)
+    parser.add_argument("--cancellation-rate", type=float, default=0.08)
+    parser.add_argument("--no-show-rate", type=float, default=0.02)
+    parser.add_argument("--guests", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--overwrite", action="store_true", help="replace an existing database file")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        if not args.overwrite:
+            parser.error(f"{args.db} exists; pass --overwrite to replace it.")
+        os.remove(args.db)
+
+    years = args.years
+    if args.reservations is not None:
+        years = years_for(args.rooms, args.reservations, args.occupancy, args.cancellation_rate)
+    config = DatasetConfig(rooms=args.rooms, mix=args.mix, years=years, occupancy=args.occupancy,
+                           cancellation_rate=args.cancellation_rate, no_show_rate=args.no_show_rate,
+                           guests=args.guests, seed=args.seed)
+    try:
+        counts = generate(args.db, config)
+    except ValueError as e:
+        parser.error(str(e))
+    print(", ".join(f"{k}: {v}" for k, v in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
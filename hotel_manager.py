@@ -15,21 +15,29 @@ Important Functions:
   price range, availability status, and guest count.
   Input: A set of optional keyword arguments like check_in, check_out, room_types, min_capacity, max_capacity,
          min_price, max_price, availability, num_guests, etc.
-  Output: A list of sqlite3.Row objects representing the matching rooms.
+  Output: A list of RoomRecord rows (row_mapping.py) representing the matching rooms.
 
 - search_reservation(...): Performs a complex search for reservations based on multiple filter criteria. Dynamically
-  builds a SQL query with JOINs to include guest and room information.
+  builds a SQL query with JOINs to include guest and room information. Archived stays are searched too (through
+  the reservations_all view) unless the status filter rules them out.
   Input: Optional filters including reservation_id, guest_id, room_id, guest names, email, room_type, status,
          price ranges, and date ranges.
-  Output: A list of sqlite3.Row objects with complete reservation, guest, and room details.
+  Output: A list of ReservationViewRecord rows with complete reservation, guest, and room details.
 
 - calculate_total_price(...): Calculates the total cost of a stay based on the room's nightly price and the
   number of nights.
   Input: room_id (int), check_in (str), check_out (str).
   Output: float representing the total price.
 
+- quote_many(...): Prices a stay for many rooms at once from the in-memory room inventory and the rate calendar
+  (rate_plans.py), without per-room queries.
+  Input: room_ids (iterable of int), check_in, check_out (str or date).
+  Output: Dictionary mapping room_id to a PriceQuote (per-night breakdown, subtotal, tax, total). Unknown rooms are
+  left out.
+
 - reserve_room(...): Creates a new reservation with transactional safety. It performs validation checks (guest
   exists, room exists, room availability) within a database transaction to prevent double-booking (race conditions).
+  Everything runs on one connection; per-stage timings of the last call are kept in last_reserve_timings.
   Input: guest_id (int), room_id (int), check_in (str), check_out (str), num_guests (int), status (str, optional).
   Output: int, the ID of the newly created reservation.
 
@@ -58,14 +66,29 @@ Algorithms:
   execute the operation, and commit or rollback as needed. This ensures data consistency and prevents double-booking.
 
 - Stay Date Overlap Detection: Uses SQL logic to check if two date ranges overlap:
-  NOT (check_out_date <= new_check_in OR check_in_date >= new_check_out)
+  NOT (check_out_day <= new_check_in OR check_in_day >= new_check_out)
+  The *_day columns are the stay dates as integer day numbers (day_numbers.py), so the check is two integer
+  comparisons on idx_reservations_room_days; callers still pass 'YYYY-MM-DD' strings.
   This ensures reservations cannot be created or updated if they would conflict with existing occupied reservations.
+
+- Bulk Pricing (in quote_many): The dates are parsed and the list of stay nights is built once, the rooms are read
+  from one inventory snapshot, and the rate calendar is sliced once per room type. Each room's subtotal is then
+  base price * sum(multipliers) + sum(additions) for its type.
+
+- Operation Metrics: reserve_room, update_reservation, cancel_reservation, check_in_reservation and
+  check_out_reservation are wrapped with metrics_exporter.observe_operation, which counts outcomes and records
+  latency for the Prometheus exporter.
 """
-from datetime import datetime, time, timedelta
-import sqlite3
-import random
-from typing import Optional, List, Union
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from typing import Dict, Iterable, Optional, List, Union
 from database_manager import DatabaseManager
+from day_numbers import parse_date, to_day
+from hotel_models import TAX_RATE, PriceQuote
+from metrics_exporter import observe_operation
+from query_cache import cached
+from reservation_archive import COLUMNS as RESERVATION_COLUMNS, ReservationArchive
+from row_mapping import RoomRecord, ReservationViewRecord
 
 class HotelManager:
     """Handles hotel operations: room search, reservations, cancellations and pricing."""
@@ -78,12 +101,13 @@ class HotelManager:
     def __init__(self, db: DatabaseManager):
         """Initializes the HotelManager, creating a DatabaseManager instance."""
         self.db = db
+        self.last_reserve_timings = {}
 
     def _parse_dates(self, check_in: str, check_out: str) -> tuple[str, str, int]:
         """Private helper function, validates date text and calculates number of nights."""
         try:
-            ci = datetime.strptime(check_in, "%Y-%m-%d").date()
-            co = datetime.strptime(check_out, "%Y-%m-%d").date()
+            ci = parse_date(check_in)
+            co = parse_date(check_out)
         except ValueError:
             raise ValueError("Invalid date format. Use YYYY-MM-DD.")
 
@@ -95,6 +119,7 @@ class HotelManager:
         nights = (co - ci).days
         return ci.isoformat(), co.isoformat(), nights
 
+    @cached("rooms", "reservations", via="db")
     def search_rooms(
         self,
         *,
@@ -113,7 +138,7 @@ class HotelManager:
         availability: str = "free",
         sort_by: str = "price",
         sort_dir: str = "asc",
-    ) -> List[sqlite3.Row]:
+    ) -> List[RoomRecord]:
         """Builds custom SQL query based on optional filters entered, returns a list of matching rooms.
 
         Search rooms for manager/employee workflows using attribute filters plus optional
@@ -229,7 +254,7 @@ class HotelManager:
         if use_dates and availability_mode != "all":
             occ = DatabaseManager.OCCUPIED_STATUSES
             occ_placeholders = ",".join(["?"] * len(occ))
-            overlap_predicate = "NOT (res.check_out_date <= ? OR res.check_in_date >= ?)"  # allows back-to-back
+            overlap_predicate = "NOT (res.check_out_day <= ? OR res.check_in_day >= ?)"  # allows back-to-back
             if availability_mode == "free":
                 sql_parts.append(
                     f"AND NOT EXISTS (\n"
@@ -248,7 +273,7 @@ class HotelManager:
                     f"      AND {overlap_predicate}\n"
                     f")"
                 )
-            params.extend(list(occ) + [ci_iso, co_iso])
+            params.extend(list(occ) + [to_day(ci_iso), to_day(co_iso)])
 
         # Sorting
         allowed_sort = {
@@ -269,18 +294,62 @@ class HotelManager:
         return self.db.execute_query(final_sql, tuple(params))
 
     def calculate_total_price(self, room_id: int, check_in: str, check_out: str) -> float:
-        """Calculates the total price for a stay based on the room's price, nights, and tax."""
-        ci_iso, co_iso, nights = self._parse_dates(check_in, check_out)
-        room = self.db.get_room(room_id=room_id)
-        if room is None:
+        """Calculates the total price for a stay based on the room's price, rate plans, nights, and tax."""
+        quote = self.quote_many([room_id], check_in, check_out).get(room_id)
+        if quote is None:
             raise ValueError("Room does not exist")
+        return quote.total
 
-        base_price = float(room["price"]) * nights
-        tax_rate = 0.145
-        total_with_tax = base_price * (1 + tax_rate)
-        return total_with_tax
+    def quote_many(
+            self,
+            room_ids: Iterable[int],
+            check_in: Union[str, date, datetime],
+            check_out: Union[str, date, datetime]
+    ) -> Dict[int, PriceQuote]:
+        """Prices the same stay for every room in room_ids using one inventory snapshot."""
+        # str() of a datetime carries the time of day, which _parse_dates rejects; keep only the date part
+        if isinstance(check_in, date):
+            check_in = check_in.isoformat()[:10]
+        if isinstance(check_out, date):
+            check_out = check_out.isoformat()[:10]
+        ci_iso, co_iso, nights = self._parse_dates(check_in, check_out)
+        return self._quote_parsed(room_ids, ci_iso, co_iso, nights)
+
+    def _quote_parsed(self, room_ids: Iterable[int], ci_iso: str, co_iso: str, nights: int) -> Dict[int, PriceQuote]:
+        """Private helper for quote_many once the dates are validated (reserve_room reuses its own parse)."""
+        first_night = date.fromisoformat(ci_iso)
+        stay_dates = [(first_night + timedelta(days=i)).isoformat() for i in range(nights)]
+
+        snapshot = self.db.inventory.snapshot()
+        stay_rates = {}   # room_type -> StayRates, shared by every room of the type
+        quotes = {}
+        for room_id in room_ids:
+            if room_id in quotes:
+                continue
+            room = snapshot.get(room_id=room_id)
+            if room is None:
+                continue
+            rates = stay_rates.get(room.room_type)
+            if rates is None:
+                rates = self.db.rate_plans.stay_rates(room.room_type, first_night, nights)
+                stay_rates[room.room_type] = rates
+            base_price = float(room.price)
+            subtotal = rates.subtotal(base_price)
+            tax = subtotal * TAX_RATE
+            quotes[room_id] = PriceQuote(
+                room_id=room_id,
+                room_number=room.room_number,
+                check_in=ci_iso,
+                check_out=co_iso,
+                nightly=tuple(zip(stay_dates, rates.nightly(base_price))),
+                subtotal=subtotal,
+                tax=tax,
+                total=subtotal + tax,
+            )
+        return quotes
 
 
+    @observe_operation("reserve")
     def reserve_room(
             self,
             guest_id: int,
@@ -292,7 +361,20 @@ class HotelManager:
             is_paid: int = None
     ) -> int:
 
-        """Creates a new reservation in the database with transactional safety."""
+        """
+        Creates a new reservation in the database with transactional safety.
+
+        Validation, pricing and the booking transaction all run on one connection. The time spent in each stage
+        (milliseconds) is left in self.last_reserve_timings.
+        """
+        timings = {}
+        started = last = perf_counter()
+
+        def lap(stage):
+            nonlocal last
+            now = perf_counter()
+            timings[stage] = (now - last) * 1000
+            last = now
 
         # Date parsing and initial validation
         ci_iso, co_iso, nights = self._parse_dates(check_in, check_out)
@@ -302,32 +384,39 @@ class HotelManager:
                 f"Stay duration ({nights} nights) exceeds maximum allowed ({self.MAX_STAY_NIGHTS} nights).")
 
         today = datetime.now().date()
-        ci_date_obj = datetime.strptime(ci_iso, "%Y-%m-%d").date()
+        ci_date_obj = date.fromisoformat(ci_iso)
         if (ci_date_obj - today).days > self.MAX_ADVANCE_DAYS:
             raise ValueError(f"Check-in date cannot be more than {self.MAX_ADVANCE_DAYS} days in the future.")
 
-        if not self.db.guest_exists(guest_id=guest_id):
-            raise ValueError("Guest does not exist.")
+        conn = self.db.connect()
+        cur = conn.cursor()
 
-        if not self.db.room_exists(room_id=room_id):
-            raise ValueError("Room does not exist.")
+        try:
+            # Guest lookup reuses the booking connection; rooms and prices come from memory
+            if not self.db.guest_exists(guest_id=guest_id, conn=conn):
+                raise ValueError("Guest does not exist.")
 
-        if num_guests is not None and num_guests < 1:
-            raise ValueError("Number of guests must be at least 1.")
+            if not self.db.room_exists(room_id=room_id):
+                raise ValueError("Room does not exist.")
 
-        if num_guests is not None:
-            room = self.db.get_room(room_id=room_id)
-            if num_guests > room["capacity"]:
-                raise ValueError("Number of guests exceeds room capacity.")
+            if num_guests is not None and num_guests < 1:
+                raise ValueError("Number of guests must be at least 1.")
 
-        total_price = self.calculate_total_price(room_id, check_in, check_out)
+            if num_guests is not None:
+                room = self.db.get_room(room_id=room_id)
+                if num_guests > room["capacity"]:
+                    raise ValueError("Number of guests exceeds room capacity.")
+            lap("validate")
 
-        conn = self.db.connect()
-        cur = conn.cursor()
+            quote = self._quote_parsed([room_id], ci_iso, co_iso, nights).get(room_id)
+            if quote is None:
+                raise ValueError("Room does not exist.")
+            total_price = quote.total
+            lap("price")
 
-        try:
             conn.isolation_level = None
             cur.execute("BEGIN IMMEDIATE")
+            lap("lock")
 
             # Check availability
             occ = DatabaseManager.OCCUPIED_STATUSES
@@ -338,25 +427,22 @@ class HotelManager:
                     FROM reservations
                     WHERE room_id = ?
                         AND status IN ({ph})
-                        AND (check_out_date > ? AND check_in_date < ?)
+                        AND (check_out_day > ? AND check_in_day < ?)
                     LIMIT 1
                 """,
-                (room_id, *occ, ci_iso, co_iso),
+                (room_id, *occ, to_day(ci_iso), to_day(co_iso)),
             )
 
             if cur.fetchone():
                 cur.execute("ROLLBACK")
                 raise ValueError("Room is no longer available for the selected dates.")
+            lap("overlap")
 
             # -----------------------------
-            # Generate unique 6-digit ID
+            # Allocate unique reservation ID (6 digits, then 7+) inside this transaction
             # -----------------------------
-            reservation_id = random.randint(100000, 999999)
-
-            # Ensure uniqueness (very fast, tiny table)
-            cur.execute("SELECT 1 FROM reservations WHERE reservation_id = ?", (reservation_id,))
-            while cur.fetchone():
-                reservation_id = random.randint(100000, 999999)
+            reservation_id = self.db.id_allocator.allocate("reservations", conn=conn)
+            lap("allocate")
 
             # Insert reservation with custom ID
             cur.execute(
@@ -367,11 +453,14 @@ class HotelManager:
                 """,
                 (reservation_id, guest_id, room_id, ci_iso, co_iso, num_guests, total_price, status, is_paid),
             )
+            lap("insert")
 
-            # OPTIONAL: mark room as unavailable
-            cur.execute("UPDATE rooms SET is_available = 0 WHERE room_id = ?", (room_id,))
+            # Recompute today's availability flag for this room only (unchanged for future stays)
+            self.db.refresh_room_availability([room_id], conn=conn)
+            lap("availability")
 
             cur.execute("COMMIT")
+            lap("commit")
             return reservation_id
 
         except Exception:
@@ -383,7 +472,10 @@ class HotelManager:
 
         finally:
             conn.close()
+            timings["total"] = (perf_counter() - started) * 1000
+            self.last_reserve_timings = timings
 
+    @observe_operation("cancel")
     def cancel_reservation(self, reservation_id: int) -> dict:
         """
         Cancels a reservation applying strict time-based fee logic centered on 2:00 PM check-in.
@@ -424,7 +516,7 @@ class HotelManager:
                 raise ValueError("Cannot cancel reservation after check-in, perform early check-out instead.")
 
             # Calculate Fee Logic
-            check_in_date = datetime.strptime(check_in_date_str, "%Y-%m-%d").date()
+            check_in_date = parse_date(check_in_date_str)
             check_in_deadline = datetime.combine(check_in_date, time(14,0))
             now = datetime.now()
 
@@ -467,6 +559,7 @@ class HotelManager:
                 """,
                 (final_fee, reservation_id)
             )
+            self.db.refresh_room_availability([room_id], conn=conn)
 
             cur.execute("COMMIT")
 
@@ -490,6 +583,7 @@ class HotelManager:
         finally:
             conn.close()
 
+    @observe_operation("modify")
     def update_reservation(
         self,
         reservation_id: int,  # REQUIRED: The target
@@ -523,7 +617,6 @@ class HotelManager:
         """
 
         conn = self.db.connect()
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
 
         try:
@@ -584,8 +677,8 @@ class HotelManager:
                     raise ValueError("Cannot change room: Guest is already checked-in. Check out first.")
             # Cannot set check-in or check-out dates to dates that already passed
             today = datetime.now().date()
-            ci_date_obj = datetime.strptime(final_check_in, "%Y-%m-%d").date()
-            co_date_obj = datetime.strptime(final_check_out, "%Y-%m-%d").date()
+            ci_date_obj = date.fromisoformat(ci_iso)
+            co_date_obj = date.fromisoformat(co_iso)
             if ci_date_obj < today:
                 cur.execute("ROLLBACK")
                 raise ValueError(f"New check-in date ({final_check_in}) cannot be in the past.")
@@ -632,10 +725,10 @@ class HotelManager:
                     WHERE room_id = ?
                         AND reservation_id != ?
                         AND status IN ({placeholders})
-                        AND NOT (check_out_date <= ? OR check_in_date >= ?)
+                        AND NOT (check_out_day <= ? OR check_in_day >= ?)
                         LIMIT 1
                 """
-                params = [final_room_id, reservation_id] + list(occ) + [ci_iso, co_iso]
+                params = [final_room_id, reservation_id] + list(occ) + [to_day(ci_iso), to_day(co_iso)]
 
                 cur.execute(query, tuple(params))
                 if cur.fetchone():
@@ -670,6 +763,7 @@ class HotelManager:
                     is_paid = ?
                 WHERE reservation_id = ?
             """, (final_room_id, ci_iso, co_iso, final_guests, new_total, final_is_paid, reservation_id))
+            self.db.refresh_room_availability({row["room_id"], final_room_id}, conn=conn)
 
             cur.execute("COMMIT")
 
@@ -695,6 +789,7 @@ class HotelManager:
 
 
 
+    @cached("reservations", "guests", "rooms", via="db")
     def search_reservation(
         self,
         *,
@@ -734,7 +829,7 @@ class HotelManager:
         sort_by: str = "check_in_date",
         sort_dir: str = "asc"
 
-    ) -> List[sqlite3.Row]:
+    ) -> List[ReservationViewRecord]:
 
         # Convert single values to lists for consistent handling
         if reservation_id is not None and not isinstance(reservation_id, list):
@@ -764,17 +859,23 @@ class HotelManager:
         if stay_start and stay_end:
             stay_start, stay_end, _ = self._parse_dates(stay_start, stay_end)
         elif stay_start:
-            datetime.strptime(stay_start, "%Y-%m-%d")  # validate only
+            parse_date(stay_start)  # validate only
         elif stay_end:
-            datetime.strptime(stay_end, "%Y-%m-%d")  # validate only
+            parse_date(stay_end)  # validate only
+
+        # Archived stays are all Cancelled/Complete: a search limited to other statuses skips the archive
+        if status and not set(status) & set(ReservationArchive.CLOSED_STATUSES):
+            source = "reservations"
+        else:
+            source = "reservations_all"
 
-        # Base Query
-        query = """
+        # Base Query. The reservation columns are listed (not r.*) so both sources give rows of the same shape
+        query = f"""
             SELECT
-                r.*,
+                {", ".join("r." + col for col in RESERVATION_COLUMNS)},
                 g.first_name, g.last_name, g.email, g.phone_number, 
                 rm.room_number, rm.room_type, rm.smoking, rm.capacity, rm.price
-            FROM reservations r 
+            FROM {source} r 
             JOIN guests g ON r.guest_id = g.guest_id
             JOIN rooms rm ON r.room_id = rm.room_id
             WHERE 1=1
@@ -867,19 +968,19 @@ class HotelManager:
         # Scenario A: Bounded Range (Start AND End)
         if stay_start and stay_end:
             # Standard Overlap Logic
-            query += " AND (r.check_in_date < ? AND r.check_out_date > ?)"
-            params.append(stay_end)
-            params.append(stay_start)
+            query += " AND (r.check_in_day < ? AND r.check_out_day > ?)"
+            params.append(to_day(stay_end))
+            params.append(to_day(stay_start))
         # Scenario B: Open-Ended Start ("From this date onward")
         elif stay_start:
             # Show anything that is still in the hotel after this start date
-            query += " AND r.check_out_date > ?"
-            params.append(stay_start)
+            query += " AND r.check_out_day > ?"
+            params.append(to_day(stay_start))
         # Scenario C: Open-Ended End ("Up until this date")
         elif stay_end:
             # Show anything that arrived before this cutoff
-            query += " AND r.check_in_date < ?"
-            params.append(stay_end)
+            query += " AND r.check_in_day < ?"
+            params.append(to_day(stay_end))
 
         valid_sort_cols = {
             "check_in_date": "r.check_in_date",
@@ -899,6 +1000,7 @@ class HotelManager:
 
         return self.db.execute_query(query, tuple(params))
 
+    @observe_operation("check_in")
     def check_in_reservation(self, reservation_id: int, confirm_payment: bool = False) -> dict:
         """
         Checks in a guest, strictly enforcing the 2:00 PM check-in policy.
@@ -934,7 +1036,7 @@ class HotelManager:
                 raise ValueError(f"Reservation {reservation_id} not found.")
 
             status, check_in_str, room_id, is_paid, total_price = row
-            check_in_date = datetime.strptime(check_in_str, "%Y-%m-%d").date()
+            check_in_date = parse_date(check_in_str)
 
             # Validate status
             if status == "Checked-in":
@@ -988,6 +1090,7 @@ class HotelManager:
         finally:
             conn.close()
 
+    @observe_operation("check_out")
     def check_out_reservation(self, reservation_id: int) -> dict:
         """
         Completes a reservation, calculating late fees and releasing the room.
@@ -1012,7 +1115,7 @@ class HotelManager:
 
             # Retrieve reservation with room price (for late fee calculation)
             cur.execute("""
-                SELECT r.status, r.total_price, r.is_paid, rm.price
+                SELECT r.status, r.total_price, r.is_paid, rm.price, r.room_id
                 FROM reservations r
                 JOIN rooms rm ON r.room_id = rm.room_id
                 WHERE r.reservation_id = ?
@@ -1024,7 +1127,7 @@ class HotelManager:
                 cur.execute("ROLLBACK")
                 raise ValueError(f"Reservation {reservation_id} not found.")
 
-            status, original_price, is_paid, nightly_rate = row
+            status, original_price, is_paid, nightly_rate, room_id = row
 
             # Validate Status
             if status not in ("Checked-in", "Late Check-out"):
@@ -1050,6 +1153,8 @@ class HotelManager:
                 SET status = 'Complete', total_price = ?, is_paid = ?
                 WHERE reservation_id = ?
             """, (final_price, new_is_paid, reservation_id))
+            # Early check-out frees the room for the rest of today
+            self.db.refresh_room_availability([room_id], conn=conn)
 
             cur.execute("COMMIT")
 
@@ -7,11 +7,14 @@ Description:
 This module defines the primary data model classes for the application: Room, Guest, and Reservation.
 These classes are intended to represent the main entities of the hotel management system. Currently, they serve
 as simple data containers with constructors and setter methods, but are not deeply integrated into the application's
-data flow, which primarily uses sqlite3.Row objects.
+data flow, which primarily uses row_mapping records (see row_mapping.py).
 
 Class: Room
-Description: Represents a hotel room with its properties.
-- Important Attributes: room_id, room_number, room_type, capacity, price, is_available.
+Description: Represents a hotel room with its properties. A slotted dataclass so the in-memory RoomInventory
+(room_inventory.py) can hold every room compactly. Rooms handed out by the inventory are shared and must be treated
+as read-only; use dataclasses.replace() to derive a changed copy. Supports room["column"] lookups so it can stand
+in for the row that DatabaseManager.get_room used to return.
+- Important Attributes: room_id, room_number, room_type, capacity, price, is_available, smoking, out_of_service.
 
 Class: Guest
 Description: Represents a hotel guest with their contact information.
@@ -23,18 +26,48 @@ Description: Represents a booking, linking a Guest to a Room for a specific date
 - Important Data Structures:
   - STATUSES: A class-level tuple containing all valid states for a reservation (e.g., "Confirmed", "Cancelled").
     This is used to enforce data integrity for the reservation status.
+
+Class: PriceQuote
+Description: The price of one room for one stay, as returned by HotelManager.quote_many. Frozen so quotes can be
+shared between the search results and the reservation form.
+- Important Attributes: room_id, room_number, check_in, check_out, nightly ((date, rate) per night), subtotal, tax,
+  total.
+
+Constants:
+- TAX_RATE: Tax applied to every stay (14.5%). Shared by pricing, the reservation form and the emailed receipt.
 """
+from dataclasses import dataclass, fields
 from datetime import datetime
 import sqlite3
 
+TAX_RATE = 0.145
+
+@dataclass(slots=True)
 class Room:
-    def __init__(self, room_id, room_number, room_type, capacity, price, is_available):
-        self.room_id = room_id
-        self.room_number = room_number
-        self.room_type = room_type
-        self.capacity = capacity
-        self.price = price
-        self.is_available = is_available
+    room_id: int
+    room_number: str
+    room_type: str
+    capacity: int
+    price: float
+    is_available: int
+    smoking: int = 0
+    out_of_service: int = 0
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a Room from a rooms table row (RoomRecord); columns missing from older schemas use defaults."""
+        columns = row.keys()
+        return cls(**{f.name: row[f.name] for f in fields(cls) if f.name in columns})
+
+    def __getitem__(self, key):
+        """Row-style access: room["price"]."""
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def keys(self):
+        return [f.name for f in fields(self)]
 
     #Set method
     def set_room_id(self, room_id):
@@ -57,6 +90,22 @@ class Room:
         self.is_available = is_available
 
 
+@dataclass(frozen=True, slots=True)
+class PriceQuote:
+    room_id: int
+    room_number: str
+    check_in: str
+    check_out: str
+    nightly: tuple      # ((ISO date, rate), ...) one entry per night
+    subtotal: float
+    tax: float
+    total: float
+
+    @property
+    def nights(self):
+        return len(self.nightly)
+
+
 class Reservation:
     STATUSES = ("Confirmed", "Checked-in", "Checked-out", "Cancelled", "No-show") #Revise later if all of these are needed
 
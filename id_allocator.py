@@ -0,0 +1,182 @@
+"""
+Module: id_allocator.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module hands out the public, human-facing IDs for reservations and employees. The old code picked a random
+number (100000-999999 for reservations, 10000-99999 for employees) and probed the table until it missed, which slows
+down as the table fills and fails outright once the 6-digit space is used up. Here every ID comes from a counter
+stored in the `id_sequences` table, run through a keyed Feistel permutation, so IDs are unique by construction,
+look random (not sequential/guessable) and cost O(1) to produce. When the current width (e.g. 6 digits) is used
+up, the sequence moves on to the next width (7 digits) automatically.
+
+Important Functions:
+- IdAllocator.allocate(name, conn=None): Return one new ID for the named sequence.
+  Input: name (str, key of SEQUENCES), conn (sqlite3.Connection, optional; see Algorithms).
+  Output: int
+
+- IdAllocator.allocate_many(name, count, conn=None): Reserve a block of `count` IDs with a single counter update.
+  Input: name (str), count (int), conn (optional).
+  Output: list of int
+
+- permute(value, domain, secret, rounds): Keyed permutation of range(domain).
+  Input: value (int in [0, domain)), domain (int), secret (bytes), rounds (int).
+  Output: int in [0, domain)
+
+- position_to_id(position, min_width, secret): Map a global counter value to the ID it stands for.
+
+Important Data Structures:
+- IdSequence: Dataclass describing a sequence (the table/column it fills and the minimum number of digits).
+- SEQUENCES: The sequences used by the application ("reservations" and "employees").
+- id_sequences table: One row per sequence with the next counter value and the sequence's secret key.
+
+Algorithms:
+- Width epochs: The counter is global and never resets. Position p falls into the first width w >= min_width whose
+  block of 9 * 10^(w-1) IDs it has not passed yet; the ID is 10^(w-1) + permute(offset, 9 * 10^(w-1)). Blocks of
+  different widths cannot overlap, and within a block the permutation is one-to-one, so no two positions ever share
+  an ID.
+- Feistel network: The offset is split into two halves (base m = ceil(sqrt(N))) and mixed for ROUNDS rounds with a
+  BLAKE2b keyed round function. This permutes range(m * m); values that land outside range(N) are encrypted again
+  (cycle walking), which takes about 1 + 2/m tries on average.
+- Counter reservation: The counter is advanced with an UPDATE before it is read, so the write lock is taken first
+  and concurrent allocators (threads or processes) always get disjoint blocks. Passing `conn` lets the allocation
+  happen inside the caller's own transaction (e.g. reserve_room's BEGIN IMMEDIATE); without it the allocator runs
+  its own short transaction.
+- Foreign IDs: Rows inserted without the allocator (older random IDs, hand-written SQL) may already use an ID.
+  Those are checked with a primary key lookup and skipped; the skips are bounded by the number of such rows, so the
+  cost does not grow with the number of allocator-issued IDs.
+"""
+import functools
+import hashlib
+import math
+import secrets
+from dataclasses import dataclass
+
+
+ROUNDS = 6
+
+
+@dataclass(frozen=True)
+class IdSequence:
+    name: str
+    table: str
+    column: str
+    min_width: int
+
+
+SEQUENCES = {
+    # Archived reservations keep their IDs, so both tables are checked (reservation_archive.py)
+    "reservations": IdSequence("reservations", "reservations_all", "reservation_id", 6),
+    "employees": IdSequence("employees", "employees", "employee_id", 5),
+}
+
+
+def permute(value: int, domain: int, secret: bytes, rounds: int = ROUNDS) -> int:
+    """Keyed bijection on range(domain) (Feistel network with cycle walking)."""
+    if not 0 <= value < domain:
+        raise ValueError("value must be in range(domain).")
+    half = math.isqrt(domain - 1) + 1
+    keyed = _keyed_hash(secret)
+    prefix = f"{domain}:"
+
+    x = value
+    while True:
+        left, right = divmod(x, half)
+        for r in range(rounds):
+            h = keyed.copy()
+            h.update(f"{prefix}{r}:{right}".encode())
+            left, right = right, (left + int.from_bytes(h.digest(), "big")) % half
+        x = left * half + right
+        if x < domain:
+            return x
+
+
+@functools.lru_cache(maxsize=32)
+def _keyed_hash(secret: bytes):
+    """BLAKE2b state already keyed with `secret`; copying it is cheaper than keying a new hash per round."""
+    return hashlib.blake2b(key=secret, digest_size=8)
+
+
+def position_to_id(position: int, min_width: int, secret: bytes) -> int:
+    """Map a counter position to its ID, moving to wider IDs as each width's block is used up."""
+    width = min_width
+    while True:
+        low = 10 ** (width - 1)
+        block = 9 * low   # number of IDs with exactly `width` digits
+        if position < block:
+            return low + permute(position, block, secret)
+        position -= block
+        width += 1
+
+
+class IdAllocator:
+    def __init__(self, db, sequences=None):
+        self.db = db
+        self.sequences = sequences or SEQUENCES
+        self._secrets = {}   # name -> bytes, the key never changes once created
+
+    def allocate(self, name: str, conn=None) -> int:
+        """Return one new unique ID for the named sequence."""
+        return self.allocate_many(name, 1, conn)[0]
+
+    def allocate_many(self, name: str, count: int, conn=None) -> list[int]:
+        """Reserve `count` new unique IDs for the named sequence."""
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+        seq = self.sequences.get(name)
+        if seq is None:
+            raise ValueError(f"Unknown ID sequence: {name}")
+
+        own_conn = conn is None
+        if own_conn:
+            conn = self.db.connect()
+            conn.isolation_level = None
+        cur = conn.cursor()
+        try:
+            if own_conn:
+                cur.execute("BEGIN IMMEDIATE")
+
+            ids = []
+            while len(ids) < count:
+                candidates = self._reserve(cur, seq, count - len(ids))
+                taken = self._existing(cur, seq, candidates)
+                ids.extend(i for i in candidates if i not in taken)
+
+            if own_conn:
+                cur.execute("COMMIT")
+            return ids
+        except Exception:
+            # Skip the rollback when BEGIN IMMEDIATE itself failed (database is locked), so that error is raised
+            if own_conn and conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+        finally:
+            if own_conn:
+                conn.close()
+
+    def _reserve(self, cur, seq: IdSequence, count: int) -> list[int]:
+        """Advance the counter by `count` and return the IDs for the reserved positions."""
+        cur.execute("UPDATE id_sequences SET next_value = next_value + ? WHERE name = ?", (count, seq.name))
+        if cur.rowcount == 0:
+            # First use: create the sequence row with a fresh secret, then reserve
+            cur.execute(
+                "INSERT OR IGNORE INTO id_sequences (name, next_value, secret) VALUES (?, 0, ?)",
+                (seq.name, secrets.token_hex(16)),
+            )
+            cur.execute("UPDATE id_sequences SET next_value = next_value + ? WHERE name = ?", (count, seq.name))
+
+        cur.execute("SELECT next_value, secret FROM id_sequences WHERE name = ?", (seq.name,))
+        next_value, secret_hex = cur.fetchone()
+        secret = self._secrets.setdefault(seq.name, bytes.fromhex(secret_hex))
+        return [position_to_id(p, seq.min_width, secret) for p in range(next_value - count, next_value)]
+
+    def _existing(self, cur, seq: IdSequence, ids: list[int]) -> set[int]:
+        """Return the IDs that are already used in the sequence's table (inserted without the allocator)."""
+        taken = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join(["?"] * len(chunk))
+            cur.execute(f"SELECT {seq.column} FROM {seq.table} WHERE {seq.column} IN ({placeholders})", chunk)
+            taken.update(row[0] for row in cur.fetchall())
+        return taken
@@ -0,0 +1,348 @@
+"""
+Module: job_scheduler.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module runs the hotel's daily maintenance work (room availability, late reservations, late check-outs,
+expired late cancellations and archiving closed stays) as scheduled background jobs instead of from UI refresh()
+methods. Every job run is recorded in the `job_runs` table keyed by (job_name, business_date), so each job runs at
+most once per business day no matter how many screens, windows or processes are open. The scheduler can run on a background timer thread
+inside the GUI, or from the command line to run or backfill jobs for a given date.
+
+Important Functions:
+- JobScheduler.run_due(now): Runs every job that is due at `now` and has not already succeeded for that
+  business date.
+  Input: now (datetime, optional).
+  Output: dict mapping job name -> result string ("success", "failed", "skipped").
+
+- JobScheduler.run_job(name, business_date, now, force): Runs a single job for a business date if it has not
+  already succeeded (or unconditionally when force=True).
+  Input: name (str), business_date (date), now (datetime, optional), force (bool).
+  Output: "success", "failed" or "skipped".
+
+- JobScheduler.backfill(start, end, names, force): Runs jobs for every business date in [start, end].
+  Input: start (date), end (date), names (list of str, optional), force (bool).
+  Output: dict mapping ISO date -> run_due style result dict.
+
+- JobScheduler.start() / stop(): Start or stop the background timer thread.
+
+- main(argv): Command line entry point (list, run, backfill, status).
+
+Important Data Structures:
+- Job: Dataclass with the job name, the callable that performs it, and the earliest time of day it may run.
+- DEFAULT_JOBS: Tuple of the hotel's daily maintenance jobs in the order they must run.
+- job_runs table: One row per (job_name, business_date) with status, timings, attempt count and last error.
+
+Algorithms:
+- Claiming a run: Inside a BEGIN IMMEDIATE transaction the scheduler reads the job's row for the business date.
+  A successful row, or a fresh 'running' row owned by another process, means the run is skipped. Otherwise the row
+  is inserted/updated to 'running' and committed before the job executes, so two processes can never run the same
+  job for the same day. A 'running' row older than STALE_RUNNING_AFTER is treated as a crashed run and retried.
+- Failed runs are retried on later ticks until MAX_ATTEMPTS is reached for that business date.
+- Successful (job, date) pairs are also cached in memory so the timer thread does not hit the database every tick.
+- Every finished run is also recorded in the metrics registry (hotel_job_runs_total, hotel_job_duration_seconds).
+"""
+import argparse
+import sys
+import threading
+import time as time_module
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
+
+from database_manager import DatabaseManager
+from metrics_exporter import observe_job
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    action: Callable[[DatabaseManager, date, datetime], None]
+    not_before: time = time(0, 0)
+    description: str = ""
+
+
+DEFAULT_JOBS = (
+    Job(
+        "room_availability",
+        lambda db, business_date, now: db.update_room_availability_today(business_date),
+        description="Recompute rooms.is_available for the business date.",
+    ),
+    Job(
+        "mark_late_reservations",
+        lambda db, business_date, now: db.mark_late_reservations(business_date),
+        description="Mark yesterday's arrivals that never checked in as 'Late'.",
+    ),
+    Job(
+        "mark_late_checkouts",
+        lambda db, business_date, now: db.mark_late_checkouts(now),
+        not_before=time(12, 0),
+        description="Mark today's departures still in-house after noon as 'Late Check-out'.",
+    ),
+    Job(
+        "cancel_expired_late_reservations",
+        lambda db, business_date, now: db.cancel_expired_late_reservations(now),
+        not_before=time(14, 0),
+        description="Cancel 'Late' reservations 24 hours past their check-in time.",
+    ),
+    Job(
+        "archive_closed_reservations",
+        lambda db, business_date, now: db.archive.archive_closed(business_date),
+        description="Move old Cancelled/Complete reservations to reservations_archive.",
+    ),
+)
+
+
+class JobScheduler:
+    STALE_RUNNING_AFTER = timedelta(minutes=30)
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, db: DatabaseManager, jobs=DEFAULT_JOBS, interval_seconds: float = 60):
+        self.db = db
+        self.jobs = {job.name: job for job in jobs}
+        self.interval_seconds = interval_seconds
+        self._done = set()   # (job_name, business_date) pairs known to have succeeded
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # ---------------------------------------------------
+    # Running jobs
+    # ---------------------------------------------------
+    def run_due(self, now: Optional[datetime] = None):
+        """Run every job that is due at `now` and has not succeeded yet for today's business date."""
+        now = now or datetime.now()
+        business_date = now.date()
+        results = {}
+        for job in self.jobs.values():
+            if (job.name, business_date) in self._done or now.time() < job.not_before:
+                results[job.name] = "skipped"
+                continue
+            results[job.name] = self.run_job(job.name, business_date, now)
+        return results
+
+    def run_job(self, name: str, business_date: date, now: Optional[datetime] = None, force: bool = False):
+        """Run one job for a business date. Returns 'success', 'failed' or 'skipped'."""
+        job = self.jobs.get(name)
+        if job is None:
+            raise ValueError(f"Unknown job: {name}")
+
+        # Jobs run for a past date see the end of that day as "now".
+        if now is None:
+            now = datetime.now() if business_date == date.today() else datetime.combine(business_date, time(23, 59, 59))
+
+        with self._lock:
+            if not self._claim(name, business_date, now, force):
+                return "skipped"
+
+            start = time_module.perf_counter()
+            try:
+                job.action(self.db, business_date, now)
+            except Exception as e:
+                self._finish(name, business_date, "failed", start, repr(e))
+                print(f"[JobScheduler] {name} for {business_date.isoformat()} failed: {e}")
+                return "failed"
+
+            self._finish(name, business_date, "success", start)
+            self._done.add((name, business_date))
+            return "success"
+
+    def backfill(self, start: date, end: date, names=None, force: bool = False):
+        """Run jobs (all, or only `names`) for every business date from start to end inclusive."""
+        if end < start:
+            raise ValueError("end date must not be before start date.")
+        names = list(names) if names else list(self.jobs)
+        results = {}
+        day = start
+        while day <= end:
+            results[day.isoformat()] = {name: self.run_job(name, day, force=force) for name in names}
+            day += timedelta(days=1)
+        return results
+
+    def _claim(self, name, business_date, now, force):
+        """Atomically mark the run as 'running'. Returns False if it must be skipped."""
+        conn = self.db.connect()
+        conn.isolation_level = None
+        cur = conn.cursor()
+        stamp = datetime.now().isoformat(timespec="seconds")
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute(
+                "SELECT status, started_at, attempts FROM job_runs WHERE job_name = ? AND business_date = ?",
+                (name, business_date.isoformat()),
+            )
+            row = cur.fetchone()
+
+            if row is None:
+                cur.execute("""
+                    INSERT INTO job_runs (job_name, business_date, status, started_at, attempts)
+                    VALUES (?, ?, 'running', ?, 1)
+                """, (name, business_date.isoformat(), stamp))
+            else:
+                status, started_at, attempts = row
+                if not force:
+                    if status == "success":
+                        self._done.add((name, business_date))
+                        cur.execute("ROLLBACK")
+                        return False
+                    if status == "running" and datetime.now() - datetime.fromisoformat(started_at) < self.STALE_RUNNING_AFTER:
+                        cur.execute("ROLLBACK")
+                        return False
+                    if status == "failed" and attempts >= self.MAX_ATTEMPTS:
+                        cur.execute("ROLLBACK")
+                        return False
+                cur.execute("""
+                    UPDATE job_runs
+                    SET status = 'running', started_at = ?, finished_at = NULL,
+                        duration_ms = NULL, error = NULL, attempts = attempts + 1
+                    WHERE job_name = ? AND business_date = ?
+                """, (stamp, name, business_date.isoformat()))
+
+            cur.execute("COMMIT")
+            return True
+        except Exception:
+            # BEGIN IMMEDIATE itself may have failed (database is locked); there is nothing to roll back then
+            if conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _finish(self, name, business_date, status, start, error=None):
+        duration_ms = (time_module.perf_counter() - start) * 1000
+        observe_job(name, status, duration_ms / 1000)
+        conn = self.db.connect()
+        try:
+            conn.execute("""
+                UPDATE job_runs
+                SET status = ?, finished_at = ?, duration_ms = ?, error = ?
+                WHERE job_name = ? AND business_date = ?
+            """, (status, datetime.now().isoformat(timespec="seconds"), duration_ms, error,
+                  name, business_date.isoformat()))
+            conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def get_runs(self, business_date: Optional[date] = None, limit: int = 50):
+        """Return job_runs rows (newest business date first), optionally for a single date."""
+        query = "SELECT * FROM job_runs"
+        params = []
+        if business_date is not None:
+            query += " WHERE business_date = ?"
+            params.append(business_date.isoformat())
+        query += " ORDER BY business_date DESC, job_name LIMIT ?"
+        params.append(limit)
+        return self.db.execute_query(query, params)
+
+    # ---------------------------------------------------
+    # Background timer thread
+    # ---------------------------------------------------
+    def start(self, run_now: bool = True):
+        """Start the timer thread. With run_now, jobs due right now run before this returns."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if run_now:
+            self._tick()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="JobScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self._tick()
+
+    def _tick(self):
+        try:
+            self.run_due()
+        except Exception as e:
+            # Never let a database hiccup kill the timer thread; the next tick retries.
+            print(f"[JobScheduler] Tick failed: {e}")
+
+
+# ---------------------------------------------------
+# Command line interface
+# ---------------------------------------------------
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError("Invalid date format. Use YYYY-MM-DD.")
+
+
+def main(argv=None):
+    from config import DB_PATH
+    from hotel_manager import HotelManager
+
+    parser = argparse.ArgumentParser(description="Run or backfill the hotel's daily maintenance jobs.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="List the registered jobs.")
+
+    run_p = sub.add_parser("run", help="Run jobs for one business date (default: today).")
+    run_p.add_argument("jobs", nargs="*", help="Job names (default: all jobs due now)")
+    run_p.add_argument("--date", type=_parse_date, help="Business date YYYY-MM-DD")
+    run_p.add_argument("--force", action="store_true", help="Run even if already successful for the date")
+
+    back_p = sub.add_parser("backfill", help="Run jobs for every date in a range.")
+    back_p.add_argument("start", type=_parse_date)
+    back_p.add_argument("end", type=_parse_date, nargs="?", help="Last date (default: today)")
+    back_p.add_argument("--job", action="append", dest="jobs", help="Only run this job (repeatable)")
+    back_p.add_argument("--force", action="store_true")
+
+    status_p = sub.add_parser("status", help="Show recorded job runs.")
+    status_p.add_argument("--date", type=_parse_date)
+    status_p.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(args.db)
+    # cancel_expired_late_reservations goes through HotelManager's fee logic
+    db.hotel_manager = HotelManager(db)
+    scheduler = JobScheduler(db)
+
+    if args.command == "list":
+        for job in scheduler.jobs.values():
+            print(f"{job.name:<34} not before {job.not_before.strftime('%H:%M')}  {job.description}")
+        return 0
+
+    if args.command == "run":
+        if args.date is None and not args.jobs and not args.force:
+            results = scheduler.run_due()
+        else:
+            business_date = args.date or date.today()
+            names = args.jobs or list(scheduler.jobs)
+            results = {name: scheduler.run_job(name, business_date, force=args.force) for name in names}
+        for name, result in results.items():
+            print(f"{name:<34} {result}")
+        return 1 if "failed" in results.values() else 0
+
+    if args.command == "backfill":
+        results = scheduler.backfill(args.start, args.end or date.today(), args.jobs, args.force)
+        failed = False
+        for day, day_results in results.items():
+            for name, result in day_results.items():
+                print(f"{day}  {name:<34} {result}")
+                failed = failed or result == "failed"
+        return 1 if failed else 0
+
+    for row in scheduler.get_runs(args.date, args.limit):
+        duration = f"{row['duration_ms']:.1f} ms" if row["duration_ms"] is not None else "-"
+        print(f"{row['business_date']}  {row['job_name']:<34} {row['status']:<8} "
+              f"attempts={row['attempts']} {duration} {row['error'] or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
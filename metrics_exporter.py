@@ -0,0 +1,474 @@
+"""
+Module: metrics_exporter.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module exposes reservation engine health in the Prometheus text exposition format (version 0.0.4), so it can
+be scraped into the existing Grafana. A small in-process registry holds counters, gauges and histograms.
+HotelManager's reserve/modify/cancel/check-in/check-out methods record their outcome and latency into it, and
+JobScheduler records each job run. Database-wide figures (lock waits from the query statistics, cache hit ratios,
+the last job_runs rows) are read from a registered DatabaseManager when the metrics are rendered. The text can be
+written to a file for node_exporter's textfile collector (nothing has to listen on a port), or served over HTTP.
+
+Operation counts, lock waits and cache statistics live in the process that does the work, so the full set is only
+available from inside the app (HOTEL_METRICS_PORT / HOTEL_METRICS_FILE). The command line exporter runs in its own
+process and exports only what is stored in the database: each job's latest job_runs row.
+
+Usage:
+    HOTEL_METRICS_PORT=9464 python "Single Screen Prototype/main.py"     # all metrics, served from inside the app
+    python metrics_exporter.py --db hotel.db --textfile /var/lib/node_exporter/hotel.prom --interval 15  # job_runs only
+    python metrics_exporter.py --db hotel.db --port 9464                                               # job_runs only
+
+Important Functions:
+- observe_operation(name): Decorator counting a method's calls by outcome and timing them.
+- observe_job(name, status, seconds): Record one scheduled job run.
+- observe_email(result): Count one email outbox send attempt ("sent", "retry" or "failed").
+- register_database(db, registry=REGISTRY, process_stats=True): Add the job_runs collector for a DatabaseManager,
+  and (process_stats) the lock-wait and cache collectors for its in-process statistics.
+- render(registry=REGISTRY): The exposition text.
+  Output: str.
+- write_textfile(path, registry=REGISTRY): Atomically replace `path` with the current exposition text.
+- start_textfile_writer(path, interval, registry=REGISTRY): Rewrite the file every `interval` seconds.
+  Output: threading.Event; set it to stop the writer.
+- serve(port, addr="", registry=REGISTRY): Serve GET /metrics from a daemon thread.
+  Output: http.server.ThreadingHTTPServer (call shutdown() to stop).
+- main(argv): Command line entry point. Exports the job_runs figures only, from a registry of its own.
+
+Important Data Structures:
+- MetricsRegistry: Metrics in registration order plus collector callbacks run at render time.
+- Counter / Gauge / Histogram: Metric families; labels(*values) returns (and caches) the child for a label set.
+- REGISTRY: The process-wide default registry used by HotelManager and JobScheduler.
+- OPERATIONS / OPERATION_SECONDS / JOB_RUNS / JOB_SECONDS / EMAILS: The metrics recorded on the hot path.
+
+Algorithms:
+- Hot path cost: observe_operation binds the label children once at decoration time, so a call costs two
+  perf_counter() reads and two short locked updates. A histogram observation is a bisect over the bucket bounds;
+  counts are stored per bucket and made cumulative only when rendered.
+- Outcomes: "success", "rejected" for ValueError (business rules, e.g. the room was just taken) and "error" for
+  any other exception (sqlite3.OperationalError "database is locked", ...). The exception is re-raised.
+- Lock waits: every transaction starts with BEGIN IMMEDIATE, and the time that statement takes is the time spent
+  waiting for the write lock. Its QueryStats entry is exported as a summary (count/sum) plus the maximum.
+"""
+import abc
+import argparse
+import bisect
+import functools
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from time import perf_counter
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+# ---------------------------------------------------
+# Metric families
+# ---------------------------------------------------
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """Return a fresh per-label-set value holder with a samples(name, labels) method."""
+
+    def samples(self):
+        """Yield (sample name, ((label, value), ...), value)."""
+        for values, child in list(self._children.items()):
+            yield from child.samples(self.name, tuple(zip(self.labelnames, values)))
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = float(value)
+
+    def samples(self, name, labels):
+        yield name, labels, self.value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)    # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self, name, labels):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            yield f"{name}_bucket", labels + (("le", _format_value(float(bound))),), cumulative
+        yield f"{name}_sum", labels, total
+        yield f"{name}_count", labels, cumulative
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+
+# ---------------------------------------------------
+# Registry
+# ---------------------------------------------------
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered with a different shape.")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector, key=None):
+        """Add collector() -> iterable of (name, kind, documentation, samples). Each sample is (labels dict, value),
+        or (suffix, labels dict, value) for samples such as "_count". A collector registered again under the same
+        key replaces the previous one."""
+        with self._lock:
+            if key is not None:
+                self._collectors = [(k, c) for k, c in self._collectors if k != key]
+            self._collectors.append((key, collector))
+
+    def collect(self):
+        """Yield (name, kind, documentation, samples) with samples as (sample name, labels tuple, value)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = [c for _, c in self._collectors]
+        for metric in metrics:
+            yield metric.name, metric.kind, metric.documentation, list(metric.samples())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                # A failing collector must not take the whole scrape down
+                print(f"[Metrics] Collector failed: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                yield name, kind, documentation, [
+                    (name + sample[0], tuple(sample[1].items()), sample[2]) if len(sample) == 3
+                    else (name, tuple(sample[0].items()), sample[1])
+                    for sample in samples
+                ]
+
+
+REGISTRY = MetricsRegistry()
+
+OPERATIONS = REGISTRY.counter(
+    "hotel_operations_total", "HotelManager operations by outcome (success, rejected, error).",
+    ("operation", "outcome"))
+OPERATION_SECONDS = REGISTRY.histogram(
+    "hotel_operation_duration_seconds", "HotelManager operation latency.", ("operation",))
+JOB_RUNS = REGISTRY.counter(
+    "hotel_job_runs_total", "Scheduled maintenance job runs by status.", ("job", "status"))
+JOB_SECONDS = REGISTRY.histogram(
+    "hotel_job_duration_seconds", "Scheduled maintenance job run time.", ("job",), buckets=JOB_BUCKETS)
+EMAILS = REGISTRY.counter(
+    "hotel_emails_total", "Email outbox send attempts by result (sent, retry, failed).", ("result",))
+
+OUTCOMES = ("success", "rejected", "error")
+
+
+def observe_operation(name):
+    """Decorator: count calls by outcome and record latency under operation=`name`."""
+
+    def decorator(func):
+        success, rejected, error = (OPERATIONS.labels(name, outcome) for outcome in OUTCOMES)
+        latency = OPERATION_SECONDS.labels(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except ValueError:
+                rejected.inc()
+                latency.observe(perf_counter() - start)
+                raise
+            except Exception:
+                error.inc()
+                latency.observe(perf_counter() - start)
+                raise
+            success.inc()
+            latency.observe(perf_counter() - start)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def observe_job(name, status, seconds):
+    JOB_RUNS.labels(name, status).inc()
+    JOB_SECONDS.labels(name).observe(seconds)
+
+
+def observe_email(result):
+    EMAILS.labels(result).inc()
+
+
+# ---------------------------------------------------
+# Database collectors
+# ---------------------------------------------------
+def register_database(db, registry=REGISTRY, process_stats=True):
+    """Export lock waits, cache statistics and the latest job_runs rows for `db` (one database per registry).
+    Lock waits and cache statistics are counted by this process's DatabaseManager; process_stats=False leaves them
+    out and exports only what is stored in the database (job_runs), as the standalone exporter does.
+    """
+
+    def collect_process():
+        stats = db.query_stats.snapshot()
+        begin = next((s for s in stats["statements"] if s["fingerprint"] == "BEGIN IMMEDIATE"), None)
+        count, total, longest, errors = (0, 0.0, 0.0, 0) if begin is None else (
+            begin["calls"], begin["total_ms"] / 1000, begin["max_ms"] / 1000, begin["errors"])
+        yield ("hotel_db_lock_wait_seconds", "summary", "Time spent in BEGIN IMMEDIATE waiting for the write lock.",
+               [({"quantile": "1"}, longest), ("_count", {}, count), ("_sum", {}, total)])
+        yield ("hotel_db_lock_errors_total", "counter", "BEGIN IMMEDIATE failures (database is locked/busy).",
+               [({}, errors)])
+        yield ("hotel_db_statements_total", "counter", "SQL statements run through DatabaseManager.connect().",
+               [({}, stats["statements_run"])])
+        yield ("hotel_db_statement_errors_total", "counter", "SQL statements that raised.", [({}, stats["errors"])])
+        yield ("hotel_db_slow_queries", "gauge", "Entries in the slow-query log.",
+               [({}, len(stats["slow_queries"]))])
+
+        cache = db.cache.stats()
+        yield ("hotel_cache_hits_total", "counter", "QueryCache hits by method.",
+               [({"method": m}, c["hits"]) for m, c in cache["methods"].items()])
+        yield ("hotel_cache_misses_total", "counter", "QueryCache misses by method.",
+               [({"method": m}, c["misses"]) for m, c in cache["methods"].items()])
+        yield ("hotel_cache_hit_ratio", "gauge", "QueryCache hits / lookups since start.", [({}, cache["hit_rate"])])
+        yield ("hotel_cache_evictions_total", "counter", "QueryCache LRU evictions.", [({}, cache["evictions"])])
+        yield ("hotel_cache_entries", "gauge", "QueryCache entries held.", [({}, cache["size"])])
+
+    def collect_database():
+        rows = db.execute_query("""
+            SELECT job_name, status, duration_ms, finished_at
+            FROM job_runs j
+            WHERE business_date = (SELECT MAX(business_date) FROM job_runs WHERE job_name = j.job_name)
+        """)
+        yield ("hotel_job_last_duration_seconds", "gauge", "Duration of each job's latest recorded run.",
+               [({"job": r["job_name"]}, (r["duration_ms"] or 0) / 1000) for r in rows])
+        yield ("hotel_job_last_success", "gauge", "1 if each job's latest recorded run succeeded.",
+               [({"job": r["job_name"]}, 1 if r["status"] == "success" else 0) for r in rows])
+
+    if process_stats:
+        registry.register_collector(collect_process, key="database_process")
+    registry.register_collector(collect_database, key="database")
+
+
+# ---------------------------------------------------
+# Output
+# ---------------------------------------------------
+def render(registry=REGISTRY):
+    lines = []
+    for name, kind, documentation, samples in registry.collect():
+        lines.append(f"# HELP {name} {_escape(documentation)}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Write the exposition text next to `path` and rename it over `path`, so readers never see half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render(registry))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def start_textfile_writer(path, interval=15.0, registry=REGISTRY):
+    stop = threading.Event()
+
+    def loop():
+        while True:
+            try:
+                write_textfile(path, registry)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[Metrics] Could not write {path}: {e}")
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=loop, name="MetricsTextfile", daemon=True).start()
+    return stop
+
+
+def serve(port, addr="", registry=REGISTRY):
+    # Imported here: the HTTP endpoint is optional and http.server is slow to import at app startup
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render(registry).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=server.serve_forever, name="MetricsHTTP", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export reservation engine metrics in Prometheus text format.")
+    parser.add_argument("--db", default=None, help="database file (default: config.DB_PATH)")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--textfile", help="write the metrics to this file")
+    output.add_argument("--port", type=int, help="serve /metrics on this port")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="with --textfile, rewrite the file every INTERVAL seconds instead of once")
+    args = parser.parse_args(argv)
+
+    from config import DB_PATH
+    from database_manager import DatabaseManager
+    # A separate process sees none of the app's operations, query statistics or cache lookups, so only the
+    # database-wide figures are exported here (see the module docstring)
+    registry = MetricsRegistry()
+    register_database(DatabaseManager(args.db or DB_PATH), registry, process_stats=False)
+
+    if args.port:
+        server = serve(args.port, registry=registry)
+        print(f"Serving metrics on http://localhost:{server.server_address[1]}/metrics")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+    if args.textfile:
+        if args.interval:
+            start_textfile_writer(args.textfile, args.interval, registry)
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+        else:
+            write_textfile(args.textfile, registry)
+        return 0
+    sys.stdout.write(render(registry))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Module: query_cache.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module memoizes read methods of DatabaseManager and HotelManager (get_rooms_filtered, search_rooms, ...).
+The Tk frames call these repeatedly with the same arguments (every refresh, filter change and page flip), and each
+call opens a new SQLite connection. Every cached entry records the
+tables it was read from and the version of each of those tables at the time. Writes bump the table versions, so a
+later lookup sees the mismatch and reads from the database again. Writes from other processes are detected with
+`PRAGMA data_version`.
+
+Important Functions:
+- cached(*tables, via=None): Decorator for read methods. `tables` are the tables the method reads; `via` names the
+  attribute holding the DatabaseManager when the decorated method belongs to another class (HotelManager uses "db").
+- QueryCache.get_or_load(method, key, tables, loader): Return the cached value or call loader() and store it.
+- QueryCache.note_statement(conn, sql): Trace callback hook; records tables written by INSERT/UPDATE/DELETE.
+- QueryCache.note_commit(conn): Publishes a connection's pending writes when it commits or closes.
+- QueryCache.version_token(*tables): Token that changes whenever any of the tables may have changed.
+- QueryCache.add_commit_listener(callback): Call callback(tables) after a local connection commits writes.
+- QueryCache.stats(): Hit/miss/eviction counters overall and per method.
+  Output: dict
+- QueryCache.clear(): Drop every entry.
+
+Important Data Structures:
+- _entries (OrderedDict): (method, args) -> (version snapshot, value), kept in least-recently-used order.
+- _versions (dict): table name -> int version. `_epoch` is bumped for changes that can touch any table (DDL,
+  writes from another process to a database without table_versions).
+- _table_versions (dict): Last table_versions row values seen by the monitor connection.
+- TrackedConnection: sqlite3.Connection subclass returned by DatabaseManager.connect(); remembers which tables it
+  wrote so they can be bumped again once the transaction is committed.
+
+Algorithms:
+- Version check: An entry is valid only if the epoch and the current version of every table it depends on match
+  the snapshot stored with it. Stale entries are dropped on lookup (lazy invalidation).
+- Write detection: The connection's trace callback parses each statement's leading keyword and table name. The
+  table is bumped when the statement runs and again when the connection commits or closes, so a reader that cached
+  data between the write and the commit (seeing the old rows) is invalidated too. Python reports every row-trigger
+  step with the text of the statement that fired it, so a repeat of the previous statement's text is skipped.
+- Cross-process writes: A long-lived monitor connection reads PRAGMA data_version, which changes whenever any other
+  connection commits. When it changed, the monitor reads table_versions (kept up to date by triggers, see
+  DatabaseManager.VERSIONED_TABLES) and bumps only the tables whose counter moved. Databases without that table
+  fall back to the epoch: if none of this process's connections committed since the last check, the change came
+  from another process and every entry is invalidated.
+- LRU eviction: OrderedDict.move_to_end on hit, popitem(last=False) when over maxsize.
+"""
+import functools
+import re
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+
+
+_WRITE_RE = re.compile(
+    r"""^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+["'`\[]?(\w+)""",
+    re.IGNORECASE,
+)
+_DDL_RE = re.compile(r"^\s*(?:CREATE|DROP|ALTER)\b", re.IGNORECASE)
+_END_RE = re.compile(r"^\s*(?:COMMIT|END)\b", re.IGNORECASE)
+
+
+class TrackedConnection(sqlite3.Connection):
+    """Connection that reports commits/closes to the owning QueryCache."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_cache = None
+        self.written_tables = set()
+
+    def commit(self):
+        super().commit()
+        if self.query_cache is not None:
+            self.query_cache.note_commit(self)
+
+    def close(self):
+        if self.query_cache is not None:
+            self.query_cache.note_commit(self)
+        super().close()
+
+
+class QueryCache:
+    def __init__(self, db_name, maxsize=256, check_external=True):
+        self.db_name = db_name
+        self.maxsize = maxsize
+        self.check_external = check_external
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._epoch = 0
+        self._local_commits = 0
+        self._lock = threading.RLock()
+        self._monitor = None
+        self._last_data_version = None
+        self._last_local_commits = 0
+        self._table_versions = None
+        self._commit_listeners = []
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._per_method = {}   # method -> [hits, misses]
+
+    # ---------------------------------------------------
+    # Write tracking
+    # ---------------------------------------------------
+    def attach(self, conn):
+        """Install write tracking on a connection created by DatabaseManager.connect()."""
+        if isinstance(conn, TrackedConnection):
+            conn.query_cache = self
+        # Weak reference so the callback does not keep an unclosed connection alive
+        conn_ref = weakref.ref(conn)
+        last = [None]
+
+        def trace(sql):
+            # Row triggers (table_versions) re-report the statement that fired them once per row
+            if sql != last[0]:
+                last[0] = sql
+                self.note_statement(conn_ref(), sql)
+
+        conn.set_trace_callback(trace)
+
+    def note_statement(self, conn, sql):
+        match = _WRITE_RE.match(sql)
+        if match:
+            table = match.group(1).lower()
+            if isinstance(conn, TrackedConnection):
+                conn.written_tables.add(table)
+            self.bump(table)
+        elif _DDL_RE.match(sql):
+            self.bump()
+        elif _END_RE.match(sql):
+            self.note_commit(conn)
+
+    def note_commit(self, conn):
+        tables = getattr(conn, "written_tables", None)
+        if not tables:
+            return
+        with self._lock:
+            self._local_commits += 1
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            listeners = list(self._commit_listeners)
+        committed = frozenset(tables)
+        tables.clear()
+        for listener in listeners:
+            listener(committed)
+
+    def add_commit_listener(self, callback):
+        """callback(frozenset of table names) runs on the committing thread after each local commit with writes."""
+        with self._lock:
+            self._commit_listeners.append(callback)
+
+    def remove_commit_listener(self, callback):
+        with self._lock:
+            if callback in self._commit_listeners:
+                self._commit_listeners.remove(callback)
+
+    def bump(self, *tables):
+        """Invalidate entries depending on `tables` (all entries when no table is given)."""
+        with self._lock:
+            if not tables:
+                self._epoch += 1
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def _check_external_writes(self):
+        """Bump the epoch if another process committed since the last check."""
+        if not self.check_external:
+            return
+        try:
+            if self._monitor is None:
+                self._monitor = sqlite3.connect(self.db_name, check_same_thread=False)
+            data_version = self._monitor.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            self._epoch += 1
+            return
+        if data_version != self._last_data_version:
+            changed = self._changed_tables()
+            if changed is not None:
+                self.bump(*changed)
+            elif self._last_data_version is not None and self._local_commits == self._last_local_commits:
+                self._epoch += 1
+        self._last_data_version = data_version
+        self._last_local_commits = self._local_commits
+
+    def _changed_tables(self):
+        """Tables whose table_versions counter moved since the last read, or None if the table is missing."""
+        try:
+            versions = dict(self._monitor.execute("SELECT table_name, version FROM table_versions"))
+        except sqlite3.Error:
+            self._table_versions = None
+            return None
+        previous, self._table_versions = self._table_versions, versions
+        if previous is None:
+            return ()
+        return tuple(table for table, version in versions.items() if previous.get(table) != version)
+
+    # ---------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------
+    def _snapshot(self, tables):
+        return (self._epoch,) + tuple(self._versions.get(t, 0) for t in tables)
+
+    def version_token(self, *tables):
+        """Opaque token that changes whenever any of `tables` may have changed (used by RoomInventory)."""
+        with self._lock:
+            self._check_external_writes()
+            return self._snapshot(tuple(t.lower() for t in tables))
+
+    def get_or_load(self, method, key, tables, loader):
+        with self._lock:
+            self._check_external_writes()
+            snapshot = self._snapshot(tables)
+            counters = self._per_method.setdefault(method, [0, 0])
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == snapshot:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    counters[0] += 1
+                    return entry[1]
+                del self._entries[key]
+                self._invalidations += 1
+            self._misses += 1
+            counters[1] += 1
+
+        # Load outside the lock so slow queries do not block other threads' hits
+        value = loader()
+
+        with self._lock:
+            # Only store if nothing changed while loading; otherwise the value may already be stale
+            if self._snapshot(tables) == snapshot:
+                self._entries[key] = (snapshot, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+
+    def stats(self):
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "methods": {name: {"hits": h, "misses": m} for name, (h, m) in self._per_method.items()},
+            }
+
+
+def _freeze(value):
+    """Turn lists/dicts/sets in arguments into hashable equivalents for the cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _copy(value):
+    """Callers get their own list so mutating a result cannot corrupt the cache (rows are immutable)."""
+    return list(value) if isinstance(value, list) else value
+
+
+def cached(*tables, via=None):
+    """Memoize a read method. Bypassed when the owner has no QueryCache (e.g. a mocked DatabaseManager)."""
+    tables = tuple(t.lower() for t in tables)
+
+    def decorator(func):
+        method = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            owner = getattr(self, via) if via else self
+            cache = getattr(owner, "cache", None)
+            if not isinstance(cache, QueryCache):
+                return func(self, *args, **kwargs)
+            try:
+                key = (method, _freeze(args), _freeze(kwargs))
+                hash(key)
+            except TypeError:
+                return func(self, *args, **kwargs)
+            return _copy(cache.get_or_load(method, key, tables, lambda: func(self, *args, **kwargs)))
+
+        return wrapper
+
+    return decorator
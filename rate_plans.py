@@ -0,0 +1,320 @@
+"""
+Module: rate_plans.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module adds rate plans on top of the base price stored in rooms.price. Rules in the `rate_rules` table raise or
+lower the nightly rate for a season (date range), for certain days of the week (e.g. Friday and Saturday nights),
+for one room type or all of them, and for long stays (minimum number of nights). Evaluating every rule for every
+night of every quoted room would make search results slow, so RatePlans precomputes a rate calendar: for each room
+type and each night of the booking horizon it stores how that night's rate is derived from the room's base price.
+Quoting a stay is then a slice and a sum over that calendar.
+
+Important Functions:
+- RatePlans.stay_rates(room_type, first_night, nights): Rates for one stay of a room type.
+  Input: room_type (str), first_night (date), nights (int).
+  Output: StayRates
+- StayRates.nightly(base_price) / StayRates.subtotal(base_price): Per-night rates and their sum for one room.
+- RatePlans.add_rule(...), update_rule(rule_id, **changes), delete_rule(rule_id): Manage rules. The calendar is
+  recomputed only for the room types and dates the old and new versions of the rule cover.
+- RatePlans.list_rules(): All rules, in the order they are applied.
+  Output: list of RateRule
+
+Important Data Structures:
+- RateRule: Frozen dataclass, one row of rate_rules. adjustment_type is "percent" (adjustment is a percentage, e.g.
+  -10 for 10% off), "amount" (added to the nightly rate) or "fixed" (replaces the nightly rate).
+- Calendar: dict room_type -> (multipliers, additions), two array('d') with one entry per night of the horizon
+  (today through HORIZON_DAYS ahead). A night's rate for a room is multiplier * rooms.price + addition.
+- StayRates: The multipliers and additions for the nights of one stay, with their sums.
+
+Algorithms:
+- Rules as linear maps: Every adjustment maps a rate r to a * r + b (percent: (1 + p/100) * r, amount: r + x,
+  fixed: 0 * r + x). Applying the rules in (priority, rule_id) order composes these maps, so a night is fully
+  described by one (a, b) pair that holds for every room of the type, whatever its base price.
+- Stay sums: A stay's subtotal for a room is base_price * sum(a) + sum(b) over the stay's nights, so a result list
+  costs one slice per room type plus one multiply-add per room.
+- Length of stay: Rules with min_nights depend on the stay, not the night, so they are kept out of the calendar.
+  When a stay qualifies (enough nights, first night inside the rule's dates), the rule's map is applied to every
+  night of the stay after the calendar lookup.
+- Incremental updates: add/update/delete_rule recompute only the affected (room type, night) cells. When the
+  horizon moves to a new day the calendar is shifted and only the new last night is computed. Changes made by
+  other processes are detected through DatabaseManager.cache.version_token("rate_rules") and trigger a full
+  rebuild (a few hundred nights per room type).
+- Nights outside the horizon (e.g. re-pricing a past stay) are evaluated from the rules directly.
+"""
+import threading
+from array import array
+from dataclasses import dataclass, fields
+from datetime import date, timedelta
+from typing import Optional
+
+
+HORIZON_DAYS = 400   # covers HotelManager.MAX_ADVANCE_DAYS + MAX_STAY_NIGHTS
+
+ADJUSTMENT_TYPES = ("percent", "amount", "fixed")
+
+
+@dataclass(frozen=True)
+class RateRule:
+    rule_id: int
+    name: str
+    adjustment_type: str
+    adjustment: float
+    room_type: Optional[str] = None
+    start_date: Optional[str] = None     # first night the rule applies to, inclusive
+    end_date: Optional[str] = None       # last night the rule applies to, inclusive
+    days_of_week: Optional[str] = None   # comma separated weekday numbers, 0 = Monday
+    min_nights: Optional[int] = None
+    priority: int = 0
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**{f.name: row[f.name] for f in fields(cls)})
+
+    @property
+    def weekdays(self):
+        if not self.days_of_week:
+            return None
+        return frozenset(int(d) for d in self.days_of_week.split(","))
+
+    def covers(self, room_type, night):
+        """True if the rule applies to this room type and night (ignoring min_nights)."""
+        if self.room_type is not None and self.room_type != room_type:
+            return False
+        iso = night.isoformat()
+        if self.start_date is not None and iso < self.start_date:
+            return False
+        if self.end_date is not None and iso > self.end_date:
+            return False
+        weekdays = self.weekdays
+        return weekdays is None or night.weekday() in weekdays
+
+    def apply(self, a, b):
+        """Compose the rule's adjustment onto the map rate -> a * rate + b."""
+        if self.adjustment_type == "percent":
+            factor = 1 + self.adjustment / 100
+            return a * factor, b * factor
+        if self.adjustment_type == "amount":
+            return a, b + self.adjustment
+        return 0.0, self.adjustment
+
+
+def _validate_rule(values):
+    if values["adjustment_type"] not in ADJUSTMENT_TYPES:
+        raise ValueError(f"adjustment_type must be one of {ADJUSTMENT_TYPES}.")
+    for key in ("start_date", "end_date"):
+        if values.get(key) is not None:
+            values[key] = date.fromisoformat(str(values[key])).isoformat()
+    if values.get("start_date") and values.get("end_date") and values["end_date"] < values["start_date"]:
+        raise ValueError("end_date must not be before start_date.")
+    days = values.get("days_of_week")
+    if days is not None and not isinstance(days, str):
+        values["days_of_week"] = ",".join(str(int(d)) for d in sorted(set(days)))
+    if values.get("days_of_week") and not all(0 <= int(d) <= 6 for d in values["days_of_week"].split(",")):
+        raise ValueError("days_of_week must be weekday numbers 0 (Monday) to 6 (Sunday).")
+    if values.get("min_nights") is not None and values["min_nights"] < 1:
+        raise ValueError("min_nights must be at least 1.")
+    return values
+
+
+@dataclass(frozen=True)
+class StayRates:
+    multipliers: tuple
+    additions: tuple
+    multiplier_sum: float
+    addition_sum: float
+
+    def nightly(self, base_price):
+        return tuple(a * base_price + b for a, b in zip(self.multipliers, self.additions))
+
+    def subtotal(self, base_price):
+        return base_price * self.multiplier_sum + self.addition_sum
+
+
+class RatePlans:
+    def __init__(self, db, horizon_days=HORIZON_DAYS):
+        self.db = db
+        self.horizon_days = horizon_days
+        self._lock = threading.RLock()
+        self._rules = None         # list of RateRule in application order
+        self._start = None         # first night of the calendar
+        self._calendar = {}        # room_type -> (array a, array b)
+        self._token = None
+
+    # ---------------------------------------------------
+    # Rule management
+    # ---------------------------------------------------
+    def list_rules(self):
+        with self._lock:
+            self._ensure_current()
+            return list(self._rules)
+
+    def add_rule(self, name, adjustment_type, adjustment, room_type=None, start_date=None, end_date=None,
+                 days_of_week=None, min_nights=None, priority=0) -> int:
+        """Insert a rule and update the calendar cells it covers. Returns the new rule_id."""
+        values = _validate_rule(dict(
+            name=name, adjustment_type=adjustment_type, adjustment=float(adjustment), room_type=room_type,
+            start_date=start_date, end_date=end_date, days_of_week=days_of_week, min_nights=min_nights,
+            priority=priority,
+        ))
+        with self._lock:
+            self._ensure_current()
+            conn = self.db.connect()
+            try:
+                cur = conn.cursor()
+                cur.execute(
+                    f"INSERT INTO rate_rules ({', '.join(values)}) VALUES ({', '.join(['?'] * len(values))})",
+                    tuple(values.values()),
+                )
+                rule_id = cur.lastrowid
+                conn.commit()
+            finally:
+                conn.close()
+            self._rules_changed(None, rule_id)
+            return rule_id
+
+    def update_rule(self, rule_id, **changes):
+        """Change some fields of a rule and update the calendar cells covered before or after the change."""
+        allowed = {f.name for f in fields(RateRule)} - {"rule_id"}
+        unknown = set(changes) - allowed
+        if unknown:
+            raise ValueError(f"Unknown rate rule fields: {', '.join(sorted(unknown))}")
+        with self._lock:
+            self._ensure_current()
+            old = self._find(rule_id)
+            values = {f.name: getattr(old, f.name) for f in fields(RateRule) if f.name != "rule_id"}
+            values.update(changes)
+            values = _validate_rule(values)
+            conn = self.db.connect()
+            try:
+                conn.execute(
+                    f"UPDATE rate_rules SET {', '.join(f'{k} = ?' for k in values)} WHERE rule_id = ?",
+                    (*values.values(), rule_id),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+            self._rules_changed(old, rule_id)
+
+    def delete_rule(self, rule_id):
+        with self._lock:
+            self._ensure_current()
+            old = self._find(rule_id)
+            conn = self.db.connect()
+            try:
+                conn.execute("DELETE FROM rate_rules WHERE rule_id = ?", (rule_id,))
+                conn.commit()
+            finally:
+                conn.close()
+            self._rules_changed(old, None)
+
+    def _find(self, rule_id):
+        for rule in self._rules:
+            if rule.rule_id == rule_id:
+                return rule
+        raise ValueError(f"Rate rule {rule_id} does not exist.")
+
+    # ---------------------------------------------------
+    # Quoting
+    # ---------------------------------------------------
+    def stay_rates(self, room_type, first_night, nights) -> StayRates:
+        """Multipliers/additions for each night of a stay of `room_type` starting on `first_night`."""
+        with self._lock:
+            self._ensure_current()
+            offset = (first_night - self._start).days
+            if 0 <= offset and offset + nights <= self.horizon_days:
+                a_cells, b_cells = self._calendar_for(room_type)
+                a = a_cells[offset:offset + nights]
+                b = b_cells[offset:offset + nights]
+            else:
+                a, b = array("d"), array("d")
+                for i in range(nights):
+                    ai, bi = self._evaluate(room_type, first_night + timedelta(days=i))
+                    a.append(ai)
+                    b.append(bi)
+            stay_rules = [r for r in self._rules if r.min_nights is not None and r.min_nights <= nights
+                          and r.covers(room_type, first_night)]
+
+        if stay_rules:
+            a, b = list(a), list(b)
+            for rule in stay_rules:
+                for i in range(nights):
+                    a[i], b[i] = rule.apply(a[i], b[i])
+        return StayRates(tuple(a), tuple(b), sum(a), sum(b))
+
+    # ---------------------------------------------------
+    # Calendar maintenance
+    # ---------------------------------------------------
+    def _ensure_current(self):
+        token = self.db.cache.version_token("rate_rules")
+        today = date.today()
+        if self._rules is None or token != self._token:
+            self._rules = self._load_rules()
+            self._start = today
+            self._calendar = {}
+            self._token = token
+        elif today != self._start:
+            self._shift(today)
+
+    def _load_rules(self):
+        conn = self.db.connect()
+        try:
+            rows = conn.execute("SELECT * FROM rate_rules ORDER BY priority, rule_id").fetchall()
+        finally:
+            conn.close()
+        return [RateRule.from_row(row) for row in rows]
+
+    def _calendar_for(self, room_type):
+        cells = self._calendar.get(room_type)
+        if cells is None:
+            cells = (array("d", [1.0]) * self.horizon_days, array("d", [0.0]) * self.horizon_days)
+            self._calendar[room_type] = cells
+            self._recompute([room_type], 0, self.horizon_days)
+        return cells
+
+    def _evaluate(self, room_type, night):
+        a, b = 1.0, 0.0
+        for rule in self._rules:
+            if rule.min_nights is None and rule.covers(room_type, night):
+                a, b = rule.apply(a, b)
+        return a, b
+
+    def _recompute(self, room_types, first, last):
+        """Recompute calendar offsets [first, last) for the given room types."""
+        for room_type in room_types:
+            a_cells, b_cells = self._calendar[room_type]
+            for offset in range(first, last):
+                a_cells[offset], b_cells[offset] = self._evaluate(room_type, self._start + timedelta(days=offset))
+
+    def _shift(self, today):
+        days = (today - self._start).days
+        self._start = today
+        if days <= 0 or days >= self.horizon_days:
+            self._calendar = {}
+            return
+        for room_type, (a_cells, b_cells) in self._calendar.items():
+            del a_cells[:days]
+            del b_cells[:days]
+            a_cells.extend([1.0] * days)
+            b_cells.extend([0.0] * days)
+        self._recompute(list(self._calendar), self.horizon_days - days, self.horizon_days)
+
+    def _rules_changed(self, old, new_rule_id):
+        """Reload the rules and recompute the cells the old and new versions of one rule cover."""
+        self._rules = self._load_rules()
+        self._token = self.db.cache.version_token("rate_rules")
+        new = next((r for r in self._rules if r.rule_id == new_rule_id), None)
+
+        for rule in (old, new):
+            if rule is None or rule.min_nights is not None:
+                continue   # stay rules are applied at quote time
+            first, last = 0, self.horizon_days
+            if rule.start_date is not None:
+                first = max(first, (date.fromisoformat(rule.start_date) - self._start).days)
+            if rule.end_date is not None:
+                last = min(last, (date.fromisoformat(rule.end_date) - self._start).days + 1)
+            if first >= last:
+                continue
+            room_types = [t for t in self._calendar if rule.room_type is None or t == rule.room_type]
+            self._recompute(room_types, first, last)
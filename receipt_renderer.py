@@ -0,0 +1,351 @@
+"""
+Module: receipt_renderer.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module renders reservation receipt emails (HTML body plus inline hotel logo) as ready-to-send message text.
+The receipt template is compiled once per renderer. The constant parts, such as the sender name and tax rate, are
+filled in at compile time. The logo's MIME part is encoded once and reused for every message, so rendering a
+receipt costs a template fill and one base64 pass over the small HTML body. Before, every receipt decoded the logo
+and serialized it again through the email package. render_many() renders receipts in bulk (e.g. folio emails for
+every departure of the day) and spreads large runs over a process pool.
+
+Usage:
+    renderer = ReceiptRenderer("RSC Hotels", "roomservicecoders@gmail.com")
+    subject, message = renderer.render_receipt(receipt)
+    for receipt, subject, message in render_many(receipts, "RSC Hotels", "desk@hotel.example"):
+        outbox.enqueue(receipt.guest_email, subject, message, reservation_id=receipt.reservation_id)
+
+Important Functions:
+- ReceiptRenderer.render_html(...): The receipt HTML for one reservation.
+- ReceiptRenderer.render_message(to_email, subject, body_html): Complete RFC 5322 message text
+  (multipart/related with the cached logo part), accepted by smtplib.sendmail and EmailOutbox.enqueue.
+- ReceiptRenderer.render_receipt(receipt): (subject, message text) for a Receipt.
+- render_many(receipts, sender_name, from_address, workers=None): Yields (receipt, subject, message text) in
+  input order; uses a process pool for PARALLEL_MIN receipts or more.
+
+Important Data Structures:
+- Receipt: Frozen dataclass with what one receipt shows (guest, reservation, room, dates, nights, amount, is_paid).
+- CompiledTemplate: The template split once into (literal, field, format spec) parts.
+- RECEIPT_HTML: The receipt template ({field} placeholders, literal braces doubled).
+
+Algorithms:
+- Compilation: string.Formatter().parse splits the template once. Fields known at compile time are formatted
+  into the neighbouring literal text, so rendering only joins the literals with the per-receipt values. String
+  values are HTML-escaped.
+- Message assembly: The headers, the base64 HTML part and the boundaries are written directly as text; the logo
+  part is serialized once in the constructor. Boundaries start with "=_", which cannot occur in base64 text.
+- Bulk rendering: Workers render only the per-receipt head of each message (headers and HTML part), in chunks of
+  chunk_size. The parent process appends the shared logo part, so the large logo is never sent between
+  processes and only one message at a time is held in memory.
+"""
+import base64
+import os
+import secrets
+from dataclasses import dataclass
+from email.header import Header
+from email.mime.image import MIMEImage
+from email.utils import formataddr, formatdate, make_msgid
+from html import escape
+from string import Formatter
+
+from hotel_models import TAX_RATE
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Single Screen Prototype", "Images",
+                         "Hotel_Logo.png")
+PARALLEL_MIN = 2000
+
+RECEIPT_SUBJECT = "Your Reservation Confirmation #{reservation_id}"
+
+RECEIPT_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+    <meta charset="UTF-8" />
+    <title>Your Reservation Receipt</title>
+
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            background-color: #f4f4f4;
+            margin: 0;
+            padding: 0;
+        }}
+
+        .container {{
+            width: 100%;
+            max-width: 600px;
+            margin: 20px auto;
+            background: white;
+            padding: 20px;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+        }}
+
+        h2 {{
+            text-align: center;
+            color: #2C3E50;
+        }}
+
+        .receipt-box {{
+            border: 1px solid #ccc;
+            padding: 20px;
+            border-radius: 6px;
+            background-color: #fafafa;
+            margin-top: 20px;
+        }}
+
+        .row {{
+            margin-bottom: 10px;
+        }}
+
+        .label {{
+            font-weight: bold;
+            color: #34495E;
+            margin-right: 5px;
+        }}
+
+        .footer {{
+            margin-top: 25px;
+            text-align: center;
+            font-size: 13px;
+            color: #666;
+        }}
+
+        .logo {{
+            text-align: center;
+            margin-bottom: 20px;
+        }}
+    </style>
+
+    </head>
+    <body>
+
+    <div class="container">
+
+        <div class="logo">
+            <img src="cid:hotel_logo" alt="Hotel Logo" style="width:160px;">
+        </div>
+
+        <h2>Reservation Confirmation</h2>
+
+        <p>Hello {guest_name},</p>
+        <p>Thank you for choosing our hotel! Below is your reservation receipt:</p>
+
+        <div class="receipt-box">
+
+            <div class="row"><span class="label">Reservation ID:</span> {reservation_id}</div>
+            <div class="row"><span class="label">Room Number:</span> {room_number}</div>
+            <div class="row"><span class="label">Check-In:</span> {check_in}</div>
+            <div class="row"><span class="label">Check-Out:</span> {check_out}</div>
+
+            <hr>
+
+            <div class="row"><span class="label">Room Price:</span> ${room_price:.2f}</div>
+            <div class="row"><span class="label">{nights} Nights:</span> X{nights}</div>
+            <div class="row"><span class="label">Subtotal:</span> ${subtotal:.2f}</div>
+            <div class="row"><span class="label">Tax ({tax_rate:.1%}):</span> ${tax_amount:.2f}</div>
+
+            <div class="row" style="margin-top: 15px; font-size: 16px;">
+                <span class="label">{status_label}:</span> ${amount:.2f}
+            </div>
+
+        </div>
+
+        <p class="footer">
+            We look forward to your stay!<br>
+            — {sender_name}
+        </p>
+
+    </div>
+
+    </body>
+    </html>
+    """
+
+
+@dataclass(frozen=True)
+class Receipt:
+    guest_email: str
+    guest_name: str
+    reservation_id: int
+    room_number: object
+    check_in: str
+    check_out: str
+    nights: int
+    amount: float
+    is_paid: bool
+
+
+class CompiledTemplate:
+
+    def __init__(self, text, **constants):
+        """Split `text` ({field} / {field:spec} placeholders) once; fields in `constants` are filled in now."""
+        parts = []
+        literal_run = ""
+        for literal, field, spec, conversion in Formatter().parse(text):
+            literal_run += literal
+            if field is None:
+                continue
+            if conversion:
+                raise ValueError(f"Conversions are not supported in receipt templates: {{{field}!{conversion}}}")
+            if field in constants:
+                literal_run += self._format(constants[field], spec)
+                continue
+            parts.append((literal_run, field, spec))
+            literal_run = ""
+        self._parts = tuple(parts)
+        self._tail = literal_run
+        self.fields = frozenset(field for _, field, _ in parts)
+
+    @staticmethod
+    def _format(value, spec):
+        return escape(format(value, spec)) if isinstance(value, str) else format(value, spec)
+
+    def render(self, values):
+        out = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            out.append(self._format(values[field], spec))
+        out.append(self._tail)
+        return "".join(out)
+
+
+class ReceiptRenderer:
+
+    def __init__(self, sender_name="Hotel Reservations", from_address="", logo_bytes=None, template=RECEIPT_HTML):
+        self.sender_name = sender_name
+        self.from_address = from_address
+        self.template = CompiledTemplate(template, sender_name=sender_name, tax_rate=TAX_RATE)
+        self._from_header = self._header(formataddr((sender_name, from_address)))
+        self._msgid_domain = from_address.rpartition("@")[2] or "localhost"
+
+        if logo_bytes is None:
+            with open(LOGO_PATH, "rb") as f:
+                logo_bytes = f.read()
+        self.logo_part = self._build_logo_part(logo_bytes) if logo_bytes else ""
+
+    # ---------------------------------------------------
+    # HTML
+    # ---------------------------------------------------
+    def render_html(self, guest_name, reservation_id, room_number, check_in, check_out, nights, amount, is_paid):
+        # Reverse-calc subtotal and tax using the total
+        subtotal = amount / (1 + TAX_RATE)
+        return self.template.render({
+            "guest_name": guest_name,
+            "reservation_id": reservation_id,
+            "room_number": room_number,
+            "check_in": check_in,
+            "check_out": check_out,
+            "nights": nights,
+            "room_price": subtotal / nights if nights else subtotal,
+            "subtotal": subtotal,
+            "tax_amount": subtotal * TAX_RATE,
+            "status_label": "Total Paid" if is_paid else "Total Due At Check-In",
+            "amount": amount,
+        })
+
+    # ---------------------------------------------------
+    # Message text
+    # ---------------------------------------------------
+    def render_message(self, to_email, subject, body_html):
+        head, tail = self._render_head(to_email, subject, body_html)
+        return head + self.logo_part + tail
+
+    def render_receipt(self, receipt):
+        """(subject, message text) for one Receipt."""
+        subject, head, tail = self._render_receipt_head(receipt)
+        return subject, head + self.logo_part + tail
+
+    def _render_receipt_head(self, receipt):
+        subject = RECEIPT_SUBJECT.format(reservation_id=receipt.reservation_id)
+        html = self.render_html(receipt.guest_name, receipt.reservation_id, receipt.room_number, receipt.check_in,
+                                receipt.check_out, receipt.nights, receipt.amount, receipt.is_paid)
+        head, tail = self._render_head(receipt.guest_email, subject, html)
+        return subject, head, tail
+
+    def _render_head(self, to_email, subject, body_html):
+        """Everything before the logo part, and the closing delimiter after it."""
+        boundary = f"=_{secrets.token_hex(16)}"
+        # Independent token: RFC 2046 5.1.1 forbids a nested boundary that starts with the enclosing one
+        alt_boundary = f"=_{secrets.token_hex(16)}"
+        body = base64.encodebytes(body_html.encode("utf-8")).decode("ascii")
+        head = (
+            f'Content-Type: multipart/related; boundary="{boundary}"\n'
+            "MIME-Version: 1.0\n"
+            f"From: {self._from_header}\n"
+            f"To: {self._header(to_email)}\n"
+            f"Subject: {self._header(subject)}\n"
+            f"Date: {formatdate(localtime=True)}\n"
+            f"Message-ID: {make_msgid(domain=self._msgid_domain)}\n"
+            "\n"
+            f"--{boundary}\n"
+            f'Content-Type: multipart/alternative; boundary="{alt_boundary}"\n'
+            "MIME-Version: 1.0\n"
+            "\n"
+            f"--{alt_boundary}\n"
+            'Content-Type: text/html; charset="utf-8"\n'
+            "MIME-Version: 1.0\n"
+            "Content-Transfer-Encoding: base64\n"
+            "\n"
+            f"{body}"
+            f"--{alt_boundary}--\n"
+            "\n"
+            f"--{boundary}\n"
+        )
+        return head, f"\n--{boundary}--\n"
+
+    @staticmethod
+    def _header(value):
+        value = str(value).replace("\r", " ").replace("\n", " ")
+        return value if value.isascii() else Header(value, "utf-8").encode()
+
+    @staticmethod
+    def _build_logo_part(logo_bytes):
+        img = MIMEImage(logo_bytes, name="hotel_logo.png")
+        img.add_header("Content-ID", "<hotel_logo>")
+        img.add_header("Content-Disposition", "inline", filename="hotel_logo.png")
+        return img.as_string()
+
+
+# ---------------------------------------------------
+# Bulk rendering
+# ---------------------------------------------------
+_worker_renderer = None
+
+
+def _init_worker(sender_name, from_address):
+    global _worker_renderer
+    # Workers only render message heads; the logo part is appended by the parent
+    _worker_renderer = ReceiptRenderer(sender_name, from_address, logo_bytes=b"")
+
+
+def _render_chunk(receipts):
+    return [_worker_renderer._render_receipt_head(receipt) for receipt in receipts]
+
+
+def render_many(receipts, sender_name, from_address, logo_bytes=None, workers=None, chunk_size=500):
+    """
+    Yield (receipt, subject, message text) for every receipt, in order. Runs with fewer than PARALLEL_MIN
+    receipts, or with workers=1, are rendered in this process.
+    """
+    receipts = list(receipts)
+    renderer = ReceiptRenderer(sender_name, from_address, logo_bytes)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(receipts) < PARALLEL_MIN:
+        for receipt in receipts:
+            subject, message = renderer.render_receipt(receipt)
+            yield receipt, subject, message
+        return
+
+    # Only bulk runs need a pool; importing it up front would slow down every app start
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [receipts[i:i + chunk_size] for i in range(0, len(receipts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(sender_name, from_address)) as pool:
+        for chunk, heads in zip(chunks, pool.map(_render_chunk, chunks)):
+            for receipt, (subject, head, tail) in zip(chunk, heads):
+                yield receipt, subject, head + renderer.logo_part + tail
@@ -0,0 +1,142 @@
+"""
+Module: reservation_archive.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module moves closed stays (Cancelled or Complete reservations whose check-out is older than a configurable age)
+out of the `reservations` table into `reservations_archive`. Closed reservations are never updated again, but
+without archiving they stay in the hot table forever, and every active-status query, overlap check and metrics
+count has to skip past them. History reads go through the `reservations_all` view (the UNION ALL of both tables),
+so inactive booking records, reservation search, guest history and the all-time metrics still see every row.
+The move runs daily as the scheduler's archive_closed_reservations job, or from the command line.
+
+Usage:
+    moved = db.archive.archive_closed(business_date=date.today())
+    python reservation_archive.py --db hotel.db --days 365
+
+Important Functions:
+- ReservationArchive.archive_closed(business_date=None): Move every closed stay that checked out more than
+  min_age_days before business_date, chunk_size rows per transaction.
+  Output: int, number of reservations moved.
+- ReservationArchive.cutoff(business_date=None): The first check-out date that is NOT archived yet.
+- ReservationArchive.counts(): {"hot": rows in reservations, "archived": rows in reservations_archive}.
+- main(argv): Command line entry point.
+
+Important Data Structures:
+- reservations_archive table: The reservation columns (including the day numbers) plus archived_at.
+- reservations_all view: Both tables with the same columns, for reads that must include archived stays.
+- COLUMNS: The columns copied from reservations, in the view's order.
+
+Algorithms:
+- Chunked moves: Each chunk is its own BEGIN IMMEDIATE transaction that selects up to chunk_size due ids
+  (idx_reservations_status_checkout), copies those rows into the archive and deletes them from reservations.
+  Front-desk writers wait for at most one chunk, and a crash loses no rows: a chunk is either fully moved or not
+  moved at all. The loop ends when a chunk comes back short.
+- The deletes fire the usual change-tracking and table_versions triggers, so delta readers of the reservations table
+  drop the rows and cached searches are invalidated. get_filtered_reservation_changes looks reservations up in
+  reservations_all, so an inactive booking-records list keeps showing an archived row.
+- Only Cancelled and Complete rows are moved, and only after check-out, so the overlap checks, availability and
+  the active lists never needed them.
+"""
+import argparse
+from datetime import date, datetime, timedelta
+
+COLUMNS = ("reservation_id", "guest_id", "room_id", "check_in_date", "check_out_date", "num_guests",
+           "total_price", "status", "is_paid", "change_seq", "updated_at", "check_in_day", "check_out_day")
+
+
+class ReservationArchive:
+    MIN_AGE_DAYS = 90
+    CHUNK_SIZE = 500
+    CLOSED_STATUSES = ("Cancelled", "Complete")
+
+    def __init__(self, db, min_age_days=MIN_AGE_DAYS, chunk_size=CHUNK_SIZE):
+        if min_age_days < 0:
+            raise ValueError("min_age_days cannot be negative.")
+        if not 1 <= chunk_size <= 900:
+            raise ValueError("chunk_size must be between 1 and 900.")   # one bound variable per id
+        self.db = db
+        self.min_age_days = min_age_days
+        self.chunk_size = chunk_size
+
+    def cutoff(self, business_date=None):
+        return (business_date or date.today()) - timedelta(days=self.min_age_days)
+
+    def archive_closed(self, business_date=None):
+        """Move closed stays that checked out before cutoff(business_date). Returns how many were moved."""
+        cutoff = self.cutoff(business_date).isoformat()
+        moved = 0
+        while True:
+            count = self._archive_chunk(cutoff)
+            moved += count
+            if count < self.chunk_size:
+                return moved
+
+    def _archive_chunk(self, cutoff):
+        columns = ", ".join(COLUMNS)
+        statuses = ", ".join("?" for _ in self.CLOSED_STATUSES)
+        archived_at = datetime.now().isoformat(timespec="seconds")
+        conn = self.db.connect(raw=True)
+        cur = conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute(
+                f"SELECT reservation_id FROM reservations WHERE status IN ({statuses}) AND check_out_date < ? "
+                f"LIMIT ?",
+                (*self.CLOSED_STATUSES, cutoff, self.chunk_size),
+            )
+            ids = [row[0] for row in cur.fetchall()]
+            if ids:
+                placeholders = ", ".join("?" for _ in ids)
+                cur.execute(
+                    f"INSERT INTO reservations_archive ({columns}, archived_at) "
+                    f"SELECT {columns}, ? FROM reservations WHERE reservation_id IN ({placeholders})",
+                    (archived_at, *ids),
+                )
+                # One id per statement: the delete triggers re-trace their statement once per row, and a 500-id
+                # IN list made that trace (QueryCache write tracking) several times slower than the delete itself
+                cur.executemany("DELETE FROM reservations WHERE reservation_id = ?", [(rid,) for rid in ids])
+            cur.execute("COMMIT")
+            return len(ids)
+        except Exception:
+            # BEGIN IMMEDIATE itself may have failed (a front-desk writer holds the lock); nothing to roll back then
+            if conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def counts(self):
+        conn = self.db.connect(raw=True)
+        try:
+            return {
+                "hot": conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0],
+                "archived": conn.execute("SELECT COUNT(*) FROM reservations_archive").fetchone()[0],
+            }
+        finally:
+            conn.close()
+
+
+def main(argv=None):
+    from config import DB_PATH
+    from database_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Move old Cancelled/Complete reservations to the archive table.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database (default: %(default)s)")
+    parser.add_argument("--days", type=int, default=ReservationArchive.MIN_AGE_DAYS,
+                        help="Archive stays that checked out more than this many days ago (default: %(default)s)")
+    parser.add_argument("--chunk", type=int, default=ReservationArchive.CHUNK_SIZE,
+                        help="Reservations moved per transaction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    archive = ReservationArchive(DatabaseManager(args.db), args.days, args.chunk)
+    moved = archive.archive_closed()
+    counts = archive.counts()
+    print(f"Archived {moved} reservations (checked out before {archive.cutoff()}). "
+          f"Hot table: {counts['hot']}, archive: {counts['archived']}.")
+    return moved
+
+
+if __name__ == "__main__":
+    main()
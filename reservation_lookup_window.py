@@ -5,13 +5,24 @@ from datetime import datetime, date
 from database_manager import DatabaseManager
 from hotel_manager import HotelManager
 
-# make these once so we don't reconnect over and over
-_db = DatabaseManager()
-_hotel = HotelManager(_db)
+# made once, on first use, so we don't reconnect over and over (and importing this module stays cheap)
+_hotel = None
+
+
+def _get_hotel(parent):
+    """The app's HotelManager when the parent has one, otherwise a module-wide one."""
+    global _hotel
+    hotel = getattr(parent, "hotel", None)
+    if hotel is not None:
+        return hotel
+    if _hotel is None:
+        _hotel = HotelManager(DatabaseManager())
+    return _hotel
 
 
 def open_reservation_lookup_window(parent):
     """Tiny guest window to search & cancel a reservation."""
+    hotel = _get_hotel(parent)
 
     win = tk.Toplevel(parent)
     win.title("Find My Reservation")
@@ -81,7 +92,7 @@ def open_reservation_lookup_window(parent):
                 return
 
         try:
-            rows = _hotel.search_reservation(
+            rows = hotel.search_reservation(
                 reservation_id=res_id,
                 email=email or None,
             )
@@ -150,7 +161,7 @@ def open_reservation_lookup_window(parent):
             return
 
         try:
-            receipt = _hotel.cancel_reservation(res_id)
+            receipt = hotel.cancel_reservation(res_id)
         except Exception as ex:
             messagebox.showerror("Error", f"Cancellation failed:\n{ex}")
             return
@@ -0,0 +1,103 @@
+"""
+Module: room_inventory.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module keeps the rooms table in memory. The table is small and rarely changes, but price quotes, capacity
+checks and room-number lookups (get_room, get_room_price, get_room_number, room_exists) each used to be a round trip
+to SQLite. RoomInventory loads every room once into an immutable snapshot indexed by room_id, room_number and
+room_type, and swaps in a freshly loaded snapshot whenever the rooms table changes.
+
+Important Functions:
+- RoomInventory.snapshot(): Return the current InventorySnapshot, reloading it first if the rooms table changed.
+  Output: InventorySnapshot
+- RoomInventory.invalidate(): Force the next snapshot() call to reload (called by add_room/update_room).
+- InventorySnapshot.get(room_id=None, room_number=None): Look up one room.
+  Output: Room or None
+- InventorySnapshot.of_type(room_type): All rooms of one type.
+  Output: tuple of Room
+
+Important Data Structures:
+- InventorySnapshot: Frozen dataclass holding a tuple of Room objects plus read-only (MappingProxyType) indexes
+  by_id (int -> Room), by_number (str -> Room) and by_type (str -> tuple of Room).
+- Room (hotel_models.py): Slotted dataclass, one per row.
+
+Algorithms:
+- Change detection: The snapshot is tagged with DatabaseManager.cache.version_token("rooms"). Any write to rooms
+  through DatabaseManager (and any write from another process) changes the token, so the next snapshot() call loads
+  a new snapshot. The token is taken before loading; if the table changes while loading, the token is already
+  stale and the following call reloads again.
+- Atomic swap: A new snapshot is built completely and then published with a single attribute assignment, so readers
+  on other threads see either the old snapshot or the new one, never a partially built index.
+- Room numbers are indexed as strings (rooms.room_number is TEXT), so get(room_number=101) and
+  get(room_number="101") find the same room, as the SQL lookup did.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from hotel_models import Room
+
+
+@dataclass(frozen=True, slots=True)
+class InventorySnapshot:
+    rooms: tuple
+    by_id: MappingProxyType
+    by_number: MappingProxyType
+    by_type: MappingProxyType
+
+    @classmethod
+    def build(cls, rooms):
+        rooms = tuple(rooms)
+        by_type = {}
+        for room in rooms:
+            by_type.setdefault(room.room_type, []).append(room)
+        return cls(
+            rooms=rooms,
+            by_id=MappingProxyType({room.room_id: room for room in rooms}),
+            by_number=MappingProxyType({str(room.room_number): room for room in rooms}),
+            by_type=MappingProxyType({t: tuple(rs) for t, rs in by_type.items()}),
+        )
+
+    def get(self, room_id=None, room_number=None):
+        if room_id:
+            return self.by_id.get(room_id)
+        if room_number is not None:
+            return self.by_number.get(str(room_number))
+        return None
+
+    def of_type(self, room_type):
+        return self.by_type.get(room_type, ())
+
+
+class RoomInventory:
+    def __init__(self, db):
+        self.db = db
+        self._snapshot = None
+        self._token = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> InventorySnapshot:
+        token = self.db.cache.version_token("rooms")
+        if self._snapshot is not None and token == self._token:
+            return self._snapshot
+
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            if self._snapshot is not None and token == self._token:
+                return self._snapshot
+            snapshot = self._load()
+            self._snapshot, self._token = snapshot, token
+            return snapshot
+
+    def invalidate(self):
+        self._token = None
+
+    def _load(self) -> InventorySnapshot:
+        conn = self.db.connect()
+        try:
+            rows = conn.execute("SELECT * FROM rooms ORDER BY room_id").fetchall()
+        finally:
+            conn.close()
+        return InventorySnapshot.build(Room.from_row(row) for row in rows)
@@ -0,0 +1,130 @@
+"""
+Module: row_mapping.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module is the single row format for query results. DatabaseManager.connect() installs `record_factory` as the
+row factory, so every query returns lightweight records instead of a mix of sqlite3.Row objects, plain tuples and
+hand-built dicts. A record is a tuple subclass with `__slots__ = ()`: it costs the same memory as a plain tuple, and
+it still supports everything callers did with the old formats (row[0], row["price"], row.price, unpacking, keys(),
+dict(row)). Bulk paths that only need positions can ask for raw tuples with DatabaseManager.connect(raw=True).
+
+Important Functions:
+- record_factory(cursor, row): sqlite3 row_factory returning a Record subclass for the cursor's columns.
+- record_class(names): The Record subclass for a tuple of column names (created once per distinct column list).
+  Input: tuple of str.
+  Output: subclass of RoomRecord, GuestRecord, ReservationRecord, ReservationViewRecord or Record.
+
+Important Data Structures:
+- Record: Base tuple subclass. `_fields` holds the column names, `_index` maps name (and lower-cased name) to
+  position, and each column is also exposed as a read-only attribute.
+- RoomRecord / GuestRecord / ReservationRecord / ReservationViewRecord: Typed bases picked from the column names
+  (a reservation joined with guest or room columns is a ReservationViewRecord), so isinstance() checks can tell
+  what a result holds.
+
+Algorithms:
+- Class reuse: record_class is memoized on the column-name tuple, and record_factory remembers the last cursor
+  description it saw. sqlite3 reuses one description object for every row of a result, so after the first row each
+  row costs one identity check plus a tuple copy.
+- Name lookup matches sqlite3.Row: exact name first, then case-insensitive; a missing name raises IndexError.
+"""
+import functools
+import keyword
+from operator import itemgetter
+
+
+class Record(tuple):
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            index = self._index.get(key)
+            if index is None:
+                index = self._index.get(key.lower())
+                if index is None:
+                    raise IndexError(f"No item with that key: {key}")
+            return tuple.__getitem__(self, index)
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return list(self._fields)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except IndexError:
+            return default
+
+    def as_dict(self):
+        return dict(zip(self._fields, self))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+        return f"{type(self).__name__}({values})"
+
+
+class RoomRecord(Record):
+    __slots__ = ()
+
+
+class GuestRecord(Record):
+    __slots__ = ()
+
+
+class ReservationRecord(Record):
+    __slots__ = ()
+
+
+class ReservationViewRecord(Record):
+    __slots__ = ()
+
+
+_ROOM_COLUMNS = {"room_id", "room_number"}
+_GUEST_COLUMNS = {"guest_id", "first_name", "last_name"}
+_RESERVATION_COLUMNS = {"reservation_id", "check_in_date", "check_out_date"}
+
+
+def _kind_for(names):
+    columns = set(names)
+    if _RESERVATION_COLUMNS <= columns:
+        joined = "room_number" in columns or "first_name" in columns or "guest_name" in columns
+        return ReservationViewRecord if joined else ReservationRecord
+    if _ROOM_COLUMNS <= columns and "room_type" in columns:
+        return RoomRecord
+    if _GUEST_COLUMNS <= columns:
+        return GuestRecord
+    return Record
+
+
+@functools.lru_cache(maxsize=512)
+def record_class(names: tuple):
+    """Return the Record subclass for a result with these column names."""
+    kind = _kind_for(names)
+    index = {}
+    for i, name in enumerate(names):
+        index.setdefault(name, i)            # duplicate column names resolve to the first, like sqlite3.Row
+        index.setdefault(name.lower(), i)
+
+    namespace = {"__slots__": (), "_fields": names, "_index": index}
+    for name, i in index.items():
+        if name.isidentifier() and not keyword.iskeyword(name) and not hasattr(kind, name):
+            namespace[name] = property(itemgetter(i))
+    return type(kind.__name__, (kind,), namespace)
+
+
+_last = (None, None)   # (cursor.description, record class) of the most recent result
+
+
+def record_factory(cursor, row):
+    """sqlite3 row_factory producing Record subclasses."""
+    global _last
+    description = cursor.description
+    last = _last
+    if last[0] is description:
+        return last[1](row)
+    cls = record_class(tuple(column[0] for column in description))
+    _last = (description, cls)
+    return cls(row)
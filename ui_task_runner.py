@@ -0,0 +1,205 @@
+"""
+Module: ui_task_runner.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module runs database work for the Tk screens on a small thread pool, so a slow query no longer freezes the
+window. Results are handed back to the Tk main thread with after(), and the callbacks that touch widgets run there.
+When a screen starts a new load under the same key (the user changed a filter before the last load finished), the
+older request is superseded: it is cancelled if it has not started yet, and its result is dropped if it has. A
+LoadingIndicator shows a "Loading..." overlay and a busy cursor while a screen has work in flight.
+
+Usage:
+    self.loading = LoadingIndicator(self.tree)
+    get_runner().submit(self, db.get_filtered_reservations, key="load", indicator=self.loading,
+                        on_success=self._show_rows, on_error=self._show_error, guest_name=name)
+
+Important Functions:
+- UITaskRunner.submit(owner, func, *args, key=None, on_success=None, on_error=None, indicator=None, **kwargs):
+  Run func(*args, **kwargs) on the pool. Callbacks run on the Tk thread, and only if `owner` still exists and
+  the task was not superseded.
+  Output: TaskHandle.
+- UITaskRunner.cancel(owner, key): Supersede the owner's in-flight task for `key` without starting a new one.
+- UITaskRunner.shutdown(): Stop the pool (pending tasks are cancelled).
+- get_runner(): The shared runner used by every screen.
+- LoadingIndicator.show()/hide(): Reference-counted overlay on a widget.
+
+Important Data Structures:
+- TaskHandle: The future, owner, key and callbacks of one submitted task, plus its cancelled flag.
+- _latest (dict): (owner, key) -> newest TaskHandle; older handles for the same key are superseded.
+- _done (queue.SimpleQueue): Finished handles, pushed from worker threads and drained on the Tk thread.
+
+Algorithms:
+- Marshalling: Tk widgets may only be used from the main thread. Workers never touch Tk. Each future's done
+  callback puts the handle on _done, and a poll loop scheduled with after() on the Tk root drains the queue and
+  runs the callbacks. The loop only runs while tasks are outstanding.
+- Supersession is cooperative: a query that has already started is left to finish (SQLite work on another
+  connection cannot be stopped safely from here), and its result is discarded.
+"""
+import queue
+import threading
+import tkinter as tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskHandle:
+    __slots__ = ("owner", "key", "future", "on_success", "on_error", "indicator", "cancelled")
+
+    def __init__(self, owner, key, on_success, on_error, indicator):
+        self.owner = owner
+        self.key = key
+        self.future = None
+        self.on_success = on_success
+        self.on_error = on_error
+        self.indicator = indicator
+        self.cancelled = False
+
+    def cancel(self):
+        """Drop this task's result; the work itself is skipped if it has not started yet."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+def _exists(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except (tk.TclError, AttributeError, RuntimeError):
+        return False
+
+
+class UITaskRunner:
+    POLL_MS = 25
+
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._done = queue.SimpleQueue()
+        self._latest = {}
+        self._outstanding = 0
+        self._poll_widget = None
+        self._lock = threading.Lock()
+
+    def submit(self, owner, func, *args, key=None, on_success=None, on_error=None, indicator=None, **kwargs):
+        """Run func(*args, **kwargs) off the Tk thread. Must be called from the Tk thread."""
+        handle = TaskHandle(owner, key, on_success, on_error, indicator)
+        if key is not None:
+            previous = self._latest.get((owner, key))
+            if previous is not None:
+                previous.cancel()
+            self._latest[(owner, key)] = handle
+
+        if indicator is not None:
+            indicator.show()
+        with self._lock:
+            self._outstanding += 1
+        handle.future = self._executor.submit(func, *args, **kwargs)
+        handle.future.add_done_callback(lambda _future: self._done.put(handle))
+        self._ensure_polling(owner)
+        return handle
+
+    def cancel(self, owner, key):
+        handle = self._latest.pop((owner, key), None)
+        if handle is not None:
+            handle.cancel()
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ---------------------------------------------------
+    # Tk thread side
+    # ---------------------------------------------------
+    def _ensure_polling(self, owner):
+        if self._poll_widget is not None:
+            return
+        # Poll on the Tk root so the loop survives the owner (e.g. a popup) being destroyed
+        root = owner._root() if hasattr(owner, "_root") else owner
+        self._poll_widget = root
+        root.after(self.POLL_MS, self._drain)
+
+    def _drain(self):
+        while True:
+            try:
+                handle = self._done.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._outstanding -= 1
+            self._deliver(handle)
+
+        with self._lock:
+            outstanding = self._outstanding
+        widget, self._poll_widget = self._poll_widget, None
+        if outstanding and widget is not None and _exists(widget):
+            self._poll_widget = widget
+            widget.after(self.POLL_MS, self._drain)
+
+    def _deliver(self, handle):
+        if handle.key is not None and self._latest.get((handle.owner, handle.key)) is handle:
+            del self._latest[(handle.owner, handle.key)]
+        if handle.indicator is not None:
+            handle.indicator.hide()
+        if handle.cancelled or handle.future.cancelled() or not _exists(handle.owner):
+            return
+
+        error = handle.future.exception()
+        try:
+            if error is None:
+                if handle.on_success is not None:
+                    handle.on_success(handle.future.result())
+            elif handle.on_error is not None:
+                handle.on_error(error)
+            else:
+                print(f"[UITaskRunner] Background task failed: {error!r}")
+                traceback.print_exception(type(error), error, error.__traceback__)
+        except Exception as e:
+            # A failing callback must not stop results for other screens from being delivered
+            print(f"[UITaskRunner] Callback failed: {e!r}")
+
+
+class LoadingIndicator:
+    """'Loading...' label centered over `widget` plus a busy cursor, shown while any load is in flight."""
+
+    def __init__(self, widget, text="Loading..."):
+        self.widget = widget
+        self.text = text
+        self._count = 0
+        self._label = None
+
+    def show(self):
+        self._count += 1
+        if self._count > 1 or not _exists(self.widget):
+            return
+        self._label = tk.Label(self.widget, text=self.text, font=("Arial", 14, "bold"),
+                               bg="#E8EEF4", fg="#1B2A41", padx=16, pady=8)
+        self._label.place(relx=0.5, rely=0.5, anchor="center")
+        self.widget.configure(cursor="watch")
+
+    def hide(self):
+        self._count = max(0, self._count - 1)
+        if self._count:
+            return
+        if self._label is not None:
+            if _exists(self._label):
+                self._label.destroy()
+            self._label = None
+        if _exists(self.widget):
+            self.widget.configure(cursor="")
+
+    @property
+    def active(self):
+        return self._count > 0
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """The runner shared by every screen (created on first use)."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = UITaskRunner()
+        return _runner
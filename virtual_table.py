@@ -0,0 +1,273 @@
+"""
+Module: virtual_table.py
+Date: 10/19/2026
+Programmer: Keano
+
+Description:
+This module makes a ttk.Treeview show very large result sets without creating an item per row. A VirtualTable owns
+the full row list, but only the rows in the visible window are materialized as Treeview items. Scrolling does not
+create or delete items. The items that scrolled out of view are recycled to show the rows that scrolled in. When
+the screen reloads, set_rows() works out a keyed diff against the previous rows, and only the visible items whose
+row was added, changed or removed are touched. Tens of thousands of reservations scroll as quickly as one page.
+
+Usage:
+    self.table = VirtualTable(self.tree, key=lambda row: row[0], scrollbar=vsb)
+    self.table.set_rows(rows)               # initial load, re-sort or refresh
+    row = self.table.row_for(self.tree.focus())
+
+Important Functions:
+- VirtualTable.set_rows(rows, keep_position=True): Replace the rows and refresh only what changed on screen.
+  Output: RowDiff of the keys that were added, changed and removed.
+- VirtualTable.yview(*args): Scrollbar command ("moveto" / "scroll"); also driven by the mouse wheel and keys.
+- VirtualTable.scroll_to(index): Scroll so that row `index` is on screen.
+- VirtualTable.row_for(item) / selected_rows(): Map Treeview items back to the rows they currently show.
+
+Important Data Structures:
+- _rows (list) / _positions (dict): The full result set and key -> index.
+- _items (list): Attached Treeview item ids in display order; _spare holds detached items kept for reuse.
+- _shown (dict): item id -> (key, values, tags) the item currently displays, used to skip redundant updates.
+- _selected (set): Keys of selected rows, so the selection follows its rows as the items are recycled.
+
+Algorithms:
+- Windowing: The window is rows[offset:offset + visible], where visible is the number of rows that fit in the
+  Treeview's height. The Treeview never scrolls itself. The scrollbar shows offset/len(rows) instead.
+- Reconciliation: For each row in the window, reuse the item already showing that key. Otherwise take an item
+  whose row left the window (or a spare), and insert a new item only when none is free. Items are updated only
+  when their key, values or tags differ, and are reordered with move() only when the order is wrong.
+- Refresh anchoring: After set_rows(), the row that was at the top stays at the top if it still exists.
+"""
+import tkinter as tk
+from dataclasses import dataclass
+from tkinter import ttk
+
+
+@dataclass(frozen=True)
+class RowDiff:
+    added: tuple
+    changed: tuple
+    removed: tuple
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+class VirtualTable:
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, tree, key=lambda row: row[0], tags=None, scrollbar=None):
+        """
+        Wrap an already configured Treeview (columns, headings and tag styles are left to the caller).
+        key(row) must be unique per row; tags(row) optionally returns the row's Treeview tags.
+        """
+        self.tree = tree
+        self._key = key
+        self._tags = tags
+        self.scrollbar = scrollbar
+
+        self._rows = []
+        self._positions = {}
+        self._offset = 0
+        self._visible = max(1, int(tree.cget("height")))
+        self._items = []
+        self._spare = []
+        self._shown = {}
+        self._selected = set()
+
+        # Scrolling is virtual: the Treeview itself always shows its first item at the top
+        tree.configure(yscrollcommand="")
+        if scrollbar is not None:
+            scrollbar.configure(command=self.yview)
+        tree.bind("<MouseWheel>", self._on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        tree.bind("<Down>", lambda e: self._on_arrow(1))
+        tree.bind("<Prior>", lambda e: self._scroll_by(-self._visible) or "break")
+        tree.bind("<Next>", lambda e: self._scroll_by(self._visible) or "break")
+        tree.bind("<Configure>", self._on_configure, add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    # ---------------------------------------------------
+    # Data
+    # ---------------------------------------------------
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def visible(self):
+        return self._visible
+
+    def set_rows(self, rows, keep_position=True):
+        """
+        Replace the rows. With keep_position the row at the top stays at the top (a refresh); otherwise the
+        table scrolls back to the first row (a new search or sort).
+        """
+        rows = list(rows)
+        positions = {}
+        for index, row in enumerate(rows):
+            positions[self._key(row)] = index
+        if len(positions) != len(rows):
+            raise ValueError("VirtualTable keys must be unique")
+
+        old_rows, old_positions = self._rows, self._positions
+        added = tuple(k for k in positions if k not in old_positions)
+        removed = tuple(k for k in old_positions if k not in positions)
+        changed = tuple(k for k, i in positions.items()
+                        if k in old_positions and tuple(old_rows[old_positions[k]]) != tuple(rows[i]))
+
+        # Keep the top row in place across refreshes when it survives
+        anchor = self._key(old_rows[self._offset]) if self._offset < len(old_rows) else None
+        self._rows, self._positions = rows, positions
+        self._selected &= positions.keys()
+        self._offset = positions.get(anchor, self._offset) if keep_position else 0
+        self._render()
+        return RowDiff(added, changed, removed)
+
+    def row_for(self, item):
+        """The row the given Treeview item currently shows, or None."""
+        shown = self._shown.get(item)
+        if shown is None or item not in self._items:
+            return None
+        return self._rows[self._positions[shown[0]]]
+
+    def selected_rows(self):
+        return [self._rows[i] for i in sorted(self._positions[k] for k in self._selected)]
+
+    # ---------------------------------------------------
+    # Scrolling
+    # ---------------------------------------------------
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")."""
+        if not args:
+            return self._fraction()
+        if args[0] == "moveto":
+            self._set_offset(round(float(args[1]) * len(self._rows)))
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self._scroll_by(int(args[1]) * step)
+
+    def scroll_to(self, index):
+        if index < self._offset:
+            self._set_offset(index)
+        elif index >= self._offset + self._visible:
+            self._set_offset(index - self._visible + 1)
+
+    def _scroll_by(self, rows):
+        self._set_offset(self._offset + rows)
+
+    def _set_offset(self, offset):
+        offset = max(0, min(offset, len(self._rows) - self._visible))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _fraction(self):
+        total = len(self._rows)
+        if total == 0:
+            return 0.0, 1.0
+        return self._offset / total, min(1.0, (self._offset + self._visible) / total)
+
+    # ---------------------------------------------------
+    # Rendering
+    # ---------------------------------------------------
+    def _render(self):
+        self._offset = max(0, min(self._offset, len(self._rows) - self._visible))
+        window = self._rows[self._offset:self._offset + self._visible]
+        keys = [self._key(row) for row in window]
+        wanted = set(keys)
+
+        by_key = {}
+        free = []
+        for item in self._items:
+            key = self._shown[item][0]
+            if key in wanted and key not in by_key:
+                by_key[key] = item
+            else:
+                free.append(item)
+        free.extend(reversed(self._spare))
+
+        items = []
+        for key, row in zip(keys, window):
+            item = by_key.get(key)
+            if item is None:
+                item = free.pop() if free else self.tree.insert("", "end")
+            state = (key, tuple(row), tuple(self._tags(row)) if self._tags else ())
+            if self._shown.get(item) != state:
+                self.tree.item(item, values=state[1], tags=state[2])
+                self._shown[item] = state
+            items.append(item)
+
+        # Items no longer needed are detached and kept as spares (up to one window's worth)
+        for item in free:
+            if item in self._items:
+                self.tree.detach(item)
+        keep = free[-self._visible:] if free else []
+        drop = [item for item in free if item not in keep]
+        if drop:
+            self.tree.delete(*drop)
+            for item in drop:
+                del self._shown[item]
+        self._spare = keep
+
+        if list(self.tree.get_children()) != items:
+            for index, item in enumerate(items):
+                self.tree.move(item, "", index)
+        self._items = items
+
+        selection = [item for item in items if self._shown[item][0] in self._selected]
+        if list(self.tree.selection()) != selection:
+            self.tree.selection_set(selection)
+        if self.scrollbar is not None:
+            self.scrollbar.set(*self._fraction())
+
+    # ---------------------------------------------------
+    # Event handlers
+    # ---------------------------------------------------
+    def _on_select(self, event=None):
+        on_screen = {self._shown[item][0] for item in self._items}
+        selected = {self._shown[item][0] for item in self.tree.selection() if item in self._shown}
+        # Rows selected earlier that are scrolled out of view stay selected
+        self._selected = (self._selected - on_screen) | selected
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120; macOS reports small deltas
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._scroll_by(-3 * step)
+        return "break"
+
+    def _on_arrow(self, direction):
+        focus = self.tree.focus()
+        if not self._items or focus not in self._items:
+            return None
+        edge = self._items[0] if direction < 0 else self._items[-1]
+        if focus != edge:
+            return None  # Let the Treeview move the focus inside the window
+        before = self._offset
+        self._scroll_by(direction)
+        if self._offset == before:
+            return "break"
+        # Items follow their rows, so the old edge item moved inward; the cursor goes to the new edge row
+        item = self._items[0] if direction < 0 else self._items[-1]
+        self._selected = {self._shown[item][0]}
+        self.tree.focus(item)
+        self.tree.selection_set([item])
+        return "break"
+
+    def _on_configure(self, event):
+        row_height = self._row_height()
+        # The heading takes roughly one row
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _row_height(self):
+        try:
+            return int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or self.DEFAULT_ROW_HEIGHT)
+        except (tk.TclError, ValueError):
+            return self.DEFAULT_ROW_HEIGHT